@@ -0,0 +1,188 @@
+"""
+Backtest Kernel - Array-backed execution loop for single-ticker strategies
+Drives TradeExecutor over raw NumPy arrays instead of per-cell DataFrame reads/writes
+"""
+
+import numpy as np
+
+# Tracking columns written back to the DataFrame (same order as get_portfolio_tracking_data)
+TRACKING_COLUMNS = ['Portfolio_Value', 'Invested_Amount', 'Remaining', 'Shares', 'Position_Value', 'Final_Cash']
+
+# Bars per block of Portfolio_Value rows handed to the executor's OnlineMetrics
+METRICS_CHUNK = 4096
+
+
+def to_signal_array(values):
+    """Convert a signal column to a plain bool array (same truthiness the executor applies)"""
+    return np.asarray(values, dtype=bool)
+
+
+def run_backtest_kernel(executor, close, entry_signal, exit_signal, strategy_type):
+    """
+    Run the executor's long/short/reversal state machine over arrays
+
+    Args:
+        executor: TradeExecutor instance (handles signals, SL/TP and liquidation)
+        close: Close prices, one per bar
+        entry_signal: Entry signals, one per bar
+        exit_signal: Exit signals, one per bar
+        strategy_type: "long", "short", or "reversal"
+
+    Returns:
+        float64 array of shape (bars, len(TRACKING_COLUMNS))
+    """
+    prices = np.asarray(close, dtype=np.float64)
+    n = len(prices)
+
+    # Preallocated output block - one row per bar
+    tracking = np.empty((n, len(TRACKING_COLUMNS)), dtype=np.float64)
+
+    # Python scalars are much cheaper to feed through the executor than NumPy scalars
+    price_list = prices.tolist()
+    entry_list = to_signal_array(entry_signal).tolist()
+    exit_list = to_signal_array(exit_signal).tolist()
+
+    portfolio = executor.portfolio
+    process_tick = executor.process_market_tick
+
+    for start in range(0, n, METRICS_CHUNK):
+        stop = min(n, start + METRICS_CHUNK)
+        for i in range(start, stop):
+            current_price = price_list[i]
+            process_tick(current_price, entry_list[i], exit_list[i], strategy_type, i)
+
+            # Same values as TradeExecutor.get_portfolio_tracking_data()
+            tracking[i] = (
+                portfolio.get_portfolio_value(current_price),
+                portfolio.invested_amount,
+                portfolio.remaining,
+                portfolio.shares_owned,
+                portfolio.get_position_value(current_price),
+                portfolio.final_cash
+            )
+        # Metrics follow the run block by block instead of with a call per bar
+        executor.metrics.update_values(tracking[start:stop, 0])
+
+    return tracking
+
+
+# First window of the forward search for a liquidation bar (doubles until one is found)
+LIQUIDATION_SEARCH_WINDOW = 64
+
+
+def _first_liquidation(prices, start, buying_price, shares):
+    """First bar at or after `start` where a short position hits the 100% loss limit (len(prices) if none)"""
+    n = len(prices)
+    position, window = start, LIQUIDATION_SEARCH_WINDOW
+    while position < n:
+        stop = min(n, position + window)
+        # Same expression as RiskManager.check_liquidation, evaluated over the window
+        hits = np.flatnonzero((buying_price - shares * prices[position:stop]) <= -(buying_price * 1.0))
+        if len(hits):
+            return position + int(hits[0])
+        position, window = stop, window * 2
+    return n
+
+
+def _fill_tracking(tracking, prices, start, stop, portfolio):
+    """Tracking rows for bars [start, stop) on which the position doesn't change (mark-to-market only)"""
+    if start >= stop:
+        return
+    span = prices[start:stop]
+    shares = portfolio.shares_owned
+    if shares != 0:
+        position_value = abs(shares) * span
+        tracking[start:stop, 0] = portfolio.remaining + position_value
+        tracking[start:stop, 4] = position_value
+    else:
+        tracking[start:stop, 0] = portfolio.final_cash if portfolio.final_cash > 0 else portfolio.initial_cash
+        tracking[start:stop, 4] = 0
+    tracking[start:stop, 1] = portfolio.invested_amount
+    tracking[start:stop, 2] = portfolio.remaining
+    tracking[start:stop, 3] = shares
+    tracking[start:stop, 5] = portfolio.final_cash
+
+
+def run_event_kernel(executor, close, entry_signal, exit_signal, strategy_type):
+    """
+    Event-driven variant of run_backtest_kernel: the executor only sees the bars where something
+    can happen - a signal that matters for the current position, the open position's next SL/TP
+    exit (RiskManager forward search) or a short's liquidation bar - and the tracking rows in
+    between are filled with vectorized mark-to-market. Cost scales with trades, not bars; trades
+    and tracking are identical to run_backtest_kernel.
+    """
+    prices = np.asarray(close, dtype=np.float64)
+    n = len(prices)
+    risk = executor.risk
+    if not risk.uses_bar_search():
+        # Exits are located on the Close (SL/TP checks are stateless between bars)
+        risk.attach_bars(risk.bar_open, risk.bar_high, risk.bar_low, close=prices)
+    if not risk.uses_bar_search():
+        # Intrabar fills without High/Low attached fall back to per-tick checks
+        return run_backtest_kernel(executor, close, entry_signal, exit_signal, strategy_type)
+
+    tracking = np.empty((n, len(TRACKING_COLUMNS)), dtype=np.float64)
+    entries = to_signal_array(entry_signal)
+    exits = to_signal_array(exit_signal)
+    entry_bars, exit_bars = np.flatnonzero(entries), np.flatnonzero(exits)
+    any_bars = np.flatnonzero(entries | exits)
+    # Signal bars that can change each position (long / short / flat); others are no-ops
+    relevant = {
+        1: exit_bars,
+        -1: entry_bars if strategy_type == "reversal" else exit_bars,
+        0: any_bars if strategy_type == "reversal" else entry_bars,
+    }
+
+    portfolio = executor.portfolio
+    process_tick = executor.process_market_tick
+    metrics, fed = executor.metrics, 0
+    i = 0
+    while i < n:
+        shares = portfolio.shares_owned
+        candidates = relevant[(shares > 0) - (shares < 0)]
+        position = np.searchsorted(candidates, i)
+        event = int(candidates[position]) if position < len(candidates) else n
+        if shares != 0:
+            exit_bar = risk.next_exit_bar(i)
+            if exit_bar is not None:
+                event = min(event, exit_bar)
+            if shares < 0:
+                event = min(event, _first_liquidation(prices[:event], i, portfolio.buying_price, abs(shares)))
+
+        _fill_tracking(tracking, prices, i, event, portfolio)
+        if event >= n:
+            break
+        if event - fed >= METRICS_CHUNK:
+            metrics.update_values(tracking[fed:event, 0])
+            fed = event
+        current_price = prices[event].item()
+        process_tick(current_price, bool(entries[event]), bool(exits[event]), strategy_type, event)
+        tracking[event] = (
+            portfolio.get_portfolio_value(current_price),
+            portfolio.invested_amount,
+            portfolio.remaining,
+            portfolio.shares_owned,
+            portfolio.get_position_value(current_price),
+            portfolio.final_cash
+        )
+        i = event + 1
+
+    metrics.update_values(tracking[fed:, 0])
+    return tracking
+
+
+def execute_with_kernel(executor, data, strategy_type, event_driven=False):
+    """
+    Run the kernel on a signal DataFrame and attach all tracking columns in one assignment
+    (event_driven=True: run_event_kernel, which skips the bars where nothing can happen)
+    """
+    kernel = run_event_kernel if event_driven else run_backtest_kernel
+    tracking = kernel(
+        executor,
+        data['Close'].to_numpy(),
+        data['Entry_Signal'],
+        data['Exit_Signal'],
+        strategy_type
+    )
+    data[TRACKING_COLUMNS] = tracking
+    return data
@@ -0,0 +1,183 @@
+"""
+Batch Backtest - Many entry/exit signal pairs backtested against one price series in one pass
+Entry/exit signals are bars x strategies boolean matrices; every strategy has its own portfolio
+(the struct-of-arrays state of the multi-ticker engine, one column per strategy) and all of
+them advance together, one bar at a time, with array operations. The rules are those of
+TradeExecutor with Close fills: liquidation of shorts at a 100% loss, then fixed / trailing
+stop-loss and take-profit, then the long / short / reversal signals - so each column's equity
+and trade count equal a separate TradeExecutor run on that column.
+"""
+
+import numpy as np
+import pandas as pd
+
+from multi_ticker_engine import MultiTickerArrays
+
+SCORE_SUFFIX = '_Score'
+
+
+def score_signals(scores):
+    """Entry (score > 0) and exit (score < 0) matrices from a bars x strategies score matrix"""
+    scores = np.asarray(scores)
+    return scores > 0, scores < 0
+
+
+def _signal_matrix(signals, bars):
+    matrix = np.asarray(signals, dtype=bool)
+    if matrix.ndim == 1:
+        matrix = matrix[:, None]
+    if matrix.ndim != 2 or matrix.shape[0] != bars:
+        raise ValueError(f"signals must be {bars} x strategies, got {matrix.shape}")
+    # Each bar reads one row: keep rows contiguous
+    return np.ascontiguousarray(matrix)
+
+
+class BatchBacktestResult:
+    """Per-strategy equity curves (bars x strategies) and trade counts of a batched run"""
+
+    def __init__(self, equity, trade_counts, initial_cash, names=None, index=None):
+        self.equity = equity
+        self.trade_counts = trade_counts
+        self.initial_cash = initial_cash
+        self.names = list(names) if names is not None else list(range(equity.shape[1]))
+        self.index = index
+
+    def __len__(self):
+        return len(self.names)
+
+    def final_values(self):
+        """Portfolio value of every strategy after the last bar"""
+        return self.equity[-1] if len(self.equity) else np.full(len(self.names), float(self.initial_cash))
+
+    def total_return_percent(self):
+        return (self.final_values() - self.initial_cash) / self.initial_cash * 100
+
+    def equity_frame(self):
+        """Equity curves as a DataFrame (one column per strategy)"""
+        return pd.DataFrame(self.equity, index=self.index, columns=self.names)
+
+    def summary(self):
+        """One row per strategy: final value, total return and number of trades"""
+        return pd.DataFrame({
+            'final_value': self.final_values(),
+            'total_return_percent': self.total_return_percent(),
+            'trades': self.trade_counts,
+        }, index=pd.Index(self.names, name='strategy'))
+
+    def metrics(self):
+        """calculate_advanced_metrics' equity metrics for every strategy in one array pass, plus trade counts"""
+        from metrics import calculate_batch_metrics
+
+        frame = pd.DataFrame(calculate_batch_metrics(self.equity), index=pd.Index(self.names, name='strategy'))
+        frame['total_trades'] = self.trade_counts
+        return frame
+
+
+def run_batch_backtest(close, entry_signals, exit_signals, strategy_type, initial_cash,
+                       per_trade_config=None, sl_tp_config=None, names=None, index=None):
+    """
+    Backtest every column of the entry/exit matrices against the same Close prices
+
+    Args:
+        close: Close prices, one per bar
+        entry_signals, exit_signals: bars x strategies boolean matrices (a 1D array is one strategy)
+        strategy_type: "long", "short", or "reversal"
+        initial_cash, per_trade_config: Each strategy's PortfolioManager settings
+        sl_tp_config: RiskManager configuration shared by every strategy (None: no SL/TP);
+            stops and take-profits fill on the Close
+        names, index: Strategy names and bar labels for the result
+
+    Returns:
+        BatchBacktestResult with the portfolio value of every strategy after each bar
+        (TradeExecutor's Portfolio_Value tracking column) and its number of logged trades
+    """
+    if strategy_type not in ("long", "short", "reversal"):
+        raise ValueError(f"strategy_type must be 'long', 'short' or 'reversal', got {strategy_type!r}")
+    if sl_tp_config is not None and sl_tp_config.get('fill_mode', 'close') != 'close':
+        raise ValueError("Batched backtests fill SL/TP on the Close (fill_mode='close')")
+    prices = np.asarray(close, dtype=np.float64)
+    bars = len(prices)
+    entries = _signal_matrix(entry_signals, bars)
+    exits = _signal_matrix(exit_signals, bars)
+    if entries.shape != exits.shape:
+        raise ValueError(f"entry and exit matrices differ in shape: {entries.shape} vs {exits.shape}")
+    count = entries.shape[1]
+
+    state = MultiTickerArrays.flat(count, initial_cash, per_trade_config, sl_tp_config)
+    risk_enabled = state.config['enabled']
+    trailing = risk_enabled and state.config.get('trailing_sl_enabled', False)
+    equity = np.empty((bars, count))
+    trade_counts = np.zeros(count, dtype=np.int64)
+
+    for i, price in enumerate(prices.tolist()):
+        # 🚨 Liquidation first: shorts whose loss reached 100% of the shorted amount (checked with or without SL/TP)
+        shares = state.shares
+        handled = (shares < 0) & ((state.buying - np.abs(shares) * price) <= -(state.buying * 1.0))
+        if handled.any():
+            state.close_positions(handled, price)
+
+        # Stop (fixed / trailing) before take profit; trailing stops follow the Close including this bar
+        if risk_enabled:
+            shares = state.shares
+            active = shares != 0
+            if active.any():
+                long = shares > 0
+                if trailing:
+                    state.extreme = np.where(active & long, np.maximum(state.extreme, price),
+                                             np.where(active & ~long, np.minimum(state.extreme, price), state.extreme))
+                stops, _ = state.stop_levels(long, state.extreme)
+                stop_hit = active & np.where(long, price <= stops, price >= stops)
+                profit_hit = active & ~stop_hit & np.where(long, price >= state.take_profit, price <= state.take_profit)
+                risk_exit = stop_hit | profit_hit
+                if risk_exit.any():
+                    state.close_positions(risk_exit, price)
+                    handled |= risk_exit
+
+        # 📊 Signals for the strategies no risk action was taken on (one logged trade per action, flips included)
+        entry, exit_ = entries[i] & ~handled, exits[i] & ~handled
+        shares = state.shares
+        if strategy_type == "reversal":
+            # An entry signal wins: it flips shorts, opens from flat and ignores the exit signal when long
+            go_long = entry & (shares <= 0)
+            go_short = ~entry & exit_ & (shares >= 0)
+            closing = (go_long & (shares < 0)) | (go_short & (shares > 0))
+            openings = ((go_long, 1), (go_short, -1))
+        else:
+            side = 1 if strategy_type == "long" else -1
+            closing = exit_ & (shares * side > 0)
+            openings = ((entry & (shares == 0), side),)
+        if closing.any():
+            state.close_positions(closing, price)
+        acted = closing.copy()
+        for opening, side in openings:
+            if opening.any():
+                _open(state, opening, price, side)
+                acted |= opening
+        trade_counts += handled
+        trade_counts += acted
+
+        equity[i] = state.values(price)
+
+    return BatchBacktestResult(equity, trade_counts, initial_cash, names, index)
+
+
+def _open(state, mask, price, side):
+    shares = state.open_positions(mask, price, side)
+    # Levels only for entries that got at least one share (a 0-share entry stays flat)
+    opened = mask.copy()
+    opened[mask] = shares > 0
+    if opened.any():
+        state.set_levels(opened, price, shares[shares > 0], side)
+
+
+def run_score_backtests(data, strategy_type="long", initial_cash=10000, per_trade_config=None,
+                        sl_tp_config=None, columns=None):
+    """
+    Backtest every `_Score` column of `data` (or `columns`) as its own strategy: entry on a
+    positive score, exit on a negative one, all against data['Close'] in one batched pass
+    """
+    if columns is None:
+        columns = [name for name in data.columns if str(name).endswith(SCORE_SUFFIX)]
+    entries, exits = score_signals(data[columns].to_numpy())
+    return run_batch_backtest(data['Close'].to_numpy(), entries, exits, strategy_type, initial_cash,
+                              per_trade_config, sl_tp_config, names=columns, index=data.index)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the core backtest path
+Each measurement runs in a fresh interpreter so module caches don't hide the cost
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Modules on the core backtest path, plus the TV library itself for reference
+MODULES = [
+    "indicators",
+    "inputs",
+    "strategy",
+    "multicondition",
+    "ta_strategies_combinations_TVLibrary",
+    "ta_strategies_TVLibrary",
+]
+
+_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({{'seconds': elapsed, 'tv_loaded': 'ta_strategies_TVLibrary' in sys.modules}}))\n"
+)
+
+
+def measure_import(module, cold=False):
+    """
+    Import `module` in a fresh interpreter and return (seconds, tv_library_loaded)
+
+    cold=True points the bytecode cache at an empty directory so every module is compiled from source
+    """
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as pycache_dir:
+        if cold:
+            env["PYTHONPYCACHEPREFIX"] = pycache_dir
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env, capture_output=True, text=True, check=True
+        )
+    payload = json.loads(result.stdout.strip().splitlines()[-1])
+    return payload["seconds"], payload["tv_loaded"]
+
+
+def run_benchmark(modules=MODULES, repeats=5, cold=False):
+    """Median import time per module over `repeats` fresh interpreters"""
+    results = {}
+    for module in modules:
+        timings = []
+        tv_loaded = False
+        for _ in range(repeats):
+            seconds, tv_loaded = measure_import(module, cold=cold)
+            timings.append(seconds)
+        results[module] = {"median_seconds": statistics.median(timings), "tv_loaded": tv_loaded}
+    return results
+
+
+def print_report(results, title):
+    """Print a small table of import timings"""
+    print(f"\n⏱️ {title}")
+    print("=" * 72)
+    print(f"{'Module':<42}{'Median (ms)':>14}{'TV library':>16}")
+    print("-" * 72)
+    for module, stats in results.items():
+        tv = "loaded" if stats["tv_loaded"] else "not loaded"
+        print(f"{module:<42}{stats['median_seconds'] * 1000:>14.1f}{tv:>16}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print_report(run_benchmark(repeats=repeats), f"Warm import times (bytecode cached, {repeats} runs)")
+    print_report(run_benchmark(repeats=repeats, cold=True), f"Cold import times (compiled from source, {repeats} runs)")
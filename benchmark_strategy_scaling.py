@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Scaling report for AllStrategies.run_all_strategies: worker count versus wall time
+Compares the thread executor against the shared-memory process executor on synthetic OHLCV
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+import warnings
+
+
+def default_worker_counts():
+    """1, 2, 4, ... up to the number of CPUs (always including the CPU count itself)"""
+    cpus = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < cpus:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cpus)
+    return counts
+
+
+def time_run(runner_factory, df, repeats):
+    """Median wall time of runner_factory().run_all_strategies(df) over `repeats` runs"""
+    timings = []
+    for _ in range(repeats):
+        runner = runner_factory()
+        start = time.perf_counter()
+        runner.run_all_strategies(df, append=False)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_scaling_benchmark(rows=2000, worker_counts=None, repeats=3, seed=7):
+    """Time the thread executor (4 workers, the default) and the process executor at each worker count"""
+    from data_sources import SyntheticSource
+    from ta_strategies_combinations_TVLibrary import AllStrategies
+
+    df = SyntheticSource(seed=seed).fetch('SCALE', 'max', '1d').tail(rows)
+    worker_counts = worker_counts or default_worker_counts()
+
+    results = [("thread", 4, time_run(lambda: AllStrategies(max_workers=4), df, repeats))]
+    for workers in worker_counts:
+        seconds = time_run(lambda: AllStrategies(max_workers=workers, executor="process"), df, repeats)
+        results.append(("process", workers, seconds))
+    return len(df), results
+
+
+def print_report(rows, results):
+    """Print wall time and speedup relative to the thread executor"""
+    baseline = results[0][2]
+    print(f"\n⏱️ AllStrategies scaling ({rows} bars, {os.cpu_count()} CPUs)")
+    print("=" * 56)
+    print(f"{'Executor':<12}{'Workers':>10}{'Wall (s)':>16}{'Speedup':>18}")
+    print("-" * 56)
+    for executor, workers, seconds in results:
+        print(f"{executor:<12}{workers:>10}{seconds:>16.2f}{baseline / seconds:>17.2f}x")
+    print("=" * 56)
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    warnings.simplefilter("ignore")
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print_report(*run_scaling_benchmark(rows=rows, repeats=repeats))
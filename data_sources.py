@@ -0,0 +1,354 @@
+"""
+Data Sources - Pluggable OHLCV providers with a persistent local cache
+Every source returns frames shaped like yf.Ticker(ticker).history(): a DatetimeIndex
+named 'Date' (daily and above) or 'Datetime' (intraday) plus Open/High/Low/Close/Volume
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+# Intervals at or above one day use a 'Date' index, everything else 'Datetime' (same as yfinance)
+DAILY_INTERVALS = {'1d', '5d', '1wk', '1mo', '3mo'}
+
+# yfinance interval -> pandas frequency for generated data
+INTERVAL_FREQUENCIES = {
+    '1m': 'min', '2m': '2min', '5m': '5min', '15m': '15min', '30m': '30min', '60m': 'h', '90m': '90min',
+    '1h': 'h', '4h': '4h', '1d': 'B', '5d': '5B', '1wk': 'W-MON', '1mo': 'MS', '3mo': 'QS',
+}
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def _parse_period(period):
+    """(amount, unit) of a yfinance period string ('5y', '6mo', '60d', '1wk'), None for 'max'"""
+    if period is None or period == 'max':
+        return None
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', str(period).strip().lower())
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(match.group(1)), match.group(2)
+
+
+def trading_days(period):
+    """N for an 'Nd' period - yfinance counts those in trading dates, not calendar days - else None"""
+    parsed = None if period == 'ytd' else _parse_period(period)
+    return parsed[0] if parsed is not None and parsed[1] == 'd' else None
+
+
+def period_offset(period):
+    """Calendar offset for a yfinance period ('6mo' -> 6 calendar months), None for 'max'"""
+    parsed = _parse_period(period)
+    if parsed is None:
+        return None
+    amount, unit = parsed
+    if unit == 'd':
+        # Only an estimate of the span: 'Nd' means the last N trading dates (see trading_days)
+        return pd.offsets.BDay(amount)
+    return {'wk': pd.DateOffset(weeks=amount), 'mo': pd.DateOffset(months=amount),
+            'y': pd.DateOffset(years=amount)}[unit]
+
+
+def period_start(period, now=None):
+    """Earliest timestamp a request for `period` should include (None means unbounded)"""
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    offset = period_offset(period)
+    return None if offset is None else now - offset
+
+
+def _align_timestamp(timestamp, index):
+    """Make a naive timestamp comparable with a (possibly tz-aware) DatetimeIndex"""
+    timestamp = pd.Timestamp(timestamp)
+    tz = getattr(index, 'tz', None)
+    if tz is not None and timestamp.tzinfo is None:
+        return timestamp.tz_localize(tz)
+    if tz is None and timestamp.tzinfo is not None:
+        return timestamp.tz_localize(None)
+    return timestamp
+
+
+def _trading_dates(index):
+    """Distinct dates of an index (intraday bars of one day share a date)"""
+    return index.normalize().unique()
+
+
+def slice_to_period(data, period, now=None):
+    """Keep only rows inside the requested period ('Nd': the last N trading dates)"""
+    if data.empty:
+        return data
+    days = trading_days(period)
+    if days is not None:
+        dates = _trading_dates(data.index)
+        if len(dates) <= days:
+            return data
+        return data[data.index >= dates[-days]]
+    start = period_start(period, now)
+    if start is None:
+        return data
+    return data[data.index >= _align_timestamp(start, data.index)]
+
+
+def _index_name(interval):
+    """Index name yfinance uses for an interval"""
+    return 'Date' if interval in DAILY_INTERVALS else 'Datetime'
+
+
+class DataSource:
+    """Base class for OHLCV providers"""
+
+    name = "base"
+
+    def fetch(self, ticker, period, interval):
+        """Return a history() shaped DataFrame (empty DataFrame when nothing is available)"""
+        raise NotImplementedError
+
+
+class YFinanceSource(DataSource):
+    """Download history from Yahoo Finance"""
+
+    name = "yfinance"
+
+    def fetch(self, ticker, period, interval):
+        import yfinance as yf
+        return yf.Ticker(ticker).history(period=period, interval=interval)
+
+
+class LocalDirectorySource(DataSource):
+    """
+    Read history from a directory of CSV/Parquet files
+    Looks for {ticker}_{interval}.parquet/.csv, then {ticker}.parquet/.csv
+    """
+
+    name = "local"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _find_file(self, ticker, interval):
+        """Locate the best matching file for a ticker/interval"""
+        for stem in (f"{ticker}_{interval}", ticker):
+            for extension in ('.parquet', '.csv'):
+                path = os.path.join(self.directory, stem + extension)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def fetch(self, ticker, period, interval):
+        path = self._find_file(ticker, interval)
+        if path is None:
+            print(f"❌ No local file for {ticker} ({interval}) in {self.directory}")
+            return pd.DataFrame()
+
+        if path.endswith('.parquet'):
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path)
+
+        # Accept either a date column or an already-indexed frame
+        if not isinstance(data.index, pd.DatetimeIndex):
+            date_col = next((col for col in ('Datetime', 'Date', 'date', 'timestamp') if col in data.columns), None)
+            if date_col is None:
+                raise ValueError(f"{path} has no Date/Datetime column")
+            data[date_col] = pd.to_datetime(data[date_col])
+            data = data.set_index(date_col)
+
+        data = data.sort_index()
+        data.index.name = _index_name(interval)
+        return slice_to_period(data, period)
+
+
+class SyntheticSource(DataSource):
+    """
+    Generate reproducible geometric-Brownian-motion OHLCV data (offline runs and tests)
+    The same (ticker, interval) always produces the same path
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed=0, start_price=100.0, drift=0.0002, volatility=0.015, end=None):
+        self.seed = seed
+        self.start_price = start_price
+        self.drift = drift
+        self.volatility = volatility
+        self.end = end
+
+    def _rng(self, ticker, interval):
+        """Deterministic generator per ticker/interval"""
+        digest = hashlib.blake2b(f"{self.seed}:{ticker}:{interval}".encode(), digest_size=8).digest()
+        return np.random.default_rng(int.from_bytes(digest, 'little'))
+
+    def fetch(self, ticker, period, interval):
+        end = pd.Timestamp.now().normalize() if self.end is None else pd.Timestamp(self.end)
+        start = period_start(period if period != 'max' else '10y', end)
+        index = pd.date_range(start=start, end=end, freq=INTERVAL_FREQUENCIES.get(interval, 'B'))
+        index.name = _index_name(interval)
+        rows = len(index)
+
+        rng = self._rng(ticker, interval)
+        returns = rng.normal(self.drift, self.volatility, rows)
+        close = self.start_price * np.exp(np.cumsum(returns))
+        open_ = np.concatenate([[self.start_price], close[:-1]])
+        spread = np.abs(rng.normal(0, self.volatility / 2, rows)) * close
+
+        history = pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Volume': rng.integers(100_000, 1_000_000, rows).astype(np.int64),
+            'Dividends': 0.0,
+            'Stock Splits': 0.0,
+        }, index=index)
+        # 'Nd' periods are the last N trading dates, like a download
+        return slice_to_period(history, period, end)
+
+
+class CachedDataSource(DataSource):
+    """
+    Persistent on-disk cache in front of another source, keyed by (ticker, interval)
+    Reads are range-aware: a cached 5y history also serves 1y/6mo requests.
+    Entries older than max_age are refreshed from the wrapped source.
+    """
+
+    name = "cached"
+
+    def __init__(self, source, cache_dir=".ohlcv_cache", max_age=timedelta(hours=12)):
+        """
+        Args:
+            source: Wrapped DataSource used on cache misses
+            cache_dir: Directory for cached histories
+            max_age: timedelta after which an entry is stale (None = never stale)
+        """
+        self.source = source
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, ticker, interval):
+        """(data path, metadata path) for a cache entry"""
+        safe_ticker = re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+        stem = os.path.join(self.cache_dir, f"{safe_ticker}__{interval}")
+        extension = '.parquet' if PARQUET_AVAILABLE else '.pkl'
+        return stem + extension, stem + '.json'
+
+    def _read_entry(self, ticker, interval):
+        """Load (data, metadata) or (None, None) when missing/unreadable"""
+        data_path, meta_path = self._paths(ticker, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        try:
+            with open(meta_path) as f:
+                metadata = json.load(f)
+            data = pd.read_parquet(data_path) if data_path.endswith('.parquet') else pd.read_pickle(data_path)
+            return data, metadata
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cache entry for {ticker} ({interval}): {e}")
+            return None, None
+
+    def _write_entry(self, ticker, interval, data, covers_from, fetched_at):
+        """Atomically write data + metadata for an entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(ticker, interval)
+        tmp_data, tmp_meta = f"{data_path}.tmp", f"{meta_path}.tmp"
+
+        if data_path.endswith('.parquet'):
+            data.to_parquet(tmp_data)
+        else:
+            data.to_pickle(tmp_data)
+        with open(tmp_meta, 'w') as f:
+            json.dump({
+                'ticker': ticker,
+                'interval': interval,
+                'covers_from': None if covers_from is None else pd.Timestamp(covers_from).isoformat(),
+                'fetched_at': pd.Timestamp(fetched_at).isoformat(),
+                'source': self.source.name,
+            }, f, indent=2)
+
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+    def _is_fresh(self, metadata, now):
+        """True when the entry is younger than max_age"""
+        if self.max_age is None:
+            return True
+        return now - pd.Timestamp(metadata['fetched_at']) <= pd.Timedelta(self.max_age)
+
+    @staticmethod
+    def _covers(metadata, cached, period, now):
+        """True when the cached range holds the whole requested period (same rule as slice_to_period)"""
+        covers_from = metadata.get('covers_from')
+        if covers_from is None:
+            return True  # Cached with period='max'
+        days = trading_days(period)
+        if days is not None:
+            # Everything from covers_from on is cached: enough trading dates means the last N are there
+            return len(_trading_dates(cached.index)) >= days
+        required_start = period_start(period, now)
+        return required_start is not None and pd.Timestamp(covers_from) <= required_start
+
+    def fetch(self, ticker, period, interval):
+        now = pd.Timestamp.now()
+        cached, metadata = self._read_entry(ticker, interval)
+
+        # Periods count whole dates (like yfinance), so ranges start at midnight
+        today = now.normalize()
+        if cached is not None and self._is_fresh(metadata, now) and self._covers(metadata, cached, period, today):
+            self.hits += 1
+            print(f"💾 Cache hit: {ticker} {interval} ({period}) from {self.cache_dir}")
+            return slice_to_period(cached, period, today)
+
+        self.misses += 1
+        data = self.source.fetch(ticker, period, interval)
+        if data is None or data.empty:
+            return data
+
+        # A fresh download always covers the whole requested range, so it replaces the entry;
+        # 'Nd' downloads cover from their first bar (N trading dates back)
+        if trading_days(period) is not None:
+            first = pd.Timestamp(data.index[0])
+            covers_from = (first.tz_localize(None) if first.tzinfo is not None else first).normalize()
+        else:
+            covers_from = period_start(period, today)
+        try:
+            self._write_entry(ticker, interval, data, covers_from, now)
+        except Exception as e:
+            print(f"⚠️ Could not write cache entry for {ticker} ({interval}): {e}")
+
+        # Returned as downloaded: the source already applied its own period rules
+        return data
+
+    def clear(self):
+        """Delete all cached histories"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.parquet', '.pkl', '.json')):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+# Process-wide source used by inputs.download_and_prepare_data / download_multi_ticker_data
+_data_source = CachedDataSource(YFinanceSource())
+
+
+def get_data_source():
+    """Return the active data source"""
+    return _data_source
+
+
+def set_data_source(source):
+    """Replace the active data source (e.g. CachedDataSource(SyntheticSource()) for offline runs)"""
+    global _data_source
+    _data_source = source
+    return _data_source
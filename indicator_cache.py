@@ -0,0 +1,233 @@
+"""
+Indicator Cache - Content-addressed cache for indicator results
+Keys are (OHLCV data fingerprint, indicator name, normalized params) so identical
+requests on identical data are computed once per session (or once ever with the disk tier)
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Columns that indicator functions read - anything else in the frame is ignored for the key
+FINGERPRINT_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def data_fingerprint(data, columns=FINGERPRINT_COLUMNS):
+    """Hash the index and the given (by default price/volume) columns of a DataFrame into a short hex digest"""
+    columns = [col for col in columns if col in data.columns]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((len(data), columns, [str(data[col].dtype) for col in columns])).encode())
+    digest.update(pd.util.hash_pandas_object(data.index, index=False).to_numpy().tobytes())
+    for col in columns:
+        values = data[col].to_numpy()
+        if values.dtype.kind in 'biuf':
+            digest.update(np.ascontiguousarray(values).tobytes())
+        else:
+            digest.update(pd.util.hash_pandas_object(data[col], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def normalize_params(params):
+    """Turn params (tuple, list, dict or scalar) into a hashable, order-stable key"""
+    if isinstance(params, dict):
+        return tuple(sorted((str(key), normalize_params(value)) for key, value in params.items()))
+    if isinstance(params, (list, tuple)):
+        return tuple(normalize_params(value) for value in params)
+    if isinstance(params, np.generic):
+        return params.item()
+    return params
+
+
+def _copy_result(value):
+    """Copy a cached result so callers can't mutate the stored object"""
+    if isinstance(value, (pd.Series, pd.DataFrame, np.ndarray)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy_result(item) for item in value)
+    return value
+
+
+def _result_size(value):
+    """Approximate memory footprint of a cached result in bytes"""
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sum(_result_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class IndicatorCache:
+    """
+    Bounded LRU cache for indicator results with an optional on-disk tier
+    """
+
+    def __init__(self, max_entries=256, max_bytes=256 * 1024 * 1024, disk_dir=None):
+        """
+        Args:
+            max_entries: Maximum number of results kept in memory
+            max_bytes: Maximum approximate memory used by cached results
+            disk_dir: Optional directory for persisting results across runs
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def make_key(self, data, indicator_name, params):
+        """Build the cache key for an indicator request"""
+        return (data_fingerprint(data), str(indicator_name), normalize_params(params))
+
+    def get(self, key):
+        """Return (found, value) for a key, checking memory then disk"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, _copy_result(self._entries[key][0])
+
+        value = self._load_from_disk(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+            self._store_in_memory(key, value)
+            return True, _copy_result(value)
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """Store a result in memory (and on disk when enabled)"""
+        stored = _copy_result(value)
+        self._store_in_memory(key, stored)
+        self._save_to_disk(key, stored)
+
+    def get_or_compute(self, data, indicator_name, params, compute_func):
+        """Return a cached result or compute it with compute_func(data, indicator_name, params)"""
+        key = self.make_key(data, indicator_name, params)
+        found, value = self.get(key)
+        if found:
+            return value
+
+        value = compute_func(data, indicator_name, params)
+        self.put(key, value)
+        return value
+
+    def clear(self, include_disk=False):
+        """Drop all in-memory results (and disk files if requested)"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+        if include_disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self):
+        """Hit/miss counters and current memory usage"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._current_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def print_stats(self):
+        """Print a one-line cache summary"""
+        stats = self.stats()
+        print(f"🗃️ Indicator cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate), {stats['entries']} entries, "
+              f"{stats['bytes'] / (1024 * 1024):.1f} MB")
+
+    def _store_in_memory(self, key, value):
+        """Insert into the LRU and evict oldest entries until within bounds"""
+        size = _result_size(value)
+        if size > self.max_bytes:
+            return  # Too large to keep in memory at all
+
+        with self._lock:
+            if key in self._entries:
+                self._current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._current_bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self.evictions += 1
+
+    def _disk_path(self, key):
+        """File path for a key in the disk tier"""
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.pkl")
+
+    def _load_from_disk(self, key):
+        """Load a result from disk, or None if missing/unreadable"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                stored_key, value = pickle.load(f)
+            return value if stored_key == key else None
+        except Exception as e:
+            print(f"⚠️ Could not read indicator cache file {path}: {e}")
+            return None
+
+    def _save_to_disk(self, key, value):
+        """Persist a result atomically (write temp file, then rename)"""
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Could not write indicator cache file {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Process-wide cache used by indicators.calculate_indicator
+_default_cache = IndicatorCache()
+
+
+def get_default_cache():
+    """Return the process-wide indicator cache"""
+    return _default_cache
+
+
+def configure_default_cache(max_entries=256, max_bytes=256 * 1024 * 1024, disk_dir=None):
+    """Replace the process-wide cache with new limits / disk tier"""
+    global _default_cache
+    _default_cache = IndicatorCache(max_entries=max_entries, max_bytes=max_bytes, disk_dir=disk_dir)
+    return _default_cache
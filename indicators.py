@@ -1,5 +1,77 @@
 
-from ta_strategies_TVLibrary import *
+from tv_registry import lazy_class
+
+# Strategy classes from ta_strategies_TVLibrary - resolved by name on first use, so importing
+# this module (and the whole backtest path) doesn't load the 27k-line library
+RelativeStrengthIndexStrategies = lazy_class("RelativeStrengthIndexStrategies")
+SmoothedSimpleMovingAverageStrategies = lazy_class("SmoothedSimpleMovingAverageStrategies")
+ExponentialMovingAverageStrategies = lazy_class("ExponentialMovingAverageStrategies")
+MomentumStrategies = lazy_class("MomentumStrategies")
+OnBalanceVolumeStrategies = lazy_class("OnBalanceVolumeStrategies")
+TypicalPriceStrategies = lazy_class("TypicalPriceStrategies")
+VolumeWeightedAveragePriceStrategies = lazy_class("VolumeWeightedAveragePriceStrategies")
+MarketMomentumStrategies = lazy_class("MarketMomentumStrategies")
+AllMovingAverageStrategies = lazy_class("AllMovingAverageStrategies")
+ArnaudLegouxMovingAverageStrategies = lazy_class("ArnaudLegouxMovingAverageStrategies")
+DoubleExponentialMovingAverageStrategies = lazy_class("DoubleExponentialMovingAverageStrategies")
+HullMovingAverageStrategies = lazy_class("HullMovingAverageStrategies")
+KaufmanAdaptiveMovingAverageStrategies = lazy_class("KaufmanAdaptiveMovingAverageStrategies")
+JurikMovingAverageStrategies = lazy_class("JurikMovingAverageStrategies")
+FractalAdaptiveMovingAverageStrategies = lazy_class("FractalAdaptiveMovingAverageStrategies")
+SmoothedExponentialMovingAverageStrategies = lazy_class("SmoothedExponentialMovingAverageStrategies")
+TriangularMovingAverageStrategies = lazy_class("TriangularMovingAverageStrategies")
+T3MovingAverageStrategies = lazy_class("T3MovingAverageStrategies")
+ZeroLagExponentialMovingAverageStrategies = lazy_class("ZeroLagExponentialMovingAverageStrategies")
+ZeroLagSimpleMovingAverageStrategies = lazy_class("ZeroLagSimpleMovingAverageStrategies")
+WeightedMovingAverageStrategies = lazy_class("WeightedMovingAverageStrategies")
+VolumeWeightedMovingAverageStrategies = lazy_class("VolumeWeightedMovingAverageStrategies")
+SineWeightedMovingAverageStrategies = lazy_class("SineWeightedMovingAverageStrategies")
+PascalsWeightedMovingAverageStrategies = lazy_class("PascalsWeightedMovingAverageStrategies")
+SymmetricWeightedMovingAverageStrategies = lazy_class("SymmetricWeightedMovingAverageStrategies")
+FibonacciWeightedMovingAverageStrategies = lazy_class("FibonacciWeightedMovingAverageStrategies")
+HoltWinterMovingAverageStrategies = lazy_class("HoltWinterMovingAverageStrategies")
+HullExponentialMovingAverageStrategies = lazy_class("HullExponentialMovingAverageStrategies")
+McGinleyDynamicStrategies = lazy_class("McGinleyDynamicStrategies")
+ElasticVolumeMovingAverageStrategies = lazy_class("ElasticVolumeMovingAverageStrategies")
+ArcherOnBalanceVolumeStrategies = lazy_class("ArcherOnBalanceVolumeStrategies")
+ElasticVolumeMACDStrategies = lazy_class("ElasticVolumeMACDStrategies")
+FiniteVolumeElementStrategies = lazy_class("FiniteVolumeElementStrategies")
+KlingerVolumeOscillatorStrategies = lazy_class("KlingerVolumeOscillatorStrategies")
+NegativeVolumeIndexStrategies = lazy_class("NegativeVolumeIndexStrategies")
+PercentageVolumeOscillatorStrategies = lazy_class("PercentageVolumeOscillatorStrategies")
+PositiveVolumeIndexStrategies = lazy_class("PositiveVolumeIndexStrategies")
+PriceVolumeRankStrategies = lazy_class("PriceVolumeRankStrategies")
+PriceVolumeTrendStrategies = lazy_class("PriceVolumeTrendStrategies")
+PriceVolumeStrategies = lazy_class("PriceVolumeStrategies")
+VolumeAdjustedMovingAverageStrategies = lazy_class("VolumeAdjustedMovingAverageStrategies")
+VolumeFlowIndicatorStrategies = lazy_class("VolumeFlowIndicatorStrategies")
+VolumePriceTrendStrategies = lazy_class("VolumePriceTrendStrategies")
+VolumeProfileStrategies = lazy_class("VolumeProfileStrategies")
+VolumeZoneOscillatorStrategies = lazy_class("VolumeZoneOscillatorStrategies")
+VolumeWeightedMACDStrategies = lazy_class("VolumeWeightedMACDStrategies")
+WeightedOnBalanceVolumeStrategies = lazy_class("WeightedOnBalanceVolumeStrategies")
+AbsolutePriceOscillatorStrategies = lazy_class("AbsolutePriceOscillatorStrategies")
+AdaptivePriceZoneStrategies = lazy_class("AdaptivePriceZoneStrategies")
+AveragePriceStrategies = lazy_class("AveragePriceStrategies")
+DecreasingPriceStrategies = lazy_class("DecreasingPriceStrategies")
+DetrendedPriceOscillatorStrategies = lazy_class("DetrendedPriceOscillatorStrategies")
+IncreasingPriceStrategies = lazy_class("IncreasingPriceStrategies")
+MedianPriceStrategies = lazy_class("MedianPriceStrategies")
+MidpointPricePeriodStrategies = lazy_class("MidpointPricePeriodStrategies")
+PercentagePriceOscillatorStrategies = lazy_class("PercentagePriceOscillatorStrategies")
+PriceDistanceStrategies = lazy_class("PriceDistanceStrategies")
+WeightedClosingPriceStrategies = lazy_class("WeightedClosingPriceStrategies")
+AverageDirectionalIndexStrategies = lazy_class("AverageDirectionalIndexStrategies")
+ChandeMomentumOscillatorStrategies = lazy_class("ChandeMomentumOscillatorStrategies")
+DirectionalMovementStrategies = lazy_class("DirectionalMovementStrategies")
+TrendSignalsStrategies = lazy_class("TrendSignalsStrategies")
+SchaffTrendCycleStrategies = lazy_class("SchaffTrendCycleStrategies")
+WaveTrendOscillatorStrategies = lazy_class("WaveTrendOscillatorStrategies")
+PlusDirectionalIndicatorStrategies = lazy_class("PlusDirectionalIndicatorStrategies")
+MinusDirectionalIndicatorStrategies = lazy_class("MinusDirectionalIndicatorStrategies")
+PlusDirectionalMovementStrategies = lazy_class("PlusDirectionalMovementStrategies")
+MinusDirectionalMovementStrategies = lazy_class("MinusDirectionalMovementStrategies")
+MomentumBreakoutBandsStrategies = lazy_class("MomentumBreakoutBandsStrategies")
 
 class IndicatorRegistry:
     """Registry for all available indicators - easily extensible"""
@@ -850,8 +922,16 @@ def momentum_breakout_bands(data, period=20, upper_threshold=2, lower_threshold=
 
 
 
-def calculate_indicator(data, indicator_name, params):
-    """Generic function to calculate any indicator"""
+def calculate_indicator(data, indicator_name, params, use_cache=True):
+    """Generic function to calculate any indicator (results cached by data fingerprint + params)"""
+    if not use_cache:
+        return _compute_indicator(data, indicator_name, params)
+    
+    from indicator_cache import get_default_cache
+    return get_default_cache().get_or_compute(data, indicator_name, params, _compute_indicator)
+
+def _compute_indicator(data, indicator_name, params):
+    """Dispatch an indicator request to its registered function (uncached)"""
     indicator_func = indicator_registry.get(indicator_name)
     if indicator_func is None:
         raise ValueError(f"Unknown indicator: {indicator_name}")
@@ -3,7 +3,6 @@ from comparisons import *
 from display import *
 from metrics import *
 from comparision_types import ComparisonType
-import yfinance as yf
 # Multi-condition detector will be imported when needed
 
 
@@ -683,7 +682,8 @@ def download_and_prepare_data(ticker, period="5y", interval="4h"):
     print(f"Downloading {period} of {interval} data for {ticker}...")
     
     try:
-        data = yf.Ticker(ticker).history(period=period, interval=interval)
+        from data_sources import get_data_source
+        data = get_data_source().fetch(ticker, period, interval)
         
         if data.empty:
             print(f"❌ No data available for {ticker} with {period} period and {interval} interval")
@@ -723,8 +723,10 @@ def download_multi_ticker_data(tickers, period, interval):
     print("="*50)
     
     try:
-        import yfinance as yf
         import pandas as pd
+        from data_sources import get_data_source
+        
+        data_source = get_data_source()
         
         ticker_data = {}
         all_dates = set()
@@ -732,8 +734,7 @@ def download_multi_ticker_data(tickers, period, interval):
         # Download data for each ticker
         for ticker in tickers:
             print(f"\n📊 Downloading {ticker}...")
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period, interval=interval)
+            data = data_source.fetch(ticker, period, interval)
             
             if data.empty:
                 print(f"❌ No data found for {ticker}")
@@ -1642,8 +1643,9 @@ def get_sl_tp_configuration():
             except ValueError:
                 print("❌ Please enter a valid number")
         
-        # Ask about trailing stop loss
+        # Ask about trailing stop loss and how exits are filled
         trailing_config = get_trailing_sl_configuration()
+        fill_config = get_sl_tp_fill_configuration()
         
         return {
             'enabled': True,
@@ -1653,7 +1655,8 @@ def get_sl_tp_configuration():
             'tp_value': tp_percent / 100,   # Convert to decimal
             'trailing_sl_enabled': trailing_config['enabled'],
             'trailing_sl_type': trailing_config['type'],
-            'trailing_sl_value': trailing_config['value']
+            'trailing_sl_value': trailing_config['value'],
+            **fill_config
         }
     
     else:
@@ -1682,8 +1685,9 @@ def get_sl_tp_configuration():
             except ValueError:
                 print("❌ Please enter a valid number")
         
-        # Ask about trailing stop loss
+        # Ask about trailing stop loss and how exits are filled
         trailing_config = get_trailing_sl_configuration()
+        fill_config = get_sl_tp_fill_configuration()
         
         return {
             'enabled': True,
@@ -1693,7 +1697,8 @@ def get_sl_tp_configuration():
             'tp_value': tp_dollars,
             'trailing_sl_enabled': trailing_config['enabled'],
             'trailing_sl_type': trailing_config['type'],
-            'trailing_sl_value': trailing_config['value']
+            'trailing_sl_value': trailing_config['value'],
+            **fill_config
         }
 
 def get_trailing_sl_configuration():
@@ -1784,6 +1789,36 @@ def get_trailing_sl_configuration():
             'value': trailing_amount
         }
 
+def get_sl_tp_fill_configuration():
+    """Get how SL/TP exits are filled: at the Close, or intrabar from each bar's High/Low"""
+    print("\n📏 Choose SL/TP Fill Mode:")
+    print("1. Close-based (SL/TP checked against each bar's Close)")
+    print("2. Intrabar (SL/TP checked against each bar's High/Low - realistic exits on 4h/daily bars)")
+    
+    while True:
+        try:
+            mode_input = input("Select fill mode (1 or 2) [default: 1]: ").strip()
+            mode = int(mode_input or "1")
+            if mode in [1, 2]:
+                break
+            else:
+                print("❌ Please enter 1 or 2")
+        except ValueError:
+            print("❌ Please enter a valid number")
+    
+    if mode == 1:
+        return {'fill_mode': 'close', 'same_bar_priority': 'stop_loss'}
+    
+    while True:
+        priority = input("If one bar touches both SL and TP, which fills first? (sl/tp) [default: sl]: ").strip().lower()
+        if not priority:
+            priority = 'sl'
+        if priority in ['sl', 'tp']:
+            break
+        print("❌ Please enter 'sl' or 'tp'")
+    
+    return {'fill_mode': 'intrabar', 'same_bar_priority': 'stop_loss' if priority == 'sl' else 'take_profit'}
+
 def get_per_trade_allocation(total_capital):
     """Get per-trade allocation configuration from user"""
     print("\n" + "="*50)
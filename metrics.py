@@ -63,20 +63,28 @@ def calculate_max_drawdown(returns):
     return drawdown.min()
 
 
+def trade_profits(trades):
+    """profit_loss of each trade as a float array (0 for trades without one, e.g. entries)"""
+    if hasattr(trades, 'column'):  # TradeLog: read the column directly
+        profits = trades.column('profit_loss')
+        return np.where(np.isnan(profits), 0.0, profits)
+    return np.fromiter((trade.get('profit_loss', 0) for trade in trades), dtype=np.float64, count=len(trades))
+
 def calculate_win_rate(trades):
     """Calculate win rate from trades"""
-    if not trades:
+    if len(trades) == 0:
         return 0
-    profitable_trades = sum(1 for trade in trades if trade.get('profit_loss', 0) > 0)
-    return profitable_trades / len(trades)
+    profits = trade_profits(trades)
+    return np.count_nonzero(profits > 0) / len(profits)
 
 def calculate_profit_factor(trades):
     """Calculate profit factor"""
     if len(trades) == 0:
         return 0
     
-    gross_profit = sum(trade.get('profit_loss', 0) for trade in trades if trade.get('profit_loss', 0) > 0)
-    gross_loss = abs(sum(trade.get('profit_loss', 0) for trade in trades if trade.get('profit_loss', 0) < 0))
+    profits = trade_profits(trades)
+    gross_profit = profits[profits > 0].sum()
+    gross_loss = abs(profits[profits < 0].sum())
     
     if gross_loss == 0:
         return float('inf') if gross_profit > 0 else 0
@@ -164,3 +172,282 @@ def calculate_advanced_metrics(portfolio, data, trades):
     except Exception as e:
         print(f"⚠️ Error in metrics calculation: {e}")
         return {}
+
+
+# Metrics of calculate_batch_metrics (the equity-only part of calculate_advanced_metrics)
+BATCH_METRICS = ('total_return', 'cumulative_return', 'annual_return', 'volatility', 'sharpe_ratio', 'sortino_ratio',
+                 'calmar_ratio', 'max_drawdown', 'years_traded', 'trading_days')
+
+# Runs (columns) processed together, bounding the bars x runs temporaries
+BATCH_METRICS_CHUNK = 1024
+
+
+def calculate_batch_metrics(equity, risk_free_rate=0.02, chunk=BATCH_METRICS_CHUNK):
+    """
+    calculate_advanced_metrics for every column of a bars x runs equity matrix at once
+
+    Each column is filtered like the single-series path - non-finite values dropped, returns
+    from the previous finite value, returns outside (-100%, +1000%) ignored - using masks
+    instead of per-column Series, and the drawdown comes from a cumulative max along axis 0.
+    Returns a dict of arrays (one value per run) keyed by BATCH_METRICS; runs with fewer than
+    two finite values get NaN (calculate_advanced_metrics returns {} for them). A flat curve
+    gets a Sharpe ratio of 0 (its return std is exactly 0 here; pandas can leave a rounding
+    residue in the std of the excess returns).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.ndim == 1:
+        equity = equity[:, None]
+    runs = equity.shape[1]
+    results = {name: np.empty(runs) for name in BATCH_METRICS}
+    results['trading_days'] = np.empty(runs, dtype=np.int64)
+    for start in range(0, runs, chunk):
+        block = _batch_metrics_block(equity[:, start:start + chunk], risk_free_rate)
+        for name in BATCH_METRICS:
+            results[name][start:start + chunk] = block[name]
+    return results
+
+
+def _batch_metrics_block(values, risk_free_rate):
+    bars, runs = values.shape
+    finite = np.isfinite(values)
+    count = finite.sum(axis=0)
+    valid = count >= 2
+    if bars < 2:
+        # No returns at all: no metrics (a single bar still counts as a trading day)
+        return {name: np.full(runs, np.nan) if name != 'trading_days' else count for name in BATCH_METRICS}
+
+    # Returns against the previous finite value of the column (pct_change after dropna)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if (count == bars).all():
+            returns = values[1:] / values[:-1] - 1
+            used = (returns > -1.0) & (returns < 10.0)
+        else:
+            last_finite = np.maximum.accumulate(np.where(finite, np.arange(bars)[:, None], -1), axis=0)
+            previous = last_finite[:-1]
+            returns = values[1:] / np.take_along_axis(values, np.maximum(previous, 0), axis=0) - 1
+            used = finite[1:] & (previous >= 0) & (returns > -1.0) & (returns < 10.0)
+    returns = np.where(used, returns, 0.0)
+    n = used.sum(axis=0)
+    several = n > 1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = returns.sum(axis=0) / n
+        deviations = np.where(used, returns - mean, 0.0)
+        std = np.sqrt((deviations * deviations).sum(axis=0) / (n - 1))
+        excess = returns - risk_free_rate / 252
+        downside = used & (excess < 0)
+        downside_count = downside.sum(axis=0)
+        downside_deviation = np.sqrt(np.where(downside, excess * excess, 0.0).sum(axis=0) / downside_count)
+        excess_mean = mean - risk_free_rate / 252
+
+        volatility = np.where(several, std * np.sqrt(252), 0.0)
+        sharpe_ratio = np.where(several & (std != 0), np.sqrt(252) * excess_mean / std, 0.0)
+        sortino_ratio = np.where(downside_count == 0, np.where(excess_mean > 0, np.inf, 0.0),
+                                 np.where(downside_deviation != 0, excess_mean / downside_deviation * np.sqrt(252), 0.0))
+        sortino_ratio = np.where(several, sortino_ratio, 0.0)
+
+        # Drawdown of the compounded returns: running peak along the bars (skipped returns leave it unchanged)
+        cumulative = np.cumprod(np.where(used, 1 + returns, 1.0), axis=0)
+        peaks = np.maximum.accumulate(np.where(used, cumulative, -np.inf), axis=0)
+        drawdown = np.where(used, (cumulative - peaks) / peaks, 0.0).min(axis=0)
+        max_drawdown = np.where(several, drawdown, 0.0)
+
+        first = np.take_along_axis(values, finite.argmax(axis=0)[None], axis=0)[0]
+        last = np.take_along_axis(values, (bars - 1 - finite[::-1].argmax(axis=0))[None], axis=0)[0]
+        total_return = np.where(first == 0, 0.0, (last - first) / first)
+        years = count / 252
+        annual_return = np.where(first == 0, 0.0, (last / first) ** (1 / years) - 1)
+        calmar_ratio = _batch_calmar_ratio(annual_return * 100, max_drawdown * 100)
+
+    results = {
+        'total_return': total_return,
+        'cumulative_return': total_return * 100,
+        'annual_return': annual_return * 100,
+        'volatility': np.minimum(volatility * 100, 999.99),
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'calmar_ratio': calmar_ratio,
+        'max_drawdown': max_drawdown * 100,
+        'years_traded': years,
+    }
+    results = {name: np.where(valid, metric, np.nan) for name, metric in results.items()}
+    results['trading_days'] = count
+    return results
+
+
+def _batch_calmar_ratio(annual_return, max_drawdown):
+    """calculate_calmar_ratio over arrays"""
+    annual_decimal = np.where(np.abs(annual_return) > 1, annual_return / 100, annual_return)
+    drawdown_decimal = np.where(np.abs(max_drawdown) > 1, np.abs(max_drawdown / 100), np.abs(max_drawdown))
+    return np.where(drawdown_decimal == 0, np.where(annual_decimal > 0, np.inf, 0.0), annual_decimal / drawdown_decimal)
+
+
+class OnlineMetrics:
+    """
+    Streaming version of calculate_advanced_metrics, fed during the run: portfolio values bar by
+    bar (update) or in blocks (update_values) and trades as they are logged (update_trades).
+    State is O(1) - Welford mean / variance of the returns, downside semivariance, the running
+    compounded-return peak for max drawdown and win / loss sums - so results() is available at
+    any time without the equity history. Returns are filtered like calculate_advanced_metrics
+    (non-finite values dropped, returns outside (-100%, +1000%) ignored), so results() matches
+    it up to floating-point summation order.
+    """
+
+    def __init__(self, risk_free_rate=0.02):
+        self.risk_free_rate = risk_free_rate
+        self.bars = 0             # Values fed, including non-finite ones (rows of the Portfolio_Value column)
+        self.values = 0           # Finite values
+        self.first_value = None
+        self.last_value = None
+        # Returns: count, Welford mean / sum of squared deviations, downside count / sum of squares
+        self.returns = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside = 0
+        self.downside_squares = 0.0
+        # Compounded returns and their running peak (calculate_drawdown)
+        self.cumulative = 1.0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        # Trades
+        self.trades = 0
+        self.wins = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def update(self, value):
+        """Add one bar's portfolio value"""
+        self.bars += 1
+        value = float(value)
+        if not np.isfinite(value):
+            return
+        self.values += 1
+        previous, self.last_value = self.last_value, value
+        if previous is None:
+            self.first_value = value
+            return
+        if previous == 0:
+            return  # pct_change gives inf / NaN, both filtered out
+        daily_return = value / previous - 1
+        if not -1.0 < daily_return < 10.0:
+            return
+
+        self.returns += 1
+        delta = daily_return - self.mean
+        self.mean += delta / self.returns
+        self.m2 += delta * (daily_return - self.mean)
+        excess = daily_return - self.risk_free_rate / 252
+        if excess < 0:
+            self.downside += 1
+            self.downside_squares += excess * excess
+        self.cumulative *= 1 + daily_return
+        self.peak = max(self.peak, self.cumulative)
+        self.max_drawdown = min(self.max_drawdown, (self.cumulative - self.peak) / self.peak)
+
+    def update_values(self, values):
+        """Add a block of consecutive portfolio values (vectorized; same result as update() per value)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.bars += len(values)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        if self.last_value is None:
+            self.first_value = values[0].item()
+            chain = values
+        else:
+            chain = np.concatenate([[self.last_value], values])
+        self.values += len(values)
+        self.last_value = values[-1].item()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = chain[1:] / chain[:-1] - 1
+        returns = returns[(returns > -1.0) & (returns < 10.0)]
+        if len(returns) == 0:
+            return
+
+        # Merge the block's mean / squared deviations into the running ones (Chan et al.)
+        count = self.returns + len(returns)
+        block_mean = returns.mean()
+        delta = block_mean - self.mean
+        self.m2 += ((returns - block_mean) ** 2).sum() + delta * delta * self.returns * len(returns) / count
+        self.mean += delta * len(returns) / count
+        self.returns = count
+        excess = returns - self.risk_free_rate / 252
+        downside = excess[excess < 0]
+        self.downside += len(downside)
+        self.downside_squares += (downside * downside).sum()
+        cumulative = np.cumprod(np.concatenate([[self.cumulative], 1 + returns]))[1:]
+        peaks = np.maximum.accumulate(np.concatenate([[self.peak], cumulative]))[1:]
+        self.max_drawdown = min(self.max_drawdown, ((cumulative - peaks) / peaks).min().item())
+        self.cumulative, self.peak = cumulative[-1].item(), peaks[-1].item()
+
+    def update_trades(self, trades):
+        """Add the trades logged to a TradeLog since the last call (profit_loss; 0 for entries and flips)"""
+        profits = trades.array['profit_loss'][self.trades:]
+        if len(profits) == 0:
+            return
+        profits = np.where(np.isnan(profits), 0.0, profits)
+        self.trades += len(profits)
+        self.wins += np.count_nonzero(profits > 0)
+        self.gross_profit += profits[profits > 0].sum().item()
+        self.gross_loss += profits[profits < 0].sum().item()
+
+    def covers(self, data, trades):
+        """True if this accumulator was fed exactly `data`'s rows and `trades`"""
+        return self.bars == len(data) and self.trades == len(trades)
+
+    def results(self):
+        """Same dictionary as calculate_advanced_metrics for the values and trades seen so far"""
+        if self.bars == 0 or self.trades == 0 or self.values < 2:
+            return {}
+
+        initial_value, final_value = np.float64(self.first_value), np.float64(self.last_value)
+        total_return = calculate_cumulative_return(initial_value, final_value)
+        years = self.values / 252
+        annual_return = calculate_annual_return(initial_value, final_value, years)
+
+        volatility = sharpe_ratio = sortino_ratio = max_drawdown = 0
+        if self.returns > 1:
+            std = np.sqrt(self.m2 / (self.returns - 1))
+            volatility = std * np.sqrt(252)
+            excess_mean = self.mean - self.risk_free_rate / 252
+            if std != 0:
+                sharpe_ratio = np.sqrt(252) * excess_mean / std
+            if self.downside == 0:
+                sortino_ratio = float('inf') if excess_mean > 0 else 0
+            else:
+                downside_deviation = np.sqrt(self.downside_squares / self.downside)
+                if downside_deviation != 0:
+                    sortino_ratio = (excess_mean / downside_deviation) * np.sqrt(252)
+            max_drawdown = self.max_drawdown
+
+        calmar_ratio = calculate_calmar_ratio(annual_return * 100, max_drawdown * 100)
+        if self.gross_loss == 0:
+            profit_factor = float('inf') if self.gross_profit > 0 else 0
+        else:
+            profit_factor = self.gross_profit / abs(self.gross_loss)
+
+        return {
+            'total_return': total_return,
+            'cumulative_return': total_return * 100,
+            'annual_return': annual_return * 100,
+            'volatility': min(volatility * 100, 999.99),
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'calmar_ratio': calmar_ratio,
+            'max_drawdown': max_drawdown * 100,
+            'win_rate': self.wins / self.trades * 100,
+            'profit_factor': profit_factor,
+            'total_trades': self.trades,
+            'years_traded': years,
+            'trading_days': self.values
+        }
+
+
+def run_metrics(portfolio, data, trades, online=None):
+    """
+    calculate_advanced_metrics for a finished run - read from the run's OnlineMetrics when it
+    was fed this data and these trades, otherwise computed from the Portfolio_Value column
+    """
+    if online is not None and online.covers(data, trades):
+        return online.results()
+    return calculate_advanced_metrics(portfolio, data, trades)
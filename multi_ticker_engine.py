@@ -0,0 +1,352 @@
+"""
+Multi-Ticker Engine - Struct-of-arrays execution for MultiTickerPortfolioManager
+Cash, shares, entry prices and SL/TP levels of every ticker live in NumPy vectors and all
+tickers advance together, one bar at a time, with array operations. The rules are those of
+MultiTickerPortfolioManager.process_market_tick (liquidation, fixed / trailing stops, take
+profit, close or intrabar fills, long / short / reversal signals), so trades, portfolio values
+and final state match the per-ticker object loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+from trade_log import TradeLog, event_fields
+
+
+def _column(data, ticker, field, default=None):
+    name = f'{ticker}_{field}'
+    return data[name].to_numpy() if name in data.columns else default
+
+
+class _TradeRows:
+    """Trade rows collected bar by bar, handed to the TradeLog in bar / ticker order at the end"""
+
+    SCALARS = ('event', 'action', 'side', 'exit_reason', 'bar', 'stage')  # one value per block
+    ARRAYS = ('ticker', 'entry_bar', 'price', 'shares', 'profit_loss')   # one value per row
+
+    def __init__(self):
+        self.counts = []
+        self.columns = {field: [] for field in self.SCALARS + self.ARRAYS}
+
+    def add(self, event, action, positions, bar, stage, price, shares, entry_bar, profit_loss=None):
+        if len(positions) == 0:
+            return
+        if profit_loss is None:
+            profit_loss = np.full(len(positions), np.nan)
+        self.counts.append(len(positions))
+        for field, value in zip(self.SCALARS + self.ARRAYS, event_fields(event, action) + (
+                bar, stage, positions, entry_bar, price, shares, profit_loss)):
+            self.columns[field].append(value)
+
+    def collect(self):
+        """All rows ordered like the object loop: by bar, then ticker, exits before entries"""
+        columns = {field: np.repeat(self.columns[field], self.counts) for field in self.SCALARS}
+        columns.update({field: np.concatenate(self.columns[field]) if self.counts else np.empty(0)
+                        for field in self.ARRAYS})
+        order = np.lexsort((columns['stage'], columns['ticker'], columns['bar']))
+        rows = TradeLog.rows(len(order))
+        for field in self.SCALARS[:-1] + self.ARRAYS:
+            rows[field] = columns[field][order]
+        rows['amount'] = rows['shares'] * rows['price']
+        return rows
+
+
+class MultiTickerArrays:
+    """Per-ticker portfolio and risk state of a MultiTickerPortfolioManager as vectors"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.tickers = list(manager.allocations.keys())
+        portfolios = [manager.ticker_portfolios[ticker] for ticker in self.tickers]
+        risks = [manager.ticker_risk_managers[ticker] for ticker in self.tickers]
+        vector = lambda objects, attribute, dtype=np.float64: np.array([getattr(o, attribute) for o in objects], dtype=dtype)
+
+        # PortfolioManager state
+        self.cash = vector(portfolios, 'initial_cash')
+        self.invested = vector(portfolios, 'invested_amount')
+        self.remaining = vector(portfolios, 'remaining')
+        self.shares = vector(portfolios, 'shares_owned', np.int64)
+        self.buying = vector(portfolios, 'buying_price')
+        self.final_cash = vector(portfolios, 'final_cash')
+        self.has_trade_size = np.array([p.per_trade_config is not None for p in portfolios])
+        self.trade_size = np.array([p.per_trade_config['amount_per_trade'] if p.per_trade_config else 0.0
+                                    for p in portfolios], dtype=np.float64)
+
+        # RiskManager state (one configuration shared by every ticker)
+        self.config = manager.sl_tp_config
+        self.entry_price = vector(risks, 'entry_price')
+        self.stop_loss = vector(risks, 'stop_loss_price')
+        self.take_profit = vector(risks, 'take_profit_price')
+        self.extreme = np.where(self.shares > 0, vector(risks, 'highest_price'), vector(risks, 'lowest_price'))
+        self.trailing_distance = vector(risks, 'trailing_distance')
+        self.entry_bar = np.full(len(self.tickers), -1, dtype=np.int64)
+
+    @classmethod
+    def flat(cls, count, initial_cash, per_trade_config=None, sl_tp_config=None):
+        """
+        State of `count` fresh PortfolioManager(initial_cash, per_trade_config) /
+        RiskManager(sl_tp_config) pairs without a manager behind them (nothing to sync back)
+        """
+        state = cls.__new__(cls)
+        state.manager = None
+        state.tickers = list(range(count))
+        zeros = lambda dtype=np.float64: np.zeros(count, dtype=dtype)
+        state.cash = np.full(count, initial_cash, dtype=np.float64)
+        state.invested = np.full(count, per_trade_config['amount_per_trade'] if per_trade_config else initial_cash * 1.0,
+                                 dtype=np.float64)
+        state.remaining, state.shares, state.buying, state.final_cash = zeros(), zeros(np.int64), zeros(), zeros()
+        state.has_trade_size = np.full(count, bool(per_trade_config))
+        state.trade_size = np.full(count, per_trade_config['amount_per_trade'] if per_trade_config else 0.0,
+                                   dtype=np.float64)
+        state.config = sl_tp_config if sl_tp_config is not None else {'enabled': False}
+        state.entry_price, state.stop_loss, state.take_profit = zeros(), zeros(), zeros()
+        state.extreme, state.trailing_distance = zeros(), zeros()
+        state.entry_bar = np.full(count, -1, dtype=np.int64)
+        return state
+
+    def values(self, price):
+        """PortfolioManager.get_portfolio_value of every ticker"""
+        return np.where(self.shares != 0, self.remaining + np.abs(self.shares) * price,
+                        np.where(self.final_cash > 0, self.final_cash, self.cash))
+
+    def close_positions(self, mask, price):
+        """exit_long_position / exit_short_position for the masked tickers; returns their P&L"""
+        shares, buying = np.abs(self.shares[mask]), self.buying[mask]
+        value = shares * price
+        long = self.shares[mask] > 0
+        final_cash = np.where(long, self.remaining[mask] + buying + (value - buying),
+                              self.remaining[mask] + buying + (buying - value))
+        profit_loss = np.where(long, value - buying, buying - value)
+        self.final_cash[mask] = self.cash[mask] = final_cash
+        self.invested[mask] = np.where(self.has_trade_size[mask], self.trade_size[mask], final_cash)
+        self.remaining[mask] = 0
+        self.shares[mask] = 0
+        self.buying[mask] = 0
+        return profit_loss
+
+    def open_positions(self, mask, price, side):
+        """enter_long_position / enter_short_position for the masked tickers; returns the shares opened"""
+        shares = (self.invested[mask] / price).astype(np.int64)
+        self.buying[mask] = buying = shares * price
+        self.shares[mask] = side * shares
+        self.remaining[mask] = self.cash[mask] - buying
+        self.final_cash[mask] = 0
+        return shares
+
+    def set_levels(self, mask, price, shares, side):
+        """RiskManager.set_sl_tp_levels for the masked tickers"""
+        config = self.config
+        if not config['enabled']:
+            self.stop_loss[mask] = self.take_profit[mask] = 0
+            return
+        self.entry_price[mask] = price
+        if config['sl_type'] == 'percentage':
+            self.stop_loss[mask] = price * (1 - side * config['sl_value'])
+            self.take_profit[mask] = price * (1 + side * config['tp_value'])
+        else:
+            buying = self.buying[mask]
+            self.stop_loss[mask] = (buying - side * config['sl_value']) / shares
+            self.take_profit[mask] = (buying + side * config['tp_value']) / shares
+        if config.get('trailing_sl_enabled', False):
+            dollar = config.get('trailing_sl_type') == 'dollar'
+            self.trailing_distance[mask] = config.get('trailing_sl_value', 0) / shares if dollar else 0
+            self.extreme[mask] = price
+
+    def stop_levels(self, long, extreme):
+        """Stops in force: the tighter of the fixed and trailing stops, and whether the trailing one applies"""
+        if not self.config.get('trailing_sl_enabled', False):
+            return self.stop_loss, np.zeros(len(long), dtype=bool)
+        value = self.config.get('trailing_sl_value', 0)
+        if self.config.get('trailing_sl_type') == 'percentage':
+            trailing = np.where(long, extreme * (1 - value), extreme * (1 + value))
+        else:
+            trailing = np.where(long, extreme - self.trailing_distance, extreme + self.trailing_distance)
+        tighter = np.where(long, trailing > self.stop_loss, trailing < self.stop_loss)
+        return np.where(tighter, trailing, self.stop_loss), tighter
+
+    def sync(self):
+        """Write the vectors back to the manager's PortfolioManager / RiskManager objects"""
+        for position, ticker in enumerate(self.tickers):
+            portfolio = self.manager.ticker_portfolios[ticker]
+            portfolio.initial_cash = self.cash[position].item()
+            portfolio.invested_amount = self.invested[position].item()
+            portfolio.remaining = self.remaining[position].item()
+            portfolio.shares_owned = self.shares[position].item()
+            portfolio.buying_price = self.buying[position].item()
+            portfolio.final_cash = self.final_cash[position].item()
+            risk = self.manager.ticker_risk_managers[ticker]
+            shares = portfolio.shares_owned
+            if shares == 0:
+                risk.reset_levels()
+                continue
+            risk.position_direction = 'LONG' if shares > 0 else 'SHORT'
+            risk.entry_price = self.entry_price[position].item()
+            risk.stop_loss_price = self.stop_loss[position].item()
+            risk.take_profit_price = self.take_profit[position].item()
+            risk.position_buying_price = portfolio.buying_price
+            risk.position_shares = abs(shares)
+            risk.trailing_distance = self.trailing_distance[position].item()
+            risk.highest_price = risk.lowest_price = self.extreme[position].item()
+            if risk.trailing_sl_enabled:
+                risk.trailing_sl_price = risk._trailing_stop(self.extreme[position].item())
+            risk.next_touch = None
+
+
+def run_multi_ticker_arrays(manager, data, strategy_type):
+    """
+    Run a MultiTickerPortfolioManager over `data` ({ticker}_Close / _Entry_Signal / _Exit_Signal,
+    plus _Open/_High/_Low for intrabar fills) with every ticker advanced at once per bar
+
+    Returns:
+        (portfolio values before each bar's trades, per-ticker values after them (bars x tickers));
+        trades go to manager.all_trades and the final state back to the manager's objects
+    """
+    state = MultiTickerArrays(manager)
+    tickers = state.tickers
+    count, bars = len(tickers), len(data)
+    matrix = lambda field, default=None, dtype=np.float64: (
+        np.column_stack([np.asarray(_column(data, ticker, field, default), dtype=dtype) for ticker in tickers])
+        if count else np.empty((bars, 0), dtype=dtype))
+    close = matrix('Close')
+    entries = matrix('Entry_Signal', np.zeros(bars, dtype=bool), bool)
+    exits = matrix('Exit_Signal', np.zeros(bars, dtype=bool), bool)
+
+    config = manager.sl_tp_config
+    risk_enabled = config['enabled']
+    trailing = config.get('trailing_sl_enabled', False)
+    # Intrabar fills need the ticker's High and Low (its RiskManager falls back to the Close otherwise)
+    intrabar = np.array([config.get('fill_mode', 'close') == 'intrabar' and _column(data, ticker, 'High') is not None
+                         and _column(data, ticker, 'Low') is not None for ticker in tickers], dtype=bool)
+    if intrabar.any():
+        missing = np.full(bars, np.nan)
+        high, low, open_ = matrix('High', missing), matrix('Low', missing), matrix('Open', missing)
+    stop_first = config.get('same_bar_priority', 'stop_loss') == 'stop_loss'
+
+    values_before = np.empty((bars, count))
+    values_after = np.empty((bars, count))
+    rows = _TradeRows()
+    everyone = np.arange(count)
+
+    for i in range(bars):
+        price = close[i]
+        values_before[i] = state.values(price)
+        handled = np.zeros(count, dtype=bool)
+
+        # 🚨 Risk checks for open positions: liquidation, then stop (fixed / trailing), then take profit
+        if risk_enabled:
+            shares = state.shares
+            active = shares != 0
+            long = shares > 0
+            liquidate = active & ~long & ((state.buying - np.abs(shares) * price) <= -(state.buying * 1.0))
+            check = active & ~liquidate
+            fill = price.copy()
+            if trailing:
+                # Close fills trail the Close including this bar, intrabar fills the previous bars' High / Low
+                closing = check & ~intrabar
+                state.extreme = np.where(closing & long, np.maximum(state.extreme, price),
+                                         np.where(closing & ~long, np.minimum(state.extreme, price), state.extreme))
+            stops, trailing_applies = state.stop_levels(long, state.extreme)
+            stop_hit = check & np.where(long, price <= stops, price >= stops)
+            profit_hit = check & ~stop_hit & np.where(long, price >= state.take_profit, price <= state.take_profit)
+            if intrabar.any():
+                bar_check = check & intrabar
+                bar_high, bar_low, bar_open = high[i], low[i], open_[i]
+                touches_stop = np.where(long, bar_low <= stops, bar_high >= stops)
+                touches_profit = np.where(long, bar_high >= state.take_profit, bar_low <= state.take_profit)
+                has_open = ~np.isnan(bar_open)
+                gap_stop = has_open & np.where(long, bar_open <= stops, bar_open >= stops)
+                gap_profit = has_open & ~gap_stop & np.where(long, bar_open >= state.take_profit, bar_open <= state.take_profit)
+                level_stop = ~gap_stop & ~gap_profit & touches_stop & (~touches_profit | stop_first)
+                level_profit = ~gap_stop & ~gap_profit & ~level_stop & touches_profit
+                bar_stop = bar_check & (gap_stop | level_stop)
+                bar_profit = bar_check & (gap_profit | level_profit)
+                stop_hit = np.where(intrabar, bar_stop, stop_hit)
+                profit_hit = np.where(intrabar, bar_profit, profit_hit)
+                fill = np.where(bar_check & (gap_stop | gap_profit), bar_open,
+                                np.where(bar_stop, stops, np.where(bar_profit, state.take_profit, fill)))
+                if trailing:
+                    survivors = bar_check & ~bar_stop & ~bar_profit
+                    state.extreme = np.where(survivors & long, np.maximum(state.extreme, bar_high),
+                                             np.where(survivors & ~long, np.minimum(state.extreme, bar_low), state.extreme))
+
+            for mask, event in ((stop_hit & trailing_applies, 'Trailing Stop'), (stop_hit & ~trailing_applies, 'Stop Loss'),
+                                (profit_hit, 'Take Profit'), (liquidate, 'Liquidation')):
+                for side_mask, action in ((long, 'SELL'), (~long, 'LIQUIDATE' if event == 'Liquidation' else 'COVER')):
+                    closing = mask & side_mask
+                    if closing.any():
+                        closed = np.abs(state.shares[closing])
+                        profit_loss = state.close_positions(closing, fill[closing])
+                        rows.add(event, action, everyone[closing], i, 0, fill[closing], closed,
+                                 state.entry_bar[closing], profit_loss)
+            handled = liquidate | stop_hit | profit_hit
+
+        # 📊 Strategy signals for the tickers no risk action was taken on (masks come from the
+        # positions before any signal trade, like the object loop's if / elif per ticker)
+        entry, exit_ = entries[i] & ~handled, exits[i] & ~handled
+        shares = state.shares.copy()
+        if strategy_type == "long":
+            opening = entry & (shares == 0)
+            _signal_exit(state, rows, ~opening & exit_ & (shares > 0), price, i, 'Exit', 'SELL')
+            _signal_entry(state, rows, opening, price, i, 1, 'Entry')
+        elif strategy_type == "short":
+            opening = entry & (shares == 0)
+            _signal_exit(state, rows, ~opening & exit_ & (shares < 0), price, i, 'Exit', 'COVER')
+            _signal_entry(state, rows, opening, price, i, -1, 'Entry')
+        else:  # reversal
+            go_long = entry & (shares <= 0)
+            go_short = ~go_long & exit_ & (shares >= 0)
+            _signal_exit(state, rows, go_long & (shares < 0), price, i, 'Reversal Exit', 'COVER')
+            _signal_exit(state, rows, go_short & (shares > 0), price, i, 'Reversal Exit', 'SELL')
+            _signal_entry(state, rows, go_long, price, i, 1, 'Reversal Entry')
+            _signal_entry(state, rows, go_short, price, i, -1, 'Reversal Entry')
+
+        values_after[i] = state.values(price)
+
+    manager.all_trades.extend(rows.collect(), tickers)
+    state.sync()
+    return values_before, values_after
+
+
+def _signal_exit(state, rows, mask, price, bar, event, action):
+    if mask.any():
+        closed = np.abs(state.shares[mask])
+        profit_loss = state.close_positions(mask, price[mask])
+        rows.add(event, action, np.flatnonzero(mask), bar, 0, price[mask], closed, state.entry_bar[mask], profit_loss)
+
+
+def _signal_entry(state, rows, mask, price, bar, side, event):
+    if not mask.any():
+        return
+    shares = state.open_positions(mask, price[mask], side)
+    # Like the object loop, only entries that bought / shorted at least one share set levels and log a trade
+    opened = np.flatnonzero(mask)[shares > 0]
+    if len(opened):
+        opened_mask = np.zeros(len(mask), dtype=bool)
+        opened_mask[opened] = True
+        state.set_levels(opened_mask, price[opened], shares[shares > 0], side)
+        state.entry_bar[opened] = bar
+        rows.add(event, 'BUY' if side > 0 else 'SHORT', opened, bar, 1, price[opened], shares[shares > 0],
+                 state.entry_bar[opened])
+
+
+def execute_multi_ticker_arrays(manager, data, strategy_type):
+    """
+    Run the engine and return the data with Portfolio_Value (before each bar's trades, like the
+    object loop) and {ticker}_Portfolio_Value columns, joined in one step (a new DataFrame)
+    """
+    values_before, values_after = run_multi_ticker_arrays(manager, data, strategy_type)
+    tickers = list(manager.allocations.keys())
+    # Totals summed ticker by ticker, left to right, like get_total_portfolio_value
+    totals = np.cumsum(values_before, axis=1)[:, -1] if tickers else np.zeros(len(data))
+    tracking = pd.DataFrame(np.column_stack([totals, values_after]), index=data.index,
+                            columns=['Portfolio_Value'] + [f'{ticker}_Portfolio_Value' for ticker in tickers])
+    data = pd.concat([data.drop(columns=tracking.columns, errors='ignore'), tracking], axis=1)
+    manager.metrics.update_values(totals)
+    manager.metrics.update_trades(manager.all_trades)
+
+    prices = np.column_stack([_column(data, ticker, 'Close') for ticker in tickers]).tolist() if tickers else [[]] * len(data)
+    manager.portfolio_history.extend(
+        {'total_value': total, 'prices': dict(zip(tickers, bar_prices)), 'individual_values': dict(zip(tickers, bar_values))}
+        for total, bar_prices, bar_values in zip(totals.tolist(), prices, values_after.tolist())
+    )
+    return data
@@ -4,6 +4,9 @@ Multi-Ticker Portfolio Management System
 Handles portfolio allocation, position tracking, and execution across multiple tickers
 """
 
+from metrics import OnlineMetrics
+from trade_log import TradeLog
+
 class MultiTickerPortfolioManager:
     """Manages portfolio across multiple tickers with individual allocations"""
     
@@ -37,8 +40,10 @@ class MultiTickerPortfolioManager:
             print(f"  📈 {ticker}: ${allocated_capital:,.2f} ({allocation*100:.1f}%) - ${trade_config['amount_per_trade']:,.2f}/trade")
         
         # Portfolio tracking
-        self.all_trades = []
+        self.all_trades = TradeLog()
+        self._bar = None
         self.portfolio_history = []
+        self.metrics = OnlineMetrics()  # Fed the total value and new trades every tick
         
         print(f"✅ Multi-ticker portfolio ready!")
     
@@ -53,8 +58,22 @@ class MultiTickerPortfolioManager:
         
         return total_value
     
-    def process_market_tick(self, current_prices, signals, strategy_type):
-        """Process market tick for all tickers simultaneously"""
+    def attach_bars(self, data):
+        """
+        Hand each ticker's `{ticker}_Open/High/Low/Close` columns to its risk manager for
+        intrabar SL/TP fills and trailing stops (process_market_tick then needs `bar`)
+        """
+        self.all_trades.attach_index(data.index)
+        for ticker, risk_manager in self.ticker_risk_managers.items():
+            column = lambda field: data[f'{ticker}_{field}'].to_numpy() if f'{ticker}_{field}' in data.columns else None
+            if risk_manager.fill_mode == 'intrabar' and column('High') is not None and column('Low') is not None:
+                risk_manager.attach_bars(column('Open'), column('High'), column('Low'))
+            elif risk_manager.fill_mode == 'close' and risk_manager.trailing_sl_enabled and column('Close') is not None:
+                risk_manager.attach_bars(None, None, None, close=column('Close'))
+
+    def process_market_tick(self, current_prices, signals, strategy_type, bar=None):
+        """Process market tick for all tickers simultaneously (`bar`: the tick's position, see attach_bars)"""
+        self._bar = bar
         total_portfolio_value = self.get_total_portfolio_value(current_prices)
         
         # Process each ticker independently
@@ -69,7 +88,7 @@ class MultiTickerPortfolioManager:
             # Process tick for this ticker
             self._process_ticker_tick(
                 ticker, current_price, entry_signal, exit_signal, 
-                portfolio, risk_manager, strategy_type
+                portfolio, risk_manager, strategy_type, bar
             )
         
         # Record portfolio snapshot
@@ -81,23 +100,30 @@ class MultiTickerPortfolioManager:
                 for ticker, portfolio in self.ticker_portfolios.items()
             }
         })
+        self.metrics.update(total_portfolio_value)
+        self.metrics.update_trades(self.all_trades)
         
         return total_portfolio_value
     
     def _process_ticker_tick(self, ticker, current_price, entry_signal, exit_signal, 
-                           portfolio, risk_manager, strategy_type):
+                           portfolio, risk_manager, strategy_type, bar=None):
         """Process a single ticker's market tick"""
         
         # Risk management checks first
         if risk_manager.is_sl_tp_enabled() and portfolio.shares_owned != 0:
-            risk_result = risk_manager.get_risk_check_result(current_price, portfolio)
+            risk_result = risk_manager.get_risk_check_result(current_price, portfolio, bar)
             action = risk_result.get('action', 'NONE')
+            # Intrabar fills exit at the touched level instead of the Close
+            fill_price = risk_result.get('fill_price', current_price)
             
             if action == 'STOP_LOSS':
-                self._execute_sl_tp_exit(ticker, current_price, portfolio, risk_manager, "Stop Loss")
+                self._execute_sl_tp_exit(ticker, fill_price, portfolio, risk_manager, "Stop Loss")
+                return
+            elif action == 'TRAILING_STOP':
+                self._execute_sl_tp_exit(ticker, fill_price, portfolio, risk_manager, "Trailing Stop")
                 return
             elif action == 'TAKE_PROFIT':
-                self._execute_sl_tp_exit(ticker, current_price, portfolio, risk_manager, "Take Profit")
+                self._execute_sl_tp_exit(ticker, fill_price, portfolio, risk_manager, "Take Profit")
                 return
             elif action == 'LIQUIDATION':
                 self._execute_liquidation(ticker, current_price, portfolio, risk_manager)
@@ -124,14 +150,10 @@ class MultiTickerPortfolioManager:
             if shares_bought > 0:
                 risk_manager.set_sl_tp_levels(current_price, shares_bought, portfolio.buying_price, "LONG")
                 
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'BUY',
-                    'price': current_price,
-                    'shares': shares_bought,
-                    'value': shares_bought * current_price,
-                    'type': 'Entry'
-                })
+                self.all_trades.append(
+                    'Entry', current_price, shares_bought,
+                    bar=self._bar, ticker=ticker, action='BUY', amount=shares_bought * current_price
+                )
                 
         elif portfolio.shares_owned > 0 and exit_signal:
             # Exit long position
@@ -140,15 +162,10 @@ class MultiTickerPortfolioManager:
             profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
             risk_manager.reset_levels()
             
-            self.all_trades.append({
-                'ticker': ticker,
-                'action': 'SELL',
-                'price': current_price,
-                'shares': shares_sold,
-                'value': shares_sold * current_price,
-                'profit_loss': profit_loss,
-                'type': 'Exit'
-            })
+            self.all_trades.append(
+                'Exit', current_price, shares_sold,
+                bar=self._bar, ticker=ticker, action='SELL', amount=shares_sold * current_price, profit_loss=profit_loss
+            )
     
     def _execute_short_logic(self, ticker, current_price, entry_signal, exit_signal, portfolio, risk_manager):
         """Execute short strategy logic for a ticker"""
@@ -161,14 +178,10 @@ class MultiTickerPortfolioManager:
             if shares_shorted > 0:
                 risk_manager.set_sl_tp_levels(current_price, -shares_shorted, portfolio.buying_price, "SHORT")
                 
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'SHORT',
-                    'price': current_price,
-                    'shares': shares_shorted,
-                    'value': shares_shorted * current_price,
-                    'type': 'Entry'
-                })
+                self.all_trades.append(
+                    'Entry', current_price, shares_shorted,
+                    bar=self._bar, ticker=ticker, action='SHORT', amount=shares_shorted * current_price
+                )
                 
         elif portfolio.shares_owned < 0 and exit_signal:
             # Exit short position
@@ -177,15 +190,10 @@ class MultiTickerPortfolioManager:
             profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
             risk_manager.reset_levels()
             
-            self.all_trades.append({
-                'ticker': ticker,
-                'action': 'COVER',
-                'price': current_price,
-                'shares': shares_covered,
-                'value': shares_covered * current_price,
-                'profit_loss': profit_loss,
-                'type': 'Exit'
-            })
+            self.all_trades.append(
+                'Exit', current_price, shares_covered,
+                bar=self._bar, ticker=ticker, action='COVER', amount=shares_covered * current_price, profit_loss=profit_loss
+            )
     
     def _execute_reversal_logic(self, ticker, current_price, entry_signal, exit_signal, portfolio, risk_manager):
         """Execute reversal strategy logic for a ticker"""
@@ -195,14 +203,10 @@ class MultiTickerPortfolioManager:
                 shares_covered = abs(portfolio.shares_owned)
                 exit_result = portfolio.exit_short_position(current_price)
                 profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'COVER',
-                    'price': current_price,
-                    'shares': shares_covered,
-                    'profit_loss': profit_loss,
-                    'type': 'Reversal Exit'
-                })
+                self.all_trades.append(
+                    'Reversal Exit', current_price, shares_covered,
+                    bar=self._bar, ticker=ticker, action='COVER', amount=shares_covered * current_price, profit_loss=profit_loss
+                )
             
             # Enter long
             shares_before = portfolio.shares_owned
@@ -212,13 +216,10 @@ class MultiTickerPortfolioManager:
             if shares_bought > 0:
                 risk_manager.set_sl_tp_levels(current_price, shares_bought, portfolio.buying_price, "LONG")
                 
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'BUY',
-                    'price': current_price,
-                    'shares': shares_bought,
-                    'type': 'Reversal Entry'
-                })
+                self.all_trades.append(
+                    'Reversal Entry', current_price, shares_bought,
+                    bar=self._bar, ticker=ticker, action='BUY', amount=shares_bought * current_price
+                )
                 
         elif exit_signal and portfolio.shares_owned >= 0:
             # Go short (exit long if needed, then enter short)
@@ -226,14 +227,10 @@ class MultiTickerPortfolioManager:
                 shares_sold = portfolio.shares_owned
                 exit_result = portfolio.exit_long_position(current_price)
                 profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'SELL',
-                    'price': current_price,
-                    'shares': shares_sold,
-                    'profit_loss': profit_loss,
-                    'type': 'Reversal Exit'
-                })
+                self.all_trades.append(
+                    'Reversal Exit', current_price, shares_sold,
+                    bar=self._bar, ticker=ticker, action='SELL', amount=shares_sold * current_price, profit_loss=profit_loss
+                )
             
             # Enter short
             shares_before = portfolio.shares_owned
@@ -243,16 +240,14 @@ class MultiTickerPortfolioManager:
             if shares_shorted > 0:
                 risk_manager.set_sl_tp_levels(current_price, -shares_shorted, portfolio.buying_price, "SHORT")
                 
-                self.all_trades.append({
-                    'ticker': ticker,
-                    'action': 'SHORT',
-                    'price': current_price,
-                    'shares': shares_shorted,
-                    'type': 'Reversal Entry'
-                })
+                self.all_trades.append(
+                    'Reversal Entry', current_price, shares_shorted,
+                    bar=self._bar, ticker=ticker, action='SHORT', amount=shares_shorted * current_price
+                )
     
     def _execute_sl_tp_exit(self, ticker, current_price, portfolio, risk_manager, reason):
         """Execute stop loss or take profit exit"""
+        shares_closed = abs(portfolio.shares_owned)
         if portfolio.shares_owned > 0:  # Long position
             exit_result = portfolio.exit_long_position(current_price)
             profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
@@ -264,29 +259,22 @@ class MultiTickerPortfolioManager:
         
         risk_manager.reset_levels()
         
-        self.all_trades.append({
-            'ticker': ticker,
-            'action': action,
-            'price': current_price,
-            'shares': abs(portfolio.shares_owned),
-            'profit_loss': profit_loss,
-            'type': reason
-        })
+        self.all_trades.append(
+            reason, current_price, shares_closed,
+            bar=self._bar, ticker=ticker, action=action, amount=shares_closed * current_price, profit_loss=profit_loss
+        )
     
     def _execute_liquidation(self, ticker, current_price, portfolio, risk_manager):
         """Execute forced liquidation"""
+        shares_closed = abs(portfolio.shares_owned)
         exit_result = portfolio.exit_short_position(current_price)
         profit_loss = exit_result['profit_loss'] if isinstance(exit_result, dict) else exit_result
         risk_manager.reset_levels()
         
-        self.all_trades.append({
-            'ticker': ticker,
-            'action': 'LIQUIDATE',
-            'price': current_price,
-            'shares': abs(portfolio.shares_owned),
-            'profit_loss': profit_loss,
-            'type': 'Liquidation'
-        })
+        self.all_trades.append(
+            'Liquidation', current_price, shares_closed,
+            bar=self._bar, ticker=ticker, action='LIQUIDATE', amount=shares_closed * current_price, profit_loss=profit_loss
+        )
     
     def get_final_results(self, final_prices=None):
         """Get comprehensive final results with proper portfolio value calculation"""
@@ -300,6 +288,7 @@ class MultiTickerPortfolioManager:
         # Calculate total final value using proper portfolio value calculation
         total_final_value = 0
         ticker_results = {}
+        trade_counts = self.all_trades.count_by_ticker()
         
         for ticker, portfolio in self.ticker_portfolios.items():
             # Get the final price for this ticker (handle unique ticker names)
@@ -316,7 +305,7 @@ class MultiTickerPortfolioManager:
                 'final_value': ticker_final_value,
                 'profit_loss': ticker_profit,
                 'return_percent': ticker_return,
-                'trades': len([t for t in self.all_trades if t['ticker'] == ticker])
+                'trades': trade_counts.get(ticker, 0)
             }
             
             total_final_value += ticker_final_value
@@ -371,7 +360,7 @@ class MultiTickerPortfolioManager:
         # Advanced metrics if data is available
         if data is not None and len(self.all_trades) > 0:
             try:
-                from metrics import calculate_advanced_metrics
+                from metrics import run_metrics
                 
                 # Create a mock portfolio manager for metrics calculation
                 class MockPortfolio:
@@ -398,7 +387,7 @@ class MultiTickerPortfolioManager:
                             portfolio_values = portfolio_values[:len(data)]
                         data['Portfolio_Value'] = portfolio_values
                 
-                metrics = calculate_advanced_metrics(mock_portfolio, data, self.all_trades)
+                metrics = run_metrics(mock_portfolio, data, self.all_trades, self.metrics)
                 
                 if metrics:
                     print(f"📈 ADVANCED PORTFOLIO METRICS:")
@@ -3,6 +3,9 @@ Multi-Condition Strategy Detector
 Handles multiple conditions with AND/OR logic for entry and exit signals
 """
 
+import numpy as np
+
+
 class MultiConditionDetector:
     """
     Manages multiple trading conditions and evaluates them with AND/OR logic
@@ -52,10 +55,10 @@ class MultiConditionDetector:
         self.exit_conditions.append(condition_data)
         print(f"➕ Exit condition {len(self.exit_conditions)} added: {condition_data['comp1_name']} {condition_data['strategy']} {condition_data['comp2_name']}")
     
-    def evaluate_single_condition(self, data, condition, index):
+    def evaluate_condition_series(self, data, condition):
         """
-        Evaluate a single condition at given index
-        Returns True/False
+        Evaluate a single condition over the whole DataFrame
+        Returns a boolean NumPy array (one value per row)
         """
         try:
             # Import comparison functions
@@ -77,7 +80,7 @@ class MultiConditionDetector:
             comparison_func = strategy_map.get(condition['strategy'])
             if not comparison_func:
                 print(f"❌ Unknown strategy: {condition['strategy']}")
-                return False
+                return np.zeros(len(data), dtype=bool)
             
             # Get column names for comparison 1 and 2
             if condition['comp1_type'] == 'INDICATOR':
@@ -113,14 +116,45 @@ class MultiConditionDetector:
                     data[comp2_shifted_col] = data[comp2_col].shift(condition['comp2_candles_ago'])
                 comp2_col = comp2_shifted_col
             
-            # Evaluate the condition - comparison functions return Series, we need specific index
+            # Evaluate the condition once for every row
             result_series = comparison_func(data, comp1_col, comp2_col)
-            result = result_series.iloc[index] if index < len(result_series) else False
-            return bool(result)
+            return np.asarray(result_series, dtype=bool)
             
         except Exception as e:
             print(f"❌ Error evaluating condition: {e}")
-            return False
+            return np.zeros(len(data), dtype=bool)
+    
+    def evaluate_single_condition(self, data, condition, index):
+        """
+        Evaluate a single condition at given index
+        Returns True/False
+        """
+        result = self.evaluate_condition_series(data, condition)
+        return bool(result[index]) if index < len(result) else False
+    
+    def compile_conditions(self, data, conditions, logic_type):
+        """
+        Combine a list of conditions into one boolean array with AND/OR logic
+        Returns all False when there are no conditions
+        """
+        if not conditions:
+            return np.zeros(len(data), dtype=bool)
+        
+        results = [self.evaluate_condition_series(data, condition) for condition in conditions]
+        
+        # Apply logic
+        if logic_type == "AND":
+            return np.logical_and.reduce(results)  # All must be True
+        return np.logical_or.reduce(results)  # At least one must be True
+    
+    def generate_signals(self, data):
+        """
+        Evaluate entry and exit conditions for every row in one vectorized pass
+        Returns (entry_signals, exit_signals) as boolean arrays
+        """
+        entry_signals = self.compile_conditions(data, self.entry_conditions, self.entry_logic_type)
+        exit_signals = self.compile_conditions(data, self.exit_conditions, self.exit_logic_type)
+        return entry_signals, exit_signals
     
     def evaluate_entry_conditions(self, data, index):
         """
@@ -130,20 +164,8 @@ class MultiConditionDetector:
         if not self.entry_conditions:
             return False
         
-        results = []
-        for i, condition in enumerate(self.entry_conditions):
-            result = self.evaluate_single_condition(data, condition, index)
-            results.append(result)
-            # Debug output
-            # print(f"🔍 Entry Condition {i+1}: {result}")
-        
-        # Apply logic
-        if self.entry_logic_type == "AND":
-            final_result = all(results)  # All must be True
-        else:  # OR
-            final_result = any(results)  # At least one must be True
-        
-        return final_result
+        signals = self.compile_conditions(data, self.entry_conditions, self.entry_logic_type)
+        return bool(signals[index]) if index < len(signals) else False
     
     def evaluate_exit_conditions(self, data, index):
         """
@@ -153,20 +175,8 @@ class MultiConditionDetector:
         if not self.exit_conditions:
             return False
         
-        results = []
-        for i, condition in enumerate(self.exit_conditions):
-            result = self.evaluate_single_condition(data, condition, index)
-            results.append(result)
-            # Debug output
-            # print(f"🔍 Exit Condition {i+1}: {result}")
-        
-        # Apply logic
-        if self.exit_logic_type == "AND":
-            final_result = all(results)  # All must be True
-        else:  # OR
-            final_result = any(results)  # At least one must be True
-        
-        return final_result
+        signals = self.compile_conditions(data, self.exit_conditions, self.exit_logic_type)
+        return bool(signals[index]) if index < len(signals) else False
     
     def get_condition_summary(self):
         """Get a summary of all conditions"""
@@ -187,9 +197,14 @@ Entry Details:"""
         return summary
 
 
-# Create global instances for easy access
-entry_multi_detector = MultiConditionDetector()
-exit_multi_detector = MultiConditionDetector()
+# Global instances for easy access - created on first use instead of at import
+_global_detectors = {}
+
 
-print("✅ MultiConditionDetector class created successfully!")
-print("🎯 Ready for multi-condition strategy implementation")
\ No newline at end of file
+def __getattr__(name):
+    """Lazily create entry_multi_detector / exit_multi_detector"""
+    if name in ("entry_multi_detector", "exit_multi_detector"):
+        if name not in _global_detectors:
+            _global_detectors[name] = MultiConditionDetector()
+        return _global_detectors[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,39 @@
 """
 Risk Manager - Handles all Stop Loss, Take Profit, and Liquidation logic
 Eliminates code duplication and manages risk state properly
+
+SL/TP fill modes (sl_tp_config['fill_mode']):
+    'close'     SL/TP are checked against each bar's Close (default)
+    'intrabar'  SL/TP are checked against each bar's High/Low once attach_bars() has been given
+                the price arrays; the first touching bar after entry is found with a vectorized
+                forward search. Fills happen at the SL/TP level, or at the Open when the bar
+                gaps through it. When one bar touches both levels, the level the Open gapped
+                through wins, otherwise sl_tp_config['same_bar_priority'] decides
+                ('stop_loss' by default - the conservative assumption)
+
+With only the Close attached ('close' mode), the same forward search finds the first bar at or
+beyond a level, which is how the event-driven kernel (backtest_kernel.run_event_kernel) skips
+the bars in between.
+
+Trailing stops (sl_tp_config['trailing_sl_enabled']) follow the best price since entry: the Close
+in 'close' mode, the High (LONG) / Low (SHORT) of the previous bars in 'intrabar' mode. The
+stop is trailing_sl_value below/above that extreme - a fraction of it ('percentage') or a dollar
+amount of the position spread over its shares ('dollar', like the fixed dollar SL) - and the
+tighter of the trailing and fixed stops applies. With bars attached, the running extremes are
+cumulative maxima/minima over each trade's bars (np.maximum.accumulate), computed in the same
+vectorized forward search; without them the extreme is updated tick by tick.
 """
 
+import warnings
+
+import numpy as np
+
+FILL_MODES = ('close', 'intrabar')
+SAME_BAR_PRIORITIES = ('stop_loss', 'take_profit')
+
+# First window of the forward search for the touching bar (doubles until a touch is found)
+TOUCH_SEARCH_WINDOW = 64
+
 class RiskManager:
     """Manages risk controls including SL/TP and liquidation checks"""
     
@@ -28,6 +59,21 @@ class RiskManager:
         self.position_buying_price = 0  # Money involved in position
         self.position_shares = 0        # Number of shares in position
 
+        # Intrabar fills
+        self.fill_mode = sl_tp_config.get('fill_mode', 'close')
+        self.same_bar_priority = sl_tp_config.get('same_bar_priority', 'stop_loss')
+        if self.fill_mode not in FILL_MODES:
+            raise ValueError(f"fill_mode must be one of {FILL_MODES}, got {self.fill_mode!r}")
+        if self.same_bar_priority not in SAME_BAR_PRIORITIES:
+            raise ValueError(f"same_bar_priority must be one of {SAME_BAR_PRIORITIES}, got {self.same_bar_priority!r}")
+        self.bar_open = None
+        self.bar_high = None
+        self.bar_low = None
+        self.bar_close = None
+        self.trailing_distance = 0  # Per-share trailing distance (dollar trailing stops)
+        self.next_touch = None  # (bar, action, fill price, trigger price) of the upcoming exit, once searched
+        self.warned_close_fills = False  # 'intrabar' run without High/Low bars reported once
+
         # entry price, stop loss price, take profit price, position direction, position buying price, position shares
         
         print(f"Risk Manager initialized - SL/TP enabled: {self.sl_tp_config['enabled']}")
@@ -42,6 +88,9 @@ class RiskManager:
                     print(f"  🔄 Trailing SL: {self.trailing_sl_value*100:.1f}% (moves with profits)")
                 else:
                     print(f"  🔄 Trailing SL: ${self.trailing_sl_value:.0f} (moves with profits)")
+
+            if self.fill_mode == 'intrabar':
+                print(f"  📏 Intrabar fills: High/Low touches, {self.same_bar_priority.replace('_', ' ')} first on the same bar")
     
     def set_sl_tp_levels(self, entry_price, shares_owned, buying_price, position_type):
         """Set Stop Loss and Take Profit levels after position entry"""
@@ -51,6 +100,7 @@ class RiskManager:
             return
         
         # Store position info
+        self.next_touch = None
         self.entry_price = entry_price
         self.position_direction = position_type
         self.position_buying_price = buying_price
@@ -78,16 +128,60 @@ class RiskManager:
             # Convert to per-share prices
             self.stop_loss_price = stop_loss_amount / abs(shares_owned)
             self.take_profit_price = take_profit_amount / abs(shares_owned)
+
+        # Trailing stop starts from the entry price
+        if self.trailing_sl_enabled:
+            self.trailing_distance = self.trailing_sl_value / abs(shares_owned) if self.trailing_sl_type == 'dollar' else 0
+            self.highest_price = self.lowest_price = entry_price
+            self.trailing_sl_price = self._trailing_stop(entry_price)
+
+    def _trailing_stop(self, extreme):
+        """Trailing stop price for the best price since entry (scalar or array)"""
+        if self.position_direction == "LONG":
+            if self.trailing_sl_type == 'percentage':
+                return extreme * (1 - self.trailing_sl_value)
+            return extreme - self.trailing_distance
+        if self.trailing_sl_type == 'percentage':
+            return extreme * (1 + self.trailing_sl_value)
+        return extreme + self.trailing_distance
+
+    def update_trailing_stop(self, current_price):
+        """Move the trailing stop with a new price (tick-by-tick path)"""
+        if not self.trailing_sl_enabled or self.position_direction == "":
+            return
+        if self.position_direction == "LONG":
+            self.highest_price = max(self.highest_price, current_price)
+            self.trailing_sl_price = self._trailing_stop(self.highest_price)
+        else:
+            self.lowest_price = min(self.lowest_price, current_price)
+            self.trailing_sl_price = self._trailing_stop(self.lowest_price)
+
+    def _trailing_is_tighter(self, trailing_price):
+        if self.position_direction == "LONG":
+            return trailing_price > self.stop_loss_price
+        return trailing_price < self.stop_loss_price
+
+    def effective_stop_price(self):
+        """The stop that applies now: the tighter of the fixed and trailing stops"""
+        if self.trailing_sl_enabled and self._trailing_is_tighter(self.trailing_sl_price):
+            return self.trailing_sl_price
+        return self.stop_loss_price
+
+    def stop_action(self):
+        """'TRAILING_STOP' when the trailing stop is the one that applies, else 'STOP_LOSS'"""
+        if self.trailing_sl_enabled and self._trailing_is_tighter(self.trailing_sl_price):
+            return 'TRAILING_STOP'
+        return 'STOP_LOSS'
     
     def check_stop_loss(self, current_price):
-        """Check if Stop Loss should trigger"""
+        """Check if Stop Loss (fixed or trailing) should trigger"""
         if not self.sl_tp_config['enabled'] or self.position_direction == "":
             return False
         
         if self.position_direction == "LONG":
-            return current_price <= self.stop_loss_price
+            return current_price <= self.effective_stop_price()
         else:  # SHORT
-            return current_price >= self.stop_loss_price
+            return current_price >= self.effective_stop_price()
     
     def check_take_profit(self, current_price):
         """Check if Take Profit should trigger"""
@@ -99,6 +193,112 @@ class RiskManager:
         else:  # SHORT
             return current_price <= self.take_profit_price
     
+    def attach_bars(self, open_prices, high, low, close=None):
+        """
+        Give the risk manager each bar's prices: Open/High/Low for intrabar fills (Open may be None),
+        Close for trailing stops in 'close' mode
+        """
+        as_array = lambda values: None if values is None else np.asarray(values, dtype=np.float64)
+        self.bar_open, self.bar_high, self.bar_low, self.bar_close = (
+            as_array(open_prices), as_array(high), as_array(low), as_array(close))
+        self.next_touch = None
+
+    def uses_bar_search(self):
+        """True when exits are located by the vectorized forward search over attached bars"""
+        if self.fill_mode == 'intrabar':
+            return self.bar_high is not None
+        return self.bar_close is not None
+
+    def _stop_levels(self, extremes):
+        """Stop per bar for the running extreme since entry (the fixed stop without trailing)"""
+        if not self.trailing_sl_enabled:
+            return np.full(len(extremes), self.stop_loss_price)
+        combine = np.maximum if self.position_direction == "LONG" else np.minimum
+        return combine(self._trailing_stop(extremes), self.stop_loss_price)
+
+    def _stop_action(self, stop_level):
+        return 'TRAILING_STOP' if self.trailing_sl_enabled and stop_level != self.stop_loss_price else 'STOP_LOSS'
+
+    def _resolve_touch(self, bar, sl_hit, tp_hit, stop_level):
+        """(action, fill price, trigger price) for a bar touching the stop and/or TP level"""
+        if self.fill_mode == 'close':
+            # Close mode checks the stop before the take profit and fills at the Close
+            if sl_hit:
+                return self._stop_action(stop_level), self.bar_close[bar], stop_level
+            return 'TAKE_PROFIT', self.bar_close[bar], self.take_profit_price
+        open_price = None if self.bar_open is None else self.bar_open[bar]
+        long = self.position_direction == "LONG"
+        if open_price is not None and not np.isnan(open_price):
+            # A level the bar opened beyond was hit first, and filled at the Open
+            if (open_price <= stop_level) if long else (open_price >= stop_level):
+                return self._stop_action(stop_level), open_price, stop_level
+            if (open_price >= self.take_profit_price) if long else (open_price <= self.take_profit_price):
+                return 'TAKE_PROFIT', open_price, self.take_profit_price
+        if sl_hit and (not tp_hit or self.same_bar_priority == 'stop_loss'):
+            return self._stop_action(stop_level), stop_level, stop_level
+        return 'TAKE_PROFIT', self.take_profit_price, self.take_profit_price
+
+    def find_next_touch(self, start):
+        """
+        First bar at or after `start` where the position's stop (fixed or trailing) or TP triggers,
+        as (bar, action, fill price, trigger price), or None if no later bar does
+        Vectorized over windows that double in size, so a trade costs about as much as its length;
+        the running extreme since entry is carried from one window to the next
+        """
+        intrabar = self.fill_mode == 'intrabar'
+        n = len(self.bar_high if intrabar else self.bar_close)
+        long = self.position_direction == "LONG"
+        accumulate = np.maximum.accumulate if long else np.minimum.accumulate
+        extreme = self.highest_price if long else self.lowest_price
+        position, window = start, TOUCH_SEARCH_WINDOW
+        while position < n:
+            stop = min(n, position + window)
+            if intrabar:
+                high, low = self.bar_high[position:stop], self.bar_low[position:stop]
+                # The trail only moves with completed bars: bar k's stop uses the extremes before it
+                running = accumulate(np.concatenate([[extreme], high if long else low]))
+                stops = self._stop_levels(running[:-1])
+                if long:
+                    sl_hits, tp_hits = low <= stops, high >= self.take_profit_price
+                else:
+                    sl_hits, tp_hits = high >= stops, low <= self.take_profit_price
+                extreme = running[-1]
+            else:
+                close = self.bar_close[position:stop]
+                running = accumulate(np.concatenate([[extreme], close]))[1:]
+                stops = self._stop_levels(running)
+                if long:
+                    sl_hits, tp_hits = close <= stops, close >= self.take_profit_price
+                else:
+                    sl_hits, tp_hits = close >= stops, close <= self.take_profit_price
+                extreme = running[-1]
+            touches = np.flatnonzero(sl_hits | tp_hits)
+            if len(touches):
+                offset = touches[0]
+                bar = position + int(offset)
+                return (bar,) + self._resolve_touch(bar, bool(sl_hits[offset]), bool(tp_hits[offset]), stops[offset])
+            position, window = stop, window * 2
+        return None
+
+    def next_exit_bar(self, bar):
+        """
+        Bar at or after `bar` on which the open position's SL/TP (fixed or trailing) exit happens
+        (the number of bars if none does), or None without a position or with SL/TP disabled
+        """
+        if not self.sl_tp_config['enabled'] or self.position_direction == "":
+            return None
+        if self.next_touch is None or self.next_touch[0] < bar:
+            # First check since entry: locate the exit bar once instead of testing every bar
+            bars = len(self.bar_high) if self.fill_mode == 'intrabar' else len(self.bar_close)
+            self.next_touch = self.find_next_touch(bar) or (bars, None, None, None)
+        return self.next_touch[0]
+
+    def check_bar(self, bar):
+        """(action, fill price, trigger price) if the position exits on bar `bar`, else None"""
+        if self.next_exit_bar(bar) == bar:
+            return self.next_touch[1:]
+        return None
+
     def check_liquidation(self, current_price, portfolio):
         """Check if liquidation should trigger (only for short positions)"""
         # Only check liquidation for short positions
@@ -144,7 +344,9 @@ class RiskManager:
             'position_direction': self.position_direction,
             'sl_type': self.sl_tp_config['sl_type'],
             'sl_value': self.sl_tp_config['sl_value'],
-            'tp_value': self.sl_tp_config['tp_value']
+            'tp_value': self.sl_tp_config['tp_value'],
+            'trailing_sl_enabled': self.trailing_sl_enabled,
+            'trailing_sl_price': self.trailing_sl_price
         }
     
     def reset_levels(self):
@@ -155,6 +357,10 @@ class RiskManager:
         self.position_direction = ""
         self.position_buying_price = 0
         self.position_shares = 0
+        self.trailing_sl_price = 0
+        self.highest_price = 0
+        self.lowest_price = 0
+        self.next_touch = None
     
     def is_sl_tp_enabled(self):
         """Check if SL/TP is enabled"""
@@ -176,22 +382,54 @@ class RiskManager:
         else:
             return f"🚨 Stop Loss: ${self.stop_loss_price:.2f} (-${self.sl_tp_config['sl_value']:.0f}), 💰 Take Profit: ${self.take_profit_price:.2f} (+${self.sl_tp_config['tp_value']:.0f})"
     
-    def get_risk_check_result(self, current_price, portfolio):
-        """Comprehensive risk check - returns action needed"""
+    def _warn_close_fills(self, bar):
+        """An 'intrabar' run without High/Low (or without `bar`) falls back to Close fills: say so once"""
+        if self.warned_close_fills:
+            return
+        self.warned_close_fills = True
+        missing = "no bar position was passed" if self.bar_high is not None else "no High/Low bars are attached"
+        warnings.warn(f"fill_mode='intrabar' but {missing}; SL/TP are checked against the Close "
+                      f"(call attach_bars with High/Low and pass bar=)", RuntimeWarning, stacklevel=4)
+
+    def get_risk_check_result(self, current_price, portfolio, bar=None):
+        """
+        Comprehensive risk check - returns action needed
+        `bar` (the bar's position) enables intrabar SL/TP fills when High/Low are attached;
+        SL/TP results then carry the 'fill_price' the exit happens at
+        """
         # Check liquidation first (highest priority)
         if self.check_liquidation(current_price, portfolio):
             return {
                 'action': 'LIQUIDATION',
                 'info': self.get_liquidation_info(current_price, portfolio)
             }
+
+        if bar is not None and self.uses_bar_search():
+            touch = self.check_bar(bar)
+            if touch is None:
+                return {'action': 'NONE'}
+            action, fill_price, trigger_price = touch
+            return {
+                'action': action,
+                'position_type': self.position_direction,
+                'entry_price': self.entry_price,
+                'trigger_price': trigger_price,
+                'fill_price': fill_price
+            }
+
+        if self.fill_mode == 'intrabar' and self.sl_tp_config['enabled'] and self.position_direction:
+            self._warn_close_fills(bar)
+
+        # Trailing stop follows the price before it is checked
+        self.update_trailing_stop(current_price)
         
-        # Check Stop Loss (second priority)
+        # Check Stop Loss, fixed or trailing (second priority)
         if self.check_stop_loss(current_price):
             return {
-                'action': 'STOP_LOSS',
+                'action': self.stop_action(),
                 'position_type': self.position_direction,
                 'entry_price': self.entry_price,
-                'trigger_price': self.stop_loss_price
+                'trigger_price': self.effective_stop_price()
             }
         
         # Check Take Profit (third priority)
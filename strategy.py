@@ -697,7 +697,7 @@ def generate_multi_condition_signals(data, entry_conditions, exit_conditions, en
     """Generate entry and exit signals using MultiConditionDetector"""
     print(f"\nSTEP 4: Generating multi-condition signals...")
     
-    from new12 import MultiConditionDetector
+    from multicondition import MultiConditionDetector
     
     # Create detector
     detector = MultiConditionDetector()
@@ -712,25 +712,17 @@ def generate_multi_condition_signals(data, entry_conditions, exit_conditions, en
     
     print(detector.get_condition_summary())
     
-    # Generate signals for each row
-    entry_signals = []
-    exit_signals = []
-    
-    print("🔄 Evaluating conditions for each time period...")
-    for i in range(len(data)):
-        entry_signal = detector.evaluate_entry_conditions(data, i)
-        exit_signal = detector.evaluate_exit_conditions(data, i)
-        
-        entry_signals.append(entry_signal)
-        exit_signals.append(exit_signal)
+    # Evaluate every condition once over the whole series
+    print("🔄 Evaluating conditions for all time periods...")
+    entry_signals, exit_signals = detector.generate_signals(data)
     
     # Add signals to DataFrame
     data['Entry_Signal'] = entry_signals
     data['Exit_Signal'] = exit_signals
     
     # Count signals
-    entry_count = sum(entry_signals)
-    exit_count = sum(exit_signals)
+    entry_count = int(entry_signals.sum())
+    exit_count = int(exit_signals.sum())
     
     print(f"✅ Multi-condition signals generated:")
     print(f"  📈 Entry signals: {entry_count}")
@@ -740,55 +732,71 @@ def generate_multi_condition_signals(data, entry_conditions, exit_conditions, en
     return data
 
 
-def execute_long_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config):
+def execute_long_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config, engine="kernel"):
     """Step 5: Execute Long Entry/Exit Strategy - Modular Version"""
     print(f"\nSTEP 5: Executing Long Entry/Exit Strategy...")
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
-    for i in range(len(data)):
-        current_price = data['Close'].iloc[i]
-        entry_signal = data['Entry_Signal'].iloc[i]
-        exit_signal = data['Exit_Signal'].iloc[i]
-        
-        # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "long")
-        
-        # Update DataFrame tracking
-        tracking = executor.get_portfolio_tracking_data(current_price)
-        for key, value in tracking.items():
-            data.loc[data.index[i], key] = value
+    if engine in ("kernel", "events"):
+        # Array-backed loop - tracking columns attached in one assignment
+        # ("events": only signal / SL-TP / liquidation bars reach the executor)
+        from backtest_kernel import execute_with_kernel
+        data = execute_with_kernel(executor, data, "long", event_driven=engine == "events")
+    else:
+        for i in range(len(data)):
+            current_price = data['Close'].iloc[i]
+            entry_signal = data['Entry_Signal'].iloc[i]
+            exit_signal = data['Exit_Signal'].iloc[i]
+            
+            # Process market tick - handles all logic automatically
+            executor.process_market_tick(current_price, entry_signal, exit_signal, "long", bar=i)
+            
+            # Update DataFrame tracking (and the running metrics)
+            tracking = executor.get_portfolio_tracking_data(current_price)
+            executor.metrics.update(tracking['Portfolio_Value'])
+            for key, value in tracking.items():
+                data.loc[data.index[i], key] = value
     
     # Print final results with advanced metrics
     executor.print_final_results(data)
     return data, executor.trades
 
-def execute_short_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config):
+def execute_short_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config, engine="kernel"):
     """Step 5: Execute Short Entry/Exit Strategy - Modular Version"""
     print(f"\nSTEP 5: Executing Short Entry/Exit Strategy...")
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
-    for i in range(len(data)):
-        current_price = data['Close'].iloc[i]
-        entry_signal = data['Entry_Signal'].iloc[i]
-        exit_signal = data['Exit_Signal'].iloc[i]
-        
-        # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "short")
-        
-        # Update DataFrame tracking
-        tracking = executor.get_portfolio_tracking_data(current_price)
-        for key, value in tracking.items():
-            data.loc[data.index[i], key] = value
+    if engine in ("kernel", "events"):
+        # Array-backed loop - tracking columns attached in one assignment
+        # ("events": only signal / SL-TP / liquidation bars reach the executor)
+        from backtest_kernel import execute_with_kernel
+        data = execute_with_kernel(executor, data, "short", event_driven=engine == "events")
+    else:
+        for i in range(len(data)):
+            current_price = data['Close'].iloc[i]
+            entry_signal = data['Entry_Signal'].iloc[i]
+            exit_signal = data['Exit_Signal'].iloc[i]
+            
+            # Process market tick - handles all logic automatically
+            executor.process_market_tick(current_price, entry_signal, exit_signal, "short", bar=i)
+            
+            # Update DataFrame tracking (and the running metrics)
+            tracking = executor.get_portfolio_tracking_data(current_price)
+            executor.metrics.update(tracking['Portfolio_Value'])
+            for key, value in tracking.items():
+                data.loc[data.index[i], key] = value
     
     # Print final results with advanced metrics
     executor.print_final_results(data)
     return data, executor.trades
 
-def execute_multi_ticker_strategy(data, strategy_data, strategy_type):
+def execute_multi_ticker_strategy(data, strategy_data, strategy_type, engine="arrays"):
     """Execute multi-ticker strategy with portfolio allocation management"""
     print(f"\nSTEP 5: Executing Multi-Ticker {strategy_type.title()} Strategy...")
     
@@ -806,60 +814,75 @@ def execute_multi_ticker_strategy(data, strategy_data, strategy_type):
         total_capital, allocations, trade_sizes, sl_tp_config
     )
     
+    portfolio_manager.attach_bars(data)
+    
     print(f"📊 Processing {len(data)} market periods...")
     
-    # Process each market period
-    for i in range(len(data)):
-        # Get current prices for all tickers
-        current_prices = {}
-        for ticker in tickers:
-            current_prices[ticker] = data[f'{ticker}_Close'].iloc[i]
+    if engine == "arrays":
+        # Struct-of-arrays engine - every ticker advances per bar with vector operations
+        from multi_ticker_engine import execute_multi_ticker_arrays
+        data = execute_multi_ticker_arrays(portfolio_manager, data, strategy_type)
+    else:
+        # Process each market period
+        for i in range(len(data)):
+            # Get current prices for all tickers
+            current_prices = {}
+            for ticker in tickers:
+                current_prices[ticker] = data[f'{ticker}_Close'].iloc[i]
         
-        # Get signals for all tickers
-        signals = {}
-        for ticker in tickers:
-            signals[f'{ticker}_Entry_Signal'] = data[f'{ticker}_Entry_Signal'].iloc[i]
-            signals[f'{ticker}_Exit_Signal'] = data[f'{ticker}_Exit_Signal'].iloc[i]
+            # Get signals for all tickers
+            signals = {}
+            for ticker in tickers:
+                signals[f'{ticker}_Entry_Signal'] = data[f'{ticker}_Entry_Signal'].iloc[i]
+                signals[f'{ticker}_Exit_Signal'] = data[f'{ticker}_Exit_Signal'].iloc[i]
         
-        # Process market tick for all tickers
-        total_portfolio_value = portfolio_manager.process_market_tick(
-            current_prices, signals, strategy_type
-        )
+            # Process market tick for all tickers
+            total_portfolio_value = portfolio_manager.process_market_tick(
+                current_prices, signals, strategy_type, bar=i
+            )
         
-        # Update data with portfolio tracking
-        data.loc[data.index[i], 'Portfolio_Value'] = total_portfolio_value
+            # Update data with portfolio tracking
+            data.loc[data.index[i], 'Portfolio_Value'] = total_portfolio_value
         
-        # Add per-ticker values for tracking
-        for ticker in tickers:
-            ticker_portfolio = portfolio_manager.ticker_portfolios[ticker]
-            ticker_value = ticker_portfolio.get_portfolio_value(current_prices[ticker])
-            data.loc[data.index[i], f'{ticker}_Portfolio_Value'] = ticker_value
+            # Add per-ticker values for tracking
+            for ticker in tickers:
+                ticker_portfolio = portfolio_manager.ticker_portfolios[ticker]
+                ticker_value = ticker_portfolio.get_portfolio_value(current_prices[ticker])
+                data.loc[data.index[i], f'{ticker}_Portfolio_Value'] = ticker_value
     
     # Print final results
     portfolio_manager.print_final_results(data)
     
     return data, portfolio_manager.all_trades
 
-def execute_reversal_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config):
+def execute_reversal_strategy(data, strategy_data, sl_tp_config, total_capital, per_trade_config, engine="kernel"):
     """Step 5: Execute Long/Short Reversal Strategy - Modular Version"""
     print(f"\nSTEP 5: Executing Long/Short Reversal Strategy...")
     print("🔄 REVERSAL STRATEGY: Always in market - Entry=Long, Exit=Short")
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
-    for i in range(len(data)):
-        current_price = data['Close'].iloc[i]
-        entry_signal = data['Entry_Signal'].iloc[i]
-        exit_signal = data['Exit_Signal'].iloc[i]
-        
-        # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "reversal")
-        
-        # Update DataFrame tracking
-        tracking = executor.get_portfolio_tracking_data(current_price)
-        for key, value in tracking.items():
-            data.loc[data.index[i], key] = value
+    if engine in ("kernel", "events"):
+        # Array-backed loop - tracking columns attached in one assignment
+        # ("events": only signal / SL-TP / liquidation bars reach the executor)
+        from backtest_kernel import execute_with_kernel
+        data = execute_with_kernel(executor, data, "reversal", event_driven=engine == "events")
+    else:
+        for i in range(len(data)):
+            current_price = data['Close'].iloc[i]
+            entry_signal = data['Entry_Signal'].iloc[i]
+            exit_signal = data['Exit_Signal'].iloc[i]
+            
+            # Process market tick - handles all logic automatically
+            executor.process_market_tick(current_price, entry_signal, exit_signal, "reversal", bar=i)
+            
+            # Update DataFrame tracking (and the running metrics)
+            tracking = executor.get_portfolio_tracking_data(current_price)
+            executor.metrics.update(tracking['Portfolio_Value'])
+            for key, value in tracking.items():
+                data.loc[data.index[i], key] = value
     
     # Print final results with advanced metrics
     executor.print_final_results(data)
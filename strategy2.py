@@ -746,6 +746,7 @@ def execute_long_strategy(data, strategy_data, sl_tp_config, total_capital, per_
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
     for i in range(len(data)):
         current_price = data['Close'].iloc[i]
@@ -753,7 +754,7 @@ def execute_long_strategy(data, strategy_data, sl_tp_config, total_capital, per_
         exit_signal = data['Exit_Signal'].iloc[i]
         
         # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "long")
+        executor.process_market_tick(current_price, entry_signal, exit_signal, "long", bar=i)
         
         # Update DataFrame tracking
         tracking = executor.get_portfolio_tracking_data(current_price)
@@ -770,6 +771,7 @@ def execute_short_strategy(data, strategy_data, sl_tp_config, total_capital, per
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
     for i in range(len(data)):
         current_price = data['Close'].iloc[i]
@@ -777,7 +779,7 @@ def execute_short_strategy(data, strategy_data, sl_tp_config, total_capital, per
         exit_signal = data['Exit_Signal'].iloc[i]
         
         # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "short")
+        executor.process_market_tick(current_price, entry_signal, exit_signal, "short", bar=i)
         
         # Update DataFrame tracking
         tracking = executor.get_portfolio_tracking_data(current_price)
@@ -806,6 +808,8 @@ def execute_multi_ticker_strategy(data, strategy_data, strategy_type):
         total_capital, allocations, trade_sizes, sl_tp_config
     )
     
+    portfolio_manager.attach_bars(data)
+    
     print(f"📊 Processing {len(data)} market periods...")
     
     # Process each market period
@@ -823,7 +827,7 @@ def execute_multi_ticker_strategy(data, strategy_data, strategy_type):
         
         # Process market tick for all tickers
         total_portfolio_value = portfolio_manager.process_market_tick(
-            current_prices, signals, strategy_type
+            current_prices, signals, strategy_type, bar=i
         )
         
         # Update data with portfolio tracking
@@ -847,6 +851,7 @@ def execute_reversal_strategy(data, strategy_data, sl_tp_config, total_capital,
     
     from trade_executor import TradeExecutor
     executor = TradeExecutor(total_capital, sl_tp_config, per_trade_config)
+    executor.attach_bars(data)
     
     for i in range(len(data)):
         current_price = data['Close'].iloc[i]
@@ -854,7 +859,7 @@ def execute_reversal_strategy(data, strategy_data, sl_tp_config, total_capital,
         exit_signal = data['Exit_Signal'].iloc[i]
         
         # Process market tick - handles all logic automatically
-        executor.process_market_tick(current_price, entry_signal, exit_signal, "reversal")
+        executor.process_market_tick(current_price, entry_signal, exit_signal, "reversal", bar=i)
         
         # Update DataFrame tracking
         tracking = executor.get_portfolio_tracking_data(current_price)
@@ -1350,7 +1355,7 @@ def execute_strategy():
                 },
                 "advanced_metrics": advanced_metrics if advanced_metrics else None
             },
-            "trades": trades if isinstance(trades, list) else []
+            "trades": trades.to_dicts() if hasattr(trades, 'to_dicts') else (trades if isinstance(trades, list) else [])
         }
         
         # Add strategy-specific configuration for multi_ticker_multi mode
@@ -1,8 +1,13 @@
-from ta_strategies_TVLibrary import *
+from tv_registry import resolve_strategy_class
+import tv_output
+import tv_primitives
+import tv_profile
 
 import pandas as pd
 import numpy as np
 import math
+import functools
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
@@ -11,14 +16,427 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def _run_single_strategy(strategy_item, df, append, ta_indicator_value, signal_score, signal_value, signal_explanation):
+def __getattr__(name):
+    """Backward compatibility: strategy classes used to be star-imported into this module"""
+    if name.startswith('__'):
+        raise AttributeError(name)
+    return resolve_strategy_class(name)
+
+
+# All strategy classes in the TV library (class names in ta_strategies_TVLibrary, resolved on first use)
+ALL_STRATEGY_NAMES = [
+    "AberrationStrategies",
+    "AbsolutePriceOscillatorStrategies",
+    "AccelerationBandsStrategies",
+    "AccumulationDistributionLineStrategies",
+    "AccumulationDistributionIndexStrategies",
+    "AccumulationDistributionOscillatorStrategies",
+    "AdaptivePriceZoneStrategies",
+    "AllMovingAverageStrategies",
+    "ArcherMovingAveragesTrendsStrategies",
+    "ArcherOnBalanceVolumeStrategies",
+    "ArnaudLegouxMovingAverageStrategies",
+    "AroonStrategies",
+    "AroonOscillatorStrategies",
+    "AverageDirectionalIndexStrategies",
+    "AveragePriceStrategies",
+    "AverageTrueRangeStrategies",
+    "AwesomeOscillatorStrategies",
+    "BalanceOfPowerStrategies",
+    "BiasStrategies",
+    "BRARStrategies",
+    "BollingerBandsStrategies",
+    "BollingerBandsWidthStrategies",
+    "BullBearPowerStrategies",
+    "BuyAndSellPressureStrategies",
+    "CenterOfGravityStrategies",
+    "ChandeForecastOscillatorStrategies",
+    "ChandeKrollStopStrategies",
+    "ChandeMomentumOscillatorStrategies",
+    "ChandelierExitStrategies",
+    "ChaikinADLineStrategies",
+    "ChaikinADOscillatorStrategies",
+    "ChaikinMoneyFlowStrategies",
+    "ChaikinOscillatorStrategies",
+    "ChoppinessIndexStrategies",
+    "CommodityChannelIndexStrategies",
+    "CorrelationTrendIndicatorStrategies",
+    "CoppockCurveStrategies",
+    "CumulativeForceIndexStrategies",
+    "CrossSignalsStrategies",
+    "DecayStrategies",
+    "DecreasingPriceStrategies",
+    "DetrendedPriceOscillatorStrategies",
+    "DirectionalMovementStrategies",
+    "DonchianChannelStrategies",
+    "DoubleExponentialMovingAverageStrategies",
+    "EhlersSuperSmootherFilterStrategies",
+    "ElderRayIndexStrategies",
+    "EldersForceIndexStrategies",
+    "EldersThermometerStrategies",
+    "ElasticVolumeMovingAverageStrategies",
+    "ElasticVolumeMACDStrategies",
+    "ExponentialMovingAverageStrategies",
+    "FibonacciPivotPointsStrategies",
+    "FibonacciWeightedMovingAverageStrategies",
+    "FiniteVolumeElementStrategies",
+    "FisherTransformStrategies",
+    "ForceIndexStrategies",
+    "FractalAdaptiveMovingAverageStrategies",
+    "GannHighLowActivatorStrategies",
+    "HighLowAverageStrategies",
+    "HilbertTransformDominantCyclePeriodStrategies",
+    "HilbertTransformDominantCyclePhaseStrategies",
+    "HilbertTransformInstantaneousTrendlineStrategies",
+    "HilbertTransformPhasorComponentsStrategies",
+    "HilbertTransformSineWaveStrategies",
+    "HilbertTransformTrendCycleStrategies",
+    "HoltWinterChannelStrategies",
+    "HoltWinterMovingAverageStrategies",
+    "HullExponentialMovingAverageStrategies",
+    "HullMovingAverageStrategies",
+    "IchimokuCloudStrategies",
+    "IncreasingPriceStrategies",
+    "InertiaStrategies",
+    "InverseFisherTransformRSIStrategies",
+    "JurikMovingAverageStrategies",
+    "KDJIndicatorStrategies",
+    "KaufmanAdaptiveMovingAverageStrategies",
+    "KaufmanEfficiencyIndicatorStrategies",
+    "KeltnerChannelStrategies",
+    "KlingerVolumeOscillatorStrategies",
+    "KnowSureThingStrategies",
+    "LinearRegressionStrategies",
+    "LinearRegressionAngleStrategies",
+    "LinearRegressionInterceptStrategies",
+    "LinearRegressionSlopeStrategies",
+    "LongRunStrategies",
+    "MarkWhistlersWAVEPMStrategies",
+    "MarketMomentumStrategies",
+    "MassIndexStrategies",
+    "McGinleyDynamicStrategies",
+    "MedianPriceStrategies",
+    "MidPointOverPeriodStrategies",
+    "MidpointPricePeriodStrategies",
+    "MinusDirectionalIndicatorStrategies",
+    "MinusDirectionalMovementStrategies",
+    "MoneyFlowIndexStrategies",
+    "MomentumStrategies",
+    "MomentumBreakoutBandsStrategies",
+    "MACDStrategies",
+    "MovingStandardDeviationStrategies",
+    "NegativeVolumeIndexStrategies",
+    "NormalizedAverageTrueRangeStrategies",
+    "NormalizedBASPStrategies",
+    "OnBalanceVolumeStrategies",
+    "OHLC_AverageStrategies",
+    "ParabolicStopAndReverseStrategies",
+    "PascalsWeightedMovingAverageStrategies",
+    "PercentBStrategies",
+    "PercentagePriceOscillatorStrategies",
+    "PercentageVolumeOscillatorStrategies",
+    "PivotPointsStrategies",
+    "PlusDirectionalIndicatorStrategies",
+    "PlusDirectionalMovementStrategies",
+    "PositiveVolumeIndexStrategies",
+    "PrettyGoodOscillatorStrategies",
+    "PriceDistanceStrategies",
+    "PriceVolumeRankStrategies",
+    "PriceVolumeTrendStrategies",
+    "PriceVolumeStrategies",
+    "PsychologicalLineStrategies",
+    "QStickStrategies",
+    "QuantitativeQualitativeEstimationStrategies",
+    "RateOfChangeStrategies",
+    "RelativeStrengthIndexStrategies",
+    "RelativeStrengthXtraStrategies",
+    "RelativeVigorIndexStrategies",
+    "RelativeVolatilityIndexStrategies",
+    "SchaffTrendCycleStrategies",
+    "ShortRunStrategies",
+    "SineWeightedMovingAverageStrategies",
+    "SlopeStrategies",
+    "SmiErgodicOscillatorStrategies",
+    "SmoothedExponentialMovingAverageStrategies",
+    "SmoothedSimpleMovingAverageStrategies",
+    "SqueezeStrategies",
+    "SqueezeProStrategies",
+    "StandardDeviationStrategies",
+    "StochasticStrategies",
+    "StochasticFastStrategies",
+    "StochasticOscillatorStrategies",
+    "StochasticOscillatorKStrategies",
+    "StochasticRSIStrategies",
+    "StochasticOscillatorDStrategies",
+    "StopAndReverseStrategies",
+    "SummationStrategies",
+    "SupertrendStrategies",
+    "SymmetricWeightedMovingAverageStrategies",
+    "T3MovingAverageStrategies",
+    "TDSequentialStrategies",
+    "TrendSignalsStrategies",
+    "TriangularMovingAverageStrategies",
+    "TripleExponentialMovingAverageOscillatorStrategies",
+    "TrixStrategies",
+    "TwiggsMoneyIndexStrategies",
+    "TTMTrendStrategies",
+    "TypicalPriceStrategies",
+    "UltimateOscillatorStrategies",
+    "UlcerIndexStrategies",
+    "UpDownStrategies",
+    "VariableIndexDynamicAverageStrategies",
+    "VarianceStrategies",
+    "VerticalHorizontalFilterStrategies",
+    "VolumeAdjustedMovingAverageStrategies",
+    "VolumeFlowIndicatorStrategies",
+    "VolumePriceTrendStrategies",
+    "VolumeWeightedAveragePriceStrategies",
+    "VolumeWeightedMovingAverageStrategies",
+    "VolumeWeightedMACDStrategies",
+    "VortexIndicatorStrategies",
+    "WaveTrendOscillatorStrategies",
+    "WeightedClosingPriceStrategies",
+    "WeightedMovingAverageStrategies",
+    "WeightedOnBalanceVolumeStrategies",
+    "WilliamsRStrategies",
+    "WildersMovingAverageStrategies",
+    "ZeroLagExponentialMovingAverageStrategies",
+    "ZeroLagSimpleMovingAverageStrategies",
+]
+
+# Trend strategies (class names in ta_strategies_TVLibrary, resolved on first use)
+TREND_STRATEGY_NAMES = [
+    "AdaptivePriceZoneStrategies",
+    "AllMovingAverageStrategies",
+    "ArcherMovingAveragesTrendsStrategies",
+    "ArnaudLegouxMovingAverageStrategies",
+    "AroonStrategies",
+    "AroonOscillatorStrategies",
+    "AverageDirectionalIndexStrategies",
+    "AveragePriceStrategies",
+    "BiasStrategies",
+    "CorrelationTrendIndicatorStrategies",
+    "CrossSignalsStrategies",
+    "DecayStrategies",
+    "DecreasingPriceStrategies",
+    "DirectionalMovementStrategies",
+    "DonchianChannelStrategies",
+    "DoubleExponentialMovingAverageStrategies",
+    "EhlersSuperSmootherFilterStrategies",
+    "ElderRayIndexStrategies",
+    "ExponentialMovingAverageStrategies",
+    "FibonacciPivotPointsStrategies",
+    "FibonacciWeightedMovingAverageStrategies",
+    "FractalAdaptiveMovingAverageStrategies",
+    "GannHighLowActivatorStrategies",
+    "HighLowAverageStrategies",
+    "HilbertTransformDominantCyclePeriodStrategies",
+    "HilbertTransformDominantCyclePhaseStrategies",
+    "HilbertTransformInstantaneousTrendlineStrategies",
+    "HilbertTransformPhasorComponentsStrategies",
+    "HilbertTransformSineWaveStrategies",
+    "HilbertTransformTrendCycleStrategies",
+    "HoltWinterChannelStrategies",
+    "HoltWinterMovingAverageStrategies",
+    "HullExponentialMovingAverageStrategies",
+    "HullMovingAverageStrategies",
+    "IchimokuCloudStrategies",
+    "IncreasingPriceStrategies",
+    "JurikMovingAverageStrategies",
+    "KaufmanAdaptiveMovingAverageStrategies",
+    "KaufmanEfficiencyIndicatorStrategies",
+    "LinearRegressionStrategies",
+    "LinearRegressionAngleStrategies",
+    "LinearRegressionInterceptStrategies",
+    "LinearRegressionSlopeStrategies",
+    "LongRunStrategies",
+    "McGinleyDynamicStrategies",
+    "MedianPriceStrategies",
+    "MidPointOverPeriodStrategies",
+    "MidpointPricePeriodStrategies",
+    "MinusDirectionalIndicatorStrategies",
+    "MinusDirectionalMovementStrategies",
+    "OHLC_AverageStrategies",
+    "ParabolicStopAndReverseStrategies",
+    "PascalsWeightedMovingAverageStrategies",
+    "PivotPointsStrategies",
+    "PlusDirectionalIndicatorStrategies",
+    "PlusDirectionalMovementStrategies",
+    "QStickStrategies",
+    "ShortRunStrategies",
+    "SineWeightedMovingAverageStrategies",
+    "SlopeStrategies",
+    "SmoothedExponentialMovingAverageStrategies",
+    "SmoothedSimpleMovingAverageStrategies",
+    "StopAndReverseStrategies",
+    "SummationStrategies",
+    "SupertrendStrategies",
+    "SymmetricWeightedMovingAverageStrategies",
+    "T3MovingAverageStrategies",
+    "TrendSignalsStrategies",
+    "TriangularMovingAverageStrategies",
+    "TTMTrendStrategies",
+    "TypicalPriceStrategies",
+    "VariableIndexDynamicAverageStrategies",
+    "VerticalHorizontalFilterStrategies",
+    "VortexIndicatorStrategies",
+    "WeightedClosingPriceStrategies",
+    "WeightedMovingAverageStrategies",
+    "WildersMovingAverageStrategies",
+    "ZeroLagExponentialMovingAverageStrategies",
+    "ZeroLagSimpleMovingAverageStrategies",
+]
+
+# Momentum strategies (class names in ta_strategies_TVLibrary, resolved on first use)
+MOMENTUM_STRATEGY_NAMES = [
+    "AbsolutePriceOscillatorStrategies",
+    "AwesomeOscillatorStrategies",
+    "BalanceOfPowerStrategies",
+    "BRARStrategies",
+    "BuyAndSellPressureStrategies",
+    "CenterOfGravityStrategies",
+    "ChandeForecastOscillatorStrategies",
+    "ChandeMomentumOscillatorStrategies",
+    "CommodityChannelIndexStrategies",
+    "CoppockCurveStrategies",
+    "CumulativeForceIndexStrategies",
+    "DetrendedPriceOscillatorStrategies",
+    "InertiaStrategies",
+    "InverseFisherTransformRSIStrategies",
+    "KDJIndicatorStrategies",
+    "KnowSureThingStrategies",
+    "MarkWhistlersWAVEPMStrategies",
+    "MarketMomentumStrategies",
+    "MomentumStrategies",
+    "MomentumBreakoutBandsStrategies",
+    "MACDStrategies",
+    "PercentagePriceOscillatorStrategies",
+    "PrettyGoodOscillatorStrategies",
+    "PsychologicalLineStrategies",
+    "QuantitativeQualitativeEstimationStrategies",
+    "RateOfChangeStrategies",
+    "RelativeStrengthIndexStrategies",
+    "RelativeStrengthXtraStrategies",
+    "RelativeVigorIndexStrategies",
+    "SchaffTrendCycleStrategies",
+    "SmiErgodicOscillatorStrategies",
+    "StochasticStrategies",
+    "StochasticFastStrategies",
+    "StochasticOscillatorStrategies",
+    "StochasticOscillatorKStrategies",
+    "StochasticRSIStrategies",
+    "StochasticOscillatorDStrategies",
+    "TDSequentialStrategies",
+    "TripleExponentialMovingAverageOscillatorStrategies",
+    "TrixStrategies",
+    "TwiggsMoneyIndexStrategies",
+    "UltimateOscillatorStrategies",
+    "UpDownStrategies",
+    "WaveTrendOscillatorStrategies",
+    "WilliamsRStrategies",
+]
+
+# Volatility strategies (class names in ta_strategies_TVLibrary, resolved on first use)
+VOLATILITY_STRATEGY_NAMES = [
+    "AccelerationBandsStrategies",
+    "AverageTrueRangeStrategies",
+    "ChandeKrollStopStrategies",
+    "ChandelierExitStrategies",
+    "BollingerBandsStrategies",
+    "BollingerBandsWidthStrategies",
+    "ChoppinessIndexStrategies",
+    "KeltnerChannelStrategies",
+    "MassIndexStrategies",
+    "MovingStandardDeviationStrategies",
+    "NormalizedAverageTrueRangeStrategies",
+    "NormalizedBASPStrategies",
+    "PercentBStrategies",
+    "RelativeVolatilityIndexStrategies",
+    "SqueezeStrategies",
+    "SqueezeProStrategies",
+    "StandardDeviationStrategies",
+    "UlcerIndexStrategies",
+    "VarianceStrategies",
+    "PriceDistanceStrategies",
+]
+
+# Volume strategies (class names in ta_strategies_TVLibrary, resolved on first use)
+VOLUME_STRATEGY_NAMES = [
+    "AccumulationDistributionLineStrategies",
+    "AccumulationDistributionIndexStrategies",
+    "AccumulationDistributionOscillatorStrategies",
+    "ArcherOnBalanceVolumeStrategies",
+    "ChaikinADLineStrategies",
+    "ChaikinADOscillatorStrategies",
+    "ChaikinMoneyFlowStrategies",
+    "ChaikinOscillatorStrategies",
+    "ElasticVolumeMovingAverageStrategies",
+    "ElasticVolumeMACDStrategies",
+    "FiniteVolumeElementStrategies",
+    "KlingerVolumeOscillatorStrategies",
+    "MoneyFlowIndexStrategies",
+    "NegativeVolumeIndexStrategies",
+    "OnBalanceVolumeStrategies",
+    "PercentageVolumeOscillatorStrategies",
+    "PositiveVolumeIndexStrategies",
+    "PriceVolumeRankStrategies",
+    "PriceVolumeTrendStrategies",
+    "PriceVolumeStrategies",
+    "VolumeAdjustedMovingAverageStrategies",
+    "VolumeFlowIndicatorStrategies",
+    "VolumePriceTrendStrategies",
+    "VolumeWeightedAveragePriceStrategies",
+    "VolumeWeightedMovingAverageStrategies",
+    "VolumeWeightedMACDStrategies",
+    "WeightedOnBalanceVolumeStrategies",
+]
+
+
+
+def _read_only_view(df):
+    """
+    A DataFrame over the same column arrays as df (nothing is copied) whose numpy columns are read-only
+    Strategies running in worker threads get this view: an in-place write to the input raises
+    instead of silently racing with the other workers, and new columns never reach df itself.
+    """
+    data = {}
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy().view()
+            values.flags.writeable = False
+            data[position] = values
+        else:
+            data[position] = column
+    view = pd.DataFrame(data, index=df.index, copy=False)
+    view.columns = df.columns
+    return view
+
+
+def _run_single_strategy(strategy_item, df, append, ta_indicator_value, signal_score, signal_value, signal_explanation, block=None, selector=None):
     """
     Helper function to run a single strategy in parallel.
     Returns tuple of (strategy_name, result_dataframe)
+    With an OutputBlock, columns are written into the block and the returned frame only holds
+    whatever the strategy did not route through it
+    With a tv_selection.StrategySelector, only the selected sub-strategies and columns are produced
     """
     name, instance = strategy_item
+    run = instance.run_all_strategies if selector is None else functools.partial(selector.run, instance)
     try:
-        result_df = instance.run_all_strategies(
+        if block is not None:
+            with tv_output.bound(instance, block):
+                result_df = run(
+                    df,
+                    append=False,
+                    ta_indicator_value=ta_indicator_value,
+                    signal_score=signal_score,
+                    signal_value=signal_value,
+                    signal_explanation=signal_explanation
+                )
+            block.add_frame(result_df, owner=name)
+            return name, result_df
+        result_df = run(
             df,
             append=append,
             ta_indicator_value=ta_indicator_value,
@@ -33,645 +451,250 @@ def _run_single_strategy(strategy_item, df, append, ta_indicator_value, signal_s
         return name, pd.DataFrame()
 
 
-class AllStrategies:
-    def __init__(self, max_workers=4):
-        # List all strategy classes
-        strategy_classes = [
-            AberrationStrategies,
-            AbsolutePriceOscillatorStrategies,
-            AccelerationBandsStrategies,
-            AccumulationDistributionLineStrategies,
-            AccumulationDistributionIndexStrategies,
-            AccumulationDistributionOscillatorStrategies,
-            AdaptivePriceZoneStrategies,
-            AllMovingAverageStrategies,
-            ArcherMovingAveragesTrendsStrategies,
-            ArcherOnBalanceVolumeStrategies,
-            ArnaudLegouxMovingAverageStrategies,
-            AroonStrategies,
-            AroonOscillatorStrategies,
-            AverageDirectionalIndexStrategies,
-            AveragePriceStrategies,
-            AverageTrueRangeStrategies,
-            AwesomeOscillatorStrategies,
-            BalanceOfPowerStrategies,
-            BiasStrategies,
-            BRARStrategies,
-            BollingerBandsStrategies,
-            BollingerBandsWidthStrategies,
-            BullBearPowerStrategies,
-            BuyAndSellPressureStrategies,
-            CenterOfGravityStrategies,
-            ChandeForecastOscillatorStrategies,
-            ChandeKrollStopStrategies,
-            ChandeMomentumOscillatorStrategies,
-            ChandelierExitStrategies,
-            ChaikinADLineStrategies,
-            ChaikinADOscillatorStrategies,
-            ChaikinMoneyFlowStrategies,
-            ChaikinOscillatorStrategies,
-            ChoppinessIndexStrategies,
-            CommodityChannelIndexStrategies,
-            CorrelationTrendIndicatorStrategies,
-            CoppockCurveStrategies,
-            CumulativeForceIndexStrategies,
-            CrossSignalsStrategies,
-            DecayStrategies,
-            DecreasingPriceStrategies,
-            DetrendedPriceOscillatorStrategies,
-            DirectionalMovementStrategies,
-            DonchianChannelStrategies,
-            DoubleExponentialMovingAverageStrategies,
-            EhlersSuperSmootherFilterStrategies,
-            ElderRayIndexStrategies,
-            EldersForceIndexStrategies,
-            EldersThermometerStrategies,
-            ElasticVolumeMovingAverageStrategies,
-            ElasticVolumeMACDStrategies,
-            ExponentialMovingAverageStrategies,
-            FibonacciPivotPointsStrategies,
-            FibonacciWeightedMovingAverageStrategies,
-            FiniteVolumeElementStrategies,
-            FisherTransformStrategies,
-            ForceIndexStrategies,
-            FractalAdaptiveMovingAverageStrategies,
-            GannHighLowActivatorStrategies,
-            HighLowAverageStrategies,
-            HilbertTransformDominantCyclePeriodStrategies,
-            HilbertTransformDominantCyclePhaseStrategies,
-            HilbertTransformInstantaneousTrendlineStrategies,
-            HilbertTransformPhasorComponentsStrategies,
-            HilbertTransformSineWaveStrategies,
-            HilbertTransformTrendCycleStrategies,
-            HoltWinterChannelStrategies,
-            HoltWinterMovingAverageStrategies,
-            HullExponentialMovingAverageStrategies,
-            HullMovingAverageStrategies,
-            IchimokuCloudStrategies,
-            IncreasingPriceStrategies,
-            InertiaStrategies,
-            InverseFisherTransformRSIStrategies,
-            JurikMovingAverageStrategies,
-            KDJIndicatorStrategies,
-            KaufmanAdaptiveMovingAverageStrategies,
-            KaufmanEfficiencyIndicatorStrategies,
-            KeltnerChannelStrategies,
-            KlingerVolumeOscillatorStrategies,
-            KnowSureThingStrategies,
-            LinearRegressionStrategies,
-            LinearRegressionAngleStrategies,
-            LinearRegressionInterceptStrategies,
-            LinearRegressionSlopeStrategies,
-            LongRunStrategies,
-            MarkWhistlersWAVEPMStrategies,
-            MarketMomentumStrategies,
-            MassIndexStrategies,
-            McGinleyDynamicStrategies,
-            MedianPriceStrategies,
-            MidPointOverPeriodStrategies,
-            MidpointPricePeriodStrategies,
-            MinusDirectionalIndicatorStrategies,
-            MinusDirectionalMovementStrategies,
-            MoneyFlowIndexStrategies,
-            MomentumStrategies,
-            MomentumBreakoutBandsStrategies,
-            MACDStrategies,
-            MovingStandardDeviationStrategies,
-            NegativeVolumeIndexStrategies,
-            NormalizedAverageTrueRangeStrategies,
-            NormalizedBASPStrategies,
-            OnBalanceVolumeStrategies,
-            OHLC_AverageStrategies,
-            ParabolicStopAndReverseStrategies,
-            PascalsWeightedMovingAverageStrategies,
-            PercentBStrategies,
-            PercentagePriceOscillatorStrategies,
-            PercentageVolumeOscillatorStrategies,
-            PivotPointsStrategies,
-            PlusDirectionalIndicatorStrategies,
-            PlusDirectionalMovementStrategies,
-            PositiveVolumeIndexStrategies,
-            PrettyGoodOscillatorStrategies,
-            PriceDistanceStrategies,
-            PriceVolumeRankStrategies,
-            PriceVolumeTrendStrategies,
-            PriceVolumeStrategies,
-            PsychologicalLineStrategies,
-            QStickStrategies,
-            QuantitativeQualitativeEstimationStrategies,
-            RateOfChangeStrategies,
-            RelativeStrengthIndexStrategies,
-            RelativeStrengthXtraStrategies,
-            RelativeVigorIndexStrategies,
-            RelativeVolatilityIndexStrategies,
-            SchaffTrendCycleStrategies,
-            ShortRunStrategies,
-            SineWeightedMovingAverageStrategies,
-            SlopeStrategies,
-            SmiErgodicOscillatorStrategies,
-            SmoothedExponentialMovingAverageStrategies,
-            SmoothedSimpleMovingAverageStrategies,
-            SqueezeStrategies,
-            SqueezeProStrategies,
-            StandardDeviationStrategies,
-            StochasticStrategies,
-            StochasticFastStrategies,
-            StochasticOscillatorStrategies,
-            StochasticOscillatorKStrategies,
-            StochasticRSIStrategies,
-            StochasticOscillatorDStrategies,
-            StopAndReverseStrategies,
-            SummationStrategies,
-            SupertrendStrategies,
-            SymmetricWeightedMovingAverageStrategies,
-            T3MovingAverageStrategies,
-            TDSequentialStrategies,
-            TrendSignalsStrategies,
-            TriangularMovingAverageStrategies,
-            TripleExponentialMovingAverageOscillatorStrategies,
-            TrixStrategies,
-            TwiggsMoneyIndexStrategies,
-            TTMTrendStrategies,
-            TypicalPriceStrategies,
-            UltimateOscillatorStrategies,
-            UlcerIndexStrategies,
-            UpDownStrategies,
-            VariableIndexDynamicAverageStrategies,
-            VarianceStrategies,
-            VerticalHorizontalFilterStrategies,
-            VolumeAdjustedMovingAverageStrategies,
-            VolumeFlowIndicatorStrategies,
-            VolumePriceTrendStrategies,
-            VolumeWeightedAveragePriceStrategies,
-            VolumeWeightedMovingAverageStrategies,
-            VolumeWeightedMACDStrategies,
-            VortexIndicatorStrategies,
-            WaveTrendOscillatorStrategies,
-            WeightedClosingPriceStrategies,
-            WeightedMovingAverageStrategies,
-            WeightedOnBalanceVolumeStrategies,
-            WilliamsRStrategies,
-            WildersMovingAverageStrategies,
-            ZeroLagExponentialMovingAverageStrategies,
-            ZeroLagSimpleMovingAverageStrategies,
-        ]
-        # Instantiate each strategy and store the instance in a dictionary
-        self.strategy_instances = {}
-        for cls in strategy_classes:
-            self.strategy_instances[cls.__name__] = cls()
-        
-        # Set max_workers for parallel processing
-        self.max_workers = max_workers
+def _run_timed_strategy(strategy_item, *args, **kwargs):
+    """_run_single_strategy plus its wall and CPU (this thread only) time: (name, result_df, wall, cpu)"""
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    name, result_df = _run_single_strategy(strategy_item, *args, **kwargs)
+    return name, result_df, time.perf_counter() - wall_start, time.thread_time() - cpu_start
 
-    def run_all_strategies(self, df, append=True, ta_indicator_value=False, 
-                           signal_score=True, signal_value=False, signal_explanation=False):
-        """
-        Runs the `run_all_strategies` method for each strategy instance using the provided DataFrame in parallel.
-        The results are stored as attributes (e.g., AberrationStrategies_df) and then concatenated
-        horizontally into one DataFrame.
-        """
-        results = {}
-        
-        logger.info(f"Running {len(self.strategy_instances)} strategies in parallel with {self.max_workers} workers")
-        
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategy tasks
-            future_to_strategy = {
-                executor.submit(
-                    _run_single_strategy, 
-                    (name, instance), 
-                    df, append, ta_indicator_value, signal_score, signal_value, signal_explanation
-                ): name for name, instance in self.strategy_instances.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_strategy):
-                try:
-                    name, result_df = future.result()
-                    results[name] = result_df
-                    setattr(self, f"{name}_df", result_df)
-                    logger.debug(f"Completed strategy: {name}")
-                except Exception as e:
-                    strategy_name = future_to_strategy[future]
-                    logger.error(f"Strategy {strategy_name} generated an exception: {e}")
-                    results[strategy_name] = pd.DataFrame()
-                    setattr(self, f"{strategy_name}_df", pd.DataFrame())
-        
-        logger.info(f"Completed all {len(results)} strategies")
-        
-        # Filter out empty DataFrames before concatenation
-        valid_results = [df for df in results.values() if not df.empty]
-        
-        if valid_results:
-            return pd.concat(valid_results, axis=1)
-        else:
-            logger.warning("No valid strategy results to concatenate")
-            return pd.DataFrame()
 
-class AllTrendStrategies:
-    def __init__(self, max_workers=4):
-        # List all strategy classes (assumed imported/defined elsewhere)
-        trend_strategies = [
-            AdaptivePriceZoneStrategies,
-            AllMovingAverageStrategies,
-            ArcherMovingAveragesTrendsStrategies,
-            ArnaudLegouxMovingAverageStrategies,
-            AroonStrategies,
-            AroonOscillatorStrategies,
-            AverageDirectionalIndexStrategies,
-            AveragePriceStrategies,
-            BiasStrategies,
-            CorrelationTrendIndicatorStrategies,
-            CrossSignalsStrategies,
-            DecayStrategies,
-            DecreasingPriceStrategies,
-            DirectionalMovementStrategies,
-            DonchianChannelStrategies,
-            DoubleExponentialMovingAverageStrategies,
-            EhlersSuperSmootherFilterStrategies,
-            ElderRayIndexStrategies,
-            ExponentialMovingAverageStrategies,
-            FibonacciPivotPointsStrategies,
-            FibonacciWeightedMovingAverageStrategies,
-            FractalAdaptiveMovingAverageStrategies,
-            GannHighLowActivatorStrategies,
-            HighLowAverageStrategies,
-            HilbertTransformDominantCyclePeriodStrategies,
-            HilbertTransformDominantCyclePhaseStrategies,
-            HilbertTransformInstantaneousTrendlineStrategies,
-            HilbertTransformPhasorComponentsStrategies,
-            HilbertTransformSineWaveStrategies,
-            HilbertTransformTrendCycleStrategies,
-            HoltWinterChannelStrategies,
-            HoltWinterMovingAverageStrategies,
-            HullExponentialMovingAverageStrategies,
-            HullMovingAverageStrategies,
-            IchimokuCloudStrategies,
-            IncreasingPriceStrategies,
-            JurikMovingAverageStrategies,
-            KaufmanAdaptiveMovingAverageStrategies,
-            KaufmanEfficiencyIndicatorStrategies,
-            LinearRegressionStrategies,
-            LinearRegressionAngleStrategies,
-            LinearRegressionInterceptStrategies,
-            LinearRegressionSlopeStrategies,
-            LongRunStrategies,
-            McGinleyDynamicStrategies,
-            MedianPriceStrategies,
-            MidPointOverPeriodStrategies,
-            MidpointPricePeriodStrategies,
-            MinusDirectionalIndicatorStrategies,
-            MinusDirectionalMovementStrategies,
-            OHLC_AverageStrategies,
-            ParabolicStopAndReverseStrategies,
-            PascalsWeightedMovingAverageStrategies,
-            PivotPointsStrategies,
-            PlusDirectionalIndicatorStrategies,
-            PlusDirectionalMovementStrategies,
-            QStickStrategies,
-            ShortRunStrategies,
-            SineWeightedMovingAverageStrategies,
-            SlopeStrategies,
-            SmoothedExponentialMovingAverageStrategies,
-            SmoothedSimpleMovingAverageStrategies,
-            StopAndReverseStrategies,
-            SummationStrategies,
-            SupertrendStrategies,
-            SymmetricWeightedMovingAverageStrategies,
-            T3MovingAverageStrategies,
-            TrendSignalsStrategies,
-            TriangularMovingAverageStrategies,
-            TTMTrendStrategies,
-            TypicalPriceStrategies,
-            VariableIndexDynamicAverageStrategies,
-            VerticalHorizontalFilterStrategies,
-            VortexIndicatorStrategies,
-            WeightedClosingPriceStrategies,
-            WeightedMovingAverageStrategies,
-            WildersMovingAverageStrategies,
-            ZeroLagExponentialMovingAverageStrategies,
-            ZeroLagSimpleMovingAverageStrategies,
-        ]
-        # Instantiate each strategy and store the instance in a dictionary
-        self.strategy_instances = {}
-        for cls in trend_strategies:
-            self.strategy_instances[cls.__name__] = cls()
+class StrategyGroupRunner:
+    """
+    Runs a group of TV library strategies in parallel and concatenates their outputs.
+    Subclasses only declare `strategy_names` (and a `label` used in log messages);
+    classes are resolved and instantiated the first time the group is used.
+    A tv_selection.StrategySelector restricts the run to some classes, sub-strategy kinds
+    and output columns; unselected classes are never instantiated.
+    Every run records per-strategy timings into a tv_profile.StrategyProfile (in memory, or
+    persisted when `profile` is a file path), and later runs start the most expensive
+    strategies first.
+    """
+    strategy_names = []
+    label = ""
+
+    def __init__(self, max_workers=4, executor="thread", selector=None, profile=None):
+        self._strategy_instances = None
+        self.selector = selector
+        self.profile = tv_profile.resolve_profile(profile)
+        self.last_timings = {}
         
         # Set max_workers for parallel processing
         self.max_workers = max_workers
 
-    def run_all_strategies(self, df, append=True, ta_indicator_value=False, 
-                           signal_score=True, signal_value=False, signal_explanation=False):
-        """
-        Runs the `run_all_strategies` method for each strategy instance using the provided DataFrame in parallel.
-        The results are stored as attributes (e.g., AberrationStrategies_df) and then concatenated
-        horizontally into one DataFrame.
-        """
-        results = {}
-        
-        logger.info(f"Running {len(self.strategy_instances)} trend strategies in parallel with {self.max_workers} workers")
-        
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategy tasks
-            future_to_strategy = {
-                executor.submit(
-                    _run_single_strategy, 
-                    (name, instance), 
-                    df, append, ta_indicator_value, signal_score, signal_value, signal_explanation
-                ): name for name, instance in self.strategy_instances.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_strategy):
-                try:
-                    name, result_df = future.result()
-                    results[name] = result_df
-                    setattr(self, f"{name}_df", result_df)
-                    logger.debug(f"Completed trend strategy: {name}")
-                except Exception as e:
-                    strategy_name = future_to_strategy[future]
-                    logger.error(f"Trend strategy {strategy_name} generated an exception: {e}")
-                    results[strategy_name] = pd.DataFrame()
-                    setattr(self, f"{strategy_name}_df", pd.DataFrame())
-        
-        logger.info(f"Completed all {len(results)} trend strategies")
-        
-        # Filter out empty DataFrames before concatenation
-        valid_results = [df for df in results.values() if not df.empty]
-        
-        if valid_results:
-            return pd.concat(valid_results, axis=1)
-        else:
-            logger.warning("No valid trend strategy results to concatenate")
-            return pd.DataFrame()
+        # "thread" shares the process (GIL-bound); "process" runs strategy chunks in worker
+        # processes that read the OHLCV frame from shared memory
+        if executor not in ("thread", "process"):
+            raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+        self.executor = executor
 
-class AllMomentumStrategies:
-    def __init__(self, max_workers=4):
-        # List all strategy classes (assumed imported/defined elsewhere)
-        momentum_strategies = [
-            AbsolutePriceOscillatorStrategies,
-            AwesomeOscillatorStrategies,
-            BalanceOfPowerStrategies,
-            BRARStrategies,
-            BuyAndSellPressureStrategies,
-            CenterOfGravityStrategies,
-            ChandeForecastOscillatorStrategies,
-            ChandeMomentumOscillatorStrategies,
-            CommodityChannelIndexStrategies,
-            CoppockCurveStrategies,
-            CumulativeForceIndexStrategies,
-            DetrendedPriceOscillatorStrategies,
-            InertiaStrategies,
-            InverseFisherTransformRSIStrategies,
-            KDJIndicatorStrategies,
-            KnowSureThingStrategies,
-            MarkWhistlersWAVEPMStrategies,
-            MarketMomentumStrategies,
-            MomentumStrategies,
-            MomentumBreakoutBandsStrategies,
-            MACDStrategies,
-            PercentagePriceOscillatorStrategies,
-            PrettyGoodOscillatorStrategies,
-            PsychologicalLineStrategies,
-            QuantitativeQualitativeEstimationStrategies,
-            RateOfChangeStrategies,
-            RelativeStrengthIndexStrategies,
-            RelativeStrengthXtraStrategies,
-            RelativeVigorIndexStrategies,
-            SchaffTrendCycleStrategies,
-            SmiErgodicOscillatorStrategies,
-            StochasticStrategies,
-            StochasticFastStrategies,
-            StochasticOscillatorStrategies,
-            StochasticOscillatorKStrategies,
-            StochasticRSIStrategies,
-            StochasticOscillatorDStrategies,
-            TDSequentialStrategies,
-            TripleExponentialMovingAverageOscillatorStrategies,
-            TrixStrategies,
-            TwiggsMoneyIndexStrategies,
-            UltimateOscillatorStrategies,
-            UpDownStrategies,
-            WaveTrendOscillatorStrategies,
-            WilliamsRStrategies,
-        ]
-        # Instantiate each strategy and store the instance in a dictionary
-        self.strategy_instances = {}
-        for cls in momentum_strategies:
-            self.strategy_instances[cls.__name__] = cls()
-        
-        # Set max_workers for parallel processing
-        self.max_workers = max_workers
+    @property
+    def strategy_instances(self):
+        """Strategy instances keyed by class name (created on first access)"""
+        if self._strategy_instances is None:
+            self._strategy_instances = {name: resolve_strategy_class(name)() for name in self.selected_names}
+        return self._strategy_instances
+
+    @property
+    def selected_names(self):
+        """Class names this runner runs (all of `strategy_names` unless a selector narrows them)"""
+        if self.selector is None:
+            return list(self.strategy_names)
+        return self.selector.select_names(self.strategy_names)
+
+    @strategy_instances.setter
+    def strategy_instances(self, instances):
+        self._strategy_instances = instances
+
+    def _record_profile(self, df, timings, results, block):
+        """Fold this run's per-strategy timings and output sizes into the profile (saved if it has a path)"""
+        output_bytes = block.owner_nbytes() if block is not None else {}
+        for name, (wall_seconds, cpu_seconds) in timings.items():
+            result_df = results.get(name)
+            nbytes = output_bytes.get(name, 0)
+            if result_df is not None and not result_df.empty:
+                nbytes += int(result_df.memory_usage(index=False, deep=True).sum())
+            self.profile.record(name, len(df), wall_seconds, cpu_seconds, nbytes)
+        self.last_timings = timings
+        if self.profile.path is not None and timings:
+            try:
+                self.profile.save()
+            except OSError as e:
+                logger.warning(f"Could not save strategy profile to {self.profile.path}: {e}")
 
     def run_all_strategies(self, df, append=True, ta_indicator_value=False, 
-                           signal_score=True, signal_value=False, signal_explanation=False):
+                           signal_score=True, signal_value=False, signal_explanation=False, output="concat"):
         """
         Runs the `run_all_strategies` method for each strategy instance using the provided DataFrame in parallel.
         The results are stored as attributes (e.g., AberrationStrategies_df) and then concatenated
-        horizontally into one DataFrame.
+        horizontally into one DataFrame, in `strategy_names` order whatever order the workers finish in.
+
+        Workers only see a read-only view of df and never modify it, so callers don't need to pass
+        a copy. With append=True the combined columns are written into df once, after all workers
+        have finished.
+
+        output="frame" writes every strategy's columns into one preallocated tv_output.OutputBlock
+        (int8 scores, float32 indicator values) and builds the combined DataFrame once;
+        output="block" returns the OutputBlock itself for callers that want the raw arrays.
+        Neither keeps per-strategy *_df attributes.
         """
+        if output not in ("concat", "frame", "block"):
+            raise ValueError(f"output must be 'concat', 'frame' or 'block', got {output!r}")
         results = {}
+        kind = f"{self.label}strategy"
+        selector = self.selector
+        instances = self.strategy_instances
+        sub_strategies = None
+        if selector is not None and selector.filters_sub_strategies:
+            plans = {name: selector.plan(instance) for name, instance in instances.items()}
+            instances = {name: instance for name, instance in instances.items() if plans[name]}
+            sub_strategies = sum(len(plan) for plan in plans.values())
+        block = None
+        if output != "concat":
+            block = tv_output.OutputBlock.for_strategies(
+                len(df), list(instances.values()), ta_indicator_value=ta_indicator_value,
+                signal_score=signal_score, signal_value=signal_value, signal_explanation=signal_explanation,
+                sub_strategies=sub_strategies, keep=selector.keeps_column if selector is not None else None,
+                owners=list(instances))
         
-        logger.info(f"Running {len(self.strategy_instances)} momentum strategies in parallel with {self.max_workers} workers")
+        logger.info(f"Running {len(instances)} {self.label}strategies in parallel with {self.max_workers} {self.executor} workers")
         
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategy tasks
-            future_to_strategy = {
-                executor.submit(
-                    _run_single_strategy, 
-                    (name, instance), 
-                    df, append, ta_indicator_value, signal_score, signal_value, signal_explanation
-                ): name for name, instance in self.strategy_instances.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_strategy):
-                try:
-                    name, result_df = future.result()
-                    results[name] = result_df
+        # Longest expected strategies start first; the merge below still follows `instances` order
+        timings = {}
+        schedule = self.profile.schedule(list(instances), len(df))
+
+        if self.executor == "process":
+            from tv_process_pool import run_in_processes
+            options = dict(append=False, ta_indicator_value=ta_indicator_value, signal_score=signal_score,
+                           signal_value=signal_value, signal_explanation=signal_explanation, selector=selector)
+            costs = {name: self.profile.expected_seconds(name, len(df)) for name in schedule}
+            scheduled = {name: instances[name] for name in schedule}
+            for name, result_df in run_in_processes(scheduled, df, self.max_workers, options,
+                                                    costs=costs, timings=timings):
+                results[name] = result_df
+                if block is not None:
+                    block.add_frame(result_df, owner=name)
+                else:
                     setattr(self, f"{name}_df", result_df)
-                    logger.debug(f"Completed momentum strategy: {name}")
-                except Exception as e:
-                    strategy_name = future_to_strategy[future]
-                    logger.error(f"Momentum strategy {strategy_name} generated an exception: {e}")
-                    results[strategy_name] = pd.DataFrame()
-                    setattr(self, f"{strategy_name}_df", pd.DataFrame())
+                logger.debug(f"Completed {kind}: {name}")
+        else:
+            # Use ThreadPoolExecutor for parallel execution; shared primitives (ATR, rolling
+            # max/min, SMA, ...) are computed once for all strategies
+            view = _read_only_view(df)
+            with tv_primitives.sharing(view), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Submit all strategy tasks
+                future_to_strategy = {
+                    executor.submit(
+                        _run_timed_strategy, 
+                        (name, instances[name]), 
+                        view, False, ta_indicator_value, signal_score, signal_value, signal_explanation, block, selector
+                    ): name for name in schedule
+                }
+            
+                # Collect results as they complete
+                for future in as_completed(future_to_strategy):
+                    try:
+                        name, result_df, wall_seconds, cpu_seconds = future.result()
+                        timings[name] = (wall_seconds, cpu_seconds)
+                        results[name] = result_df
+                        if block is None:
+                            setattr(self, f"{name}_df", result_df)
+                        logger.debug(f"Completed {kind}: {name}")
+                    except Exception as e:
+                        strategy_name = future_to_strategy[future]
+                        logger.error(f"{kind.capitalize()} {strategy_name} generated an exception: {e}")
+                        results[strategy_name] = pd.DataFrame()
+                        if block is None:
+                            setattr(self, f"{strategy_name}_df", pd.DataFrame())
         
-        logger.info(f"Completed all {len(results)} momentum strategies")
+        logger.info(f"Completed all {len(results)} {self.label}strategies")
+        self._record_profile(df, timings, results, block)
+
+        if block is not None:
+            if append:
+                block.write_into(df)
+            return block if output == "block" else block.to_frame(df.index)
         
         # Filter out empty DataFrames before concatenation
-        valid_results = [df for df in results.values() if not df.empty]
+        valid_results = [results[name] for name in instances if name in results and not results[name].empty]
         
         if valid_results:
-            return pd.concat(valid_results, axis=1)
+            combined = pd.concat(valid_results, axis=1)
+            if append:
+                tv_output.write_columns(df, combined)
+            return combined
         else:
-            logger.warning("No valid momentum strategy results to concatenate")
+            logger.warning(f"No valid {kind} results to concatenate")
             return pd.DataFrame()
 
-class AllVolatilityStrategies:
-    def __init__(self, max_workers=4):
-        # List all strategy classes (assumed imported/defined elsewhere)
-        volatility_strategies = [
-            AccelerationBandsStrategies,
-            AverageTrueRangeStrategies,
-            ChandeKrollStopStrategies,
-            ChandelierExitStrategies,
-            BollingerBandsStrategies,
-            BollingerBandsWidthStrategies,
-            ChoppinessIndexStrategies,
-            KeltnerChannelStrategies,
-            MassIndexStrategies,
-            MovingStandardDeviationStrategies,
-            NormalizedAverageTrueRangeStrategies,
-            NormalizedBASPStrategies,
-            PercentBStrategies,
-            RelativeVolatilityIndexStrategies,
-            SqueezeStrategies,
-            SqueezeProStrategies,
-            StandardDeviationStrategies,
-            UlcerIndexStrategies,
-            VarianceStrategies,
-            PriceDistanceStrategies,
-        ]
-        # Instantiate each strategy and store the instance in a dictionary
-        self.strategy_instances = {}
-        for cls in volatility_strategies:
-            self.strategy_instances[cls.__name__] = cls()
-        
-        # Set max_workers for parallel processing
-        self.max_workers = max_workers
-
-    def run_all_strategies(self, df, append=True, ta_indicator_value=False, 
-                           signal_score=True, signal_value=False, signal_explanation=False):
+    def export_scores(self, df, path):
         """
-        Runs the `run_all_strategies` method for each strategy instance using the provided DataFrame in parallel.
-        The results are stored as attributes (e.g., AberrationStrategies_df) and then concatenated
-        horizontally into one DataFrame.
+        Runs the strategies on df and exports the signal scores as a memory-mapped tv_score_store.ScoreStore.
+        A new store gets every bar of df. If `path` already holds a store with the same columns,
+        only bars after its last timestamp are appended, so df can include the lookback history.
+        Bars are timestamped by df's Date column when it has one (inputs.download_and_prepare_data
+        resets the index), otherwise by its DatetimeIndex. Returns the store, opened read-only.
         """
-        results = {}
-        
-        logger.info(f"Running {len(self.strategy_instances)} volatility strategies in parallel with {self.max_workers} workers")
-        
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategy tasks
-            future_to_strategy = {
-                executor.submit(
-                    _run_single_strategy, 
-                    (name, instance), 
-                    df, append, ta_indicator_value, signal_score, signal_value, signal_explanation
-                ): name for name, instance in self.strategy_instances.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_strategy):
-                try:
-                    name, result_df = future.result()
-                    results[name] = result_df
-                    setattr(self, f"{name}_df", result_df)
-                    logger.debug(f"Completed volatility strategy: {name}")
-                except Exception as e:
-                    strategy_name = future_to_strategy[future]
-                    logger.error(f"Volatility strategy {strategy_name} generated an exception: {e}")
-                    results[strategy_name] = pd.DataFrame()
-                    setattr(self, f"{strategy_name}_df", pd.DataFrame())
-        
-        logger.info(f"Completed all {len(results)} volatility strategies")
-        
-        # Filter out empty DataFrames before concatenation
-        valid_results = [df for df in results.values() if not df.empty]
-        
-        if valid_results:
-            return pd.concat(valid_results, axis=1)
-        else:
-            logger.warning("No valid volatility strategy results to concatenate")
-            return pd.DataFrame()
+        import os
+        from tv_score_store import COLUMNS_FILE, ScoreStore, column_metadata, create_store
 
-class AllVolumeStrategies:
-    def __init__(self, max_workers=4):
-        # List all strategy classes (assumed imported/defined elsewhere)
-        volume_strategies = [
-            AccumulationDistributionLineStrategies,
-            AccumulationDistributionIndexStrategies,
-            AccumulationDistributionOscillatorStrategies,
-            ArcherOnBalanceVolumeStrategies,
-            ChaikinADLineStrategies,
-            ChaikinADOscillatorStrategies,
-            ChaikinMoneyFlowStrategies,
-            ChaikinOscillatorStrategies,
-            ElasticVolumeMovingAverageStrategies,
-            ElasticVolumeMACDStrategies,
-            FiniteVolumeElementStrategies,
-            KlingerVolumeOscillatorStrategies,
-            MoneyFlowIndexStrategies,
-            NegativeVolumeIndexStrategies,
-            OnBalanceVolumeStrategies,
-            PercentageVolumeOscillatorStrategies,
-            PositiveVolumeIndexStrategies,
-            PriceVolumeRankStrategies,
-            PriceVolumeTrendStrategies,
-            PriceVolumeStrategies,
-            VolumeAdjustedMovingAverageStrategies,
-            VolumeFlowIndicatorStrategies,
-            VolumePriceTrendStrategies,
-            VolumeWeightedAveragePriceStrategies,
-            VolumeWeightedMovingAverageStrategies,
-            VolumeWeightedMACDStrategies,
-            WeightedOnBalanceVolumeStrategies,
-        ]
-        # Instantiate each strategy and store the instance in a dictionary
-        self.strategy_instances = {}
-        for cls in volume_strategies:
-            self.strategy_instances[cls.__name__] = cls()
-        
-        # Set max_workers for parallel processing
-        self.max_workers = max_workers
+        block = self.run_all_strategies(df, append=False, signal_score=True, output="block")
+        arrays = block.arrays()
+        names, matrix = arrays['score']
+        index = df['Date'] if 'Date' in df.columns else df.index
+        if os.path.exists(os.path.join(path, COLUMNS_FILE)):
+            store = ScoreStore(path, mode='r+')
+            if store.names != names:
+                raise ValueError(f"Score store at {path} has different columns than this run")
+            added = store.append(matrix.T, index)
+            logger.info(f"Appended {added} bars to the score store at {path}")
+            return ScoreStore(path)
+        columns = column_metadata(names, arrays['owners']['score'], self.strategy_instances)
+        store = create_store(path, matrix.T, index, columns)
+        logger.info(f"Exported {store.shape[1]} score columns x {store.shape[0]} bars to {path}")
+        return store
 
-    def run_all_strategies(self, df, append=True, ta_indicator_value=False, 
-                           signal_score=True, signal_value=False, signal_explanation=False):
+    def run_panel(self, panel, ta_indicator_value=False, signal_score=True, signal_value=False, signal_explanation=False):
         """
-        Runs the `run_all_strategies` method for each strategy instance using the provided DataFrame in parallel.
-        The results are stored as attributes (e.g., AberrationStrategies_df) and then concatenated
-        horizontally into one DataFrame.
+        Runs every strategy over a multi-ticker universe: {column: time x ticker DataFrame}.
+        `panel` is a tv_panel.Panel or the wide `{ticker}_Close` frame of inputs.download_multi_ticker_data.
+        Classes that support it compute all tickers in one vectorized pass, the rest ticker by ticker
+        (see tv_panel). A selector narrows the classes and columns; sub-strategy kinds are not filtered.
         """
-        results = {}
-        
-        logger.info(f"Running {len(self.strategy_instances)} volume strategies in parallel with {self.max_workers} workers")
-        
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all strategy tasks
-            future_to_strategy = {
-                executor.submit(
-                    _run_single_strategy, 
-                    (name, instance), 
-                    df, append, ta_indicator_value, signal_score, signal_value, signal_explanation
-                ): name for name, instance in self.strategy_instances.items()
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_strategy):
-                try:
-                    name, result_df = future.result()
-                    results[name] = result_df
-                    setattr(self, f"{name}_df", result_df)
-                    logger.debug(f"Completed volume strategy: {name}")
-                except Exception as e:
-                    strategy_name = future_to_strategy[future]
-                    logger.error(f"Volume strategy {strategy_name} generated an exception: {e}")
-                    results[strategy_name] = pd.DataFrame()
-                    setattr(self, f"{strategy_name}_df", pd.DataFrame())
-        
-        logger.info(f"Completed all {len(results)} volume strategies")
-        
-        # Filter out empty DataFrames before concatenation
-        valid_results = [df for df in results.values() if not df.empty]
-        
-        if valid_results:
-            return pd.concat(valid_results, axis=1)
-        else:
-            logger.warning("No valid volume strategy results to concatenate")
-            return pd.DataFrame()
\ No newline at end of file
+        import tv_panel
+
+        if not isinstance(panel, tv_panel.Panel):
+            panel = tv_panel.Panel.from_wide(panel)
+        keep = self.selector.keeps_column if self.selector is not None else None
+        kind = f"{self.label}strategy"
+        outputs = {}
+        logger.info(f"Running {len(self.strategy_instances)} {self.label}strategies over {len(panel.tickers)} tickers")
+        for name, instance in self.strategy_instances.items():
+            try:
+                columns = tv_panel.run_panel(instance, panel, ta_indicator_value=ta_indicator_value, signal_score=signal_score,
+                                             signal_value=signal_value, signal_explanation=signal_explanation)
+            except Exception as e:
+                logger.error(f"Error running {kind} {name} on the panel: {e}")
+                continue
+            outputs.update((column, frame) for column, frame in columns.items() if keep is None or keep(column))
+        return outputs
+
+
+class AllStrategies(StrategyGroupRunner):
+    strategy_names = ALL_STRATEGY_NAMES
+    label = ""
+
+class AllTrendStrategies(StrategyGroupRunner):
+    strategy_names = TREND_STRATEGY_NAMES
+    label = "trend "
+
+class AllMomentumStrategies(StrategyGroupRunner):
+    strategy_names = MOMENTUM_STRATEGY_NAMES
+    label = "momentum "
+
+class AllVolatilityStrategies(StrategyGroupRunner):
+    strategy_names = VOLATILITY_STRATEGY_NAMES
+    label = "volatility "
+
+class AllVolumeStrategies(StrategyGroupRunner):
+    strategy_names = VOLUME_STRATEGY_NAMES
+    label = "volume "
@@ -0,0 +1,95 @@
+"""
+Parity test for the array-backed backtest kernel
+Runs every strategy type through the legacy per-bar loop and the kernel and compares outputs
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_signal_data(rows=400, seed=7):
+    """Random-walk prices with SMA crossover signals (no network needed)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    data = pd.DataFrame({'Close': close})
+    fast = data['Close'].rolling(5).mean()
+    slow = data['Close'].rolling(20).mean()
+    data['Entry_Signal'] = (fast.shift(1) < slow.shift(1)) & (fast > slow)
+    data['Exit_Signal'] = (fast.shift(1) > slow.shift(1)) & (fast < slow)
+    return data
+
+
+SL_TP_CONFIGS = [
+    {'enabled': False, 'sl_type': None, 'tp_type': None, 'sl_value': 0, 'tp_value': 0},
+    {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.03, 'tp_value': 0.06},
+    {'enabled': True, 'sl_type': 'dollar', 'tp_type': 'dollar', 'sl_value': 50, 'tp_value': 120},
+]
+
+
+def test_kernel_matches_legacy_loop():
+    """Kernel must produce identical tracking columns, trades and final results"""
+    from strategy import execute_long_strategy, execute_short_strategy, execute_reversal_strategy
+    from backtest_kernel import TRACKING_COLUMNS
+
+    print("\n🧪 TESTING BACKTEST KERNEL PARITY")
+    per_trade_config = {'amount_per_trade': 2000, 'percentage': 20}
+    runners = {
+        'long': execute_long_strategy,
+        'short': execute_short_strategy,
+        'reversal': execute_reversal_strategy,
+    }
+
+    for strategy_type, runner in runners.items():
+        for sl_tp_config in SL_TP_CONFIGS:
+            data = make_signal_data()
+            legacy_data, legacy_trades = runner(data.copy(), None, sl_tp_config, 10000, per_trade_config, engine="loop")
+            kernel_data, kernel_trades = runner(data.copy(), None, sl_tp_config, 10000, per_trade_config, engine="kernel")
+
+            pd.testing.assert_frame_equal(legacy_data[TRACKING_COLUMNS], kernel_data[TRACKING_COLUMNS])
+            assert legacy_trades == kernel_trades
+            assert len(kernel_trades) > 0
+            print(f"✅ {strategy_type} / SL-TP {sl_tp_config['sl_type']}: {len(kernel_trades)} trades identical")
+
+
+def test_event_kernel_matches_kernel():
+    """Event-skipping kernel: same tracking and trades (bars included) while visiting only event bars"""
+    from strategy import execute_long_strategy, execute_short_strategy, execute_reversal_strategy
+    from backtest_kernel import TRACKING_COLUMNS, execute_with_kernel
+    from trade_executor import TradeExecutor
+
+    per_trade_config = {'amount_per_trade': 2000, 'percentage': 20}
+    trailing = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.08, 'tp_value': 0.5,
+                'trailing_sl_enabled': True, 'trailing_sl_type': 'percentage', 'trailing_sl_value': 0.03}
+    # A 0.1%/bar drift with few exits lets shorts run into the 100% loss liquidation
+    rally = make_signal_data(rows=1500, seed=3)
+    rally['Close'] *= np.exp(0.0015 * np.arange(len(rally)))
+    rally['Exit_Signal'] &= np.arange(len(rally)) % 5 == 0
+    cases = [(make_signal_data(), config) for config in SL_TP_CONFIGS + [trailing]]
+    cases.append((rally, {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 5.0, 'tp_value': 0.99}))
+
+    events = set()
+    for runner in (execute_long_strategy, execute_short_strategy, execute_reversal_strategy):
+        for data, sl_tp_config in cases:
+            kernel_data, kernel_trades = runner(data.copy(), None, sl_tp_config, 10000, per_trade_config, engine="kernel")
+            event_data, event_trades = runner(data.copy(), None, sl_tp_config, 10000, per_trade_config, engine="events")
+            pd.testing.assert_frame_equal(kernel_data[TRACKING_COLUMNS], event_data[TRACKING_COLUMNS])
+            assert kernel_trades == event_trades
+            assert np.array_equal(kernel_trades.array['bar'], event_trades.array['bar'])
+            events.update(event_trades.column('event'))
+    assert 'LIQUIDATION_SHORT' in events
+
+    # Only event bars reach the executor
+    data = make_signal_data(rows=2000)
+    executor = TradeExecutor(10000, SL_TP_CONFIGS[1], per_trade_config)
+    visited = []
+    process_tick = executor.process_market_tick
+    executor.process_market_tick = lambda *args: visited.append(args[-1]) or process_tick(*args)
+    execute_with_kernel(executor, data, "long", event_driven=True)
+    signals = int(data['Entry_Signal'].sum() + data['Exit_Signal'].sum())
+    assert len(visited) <= signals + len(executor.trades) < len(data) / 4
+    print(f"✅ Event kernel matches the kernel, visiting {len(visited)} of {len(data)} bars")
+
+
+if __name__ == "__main__":
+    test_kernel_matches_legacy_loop()
+    test_event_kernel_matches_kernel()
@@ -0,0 +1,83 @@
+"""
+Tests for the batched many-strategy backtest
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from test_backtest_kernel import SL_TP_CONFIGS
+
+PER_TRADE = {'amount_per_trade': 2000, 'percentage': 20}
+TRAILING = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.08, 'tp_value': 0.5,
+            'trailing_sl_enabled': True, 'trailing_sl_type': 'dollar', 'trailing_sl_value': 40}
+
+
+def make_score_data(rows=800, strategies=12, seed=11, drift=0.0):
+    """Random-walk Close with sparse random -1/0/1 `_Score` columns"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(drift, 0.02, rows)))
+    scores = rng.choice([-1, 0, 0, 0, 0, 0, 0, 0, 1], size=(rows, strategies)).astype(np.int8)
+    data = pd.DataFrame(scores, columns=[f'S{k}_Score' for k in range(strategies)],
+                        index=pd.date_range('2020-01-01', periods=rows, freq='D'))
+    data.insert(0, 'Close', close)
+    return data
+
+
+def run_executor(close, entries, exits, strategy_type, config):
+    from backtest_kernel import run_backtest_kernel
+    from trade_executor import TradeExecutor
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        executor = TradeExecutor(10000, config, PER_TRADE)
+        tracking = run_backtest_kernel(executor, close, entries, exits, strategy_type)
+    return tracking[:, 0], len(executor.trades)
+
+
+def assert_matches_executor(data, config, strategy_type):
+    from batch_backtest import run_score_backtests, score_signals
+
+    result = run_score_backtests(data, strategy_type, 10000, PER_TRADE, config)
+    names = [name for name in data.columns if name.endswith('_Score')]
+    entries, exits = score_signals(data[names].to_numpy())
+    for k in range(len(names)):
+        equity, trades = run_executor(data['Close'].to_numpy(), entries[:, k], exits[:, k], strategy_type, config)
+        assert np.array_equal(result.equity[:, k], equity)
+        assert result.trade_counts[k] == trades
+    return result
+
+
+def test_batch_matches_executor_runs():
+    """Each column's equity curve and trade count equal its own TradeExecutor run"""
+    print("\n🧪 TESTING BATCHED BACKTESTS")
+    data = make_score_data()
+    for config in SL_TP_CONFIGS + [TRAILING]:
+        for strategy_type in ('long', 'short', 'reversal'):
+            assert_matches_executor(data, config, strategy_type)
+    print("✅ Batched equity and trade counts match per-strategy runs")
+
+
+def test_liquidation_and_result():
+    """Shorts in a rally are liquidated; the result is labelled by score column"""
+    data = make_score_data(rows=1500, strategies=6, seed=4, drift=0.0015)
+    # Rare exits: shorts stay open long enough to lose 100%
+    data[[name for name in data.columns if name.endswith('_Score')]] = \
+        data.filter(like='_Score').clip(lower=0).to_numpy() - (np.arange(1500) % 700 == 699)[:, None]
+    config = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 5.0, 'tp_value': 0.99}
+    result = assert_matches_executor(data, config, 'short')
+    assert (result.equity.min(axis=0) < 10000 - 1900).any()
+
+    summary = result.summary()
+    assert list(summary.index) == [f'S{k}_Score' for k in range(6)]
+    assert summary['trades'].tolist() == result.trade_counts.tolist()
+    assert np.allclose(summary['total_return_percent'], (result.equity[-1] / 100) - 100)
+    frame = result.equity_frame()
+    assert frame.index.equals(data.index) and frame.shape == (1500, 6)
+    print("✅ Liquidations and result summary working")
+
+
+if __name__ == "__main__":
+    test_batch_matches_executor_runs()
+    test_liquidation_and_result()
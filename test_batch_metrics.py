@@ -0,0 +1,102 @@
+"""
+Tests for column-wise metrics over equity-curve matrices
+"""
+
+import numpy as np
+import pandas as pd
+
+from test_online_metrics import assert_same_metrics
+
+
+def one_trade():
+    from trade_log import TradeLog
+
+    trades = TradeLog()
+    trades.append('SELL', 100.0, 10, profit_loss=25.0)
+    return trades
+
+
+def column_metrics(results, run):
+    """One run's metrics out of calculate_batch_metrics, as calculate_advanced_metrics' equity part"""
+    return {name: values[run] for name, values in results.items()}
+
+
+def equity_only(metrics):
+    return {name: value for name, value in metrics.items() if name not in ('win_rate', 'profit_factor', 'total_trades')}
+
+
+def test_batch_matches_single_series():
+    """Every column equals calculate_advanced_metrics on it: gaps, zeros, outliers and short columns included"""
+    from metrics import BATCH_METRICS, calculate_advanced_metrics, calculate_batch_metrics
+
+    print("\n🧪 TESTING BATCH METRICS")
+    rng = np.random.default_rng(1)
+    bars, runs = 600, 120
+    equity = 1000 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (bars, runs)), axis=0))
+    equity[rng.random((bars, runs)) < 0.01] = np.nan
+    equity[rng.random((bars, runs)) < 0.002] = np.inf
+    equity[rng.random((bars, runs)) < 0.002] = 0.0
+    equity[:40, 3] = np.nan          # late start
+    equity[300, 5] *= 30             # +2900% outlier return
+    equity[:, 7] = np.nan            # a single finite value: no metrics
+    equity[10, 7] = 5.0
+
+    results = calculate_batch_metrics(equity, chunk=32)
+    assert set(results) == set(BATCH_METRICS) and all(len(values) == runs for values in results.values())
+    trades = one_trade()
+    for run in range(runs):
+        single = calculate_advanced_metrics(None, pd.DataFrame({'Portfolio_Value': equity[:, run]}), trades)
+        if not single:
+            assert run == 7 and np.isnan(results['sharpe_ratio'][run]) and results['trading_days'][run] == 1
+            continue
+        assert_same_metrics(column_metrics(results, run), equity_only(single))
+
+    # Chunking doesn't change anything; a 1D curve is one run
+    unchunked = calculate_batch_metrics(equity, chunk=runs)
+    assert all(np.array_equal(results[name], unchunked[name], equal_nan=True) for name in BATCH_METRICS)
+    assert_same_metrics(column_metrics(calculate_batch_metrics(equity[:, 0]), 0), column_metrics(results, 0))
+    print(f"✅ {runs} columns match calculate_advanced_metrics")
+
+
+def test_flat_curve_and_batch_backtest_ranking():
+    """A never-trading strategy scores zeros; BatchBacktestResult.metrics ranks a batched run"""
+    from batch_backtest import run_score_backtests
+    from metrics import calculate_advanced_metrics, calculate_batch_metrics
+    from test_batch_backtest import PER_TRADE, make_score_data
+
+    flat = calculate_batch_metrics(np.full((300, 2), 10000.0))
+    assert flat['sharpe_ratio'].tolist() == [0, 0] and flat['max_drawdown'].tolist() == [0, 0]
+    assert flat['volatility'].tolist() == [0, 0] and flat['calmar_ratio'].tolist() == [0, 0]
+
+    data = make_score_data(rows=1000, strategies=25)
+    result = run_score_backtests(data, 'reversal', 10000, PER_TRADE)
+    frame = result.metrics()
+    assert list(frame.index) == list(result.names) and frame['total_trades'].tolist() == result.trade_counts.tolist()
+    trades = one_trade()
+    for k, name in enumerate(result.names):
+        single = calculate_advanced_metrics(None, pd.DataFrame({'Portfolio_Value': result.equity[:, k]}), trades)
+        assert_same_metrics(frame.loc[name, list(equity_only(single))].to_dict(), equity_only(single))
+    best = frame['sharpe_ratio'].idxmax()
+    print(f"✅ Batch backtest ranked by Sharpe: best {best} ({frame.loc[best, 'sharpe_ratio']:.2f})")
+
+
+def test_short_curves():
+    """Zero or one bar gives NaN metrics, for the function and for a one-bar batched run"""
+    from batch_backtest import run_score_backtests
+    from metrics import BATCH_METRICS, calculate_batch_metrics
+    from test_batch_backtest import PER_TRADE, make_score_data
+
+    for bars in (0, 1):
+        results = calculate_batch_metrics(np.full((bars, 2), 1000.0) * [1, 2])
+        assert set(results) == set(BATCH_METRICS) and results['trading_days'].tolist() == [bars, bars]
+        assert all(np.isnan(values).all() for name, values in results.items() if name != 'trading_days')
+
+    frame = run_score_backtests(make_score_data(rows=1, strategies=3), 'long', 10000, PER_TRADE).metrics()
+    assert len(frame) == 3 and frame['sharpe_ratio'].isna().all() and (frame['trading_days'] == 1).all()
+    print("✅ Short curves give NaN metrics")
+
+
+if __name__ == "__main__":
+    test_batch_matches_single_series()
+    test_flat_curve_and_batch_backtest_ranking()
+    test_short_curves()
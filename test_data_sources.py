@@ -0,0 +1,149 @@
+"""
+Tests for pluggable data sources and the on-disk OHLCV cache (fully offline)
+"""
+
+import os
+import tempfile
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(seed, ticker='SYN', period='2y', interval='1d'):
+    """Offline OHLCV frame for tests: SyntheticSource's reproducible path for (seed, ticker)"""
+    from data_sources import SyntheticSource
+
+    return SyntheticSource(seed=seed).fetch(ticker, period, interval)
+
+
+class CountingSource:
+    """Wraps a source and counts how often it is actually hit"""
+
+    name = "counting"
+
+    def __init__(self, source):
+        self.source = source
+        self.calls = 0
+
+    def fetch(self, ticker, period, interval):
+        self.calls += 1
+        return self.source.fetch(ticker, period, interval)
+
+
+def test_cached_source_range_aware_reads():
+    """Repeated and shorter requests are served from disk; longer or stale ones refetch"""
+    from data_sources import CachedDataSource, SyntheticSource
+
+    print("\n🧪 TESTING CACHED DATA SOURCE")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        upstream = CountingSource(SyntheticSource(seed=1))
+        source = CachedDataSource(upstream, cache_dir=cache_dir)
+
+        first = source.fetch('AAPL', '2y', '1d')
+        second = source.fetch('AAPL', '2y', '1d')
+        assert upstream.calls == 1
+        assert first.equals(second)
+        assert list(first.columns[:5]) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert first.index.name == 'Date'
+
+        # Shorter range is a slice of the cached history
+        shorter = source.fetch('AAPL', '6mo', '1d')
+        assert upstream.calls == 1
+        assert len(shorter) < len(first) and shorter.index[-1] == first.index[-1]
+
+        # Longer range and other intervals miss
+        source.fetch('AAPL', '5y', '1d')
+        source.fetch('AAPL', '1y', '1h')
+        assert upstream.calls == 3
+
+        # Stale entries are refreshed
+        stale = CachedDataSource(upstream, cache_dir=cache_dir, max_age=timedelta(0))
+        stale.fetch('AAPL', '1y', '1d')
+        assert upstream.calls == 4
+        print(f"✅ {source.hits} hits / {source.misses} misses as expected")
+
+
+def test_local_directory_source_and_download():
+    """CSV directory backend feeds download_and_prepare_data without network access"""
+    from data_sources import (LocalDirectorySource, SyntheticSource, get_data_source,
+                              set_data_source)
+    from inputs import download_and_prepare_data
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        history = SyntheticSource(seed=2).fetch('MSFT', '1y', '1d')
+        history.reset_index().to_csv(os.path.join(data_dir, 'MSFT_1d.csv'), index=False)
+
+        local = LocalDirectorySource(data_dir)
+        loaded = local.fetch('MSFT', '1y', '1d')
+        assert len(loaded) == len(history)
+        assert np.allclose(loaded['Close'].values, history['Close'].values)
+
+        previous = get_data_source()
+        set_data_source(local)
+        try:
+            data = download_and_prepare_data('MSFT', period='1y', interval='1d')
+        finally:
+            set_data_source(previous)
+        assert data is not None and 'Date' in data.columns and len(data) == len(history)
+    print("✅ Local directory source working")
+
+
+class FixedSource:
+    """Returns a prepared history, like a download that already applied the period"""
+
+    name = "fixed"
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = 0
+
+    def fetch(self, ticker, period, interval):
+        self.calls += 1
+        return self.history.copy()
+
+
+def test_periods_follow_trading_dates_and_calendar():
+    """Downloads come back whole; cache hits slice 'Nd' as trading dates and 'mo'/'y' as calendar offsets"""
+    from data_sources import CachedDataSource, slice_to_period
+
+    now = pd.Timestamp.now().normalize()
+    # yfinance '5d': the last 5 trading dates, spanning a weekend (7+ calendar days)
+    five_days = pd.bdate_range(end=now, periods=5, name='Date')
+    history = pd.DataFrame({'Close': np.arange(5.0)}, index=five_days)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        upstream = FixedSource(history)
+        source = CachedDataSource(upstream, cache_dir=cache_dir)
+        assert len(source.fetch('AAPL', '5d', '1d')) == 5
+        assert len(source.fetch('AAPL', '5d', '1d')) == 5 and upstream.calls == 1
+        assert source.fetch('AAPL', '3d', '1d').index.equals(five_days[-3:]) and upstream.calls == 1
+        source.fetch('AAPL', '10d', '1d')
+        assert upstream.calls == 2
+
+    # '6mo': every business day since the same date 6 calendar months ago
+    start = now - pd.DateOffset(months=6)
+    six_months = pd.bdate_range(start=start, end=now, name='Date')
+    history = pd.DataFrame({'Close': np.arange(len(six_months), dtype=float)}, index=six_months)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        upstream = FixedSource(history)
+        source = CachedDataSource(upstream, cache_dir=cache_dir)
+        assert source.fetch('AAPL', '6mo', '1d').equals(history)
+        assert source.fetch('AAPL', '6mo', '1d').equals(history) and upstream.calls == 1
+        three_months = source.fetch('AAPL', '3mo', '1d')
+        assert upstream.calls == 1 and three_months.index[0] == six_months[six_months >= now - pd.DateOffset(months=3)][0]
+        source.fetch('AAPL', '1y', '1d')
+        assert upstream.calls == 2
+
+    # Intraday bars: 'Nd' keeps every bar of the last N dates
+    hourly = pd.date_range('2024-03-04 09:30', periods=21, freq='h', tz='America/New_York')
+    hourly = hourly[(hourly.hour >= 9) & (hourly.hour <= 16)]
+    bars = pd.DataFrame({'Close': np.arange(len(hourly), dtype=float)}, index=hourly)
+    kept = slice_to_period(bars, '1d')
+    assert len(kept) > 1 and kept.index.normalize().nunique() == 1 and kept.index[-1] == hourly[-1]
+    print("✅ Periods follow trading dates and calendar months")
+
+
+if __name__ == "__main__":
+    test_cached_source_range_aware_reads()
+    test_local_directory_source_and_download()
+    test_periods_follow_trading_dates_and_calendar()
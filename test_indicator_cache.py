@@ -0,0 +1,101 @@
+"""
+Tests for the content-addressed indicator cache
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(rows=250, seed=3):
+    """Synthetic OHLCV frame (no network needed)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({
+        'Open': close * 0.999,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, rows).astype(float),
+    })
+
+
+def test_calculate_indicator_hits_cache():
+    """Repeated requests on identical data hit the cache and return equal, independent copies"""
+    from indicators import calculate_indicator
+    from indicator_cache import configure_default_cache
+
+    print("\n🧪 TESTING INDICATOR CACHE")
+    cache = configure_default_cache()
+    data = make_ohlcv()
+
+    first = calculate_indicator(data, 'SMA', (20,))
+    second = calculate_indicator(data.copy(), 'SMA', [20])  # Same content, different object/params container
+    pd.testing.assert_series_equal(first, calculate_indicator(data, 'SMA', (20,), use_cache=False))
+    pd.testing.assert_series_equal(first, second)
+    assert cache.hits == 1 and cache.misses == 1
+
+    # Mutating a returned result must not corrupt the cache
+    second.iloc[:] = 0
+    pd.testing.assert_series_equal(first, calculate_indicator(data, 'SMA', (20,)))
+
+    # Extra non-OHLCV columns don't change the key; different params or prices do
+    data['SMA_cond1_left'] = first
+    calculate_indicator(data, 'SMA', (20,))
+    assert cache.hits == 3
+    calculate_indicator(data, 'SMA', (50,))
+    calculate_indicator(make_ohlcv(seed=4), 'SMA', (20,))
+    assert cache.misses == 3
+    cache.print_stats()
+
+
+def test_names_keyed_as_passed():
+    """Indicator names are case-sensitive with or without a warm cache"""
+    from indicators import calculate_indicator
+    from indicator_cache import configure_default_cache
+
+    data = make_ohlcv()
+    for warm in (False, True):
+        cache = configure_default_cache()
+        if warm:
+            expected = calculate_indicator(data, 'RSI', [14])
+            pd.testing.assert_series_equal(calculate_indicator(data, 'RSI', [14]), expected)
+        try:
+            calculate_indicator(data, 'rsi', [14])
+        except ValueError as e:
+            assert "Unknown indicator: rsi" in str(e)
+        else:
+            raise AssertionError("'rsi' should not resolve to RSI")
+        assert cache.hits == int(warm)
+    print("✅ Indicator names keyed exactly as passed")
+
+
+def test_lru_eviction_and_disk_tier():
+    """Entries are evicted oldest-first and reloaded from the disk tier"""
+    from indicator_cache import IndicatorCache
+    from indicators import _compute_indicator
+
+    data = make_ohlcv()
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = IndicatorCache(max_entries=2, disk_dir=disk_dir)
+        for period in (5, 10, 20):
+            cache.get_or_compute(data, 'SMA', (period,), _compute_indicator)
+        assert cache.stats()['entries'] == 2 and cache.evictions == 1
+
+        # SMA(5) was evicted from memory but comes back from disk
+        value = cache.get_or_compute(data, 'SMA', (5,), _compute_indicator)
+        assert cache.disk_hits == 1
+        pd.testing.assert_series_equal(value, _compute_indicator(data, 'SMA', (5,)))
+
+        # A fresh cache over the same directory starts warm
+        warm = IndicatorCache(disk_dir=disk_dir)
+        warm.get_or_compute(data, 'SMA', (10,), _compute_indicator)
+        assert warm.hits == 1 and warm.misses == 0
+    print("✅ LRU eviction and disk tier working")
+
+
+if __name__ == "__main__":
+    test_calculate_indicator_hits_cache()
+    test_names_keyed_as_passed()
+    test_lru_eviction_and_disk_tier()
@@ -0,0 +1,130 @@
+"""
+Tests for intrabar (High/Low) stop-loss / take-profit fills
+"""
+
+import numpy as np
+import pandas as pd
+
+INTRABAR_CONFIG = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.03,
+                   'tp_value': 0.05, 'fill_mode': 'intrabar', 'same_bar_priority': 'stop_loss'}
+
+
+def make_ohlc_signal_data(rows=500, seed=11):
+    """Random-walk OHLC bars with SMA crossover signals"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, rows)))
+    open_ = np.concatenate([[100.0], close[:-1] * np.exp(rng.normal(0, 0.005, rows - 1))])
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    data = pd.DataFrame({'Open': open_, 'High': np.maximum(open_, close) + spread,
+                         'Low': np.minimum(open_, close) - spread, 'Close': close})
+    fast = data['Close'].rolling(5).mean()
+    slow = data['Close'].rolling(20).mean()
+    data['Entry_Signal'] = (fast.shift(1) < slow.shift(1)) & (fast > slow)
+    data['Exit_Signal'] = (fast.shift(1) > slow.shift(1)) & (fast < slow)
+    return data
+
+
+def long_risk_manager(config, open_, high, low):
+    from risk_manager import RiskManager
+
+    risk = RiskManager(dict(INTRABAR_CONFIG, **config))
+    risk.set_sl_tp_levels(100.0, 10, 1000.0, 'LONG')  # SL 97, TP 105
+    risk.attach_bars(open_, high, low)
+    return risk
+
+
+def test_touch_rules():
+    """Level fills, gap fills at the Open and the same-bar priority rule"""
+    print("\n🧪 TESTING INTRABAR SL/TP FILLS")
+    quiet = ([100.0, 100.0], [101.0, 101.0], [99.0, 99.0])
+    risk = long_risk_manager({}, [*quiet[0], 100.0], [*quiet[1], 101.0], [*quiet[2], 96.0])
+    assert risk.check_bar(0) is None and risk.check_bar(1) is None
+    assert risk.check_bar(2) == ('STOP_LOSS', risk.stop_loss_price, risk.stop_loss_price)
+
+    gap = long_risk_manager({}, [100.0, 95.0], [101.0, 96.0], [99.0, 94.0])
+    assert gap.find_next_touch(0)[:3] == (1, 'STOP_LOSS', 95.0)
+    gap_up = long_risk_manager({}, [100.0, 108.0], [101.0, 109.0], [99.0, 107.0])
+    assert gap_up.find_next_touch(0)[:3] == (1, 'TAKE_PROFIT', 108.0)
+
+    both = ([100.0], [106.0], [96.0])
+    assert long_risk_manager({}, *both).find_next_touch(0)[1] == 'STOP_LOSS'
+    assert long_risk_manager({'same_bar_priority': 'take_profit'}, *both).find_next_touch(0)[1] == 'TAKE_PROFIT'
+
+    # Touches far beyond the first search window are still found
+    far = np.full(1000, 100.0)
+    high, low = far + 1, far - 1
+    low[777] = 90.0
+    assert long_risk_manager({}, None, high, low).find_next_touch(0)[:3] == (777, 'STOP_LOSS', risk.stop_loss_price)
+    print("✅ Touch detection, gap fills and same-bar priority working")
+
+
+def test_engines_agree_and_exit_on_first_touch():
+    """Loop and kernel engines give the same trades, and every SL/TP exit is the first touching bar"""
+    from strategy import execute_long_strategy
+
+    data = make_ohlc_signal_data()
+    per_trade_config = {'amount_per_trade': 2000, 'percentage': 20}
+    loop_data, loop_trades = execute_long_strategy(data.copy(), None, INTRABAR_CONFIG, 10000, per_trade_config, engine="loop")
+    kernel_data, kernel_trades = execute_long_strategy(data.copy(), None, INTRABAR_CONFIG, 10000, per_trade_config, engine="kernel")
+    assert loop_trades == kernel_trades
+    pd.testing.assert_series_equal(loop_data['Portfolio_Value'], kernel_data['Portfolio_Value'])
+
+    shares = kernel_data['Shares'].to_numpy()
+    entries = np.flatnonzero((shares != 0) & (np.concatenate([[0], shares[:-1]]) == 0))
+    exits = np.flatnonzero((shares == 0) & (np.concatenate([[0], shares[:-1]]) != 0))
+    closing = [trade for trade in kernel_trades if trade['type'] != 'BUY']
+    risk_exits = 0
+    for entry_bar, exit_bar, trade in zip(entries, exits, closing):
+        if trade['type'] == 'SELL':
+            continue
+        risk_exits += 1
+        entry = trade['entry_price']
+        stop_loss, take_profit = entry * 0.97, entry * 1.05
+        window = data.iloc[entry_bar + 1:exit_bar + 1]
+        touched = (window['Low'] <= stop_loss) | (window['High'] >= take_profit)
+        assert touched.iloc[-1] and not touched.iloc[:-1].any()
+        expected = stop_loss if trade['type'] == 'STOP_LOSS_LONG' else take_profit
+        open_price = window['Open'].iloc[-1]
+        if trade['type'] == 'STOP_LOSS_LONG' and open_price <= stop_loss:
+            expected = open_price
+        if trade['type'] == 'TAKE_PROFIT_LONG' and open_price >= take_profit:
+            expected = open_price
+        assert trade['price'] == expected
+    assert risk_exits > 0
+    print(f"✅ {risk_exits} intrabar exits on their first touching bar")
+
+
+def test_missing_bars_warn():
+    """'intrabar' without High/Low (or without bar=) warns once and falls back to Close fills"""
+    import contextlib
+    import io
+    import warnings
+
+    from trade_executor import TradeExecutor
+
+    data = make_ohlc_signal_data(rows=300)
+    for columns, bar in ((['Close', 'Entry_Signal', 'Exit_Signal'], True), (list(data.columns), False)):
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            executor = TradeExecutor(10000, INTRABAR_CONFIG, {'amount_per_trade': 2000, 'percentage': 20})
+            executor.attach_bars(data[columns])
+            for i, (price, entry, exit_) in enumerate(zip(data['Close'], data['Entry_Signal'], data['Exit_Signal'])):
+                executor.process_market_tick(price, entry, exit_, 'long', bar=i if bar else None)
+        assert [str(w.message) for w in caught if w.category is RuntimeWarning and 'intrabar' in str(w.message)] == [
+            "fill_mode='intrabar' but " + ("no High/Low bars are attached" if bar else "no bar position was passed")
+            + "; SL/TP are checked against the Close (call attach_bars with High/Low and pass bar=)"]
+
+    # Wired up properly: no warning
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        executor = TradeExecutor(10000, INTRABAR_CONFIG, {'amount_per_trade': 2000, 'percentage': 20})
+        executor.attach_bars(data)
+        for i, (price, entry, exit_) in enumerate(zip(data['Close'], data['Entry_Signal'], data['Exit_Signal'])):
+            executor.process_market_tick(price, entry, exit_, 'long', bar=i)
+    print("✅ Intrabar runs without bars warn once")
+
+
+if __name__ == "__main__":
+    test_touch_rules()
+    test_engines_agree_and_exit_on_first_touch()
+    test_missing_bars_warn()
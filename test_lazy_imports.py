@@ -0,0 +1,40 @@
+"""
+Tests that the core backtest path doesn't import ta_strategies_TVLibrary until it's needed
+"""
+
+
+def test_core_path_does_not_load_tv_library():
+    """Importing strategy/indicators/multicondition must leave the TV library unloaded"""
+    from benchmark_import_time import measure_import
+
+    print("\n🧪 TESTING LAZY TV LIBRARY LOADING")
+    for module in ("strategy", "multicondition", "ta_strategies_combinations_TVLibrary"):
+        seconds, tv_loaded = measure_import(module)
+        assert not tv_loaded, f"{module} eagerly imported ta_strategies_TVLibrary"
+        print(f"✅ import {module}: {seconds * 1000:.0f} ms, TV library not loaded")
+
+
+def test_lazy_classes_resolve_on_use():
+    """Library-backed indicators and runners still work once used"""
+    import numpy as np
+    import pandas as pd
+    from indicators import calculate_indicator, RelativeStrengthIndexStrategies
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies, AroonStrategies
+    import ta_strategies_TVLibrary
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))
+    data = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                         'Close': close, 'Volume': np.full(200, 1000.0)})
+
+    rsi = calculate_indicator(data, 'RSI2', (14,), use_cache=False)
+    assert len(rsi) == len(data) and rsi.notna().any()
+    assert RelativeStrengthIndexStrategies.resolve() is ta_strategies_TVLibrary.RelativeStrengthIndexStrategies
+    assert AroonStrategies is ta_strategies_TVLibrary.AroonStrategies
+    assert len(AllVolatilityStrategies().strategy_instances) == 20
+    print("✅ Lazy classes resolve to the real library classes")
+
+
+if __name__ == "__main__":
+    test_core_path_does_not_load_tv_library()
+    test_lazy_classes_resolve_on_use()
@@ -0,0 +1,116 @@
+"""
+Tests for the struct-of-arrays multi-ticker engine
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from test_intrabar_fills import make_ohlc_signal_data
+
+BASE_CONFIG = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.03, 'tp_value': 0.05}
+TRAILING = {'sl_value': 0.08, 'tp_value': 0.5, 'trailing_sl_enabled': True, 'trailing_sl_type': 'dollar',
+            'trailing_sl_value': 50}
+
+
+def make_multi_ticker_data(tickers=5, rows=400, seed=1, drift=0.0):
+    """`{ticker}_Open/High/Low/Close/Entry_Signal/Exit_Signal` columns for random-walk tickers"""
+    frames = {}
+    for k in range(tickers):
+        frame = make_ohlc_signal_data(rows=rows, seed=seed * 100 + k)
+        frame[['Open', 'High', 'Low', 'Close']] *= np.exp(drift * np.arange(rows))[:, None]
+        frames[f'T{k}'] = frame
+    data = pd.concat(frames, axis=1)
+    data.columns = [f'{ticker}_{field}' for ticker, field in data.columns]
+    data.index = pd.date_range('2020-01-01', periods=rows, freq='D')
+    return data, list(frames)
+
+
+def run_both_engines(data, tickers, config, strategy_type):
+    from strategy import execute_multi_ticker_strategy
+
+    strategy_data = {'tickers': tickers, 'total_capital': 10000 * len(tickers),
+                     'allocations': {ticker: 1 / len(tickers) for ticker in tickers},
+                     'trade_sizes': {ticker: {'percentage': 50, 'amount_per_trade': 3000 + 500 * k}
+                                     for k, ticker in enumerate(tickers)},
+                     'sl_tp_config': config}
+    runs = []
+    for engine in ('loop', 'arrays'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs.append(execute_multi_ticker_strategy(data.copy(), strategy_data, strategy_type, engine=engine))
+    return runs
+
+
+def assert_same_run(loop, arrays, tickers):
+    (loop_data, loop_trades), (array_data, array_trades) = loop, arrays
+    assert loop_trades == array_trades and len(array_trades) > 0
+    for field in ('bar', 'entry_bar', 'amount'):
+        assert np.array_equal(loop_trades.column(field), array_trades.column(field), equal_nan=field == 'amount')
+    columns = ['Portfolio_Value'] + [f'{ticker}_Portfolio_Value' for ticker in tickers]
+    pd.testing.assert_frame_equal(loop_data[columns], array_data[columns])
+
+
+def test_arrays_match_object_loop():
+    """Same trades (bars included) and portfolio values as the per-ticker object loop"""
+    print("\n🧪 TESTING MULTI-TICKER ARRAY ENGINE")
+    configs = {
+        'no SL/TP': {'enabled': False},
+        'percentage': BASE_CONFIG,
+        'dollar': dict(BASE_CONFIG, sl_type='dollar', tp_type='dollar', sl_value=40, tp_value=90),
+        'intrabar': dict(BASE_CONFIG, fill_mode='intrabar', same_bar_priority='take_profit'),
+        'trailing': dict(BASE_CONFIG, **TRAILING),
+        'intrabar trailing': dict(BASE_CONFIG, fill_mode='intrabar', **dict(TRAILING, trailing_sl_type='percentage',
+                                                                            trailing_sl_value=0.03)),
+    }
+    for seed, (name, config) in enumerate(configs.items(), 1):
+        data, tickers = make_multi_ticker_data(seed=seed)
+        for strategy_type in ('long', 'short', 'reversal'):
+            assert_same_run(*run_both_engines(data, tickers, config, strategy_type), tickers)
+        print(f"✅ {name}: engines agree")
+
+
+def test_liquidation_and_final_state():
+    """Shorts in a rally are liquidated, and the final state is written back to the manager's objects"""
+    from multi_ticker_engine import run_multi_ticker_arrays
+    from multi_ticker_portfolio import MultiTickerPortfolioManager
+
+    data, tickers = make_multi_ticker_data(tickers=4, seed=3, drift=0.006)
+    for ticker in tickers:
+        data[f'{ticker}_Exit_Signal'] = False
+    config = dict(BASE_CONFIG, sl_value=5.0, tp_value=0.99)
+    loop, arrays = run_both_engines(data, tickers, config, 'short')
+    assert_same_run(loop, arrays, tickers)
+    assert 'LIQUIDATION' in set(arrays[1].column('exit_reason'))
+
+    # Stop halfway with positions open: objects hold the same state as after the object loop
+    half = data.iloc[:200]
+    managers = []
+    for engine in ('loop', 'arrays'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = MultiTickerPortfolioManager(40000, {ticker: 0.25 for ticker in tickers},
+                                                  {ticker: {'percentage': 50, 'amount_per_trade': 3000} for ticker in tickers},
+                                                  dict(BASE_CONFIG, **TRAILING))
+        manager.attach_bars(half)
+        if engine == 'arrays':
+            run_multi_ticker_arrays(manager, half, 'reversal')
+        else:
+            for i in range(len(half)):
+                manager.process_market_tick({t: half[f'{t}_Close'].iloc[i] for t in tickers},
+                                            {f'{t}_{kind}': half[f'{t}_{kind}'].iloc[i] for t in tickers
+                                             for kind in ('Entry_Signal', 'Exit_Signal')}, 'reversal', bar=i)
+        managers.append(manager)
+    final_prices = {ticker: half[f'{ticker}_Close'].iloc[-1] for ticker in tickers}
+    results = [manager.get_final_results(final_prices) for manager in managers]
+    assert results[0]['ticker_results'] == results[1]['ticker_results']
+    for ticker in tickers:
+        loop_risk, array_risk = (manager.ticker_risk_managers[ticker] for manager in managers)
+        assert loop_risk.effective_stop_price() == array_risk.effective_stop_price()
+        assert loop_risk.take_profit_price == array_risk.take_profit_price
+    print("✅ Liquidation and final state match")
+
+
+if __name__ == "__main__":
+    test_arrays_match_object_loop()
+    test_liquidation_and_final_state()
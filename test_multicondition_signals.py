@@ -0,0 +1,135 @@
+"""
+Parity test for vectorized multi-condition signal generation
+Compares MultiConditionDetector.generate_signals against a per-row reference loop
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_condition_data(rows=300, seed=11):
+    """Random-walk Close with two SMA columns (no network needed)"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, rows)))
+    data = pd.DataFrame({'Close': close})
+    data['SMA_entry1'] = data['Close'].rolling(10).mean()
+    data['SMA_entry2'] = data['Close'].rolling(30).mean()
+    return data
+
+
+CONDITIONS = [
+    {'comp1_type': 'INDICATOR', 'comp1_name': 'SMA', 'comp1_params': (10,), 'comp1_candles_ago': 0, 'comp1_col': 'SMA_entry1',
+     'strategy': 'CROSSED UP',
+     'comp2_type': 'INDICATOR', 'comp2_name': 'SMA', 'comp2_params': (30,), 'comp2_candles_ago': 0, 'comp2_col': 'SMA_entry2'},
+    {'comp1_type': 'PRICE', 'comp1_name': 'PRICE', 'comp1_params': ('Close',), 'comp1_candles_ago': 2,
+     'strategy': 'GREATER THAN',
+     'comp2_type': 'CONSTANT', 'comp2_name': 'CONSTANT', 'comp2_params': (100,), 'comp2_candles_ago': 0},
+    {'comp1_type': 'PRICE', 'comp1_name': 'PRICE', 'comp1_params': ('Close',), 'comp1_candles_ago': 0,
+     'strategy': 'INCREASED',
+     'comp2_type': 'CONSTANT', 'comp2_name': 'CONSTANT', 'comp2_params': (0,), 'comp2_candles_ago': 0},
+    {'comp1_type': 'INDICATOR', 'comp1_name': 'SMA', 'comp1_params': (10,), 'comp1_candles_ago': 0, 'comp1_col': 'SMA_entry1',
+     'strategy': 'CROSSED DOWN',
+     'comp2_type': 'INDICATOR', 'comp2_name': 'SMA', 'comp2_params': (30,), 'comp2_candles_ago': 1, 'comp2_col': 'SMA_entry2'},
+]
+
+
+def baseline_single_condition(data, condition, index):
+    """The original MultiConditionDetector.evaluate_single_condition: one row of a freshly built series"""
+    try:
+        from comparisons import (crossed_up, crossed_down, greater_than, less_than,
+                                 equal_comparison, increased, decreased, crossed)
+
+        strategy_map = {
+            "CROSSED UP": crossed_up,
+            "CROSSED DOWN": crossed_down,
+            "GREATER THAN": greater_than,
+            "LESS THAN": less_than,
+            "EQUAL": equal_comparison,
+            "INCREASED": increased,
+            "DECREASED": decreased,
+            "CROSSED": crossed
+        }
+
+        comparison_func = strategy_map.get(condition['strategy'])
+        if not comparison_func:
+            return False
+
+        if condition['comp1_type'] == 'INDICATOR':
+            comp1_col = condition.get('comp1_col', f"{condition['comp1_name']}_entry1")
+        elif condition['comp1_type'] == 'CONSTANT':
+            comp1_col = f"CONSTANT_1_{condition['comp1_params'][0]}"
+            if comp1_col not in data.columns:
+                data[comp1_col] = condition['comp1_params'][0]
+        else:  # PRICE
+            comp1_col = 'Close'
+
+        if condition['comp2_type'] == 'INDICATOR':
+            comp2_col = condition.get('comp2_col', f"{condition['comp2_name']}_entry1")
+        elif condition['comp2_type'] == 'CONSTANT':
+            comp2_col = f"CONSTANT_2_{condition['comp2_params'][0]}"
+            if comp2_col not in data.columns:
+                data[comp2_col] = condition['comp2_params'][0]
+        else:  # PRICE
+            comp2_col = 'Close'
+
+        if condition['comp1_candles_ago'] > 0:
+            comp1_shifted_col = f"{comp1_col}_shifted"
+            if comp1_shifted_col not in data.columns:
+                data[comp1_shifted_col] = data[comp1_col].shift(condition['comp1_candles_ago'])
+            comp1_col = comp1_shifted_col
+
+        if condition['comp2_candles_ago'] > 0:
+            comp2_shifted_col = f"{comp2_col}_shifted"
+            if comp2_shifted_col not in data.columns:
+                data[comp2_shifted_col] = data[comp2_col].shift(condition['comp2_candles_ago'])
+            comp2_col = comp2_shifted_col
+
+        result_series = comparison_func(data, comp1_col, comp2_col)
+        result = result_series.iloc[index] if index < len(result_series) else False
+        return bool(result)
+
+    except Exception:
+        return False
+
+
+def reference_row_signals(data, conditions, logic_type):
+    """Original per-row evaluation: rebuild each condition series and read one row"""
+    data = data.copy()  # The baseline adds its helper columns to the frame
+    signals = []
+    for index in range(len(data)):
+        results = [baseline_single_condition(data, c, index) for c in conditions]
+        signals.append(all(results) if logic_type == "AND" else any(results))
+    return np.array(signals, dtype=bool)
+
+
+def test_generate_signals_matches_row_loop():
+    """Whole-series AND/OR signals must be identical to the per-row loop"""
+    from multicondition import MultiConditionDetector
+
+    print("\n🧪 TESTING VECTORIZED MULTI-CONDITION SIGNALS")
+    for entry_logic, exit_logic in [("AND", "OR"), ("OR", "AND")]:
+        data = make_condition_data()
+        detector = MultiConditionDetector()
+        detector.set_logic_type(entry_logic, exit_logic)
+        for condition in CONDITIONS[:3]:
+            detector.add_entry_condition(condition)
+        for condition in CONDITIONS[1:]:
+            detector.add_exit_condition(condition)
+
+        entry_signals, exit_signals = detector.generate_signals(data)
+        expected_entry = reference_row_signals(data, CONDITIONS[:3], entry_logic)
+        expected_exit = reference_row_signals(data, CONDITIONS[1:], exit_logic)
+
+        assert np.array_equal(entry_signals, expected_entry)
+        assert np.array_equal(exit_signals, expected_exit)
+        assert detector.evaluate_entry_conditions(data, 50) == expected_entry[50]
+        print(f"✅ Entry {entry_logic} ({entry_signals.sum()}) / Exit {exit_logic} ({exit_signals.sum()}) identical")
+
+    # No conditions -> no signals
+    empty = MultiConditionDetector()
+    entry_signals, exit_signals = empty.generate_signals(make_condition_data())
+    assert not entry_signals.any() and not exit_signals.any()
+
+
+if __name__ == "__main__":
+    test_generate_signals_matches_row_loop()
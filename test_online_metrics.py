@@ -0,0 +1,132 @@
+"""
+Tests for the streaming metrics accumulator fed during execution
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from test_intrabar_fills import make_ohlc_signal_data
+from test_multi_ticker_engine import BASE_CONFIG, make_multi_ticker_data
+
+RISK_CONFIG = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.03, 'tp_value': 0.05}
+
+
+def assert_same_metrics(online, batch):
+    """Same keys; counts exact, ratios equal up to summation order"""
+    assert online.keys() == batch.keys() and batch
+    for key, value in batch.items():
+        if isinstance(value, (int, np.integer)) and key in ('total_trades', 'trading_days'):
+            assert online[key] == value, key
+        else:
+            assert np.isclose(online[key], value, rtol=1e-9, atol=1e-12), (key, online[key], value)
+
+
+def dated_data(rows=900, seed=5):
+    data = make_ohlc_signal_data(rows=rows, seed=seed)
+    data.index = pd.date_range('2020-01-01', periods=rows, freq='D')
+    return data
+
+
+def test_executor_metrics_match_batch():
+    """Kernel, event kernel and per-bar loop feed metrics equal to calculate_advanced_metrics"""
+    from backtest_kernel import METRICS_CHUNK, execute_with_kernel
+    from metrics import calculate_advanced_metrics
+    from trade_executor import TradeExecutor
+
+    print("\n🧪 TESTING ONLINE METRICS")
+    data = dated_data(rows=METRICS_CHUNK + 900)
+    for strategy_type in ('long', 'short', 'reversal'):
+        for engine in ('kernel', 'events', 'loop'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                executor = TradeExecutor(10000, RISK_CONFIG, {'amount_per_trade': 2000, 'percentage': 20})
+                run = data.copy()
+                if engine == 'loop':
+                    values = []
+                    for i, (price, entry, exit_) in enumerate(zip(run['Close'], run['Entry_Signal'], run['Exit_Signal'])):
+                        executor.process_market_tick(price, entry, exit_, strategy_type, bar=i)
+                        values.append(executor.get_portfolio_tracking_data(price)['Portfolio_Value'])
+                        executor.metrics.update(values[-1])
+                    run['Portfolio_Value'] = values
+                else:
+                    run = execute_with_kernel(executor, run, strategy_type, event_driven=engine == 'events')
+            assert executor.metrics.covers(run, executor.trades)
+            assert_same_metrics(executor.metrics.results(), calculate_advanced_metrics(executor.portfolio, run, executor.trades))
+        print(f"✅ {strategy_type}: online metrics match for every engine")
+
+
+def test_block_and_value_updates_agree():
+    """Blocks split anywhere equal value-by-value updates; gaps, zeros and outlier returns are filtered"""
+    from metrics import OnlineMetrics, calculate_advanced_metrics
+    from trade_log import TradeLog
+
+    rng = np.random.default_rng(2)
+    values = 1000 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, 700)))
+    values[[50, 51, 300]] = np.nan
+    values[120] = np.inf
+    values[400] = 0.0         # return of -100% (filtered) followed by an infinite one
+    values[600] *= 20         # +1900% outlier, then a -95% return
+    trades = TradeLog()
+    for profit in (120.0, -80.0, np.nan, 45.5, -10.0):
+        trades.append('SELL', 100.0, 10, profit_loss=profit)
+
+    single, blocks = OnlineMetrics(), OnlineMetrics()
+    for value in values:
+        single.update(value)
+    for chunk in np.array_split(values, [1, 2, 3, 57, 58, 401, 650]):
+        blocks.update_values(chunk)
+    single.update_trades(trades)
+    blocks.update_trades(trades)
+    batch = calculate_advanced_metrics(None, pd.DataFrame({'Portfolio_Value': values}), trades)
+    assert_same_metrics(single.results(), batch)
+    assert_same_metrics(blocks.results(), batch)
+    assert single.results()['trading_days'] == 696 and single.results()['total_trades'] == 5
+
+    # Trades are read from where the last call stopped
+    partial = OnlineMetrics()
+    partial.update_values(values)
+    partial.update_trades(trades)
+    trades.append('SELL', 100.0, 10, profit_loss=-5.0)
+    partial.update_trades(trades)
+    assert partial.trades == 6 and np.isclose(partial.gross_loss, -95.0)
+
+    # Too little history or no trades: empty, like calculate_advanced_metrics
+    empty = OnlineMetrics()
+    empty.update(1000.0)
+    assert empty.results() == {}
+    print("✅ Block and per-value updates agree")
+
+
+def test_multi_ticker_metrics():
+    """Both multi-ticker engines feed the manager's metrics with the Portfolio_Value column and trades"""
+    from metrics import calculate_advanced_metrics
+    from multi_ticker_portfolio import MultiTickerPortfolioManager
+
+    data, tickers = make_multi_ticker_data(seed=6)
+    for engine in ('loop', 'arrays'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = MultiTickerPortfolioManager(50000, {ticker: 0.2 for ticker in tickers},
+                                                  {ticker: {'percentage': 50, 'amount_per_trade': 4000} for ticker in tickers},
+                                                  BASE_CONFIG)
+            manager.attach_bars(data)
+            if engine == 'arrays':
+                from multi_ticker_engine import execute_multi_ticker_arrays
+                run = execute_multi_ticker_arrays(manager, data.copy(), 'reversal')
+            else:
+                run = data.copy()
+                totals = [manager.process_market_tick({t: run[f'{t}_Close'].iloc[i] for t in tickers},
+                                                      {f'{t}_{kind}': run[f'{t}_{kind}'].iloc[i] for t in tickers
+                                                       for kind in ('Entry_Signal', 'Exit_Signal')}, 'reversal', bar=i)
+                          for i in range(len(run))]
+                run['Portfolio_Value'] = totals
+        assert manager.metrics.covers(run, manager.all_trades)
+        assert_same_metrics(manager.metrics.results(), calculate_advanced_metrics(None, run, manager.all_trades))
+    print("✅ Multi-ticker online metrics match")
+
+
+if __name__ == "__main__":
+    test_executor_metrics_match_batch()
+    test_block_and_value_updates_agree()
+    test_multi_ticker_metrics()
@@ -0,0 +1,151 @@
+"""
+Tests for the columnar trade log
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from test_intrabar_fills import make_ohlc_signal_data
+
+RISK_CONFIG = {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.03, 'tp_value': 0.05}
+
+
+def run_executor(data, strategy_type, config=RISK_CONFIG):
+    from backtest_kernel import execute_with_kernel
+    from trade_executor import TradeExecutor
+
+    executor = TradeExecutor(10000, config, {'amount_per_trade': 2000, 'percentage': 20})
+    executor.attach_bars(data)
+    return executor, execute_with_kernel(executor, data, strategy_type)
+
+
+def dated_data(rows=800, seed=5):
+    data = make_ohlc_signal_data(rows=rows, seed=seed)
+    data.index = pd.date_range('2020-01-01', periods=rows, freq='D')
+    return data
+
+
+def test_log_columns_and_record_views():
+    """Rows carry bars, sides and exit reasons; records read like the old per-trade dicts"""
+    from trade_log import LONG, SHORT, TradeLog
+
+    print("\n🧪 TESTING TRADE LOG")
+    log = TradeLog(capacity=2)
+    log.attach_index(pd.date_range('2024-01-01', periods=10, freq='D'))
+    log.append('BUY', 100.0, 20, bar=2, amount=2000.0)
+    log.append('STOP_LOSS_LONG', 97.0, 20, bar=5, profit_loss=-60.0, entry_price=100.0)
+    log.append('SHORT_ENTRY', 98.0, 10, bar=6, amount=980.0)
+    flip = log.append('FLIP_TO_LONG', 90.0, 11, bar=8, amount=990.0, closed_shares=10, closed_profit=80.0)
+
+    assert len(log) == 4 and log.array['price'].tolist() == [100.0, 97.0, 98.0, 90.0]
+    assert log.array['entry_bar'].tolist() == [2, 2, 6, 6]
+    assert log.array['side'].tolist() == [LONG, LONG, SHORT, SHORT]
+    assert log.column('exit_reason').tolist() == ['', 'STOP_LOSS', '', 'REVERSAL']
+    assert log.exits().tolist() == [False, True, False, True]
+    assert log[1] == {'type': 'STOP_LOSS_LONG', 'price': 97.0, 'shares': 20, 'profit_loss': -60.0, 'entry_price': 100.0}
+    assert flip == {'type': 'FLIP_TO_LONG', 'price': 90.0, 'shares_covered': 10, 'shares_bought': 11, 'short_profit': 80.0}
+    assert 'profit_loss' not in flip and flip.get('money_spent', 0) == 0
+    assert log[-1].timestamp == pd.Timestamp('2024-01-09') and log[1].entry_timestamp == pd.Timestamp('2024-01-03')
+    assert np.allclose(log.realized_profits()[[1, 3]], [-60.0, 80.0]) and np.isnan(log.realized_profits()[0])
+    frame = log.to_frame()
+    assert frame['event'].tolist()[:2] == ['BUY', 'STOP_LOSS_LONG'] and frame['timestamp'].iloc[0] == pd.Timestamp('2024-01-03')
+    print("✅ Schema columns and legacy record views working")
+
+
+def test_vectorized_metrics_match_dict_scan():
+    """Win rate and profit factor over the log equal the old per-dict scan"""
+    from metrics import calculate_profit_factor, calculate_win_rate
+
+    for strategy_type in ('long', 'short', 'reversal'):
+        executor, _ = run_executor(dated_data(), strategy_type)
+        trades = executor.trades
+        dicts = trades.to_dicts()
+        profits = [trade.get('profit_loss', 0) for trade in dicts]
+        assert calculate_win_rate(trades) == calculate_win_rate(dicts) == sum(p > 0 for p in profits) / len(dicts)
+        expected = sum(p for p in profits if p > 0) / abs(sum(p for p in profits if p < 0))
+        assert np.isclose(calculate_profit_factor(trades), expected, rtol=1e-12)
+        assert np.isclose(calculate_profit_factor(dicts), expected, rtol=1e-12)
+    print("✅ Vectorized trade metrics match the dict scan")
+
+
+def test_json_trades_use_bar_dates_and_exit_reasons():
+    executor, data = run_executor(dated_data(), 'long')
+    with tempfile.TemporaryDirectory() as path:
+        filename = os.path.join(path, 'results.json')
+        executor.save_results_to_json(data, {'mode': 'single'}, filename)
+        with open(filename) as f:
+            saved = json.load(f)['trades']
+    assert len(saved) == len(executor.trades)
+    bars = executor.trades.array['bar']
+    assert [trade['date'] for trade in saved] == [str(data.index[bar]) for bar in bars]
+    risk_exits = [trade for trade in saved if trade['type'] in ('STOP_LOSS_LONG', 'TAKE_PROFIT_LONG')]
+    assert risk_exits and all(trade['exit_reason'] in ('STOP_LOSS', 'TAKE_PROFIT') and 'entry_price' in trade
+                              for trade in risk_exits)
+    print(f"✅ {len(saved)} trades saved with their bar dates")
+
+
+def test_strategy2_json_dates():
+    """strategy2's per-bar loops record bars, so saved trades carry their dates"""
+    import contextlib
+    import io
+
+    import strategy2
+
+    for runner in (strategy2.execute_long_strategy, strategy2.execute_short_strategy, strategy2.execute_reversal_strategy):
+        data = dated_data(rows=300)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data, trades = runner(data, None, RISK_CONFIG, 10000, {'amount_per_trade': 2000, 'percentage': 20})[:2]
+        assert len(trades) > 0 and (trades.array['bar'] >= 0).all()
+        assert [str(date) for date in trades.timestamps] == [str(data.index[bar]) for bar in trades.array['bar']]
+
+    # execute_long_strategy also returns its executor, which strategy2 saves to JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        data, trades, executor = strategy2.execute_long_strategy(dated_data(rows=300), None, RISK_CONFIG, 10000,
+                                                                 {'amount_per_trade': 2000, 'percentage': 20})
+    with tempfile.TemporaryDirectory() as path:
+        filename = os.path.join(path, 'results.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            executor.save_results_to_json(data, {'mode': 'single'}, filename)
+        with open(filename) as f:
+            saved = json.load(f)['trades']
+    assert saved and all(trade['date'] is not None for trade in saved)
+    print("✅ strategy2 trades carry their bar dates")
+
+
+def test_multi_ticker_log():
+    """Multi-ticker exits record the shares they closed and per-ticker counts come from the log"""
+    from multi_ticker_portfolio import MultiTickerPortfolioManager
+
+    frames = {'AAA': make_ohlc_signal_data(rows=600, seed=8), 'BBB': make_ohlc_signal_data(rows=600, seed=9)}
+    data = pd.concat(frames, axis=1)
+    data.columns = [f'{ticker}_{field}' for ticker, field in data.columns]
+    manager = MultiTickerPortfolioManager(10000, {'AAA': 0.5, 'BBB': 0.5},
+                                          {ticker: {'percentage': 50, 'amount_per_trade': 2500} for ticker in frames},
+                                          RISK_CONFIG)
+    manager.attach_bars(data)
+    for i in range(len(data)):
+        prices = {ticker: data[f'{ticker}_Close'].iloc[i] for ticker in frames}
+        signals = {f'{ticker}_{kind}': data[f'{ticker}_{kind}'].iloc[i]
+                   for ticker in frames for kind in ('Entry_Signal', 'Exit_Signal')}
+        manager.process_market_tick(prices, signals, 'long', bar=i)
+
+    trades = manager.all_trades
+    exits = trades.exits()
+    assert exits.any() and (trades.array['shares'][exits] > 0).all()
+    assert (trades.array['entry_bar'][exits] < trades.array['bar'][exits]).all()
+    results = manager.get_final_results()
+    assert {ticker: result['trades'] for ticker, result in results['ticker_results'].items()} == \
+        {ticker: sum(trade['ticker'] == ticker for trade in trades) for ticker in frames}
+    print(f"✅ {len(trades)} multi-ticker trades logged")
+
+
+if __name__ == "__main__":
+    test_log_columns_and_record_views()
+    test_vectorized_metrics_match_dict_scan()
+    test_json_trades_use_bar_dates_and_exit_reasons()
+    test_strategy2_json_dates()
+    test_multi_ticker_log()
@@ -0,0 +1,100 @@
+"""
+Tests for trailing stop-losses (percentage / dollar, long / short, single and multi-ticker)
+"""
+
+import numpy as np
+import pandas as pd
+
+from test_intrabar_fills import make_ohlc_signal_data
+
+
+def trailing_config(trailing_type, trailing_value, fill_mode='close'):
+    return {'enabled': True, 'sl_type': 'percentage', 'tp_type': 'percentage', 'sl_value': 0.08,
+            'tp_value': 0.5, 'trailing_sl_enabled': True, 'trailing_sl_type': trailing_type,
+            'trailing_sl_value': trailing_value, 'fill_mode': fill_mode}
+
+
+def run_executor(data, config, strategy_type, attach):
+    from backtest_kernel import execute_with_kernel
+    from trade_executor import TradeExecutor
+
+    executor = TradeExecutor(10000, config, {'amount_per_trade': 2000, 'percentage': 20})
+    if attach:
+        executor.attach_bars(data)
+    execute_with_kernel(executor, data, strategy_type)
+    return executor.trades
+
+
+def test_vectorized_trailing_matches_tick_by_tick():
+    """Running extremes from the vectorized search give the same trades as updating every tick"""
+    print("\n🧪 TESTING TRAILING STOPS")
+    data = make_ohlc_signal_data(rows=800, seed=5)
+    for trailing_type, value in (('percentage', 0.03), ('dollar', 60)):
+        for strategy_type in ('long', 'short', 'reversal'):
+            config = trailing_config(trailing_type, value)
+            vectorized = run_executor(data.copy(), config, strategy_type, attach=True)
+            ticked = run_executor(data.copy(), config, strategy_type, attach=False)
+            assert vectorized == ticked
+            trailing = [trade for trade in vectorized if trade['type'].startswith('TRAILING_STOP')]
+            assert trailing, f"no trailing exits for {trailing_type} / {strategy_type}"
+            print(f"✅ {trailing_type} / {strategy_type}: {len(trailing)} trailing exits identical")
+
+
+def test_long_trailing_exit_bar():
+    """A long position exits on the first Close at or below 97% of the highest Close since entry"""
+    data = make_ohlc_signal_data(rows=800, seed=5)
+    data['Exit_Signal'] = False
+    trades = run_executor(data.copy(), trailing_config('percentage', 0.03), 'long', attach=True)
+    close = data['Close'].to_numpy()
+    entry = int(np.flatnonzero(data['Entry_Signal'].to_numpy())[0])
+    peak = np.maximum.accumulate(close[entry:])
+    exit_bar = entry + int(np.flatnonzero(close[entry:] <= np.maximum(peak * 0.97, close[entry] * 0.92))[0])
+    assert trades[1]['type'] == 'TRAILING_STOP_LONG' and trades[1]['price'] == close[exit_bar]
+
+
+def test_intrabar_trailing_fills_at_stop():
+    """Intrabar mode trails the previous bars' Highs and fills at the stop (or a gap Open)"""
+    data = make_ohlc_signal_data(rows=800, seed=5)
+    data['Exit_Signal'] = False
+    trades = run_executor(data.copy(), trailing_config('percentage', 0.03, fill_mode='intrabar'), 'long', attach=True)
+    entry = int(np.flatnonzero(data['Entry_Signal'].to_numpy())[0])
+    entry_price = data['Close'].iloc[entry]
+    high, low, open_ = (data[field].to_numpy()[entry + 1:] for field in ('High', 'Low', 'Open'))
+    prior_peak = np.maximum.accumulate(np.concatenate([[entry_price], high]))[:-1]
+    stops = np.maximum(prior_peak * 0.97, entry_price * 0.92)
+    first = int(np.flatnonzero(low <= stops)[0])
+    assert trades[1]['type'] == 'TRAILING_STOP_LONG'
+    assert trades[1]['price'] == min(open_[first], stops[first])
+
+
+def test_multi_ticker_trailing_stops():
+    """Each ticker's risk manager trails its own prices, with or without attached bars"""
+    from multi_ticker_portfolio import MultiTickerPortfolioManager
+
+    frames = {'AAA': make_ohlc_signal_data(rows=600, seed=8), 'BBB': make_ohlc_signal_data(rows=600, seed=9)}
+    data = pd.concat({ticker: frame for ticker, frame in frames.items()}, axis=1)
+    data.columns = [f'{ticker}_{field}' for ticker, field in data.columns]
+    config = trailing_config('dollar', 40)
+    sizes = {ticker: {'percentage': 50, 'amount_per_trade': 2500} for ticker in frames}
+
+    runs = []
+    for attach in (True, False):
+        manager = MultiTickerPortfolioManager(10000, {'AAA': 0.5, 'BBB': 0.5}, sizes, config)
+        if attach:
+            manager.attach_bars(data)
+        for i in range(len(data)):
+            prices = {ticker: data[f'{ticker}_Close'].iloc[i] for ticker in frames}
+            signals = {f'{ticker}_{kind}': data[f'{ticker}_{kind}'].iloc[i]
+                       for ticker in frames for kind in ('Entry_Signal', 'Exit_Signal')}
+            manager.process_market_tick(prices, signals, 'long', bar=i)
+        runs.append(manager.all_trades)
+    assert runs[0] == runs[1]
+    assert {trade['ticker'] for trade in runs[0] if trade['type'] == 'Trailing Stop'} == {'AAA', 'BBB'}
+    print("✅ Multi-ticker trailing stops working")
+
+
+if __name__ == "__main__":
+    test_vectorized_trailing_matches_tick_by_tick()
+    test_long_trailing_exit_bar()
+    test_intrabar_trailing_fills_at_stop()
+    test_multi_ticker_trailing_stops()
@@ -0,0 +1,764 @@
+"""
+Parity tests for tv_kernels: every routed TV library method must match its original per-bar loop
+The reference functions below are the loops as they were before the kernel layer was introduced
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# =============================================================================
+# Original loop implementations (reference only)
+# =============================================================================
+
+def _reference_ChandeKrollStopStrategies_compute_values(self, df):
+    prev_close = df['Close'].shift(1)
+    tr = pd.concat([df['High'] - df['Low'], (df['High'] - prev_close).abs(), (df['Low'] - prev_close).abs()], axis=1).max(axis=1)
+    atr = tr.rolling(window=self.period, min_periods=1).mean()
+    long_candidate = df['High'].rolling(window=self.period, min_periods=1).max() - self.multiplier * atr
+    short_candidate = df['Low'].rolling(window=self.period, min_periods=1).min() + self.multiplier * atr
+    cks_values = np.zeros(len(df))
+    for i in range(len(df)):
+        if i == 0:
+            mid = (long_candidate.iloc[i] + short_candidate.iloc[i]) / 2
+            cks_values[i] = long_candidate.iloc[i] if df['Close'].iloc[i] >= mid else short_candidate.iloc[i]
+        else:
+            if df['Close'].iloc[i-1] > cks_values[i-1]:
+                cks_values[i] = max(long_candidate.iloc[i], cks_values[i-1])
+            elif df['Close'].iloc[i-1] < cks_values[i-1]:
+                cks_values[i] = min(short_candidate.iloc[i], cks_values[i-1])
+            else:
+                cks_values[i] = cks_values[i-1]
+    return pd.Series(cks_values, index=df.index)
+
+
+def _reference_DoubleExponentialMovingAverageStrategies__compute_ema(self, values):
+    alpha = 2 / (self.period + 1)
+    ema = np.empty(len(values))
+    ema[0] = values[0]
+    for i in range(1, len(values)):
+        ema[i] = alpha * values[i] + (1 - alpha) * ema[i - 1]
+    return ema
+
+
+def _reference_EhlersSuperSmootherFilterStrategies_compute_values(self, df):
+    prices = df['Close'].values.astype(float)
+    N = len(prices)
+    result = np.empty(N)
+    a = np.exp(-1.414 * np.pi / self.period)
+    b = 2 * a * np.cos(1.414 * np.pi / self.period)
+    c2 = b
+    c3 = -a * a
+    c1 = 1 - c2 - c3
+    result[0] = prices[0]
+    if N > 1:
+        result[1] = prices[1]
+    for i in range(2, N):
+        result[i] = c1 * (prices[i] + prices[i-1]) / 2 + c2 * result[i-1] + c3 * result[i-2]
+    self.filter = result
+    return pd.Series(result, index=df.index)
+
+
+def _reference_ElderRayIndexStrategies_compute_values(self, df):
+    prices = df['Close'].values.astype(float)
+    N = len(prices)
+    ema = np.empty(N)
+    alpha = 2 / (self.period + 1)
+    ema[0] = prices[0]
+    for i in range(1, N):
+        ema[i] = alpha * prices[i] + (1 - alpha) * ema[i - 1]
+    self.ema = pd.Series(ema, index=df.index)
+    self.bull_power = df['High'] - self.ema
+    self.bear_power = df['Low'] - self.ema
+    return pd.DataFrame({'EMA': self.ema, 'Bull_Power': self.bull_power, 'Bear_Power': self.bear_power}, index=df.index)
+
+
+def _reference_EldersForceIndexStrategies_compute_values(self, df):
+    raw_force = (df['Close'] - df['Close'].shift(1)) * df['Volume']
+    raw_force = raw_force.fillna(0)
+    alpha = 2 / (self.period + 1)
+    ema = [raw_force.iloc[0]]
+    for i in range(1, len(raw_force)):
+        ema.append(alpha * raw_force.iloc[i] + (1 - alpha) * ema[i - 1])
+    return pd.Series(ema, index=df.index)
+
+
+def _reference_ElasticVolumeMovingAverageStrategies_compute_values(self, df):
+    base_alpha = 2 / (self.period + 1)
+    rolling_avg_vol = df['Volume'].rolling(window=self.period, min_periods=1).mean()
+    evma_list = []
+    evma_list.append(df['Close'].iloc[0])
+    for i in range(1, len(df)):
+        vol = df['Volume'].iloc[i]
+        avg_vol = rolling_avg_vol.iloc[i]
+        alpha = base_alpha * (vol / avg_vol) if avg_vol != 0 else base_alpha
+        if alpha > 1:
+            alpha = 1
+        new_val = evma_list[-1] + alpha * (df['Close'].iloc[i] - evma_list[-1])
+        evma_list.append(new_val)
+    self.evma = pd.Series(evma_list, index=df.index)
+    return self.evma
+
+
+def _reference_ElasticVolumeMACDStrategies_elastic_ema(self, series, volume, period):
+    base_alpha = 2/(period+1)
+    rolling_avg_vol = volume.rolling(window=period, min_periods=1).mean()
+    ema_values = [series.iloc[0]]
+    for i in range(1, len(series)):
+        vol = volume.iloc[i]
+        avg_vol = rolling_avg_vol.iloc[i]
+        alpha = base_alpha * (vol/avg_vol) if avg_vol != 0 else base_alpha
+        if alpha > 1:
+            alpha = 1
+        ema_values.append(ema_values[-1] + alpha*(series.iloc[i]-ema_values[-1]))
+    return pd.Series(ema_values, index=series.index)
+
+
+def _reference_ElasticVolumeMACDStrategies_standard_ema(self, series, period):
+    alpha = 2/(period+1)
+    ema_values = [series.iloc[0]]
+    for i in range(1, len(series)):
+        ema_values.append(ema_values[-1] + alpha*(series.iloc[i]-ema_values[-1]))
+    return pd.Series(ema_values, index=series.index)
+
+
+def _reference_ExponentialMovingAverageStrategies_compute_values(self, df):
+    multiplier = 2 / (self.period + 1)
+    ema_values = [df['Close'].iloc[0]]
+    for i in range(1, len(df)):
+        ema_values.append(df['Close'].iloc[i] * multiplier + ema_values[-1] * (1 - multiplier))
+    self.ema = pd.Series(ema_values, index=df.index)
+    return self.ema
+
+
+def _reference_FibonacciWeightedMovingAverageStrategies_compute_values(self, df):
+    prices = df['Close']
+    fib_sequence = []
+    for i in range(self.period):
+        if i < 2:
+            fib_sequence.append(1)
+        else:
+            fib_sequence.append(fib_sequence[-1] + fib_sequence[-2])
+    total_weight = sum(fib_sequence)
+    fwma_list = [np.nan] * (self.period - 1)
+    for i in range(self.period - 1, len(prices)):
+        window = prices.iloc[i - self.period + 1:i + 1].tolist()
+        weighted_sum = sum(fib_sequence[j] * window[j] for j in range(self.period))
+        fwma_list.append(weighted_sum / total_weight)
+    self.fwma = pd.Series(fwma_list, index=df.index)
+    return self.fwma
+
+
+def _reference_FisherTransformStrategies_compute_values(self, df):
+    highest = df['High'].rolling(window=self.period, min_periods=1).max()
+    lowest = df['Low'].rolling(window=self.period, min_periods=1).min()
+    norm = 2 * ((df['Close'] - lowest) / (highest - lowest)) - 1
+    norm = norm.clip(-0.999, 0.999)
+    fisher_values = []
+    for i in range(len(norm)):
+        fisher_values.append(0.5 * np.log((1 + norm.iloc[i]) / (1 - norm.iloc[i])))
+    self.fisher = pd.Series(fisher_values, index=df.index)
+    return self.fisher
+
+
+def _reference_FractalAdaptiveMovingAverageStrategies_compute_values(self, df):
+    prices = df['Close']
+    frama_values = []
+    for i in range(len(prices)):
+        if i == 0:
+            frama_values.append(prices.iloc[i])
+        elif i < self.period - 1:
+            frama_values.append(prices.iloc[i])
+        else:
+            window = prices.iloc[i - self.period + 1 : i + 1]
+            first_half = window.iloc[:self.period // 2]
+            second_half = window.iloc[self.period // 2:]
+            range1 = first_half.max() - first_half.min()
+            range2 = second_half.max() - second_half.min()
+            range_full = window.max() - window.min()
+            if range_full == 0:
+                D = 1
+            else:
+                D = np.log((range1 + range2) / range_full) / np.log(2)
+            alpha = np.exp(-4.6 * (D - 1))
+            lower_bound = 1 / self.period
+            if alpha < lower_bound:
+                alpha = lower_bound
+            if alpha > 1:
+                alpha = 1
+            prev_frama = frama_values[-1]
+            current_frama = prev_frama + alpha * (prices.iloc[i] - prev_frama)
+            frama_values.append(current_frama)
+    self.frama = pd.Series(frama_values, index=df.index)
+    return self.frama
+
+
+def _reference_GannHighLowActivatorStrategies_compute_values(self, df):
+    activator = []
+    for i in range(len(df)):
+        if i == 0:
+            activator.append(df['Close'].iloc[i])
+        else:
+            if df['Close'].iloc[i] > activator[i - 1]:
+                new_val = min(df['Low'].iloc[i], activator[i - 1])
+            elif df['Close'].iloc[i] < activator[i - 1]:
+                new_val = max(df['High'].iloc[i], activator[i - 1])
+            else:
+                new_val = activator[i - 1]
+            activator.append(new_val)
+    self.activator = pd.Series(activator, index=df.index)
+    return self.activator
+
+
+def _reference_HoltWinterChannelStrategies_compute_values(self, df):
+    n = len(df)
+    price = df['Close'].values
+    level = [0] * n
+    trend = [0] * n
+    forecast = [0] * n
+    level[0] = price[0]
+    trend[0] = price[1] - price[0] if n > 1 else 0
+    forecast[0] = level[0] + trend[0]
+    for i in range(1, n):
+        level[i] = self.alpha * price[i] + (1 - self.alpha) * (level[i - 1] + trend[i - 1])
+        trend[i] = self.beta * (level[i] - level[i - 1]) + (1 - self.beta) * trend[i - 1]
+        forecast[i] = level[i] + trend[i]
+    series_forecast = pd.Series(forecast, index=df.index)
+    residual = df['Close'] - series_forecast
+    error = residual.rolling(window=self.window, min_periods=1).std()
+    upper_channel = series_forecast + self.channel_multiplier * error
+    lower_channel = series_forecast - self.channel_multiplier * error
+    self.center = series_forecast
+    self.upper_channel = upper_channel
+    self.lower_channel = lower_channel
+    return pd.DataFrame({'HWC_Center': series_forecast, 'HWC_Upper': upper_channel, 'HWC_Lower': lower_channel}, index=df.index)
+
+
+def _reference_HoltWinterMovingAverageStrategies_compute_values(self, df):
+    n = len(df)
+    price = df['Close'].values
+    level = [0] * n
+    trend = [0] * n
+    forecast = [0] * n
+    level[0] = price[0]
+    trend[0] = price[1] - price[0] if n > 1 else 0
+    forecast[0] = level[0] + trend[0]
+    for i in range(1, n):
+        level[i] = self.alpha * price[i] + (1 - self.alpha) * (level[i - 1] + trend[i - 1])
+        trend[i] = self.beta * (level[i] - level[i - 1]) + (1 - self.beta) * trend[i - 1]
+        forecast[i] = level[i] + trend[i]
+    self.hwma = pd.Series(forecast, index=df.index)
+    return self.hwma
+
+
+def _reference_HullExponentialMovingAverageStrategies_compute_ema(self, series, period):
+    multiplier = 2 / (period + 1)
+    ema = [series.iloc[0]]
+    for i in range(1, len(series)):
+        ema.append((series.iloc[i] - ema[-1]) * multiplier + ema[-1])
+    return pd.Series(ema, index=series.index)
+
+
+def _reference_JurikMovingAverageStrategies_compute_values(self, df):
+    price = df['Close'].values
+    vol = pd.Series(price).diff().abs().rolling(window=self.period, min_periods=1).mean().values
+    alpha = 2.0 / (self.period + 1)
+    adaptive_alpha = alpha * (1 + self.phase * (vol ** self.power))
+    jma_array = np.empty_like(price)
+    jma_array[0] = price[0]
+    for i in range(1, len(price)):
+        jma_array[i] = jma_array[i - 1] + adaptive_alpha[i] * (price[i] - jma_array[i - 1])
+    self.jma = pd.Series(jma_array, index=df.index)
+    return self.jma
+
+
+def _reference_KDJIndicatorStrategies_compute_values(self, df):
+    k_values = []
+    d_values = []
+    j_values = []
+    k_prev = 50
+    d_prev = 50
+    for i in range(len(df)):
+        window_start = max(0, i - self.period + 1)
+        high_max = df['High'].iloc[window_start:i+1].max()
+        low_min = df['Low'].iloc[window_start:i+1].min()
+        if high_max == low_min:
+            rsv = 0
+        else:
+            rsv = (df['Close'].iloc[i] - low_min) / (high_max - low_min) * 100
+        k_curr = (2/3)*k_prev + (1/3)*rsv
+        d_curr = (2/3)*d_prev + (1/3)*k_curr
+        j_curr = 3*k_curr - 2*d_curr
+        k_values.append(k_curr)
+        d_values.append(d_curr)
+        j_values.append(j_curr)
+        k_prev = k_curr
+        d_prev = d_curr
+    self.k = pd.Series(k_values, index=df.index)
+    self.d = pd.Series(d_values, index=df.index)
+    self.j = pd.Series(j_values, index=df.index)
+    return self.k, self.d, self.j
+
+
+def _reference_KaufmanAdaptiveMovingAverageStrategies_compute_values(self, df):
+    price = df['Close'].values
+    n = len(price)
+    kama = np.empty(n)
+    kama[0] = price[0]
+    fastest_sc = 2 / (self.fast_period + 1)
+    slowest_sc = 2 / (self.slow_period + 1)
+    for i in range(1, n):
+        if i < self.period:
+            er = 0
+        else:
+            change = abs(price[i] - price[i - self.period])
+            volatility = np.sum(np.abs(np.diff(price[i - self.period:i + 1])))
+            er = change / volatility if volatility != 0 else 0
+        sc = (er * (fastest_sc - slowest_sc) + slowest_sc) ** 2
+        kama[i] = kama[i - 1] + sc * (price[i] - kama[i - 1])
+    self.kama = pd.Series(kama, index=df.index)
+    return self.kama
+
+
+def _reference_McGinleyDynamicStrategies_compute_values(self, df):
+    prices = df['Close'].values
+    mcg = np.empty_like(prices)
+    mcg[0] = prices[0]
+    for i in range(1, len(prices)):
+        prev_val = mcg[i - 1]
+        ratio = prices[i] / prev_val if prev_val != 0 else 1
+        factor = self.period * (ratio ** 4)
+        if factor == 0:
+            factor = self.period
+        mcg[i] = prev_val + (prices[i] - prev_val) / factor
+    self.mcg_dynamic = pd.Series(mcg, index=df.index)
+    return self.mcg_dynamic
+
+
+def _reference_MovingStandardDeviationStrategies_compute_values(self, df):
+    prices = df['Close'].tolist()
+    std_values = []
+    for i in range(len(prices)):
+        if i < self.period - 1:
+            window = prices[:i + 1]
+        else:
+            window = prices[i - self.period + 1:i + 1]
+        mean_val = sum(window) / len(window)
+        variance = sum((x - mean_val) ** 2 for x in window) / len(window)
+        std_values.append(variance ** 0.5)
+    self.std_series = pd.Series(std_values, index=df.index)
+    return self.std_series
+
+
+def _reference_NegativeVolumeIndexStrategies_compute_values(self, df):
+    nvi_values = []
+    nvi = self.baseline
+    nvi_values.append(nvi)
+    for i in range(1, len(df)):
+        if df['Volume'].iloc[i] < df['Volume'].iloc[i-1]:
+            ret = (df['Close'].iloc[i] - df['Close'].iloc[i-1]) / df['Close'].iloc[i-1]
+            nvi = nvi * (1 + ret)
+        nvi_values.append(nvi)
+    self.nvi = pd.Series(nvi_values, index=df.index)
+    return self.nvi
+
+
+def _reference_OnBalanceVolumeStrategies_compute_values(self, df):
+    obv_values = []
+    obv = 0
+    obv_values.append(obv)
+    for i in range(1, len(df)):
+        if df['Close'].iloc[i] > df['Close'].iloc[i-1]:
+            obv += df['Volume'].iloc[i]
+        elif df['Close'].iloc[i] < df['Close'].iloc[i-1]:
+            obv -= df['Volume'].iloc[i]
+        obv_values.append(obv)
+    self.obv = pd.Series(obv_values, index=df.index)
+    return self.obv
+
+
+def _reference_ParabolicStopAndReverseStrategies_compute_values(self, df):
+    psar_list = []
+    if len(df) < 2:
+        self.psar = pd.Series([None] * len(df), index=df.index)
+        return self.psar
+    if df['Close'].iloc[1] > df['Close'].iloc[0]:
+        trend = 'up'
+        psar = df['Low'].iloc[0]
+        ep = df['High'].iloc[0]
+    else:
+        trend = 'down'
+        psar = df['High'].iloc[0]
+        ep = df['Low'].iloc[0]
+    af = self.initial_af
+    psar_list.append(psar)
+    if trend == 'up':
+        psar = df['Low'].iloc[0]
+        ep = max(df['High'].iloc[0], df['High'].iloc[1])
+    else:
+        psar = df['High'].iloc[0]
+        ep = min(df['Low'].iloc[0], df['Low'].iloc[1])
+    psar_list.append(psar)
+    for i in range(2, len(df)):
+        prev_psar = psar
+        if trend == 'up':
+            psar = prev_psar + af * (ep - prev_psar)
+            psar = min(psar, df['Low'].iloc[i - 1], df['Low'].iloc[i - 2])
+            if df['High'].iloc[i] > ep:
+                ep = df['High'].iloc[i]
+                af = min(af + self.initial_af, self.max_af)
+            if df['Low'].iloc[i] < psar:
+                trend = 'down'
+                psar = ep
+                ep = df['Low'].iloc[i]
+                af = self.initial_af
+        else:
+            psar = prev_psar - af * (prev_psar - ep)
+            psar = max(psar, df['High'].iloc[i - 1], df['High'].iloc[i - 2])
+            if df['Low'].iloc[i] < ep:
+                ep = df['Low'].iloc[i]
+                af = min(af + self.initial_af, self.max_af)
+            if df['High'].iloc[i] > psar:
+                trend = 'up'
+                psar = ep
+                ep = df['High'].iloc[i]
+                af = self.initial_af
+        psar_list.append(psar)
+    self.psar = pd.Series(psar_list, index=df.index)
+    return self.psar
+
+
+def _reference_PascalsWeightedMovingAverageStrategies_compute_values(self, df):
+    values = []
+    for i in range(len(df)):
+        if i < self.period - 1:
+            window = df['Close'].iloc[:i+1]
+            n = len(window)
+            weights = [math.comb(n-1, k) for k in range(n)]
+            weighted_sum = sum(w * p for w, p in zip(weights, window))
+            total_weight = sum(weights)
+            values.append(weighted_sum / total_weight)
+        else:
+            window = df['Close'].iloc[i-self.period+1:i+1]
+            n = self.period
+            weights = [math.comb(n-1, k) for k in range(n)]
+            weighted_sum = sum(w * p for w, p in zip(weights, window))
+            total_weight = sum(weights)
+            values.append(weighted_sum / total_weight)
+    self.pwma = pd.Series(values, index=df.index)
+    return self.pwma
+
+
+def _reference_PositiveVolumeIndexStrategies_compute_values(self, df):
+    pvi_values = []
+    pvi = self.baseline
+    pvi_values.append(pvi)
+    for i in range(1, len(df)):
+        if df['Volume'].iloc[i] > df['Volume'].iloc[i-1]:
+            ret = (df['Close'].iloc[i] - df['Close'].iloc[i-1]) / df['Close'].iloc[i-1]
+            pvi = pvi * (1 + ret)
+        pvi_values.append(pvi)
+    self.pvi = pd.Series(pvi_values, index=df.index)
+    return self.pvi
+
+
+def _reference_QStickStrategies_compute_values(self, df):
+    diff = df['Close'] - df['Open']
+    alpha = 2 / (self.period + 1)
+    ema = [diff.iloc[0]]
+    for i in range(1, len(diff)):
+        ema.append(alpha * diff.iloc[i] + (1 - alpha) * ema[i - 1])
+    return pd.Series(ema, index=df.index)
+
+
+def _reference_SmoothedExponentialMovingAverageStrategies_compute_values(self, df):
+    prices = df['Close'].values
+    sema = np.empty_like(prices, dtype=float)
+    sema[0] = prices[0]
+    for i in range(1, len(prices)):
+        sema[i] = (prices[i] + (self.period - 1) * sema[i - 1]) / self.period
+    return pd.Series(sema, index=df.index)
+
+
+def _reference_SmoothedSimpleMovingAverageStrategies_compute_values(self, df):
+    prices = df['Close'].values
+    ssma = np.empty_like(prices, dtype=float)
+    ssma[0] = prices[0]
+    for i in range(1, len(prices)):
+        ssma[i] = (prices[i] + (self.period - 1) * ssma[i - 1]) / self.period
+    return pd.Series(ssma, index=df.index)
+
+
+def _reference_StopAndReverseStrategies_compute_values(self, df):
+    n = len(df)
+    sar = [0] * n
+    if n == 0:
+        return pd.Series([])
+    if df['Close'].iloc[1] > df['Close'].iloc[0]:
+        trend = 1
+        sar[0] = df['Low'].iloc[0]
+        ep = df['High'].iloc[0]
+    else:
+        trend = -1
+        sar[0] = df['High'].iloc[0]
+        ep = df['Low'].iloc[0]
+    af = self.initial_af
+    for i in range(1, n):
+        current_high = df['High'].iloc[i]
+        current_low = df['Low'].iloc[i]
+        previous_sar = sar[i - 1]
+        if trend == 1:
+            sar_i = previous_sar + af * (ep - previous_sar)
+            if i >= 2:
+                sar_i = min(sar_i, df['Low'].iloc[i - 1], df['Low'].iloc[i - 2])
+            else:
+                sar_i = min(sar_i, df['Low'].iloc[i - 1])
+            if current_low < sar_i:
+                trend = -1
+                sar_i = ep
+                af = self.initial_af
+                ep = current_low
+            else:
+                if current_high > ep:
+                    ep = current_high
+                    af = min(af + self.initial_af, self.max_af)
+            sar[i] = sar_i
+        else:
+            sar_i = previous_sar - af * (previous_sar - ep)
+            if i >= 2:
+                sar_i = max(sar_i, df['High'].iloc[i - 1], df['High'].iloc[i - 2])
+            else:
+                sar_i = max(sar_i, df['High'].iloc[i - 1])
+            if current_high > sar_i:
+                trend = 1
+                sar_i = ep
+                af = self.initial_af
+                ep = current_high
+            else:
+                if current_low < ep:
+                    ep = current_low
+                    af = min(af + self.initial_af, self.max_af)
+            sar[i] = sar_i
+    self.sar = pd.Series(sar, index=df.index)
+    return self.sar
+
+
+def _reference_SupertrendStrategies_compute_values(self, df):
+    high_low = df['High'] - df['Low']
+    high_close = (df['High'] - df['Close'].shift(1)).abs()
+    low_close = (df['Low'] - df['Close'].shift(1)).abs()
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    atr = tr.rolling(window=self.period, min_periods=1).mean()
+    typical_price = (df['High'] + df['Low']) / 2
+    basic_ub = typical_price + self.multiplier * atr
+    basic_lb = typical_price - self.multiplier * atr
+    final_ub_list = [0] * len(df)
+    final_lb_list = [0] * len(df)
+    for i in range(len(df)):
+        if i == 0:
+            final_ub_list[i] = basic_ub.iloc[i]
+            final_lb_list[i] = basic_lb.iloc[i]
+        else:
+            if (basic_ub.iloc[i] < final_ub_list[i-1]) or (df['Close'].iloc[i-1] > final_ub_list[i-1]):
+                final_ub_list[i] = basic_ub.iloc[i]
+            else:
+                final_ub_list[i] = final_ub_list[i-1]
+            if (basic_lb.iloc[i] > final_lb_list[i-1]) or (df['Close'].iloc[i-1] < final_lb_list[i-1]):
+                final_lb_list[i] = basic_lb.iloc[i]
+            else:
+                final_lb_list[i] = final_lb_list[i-1]
+    final_ub = pd.Series(final_ub_list, index=df.index)
+    final_lb = pd.Series(final_lb_list, index=df.index)
+    supertrend_list = [None] * len(df)
+    trend_list = [0] * len(df)
+    for i in range(len(df)):
+        if i == 0:
+            supertrend_list[i] = None
+            trend_list[i] = 1
+        else:
+            if df['Close'].iloc[i] <= final_ub.iloc[i]:
+                supertrend_list[i] = final_ub.iloc[i]
+                trend_list[i] = -1
+            elif df['Close'].iloc[i] >= final_lb.iloc[i]:
+                supertrend_list[i] = final_lb.iloc[i]
+                trend_list[i] = 1
+            else:
+                supertrend_list[i] = supertrend_list[i-1]
+                trend_list[i] = trend_list[i-1]
+    self.supertrend = pd.Series(supertrend_list, index=df.index)
+    self.trend = pd.Series(trend_list, index=df.index)
+    return self.supertrend, self.trend
+
+
+def _reference_SymmetricWeightedMovingAverageStrategies_compute_values(self, df):
+    weights = self.compute_weights()
+    swma_list = []
+    price_series = df[self.price_column]
+    for i in range(len(price_series)):
+        if i < self.period - 1:
+            swma_list.append(None)
+        else:
+            window = price_series.iloc[i - self.period + 1 : i + 1]
+            weighted_sum = sum(w * price for w, price in zip(weights, window))
+            swma_value = weighted_sum / sum(weights)
+            swma_list.append(swma_value)
+    self.swma = pd.Series(swma_list, index=df.index)
+    return self.swma
+
+
+def _reference_TDSequentialStrategies_compute_values(self, df):
+    buy_counts = [0] * len(df)
+    sell_counts = [0] * len(df)
+    closes = df['Close'].tolist()
+    for i in range(len(df)):
+        if i < 4:
+            buy_counts[i] = 0
+            sell_counts[i] = 0
+        else:
+            if closes[i] < closes[i - 4]:
+                buy_counts[i] = buy_counts[i - 1] + 1
+            else:
+                buy_counts[i] = 0
+            if closes[i] > closes[i - 4]:
+                sell_counts[i] = sell_counts[i - 1] + 1
+            else:
+                sell_counts[i] = 0
+    self.buy_setup = pd.Series(buy_counts, index=df.index)
+    self.sell_setup = pd.Series(sell_counts, index=df.index)
+    return self.buy_setup, self.sell_setup
+
+
+def _reference_VariableIndexDynamicAverageStrategies_compute_values(self, df):
+    close = df['Close']
+    delta = (close - close.shift(1)).abs()
+    avg_delta = delta.rolling(window=self.period, min_periods=1).mean()
+    alpha = pd.Series(np.where(avg_delta == 0, 0, self.k * (delta / avg_delta)), index=df.index)
+    vidya = pd.Series(index=df.index, dtype=float)
+    vidya.iloc[0] = close.iloc[0]
+    for i in range(1, len(df)):
+        vidya.iloc[i] = alpha.iloc[i] * close.iloc[i] + (1 - alpha.iloc[i]) * vidya.iloc[i-1]
+    self.vidya = vidya
+    return self.vidya
+
+
+def _reference_WildersMovingAverageStrategies_compute_values(self, df):
+    close = df['Close']
+    wma = pd.Series(index=close.index, dtype=float)
+    for i in range(len(close)):
+        if i < self.period:
+            wma.iloc[i] = close.iloc[:i+1].mean()
+        else:
+            wma.iloc[i] = (wma.iloc[i-1]*(self.period - 1) + close.iloc[i]) / self.period
+    return wma
+
+
+# (class name, method name, argument builder)
+REFERENCES = [
+    ('ChandeKrollStopStrategies', 'compute_values', lambda df: (df,)),
+    ('DoubleExponentialMovingAverageStrategies', '_compute_ema', lambda df: (df['Close'].values,)),
+    ('EhlersSuperSmootherFilterStrategies', 'compute_values', lambda df: (df,)),
+    ('ElderRayIndexStrategies', 'compute_values', lambda df: (df,)),
+    ('EldersForceIndexStrategies', 'compute_values', lambda df: (df,)),
+    ('ElasticVolumeMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('ElasticVolumeMACDStrategies', 'elastic_ema', lambda df: (df['Close'], df['Volume'], 12)),
+    ('ElasticVolumeMACDStrategies', 'standard_ema', lambda df: (df['Close'] - df['Open'], 9)),
+    ('ExponentialMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('FibonacciWeightedMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('FisherTransformStrategies', 'compute_values', lambda df: (df,)),
+    ('FractalAdaptiveMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('GannHighLowActivatorStrategies', 'compute_values', lambda df: (df,)),
+    ('HoltWinterChannelStrategies', 'compute_values', lambda df: (df,)),
+    ('HoltWinterMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('HullExponentialMovingAverageStrategies', 'compute_ema', lambda df: (df['Close'], 10)),
+    ('JurikMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('KDJIndicatorStrategies', 'compute_values', lambda df: (df,)),
+    ('KaufmanAdaptiveMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('McGinleyDynamicStrategies', 'compute_values', lambda df: (df,)),
+    ('MovingStandardDeviationStrategies', 'compute_values', lambda df: (df,)),
+    ('NegativeVolumeIndexStrategies', 'compute_values', lambda df: (df,)),
+    ('OnBalanceVolumeStrategies', 'compute_values', lambda df: (df,)),
+    ('ParabolicStopAndReverseStrategies', 'compute_values', lambda df: (df,)),
+    ('PascalsWeightedMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('PositiveVolumeIndexStrategies', 'compute_values', lambda df: (df,)),
+    ('QStickStrategies', 'compute_values', lambda df: (df,)),
+    ('SmoothedExponentialMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('SmoothedSimpleMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('StopAndReverseStrategies', 'compute_values', lambda df: (df,)),
+    ('SupertrendStrategies', 'compute_values', lambda df: (df,)),
+    ('SymmetricWeightedMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('TDSequentialStrategies', 'compute_values', lambda df: (df,)),
+    ('VariableIndexDynamicAverageStrategies', 'compute_values', lambda df: (df,)),
+    ('WildersMovingAverageStrategies', 'compute_values', lambda df: (df,)),
+]
+
+
+def make_ohlcv(rows=600, seed=21, with_gaps=False):
+    """Random-walk OHLCV; with_gaps adds NaN closes and zero-volume bars"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, rows)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    df = pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(1000, 50000, rows),
+    })
+    if with_gaps:
+        df.loc[100:102, 'Close'] = np.nan
+        df.loc[200, 'Volume'] = 0
+    return df
+
+
+def flatten_outputs(result):
+    """Turn Series/DataFrame/array/tuple outputs into a list of float arrays"""
+    if isinstance(result, tuple):
+        return [array for item in result for array in flatten_outputs(item)]
+    if isinstance(result, pd.DataFrame):
+        return [result[col].to_numpy(dtype=float) for col in result.columns]
+    return [np.asarray(result, dtype=float)]
+
+
+def test_kernels_match_original_loops():
+    """Kernel-backed methods reproduce the original loops on clean and gappy data"""
+    import ta_strategies_TVLibrary as tv
+    import tv_kernels
+
+    print(f"\n🧪 TESTING TV KERNELS (backend: {tv_kernels.BACKEND})")
+    reference_funcs = globals()
+    for with_gaps in (False, True):
+        df = make_ohlcv(with_gaps=with_gaps)
+        for class_name, method_name, build_args in REFERENCES:
+            instance = getattr(tv, class_name)()
+            expected = reference_funcs[f"_reference_{class_name}_{method_name}"](instance, *build_args(df.copy()))
+            actual = getattr(instance, method_name)(*build_args(df.copy()))
+
+            expected_arrays, actual_arrays = flatten_outputs(expected), flatten_outputs(actual)
+            assert len(expected_arrays) == len(actual_arrays), class_name
+            for expected_array, actual_array in zip(expected_arrays, actual_arrays):
+                # Exact with the Python backend; numba may reorder float ops by an ulp
+                np.testing.assert_allclose(actual_array, expected_array, rtol=1e-12, atol=0,
+                                           equal_nan=True, err_msg=f"{class_name}.{method_name}")
+    print(f"✅ {len(REFERENCES)} kernel-backed methods match the original loops")
+
+
+def test_kernels_handle_short_inputs():
+    """Empty and single-bar inputs don't crash the kernels"""
+    import tv_kernels
+
+    for length in (0, 1, 2):
+        values = np.arange(1, length + 1, dtype=float)
+        assert len(tv_kernels.exponential_smoothing(values, 0.5)) == length
+        assert len(tv_kernels.adaptive_smoothing(values, 0.5)) == length
+        assert len(tv_kernels.smoothed_average(values, 14)) == length
+        assert len(tv_kernels.holt_linear(values, 0.2, 0.1)) == length
+        assert len(tv_kernels.stop_and_reverse(values, values, values, 0.02, 0.2)) == length
+        assert len(tv_kernels.setup_counts(values)[0]) == length
+
+
+if __name__ == "__main__":
+    test_kernels_match_original_loops()
+    test_kernels_handle_short_inputs()
@@ -0,0 +1,47 @@
+"""
+Tests for integer-coded signal values and explanations
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def test_coded_map_matches_series_map():
+    """Categorical codes decode to exactly what series.map produced"""
+    from tv_labels import coded_map, materialize_labels
+
+    print("\n🧪 TESTING CODED SIGNAL LABELS")
+    scores = pd.Series([1, 0, -1, 0, 2, 1], index=pd.date_range('2024-01-01', periods=6))
+    mapping_value = {1: 'Bullish', -1: 'Bearish', 0: 'Neutral'}
+    mapping_explanation = {1: 'Rising.', -1: 'Falling.', 0: 'Rising.'}
+
+    value, explanation = coded_map(scores, mapping_value, mapping_explanation)
+    assert isinstance(value.dtype, pd.CategoricalDtype) and value.cat.codes.dtype == np.int8
+    assert list(explanation.cat.categories) == ['Rising.', 'Falling.']
+    pd.testing.assert_series_equal(materialize_labels(value), scores.map(mapping_value))
+    pd.testing.assert_series_equal(materialize_labels(explanation), scores.map(mapping_explanation))
+    print("✅ Codes decode to the mapped strings (unmapped scores stay NaN)")
+
+
+def test_library_outputs_are_coded():
+    """TV library _Value/_Explanation columns are categorical and materialize to strings"""
+    import ta_strategies_TVLibrary as tv
+    from test_data_sources import synthetic_ohlcv
+    from tv_labels import label_tables, materialize_labels
+
+    df = synthetic_ohlcv(9, 'LBL')
+    result = tv.AberrationStrategies().run_all_strategies(df, append=False, signal_value=True, signal_explanation=True)
+    label_columns = [col for col in result.columns if col.endswith(('_Value', '_Explanation'))]
+    assert len(label_columns) == 6
+    assert set(label_tables(result)) == set(label_columns)
+
+    strings = materialize_labels(result)
+    assert all(strings[col].dtype == object for col in label_columns)
+    assert strings[label_columns[0]].isin(label_tables(result)[label_columns[0]].values()).all()
+    print(f"✅ {len(label_columns)} label columns coded; "
+          f"{result.memory_usage(deep=True).sum() / 1e3:.0f} KB vs {strings.memory_usage(deep=True).sum() / 1e3:.0f} KB as strings")
+
+
+if __name__ == "__main__":
+    test_coded_map_matches_series_map()
+    test_library_outputs_are_coded()
@@ -0,0 +1,74 @@
+"""
+Tests for per-dataset memoization of TV library strategy instances
+"""
+
+import pandas as pd
+
+from test_data_sources import synthetic_ohlcv
+
+
+def test_instance_reused_across_tickers():
+    """A reused instance gives each ticker its own indicator, not the first ticker's"""
+    import ta_strategies_TVLibrary as tv
+
+    print("\n🧪 TESTING PER-DATASET MEMOIZATION")
+    first, second = synthetic_ohlcv(1, 'T1', '1y'), synthetic_ohlcv(2, 'T2', '1y')
+    strategy = tv.AberrationStrategies()
+    first_result = strategy.run_all_strategies(first, append=False, ta_indicator_value=True)
+    first_indicator = strategy.aberration
+    second_result = strategy.run_all_strategies(second, append=False, ta_indicator_value=True)
+
+    pd.testing.assert_frame_equal(
+        second_result, tv.AberrationStrategies().run_all_strategies(second, append=False, ta_indicator_value=True))
+    assert not first_result.equals(second_result)
+
+    # Switching back restores the memoized indicator instead of recomputing it
+    strategy.run_all_strategies(first.copy(), append=False)
+    assert strategy.aberration is first_indicator
+    pd.testing.assert_series_equal(strategy.aberration, tv.AberrationStrategies().compute_values(first))
+    print("✅ Reused instance matches fresh instances on every ticker")
+
+
+def test_group_runner_reused_across_tickers():
+    """One AllVolatilityStrategies object processes several tickers without stale results"""
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies
+
+    runner = AllVolatilityStrategies(max_workers=2)
+    for seed in (3, 4, 3):
+        df = synthetic_ohlcv(seed, f'T{seed}', '1y')
+        runner.run_all_strategies(df, append=False)
+        fresh = AllVolatilityStrategies(max_workers=2)
+        fresh.run_all_strategies(df, append=False)
+        for name in runner.strategy_names:
+            pd.testing.assert_frame_equal(getattr(runner, f"{name}_df"), getattr(fresh, f"{name}_df"))
+    print("✅ Group runner reused across tickers")
+
+
+def test_memo_is_bounded_and_parameter_aware():
+    """Old datasets are evicted, and changing a parameter invalidates the memo"""
+    import ta_strategies_TVLibrary as tv
+    import tv_memo
+
+    tv_memo.configure(max_datasets=2)
+    try:
+        strategy = tv.AberrationStrategies()
+        frames = [synthetic_ohlcv(seed, f'T{seed}', '1y') for seed in (5, 6, 7, 8)]
+        for df in frames:
+            strategy.calculate_scores_zero_cross_strategy(df)
+        assert len(strategy._tv_memo) == 2
+
+        strategy.period = 5
+        strategy.calculate_scores_zero_cross_strategy(frames[-1])
+        pd.testing.assert_series_equal(strategy.aberration, tv.AberrationStrategies(period=5).compute_values(frames[-1]))
+
+        tv_memo.clear(strategy)
+        assert strategy.aberration is None and not strategy._tv_memo
+    finally:
+        tv_memo.configure()
+    print("✅ Memo bounded and keyed by parameters")
+
+
+if __name__ == "__main__":
+    test_instance_reused_across_tickers()
+    test_group_runner_reused_across_tickers()
+    test_memo_is_bounded_and_parameter_aware()
@@ -0,0 +1,90 @@
+"""
+Tests for preallocated result assembly (tv_output.OutputBlock)
+"""
+
+import numpy as np
+import pandas as pd
+
+from test_data_sources import synthetic_ohlcv
+
+
+def test_output_block_storage():
+    """Scores, indicators and labels land in typed matrices; capacity grows when exceeded"""
+    from tv_output import OutputBlock
+
+    print("\n🧪 TESTING OUTPUT BLOCK")
+    index = pd.RangeIndex(5)
+    block = OutputBlock(5, score_capacity=1)
+    labels = pd.Series(pd.Categorical(['Up', 'Down', None, 'Up', 'Up']), index=index)
+    block.add_columns([('B_Value', np.linspace(0, 1, 5)), ('B_Score', pd.Series([1, -1, 0, 0, 1]))], owner='B')
+    block.add_columns([('A_Score', np.array([0, 1, 1, -1, 0])), ('A_Label', labels)], owner='A')
+    block.add_columns([('B_Extra_Score', np.array([2, 2, 2, 2, 2]))], owner='B')
+
+    assert block.columns == ['B_Value', 'B_Score', 'B_Extra_Score', 'A_Score', 'A_Label']
+    raw = block.arrays()
+    assert raw['score'][0] == ['B_Score', 'B_Extra_Score', 'A_Score'] and raw['score'][1].dtype == np.int8
+    assert raw['indicator'][1].dtype == np.float32
+    assert raw['label_tables']['A_Label'] == {0: 'Down', 1: 'Up'}
+
+    frame = block.to_frame(index)
+    assert frame['A_Score'].tolist() == [0, 1, 1, -1, 0]
+    pd.testing.assert_series_equal(frame['A_Label'], labels, check_names=False)
+    print("✅ Typed storage, growth and owner-grouped column order working")
+
+
+def test_emit_keeps_legacy_behaviour():
+    """Without a bound block, emit writes into df on append and returns the columns as a frame"""
+    import tv_output
+
+    class Strategy:
+        pass
+
+    df = pd.DataFrame({'Close': [1.0, 2.0, 3.0]})
+    score = pd.Series([1, 0, -1])
+    result = tv_output.emit(Strategy(), df, True, [('X_Score', score)])
+    assert list(df.columns) == ['Close', 'X_Score'] and result['X_Score'].equals(score)
+
+
+def test_block_assembly_matches_concat():
+    """output="frame" gives the same columns and values as the concat path, built once"""
+    from ta_strategies_combinations_TVLibrary import AllMomentumStrategies
+    from tv_output import OutputBlock
+
+    df = synthetic_ohlcv(13, 'OUT')
+    options = dict(ta_indicator_value=True, signal_value=True)
+    concatenated = AllMomentumStrategies().run_all_strategies(df.copy(), append=False, **options)
+    assembled = AllMomentumStrategies().run_all_strategies(df.copy(), append=False, output="frame", **options)
+
+    assert sorted(concatenated.columns) == sorted(assembled.columns)
+    for name in dict.fromkeys(concatenated.columns):
+        if concatenated.columns.get_indexer_for([name]).size > 1:
+            continue  # a few classes share column names; their relative order isn't defined
+        expected, actual = concatenated[name], assembled[name]
+        if expected.dtype.kind in 'iu':
+            assert actual.dtype == np.int8 and (expected.to_numpy() == actual.to_numpy()).all(), name
+        elif expected.dtype.kind == 'f':
+            np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-6, equal_nan=True, err_msg=name)
+        else:
+            assert expected.astype(object).equals(actual.astype(object)), name
+
+    block = AllMomentumStrategies().run_all_strategies(df.copy(), append=False, output="block")
+    assert isinstance(block, OutputBlock) and block.arrays()['score'][1].shape[1] == len(df)
+    print(f"✅ {assembled.shape[1]} columns assembled in one block")
+
+
+def test_block_append_writes_every_column():
+    """append=True with a block adds the same columns a single-worker concat run does"""
+    from ta_strategies_combinations_TVLibrary import AllVolumeStrategies
+
+    df = synthetic_ohlcv(13, 'OUT')
+    legacy, assembled = df.copy(), df.copy()
+    AllVolumeStrategies(max_workers=1).run_all_strategies(legacy, append=True)
+    AllVolumeStrategies().run_all_strategies(assembled, append=True, output="frame")
+    assert set(legacy.columns) == set(assembled.columns)
+
+
+if __name__ == "__main__":
+    test_output_block_storage()
+    test_emit_keeps_legacy_behaviour()
+    test_block_assembly_matches_concat()
+    test_block_append_writes_every_column()
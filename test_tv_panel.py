@@ -0,0 +1,79 @@
+"""
+Tests for the multi-ticker (time x ticker) panel mode of the TV library
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_frames(tickers=('AAA', 'BBB', 'CCC', 'DDD')):
+    from test_data_sources import synthetic_ohlcv
+
+    return {ticker: synthetic_ohlcv(61, ticker) for ticker in tickers}
+
+
+def single_ticker_run(cls, frame):
+    return cls().run_all_strategies(frame.copy(), append=False, ta_indicator_value=True, signal_value=True)
+
+
+def test_panel_from_wide_layout():
+    """The `{ticker}_{field}` layout of download_multi_ticker_data becomes one frame per field"""
+    from tv_panel import Panel
+
+    print("\n🧪 TESTING TV PANEL MODE")
+    frames = make_frames()
+    wide = pd.DataFrame({'Date': frames['AAA'].index})
+    for ticker, frame in frames.items():
+        for field in ('Open', 'High', 'Low', 'Close', 'Volume'):
+            wide[f'{ticker}_1_{field}'] = frame[field].to_numpy()
+    panel = Panel.from_wide(wide)
+    assert list(panel.tickers) == ['AAA_1', 'BBB_1', 'CCC_1', 'DDD_1']
+    assert panel.shape == (len(frames['AAA']), 4) and 'Volume' in panel
+    assert np.array_equal(panel.ticker_frame('BBB_1')['Close'].to_numpy(), frames['BBB']['Close'].to_numpy())
+    print(f"✅ Panel of {panel.shape[1]} tickers x {panel.shape[0]} rows")
+
+
+def test_vectorized_class_matches_single_ticker_runs():
+    import tv_panel
+    from ta_strategies_TVLibrary import BollingerBandsStrategies
+
+    frames = make_frames()
+    panel = tv_panel.Panel.from_frames(frames)
+    assert tv_panel.panel_supported(BollingerBandsStrategies())
+    outputs = tv_panel.run_panel(BollingerBandsStrategies(), panel, ta_indicator_value=True, signal_value=True)
+    for ticker, frame in frames.items():
+        expected = single_ticker_run(BollingerBandsStrategies, frame)
+        expected = expected.loc[:, ~expected.columns.duplicated(keep='last')]
+        actual = tv_panel.ticker_outputs(outputs, ticker)
+        assert list(actual.columns) == list(expected.columns)
+        for column in expected.columns:
+            left, right = actual[column], expected[column]
+            if isinstance(right.dtype, pd.CategoricalDtype):
+                assert left.equals(right.astype(object))
+            else:
+                assert np.array_equal(left.to_numpy(np.float64), right.to_numpy(np.float64), equal_nan=True), column
+    print(f"✅ {len(outputs)} vectorized columns match per-ticker runs")
+
+
+def test_group_runner_panel_with_fallback():
+    """Classes that can't vectorize (e.g. Keltner's kernels) still run, ticker by ticker"""
+    import tv_panel
+    from ta_strategies_TVLibrary import KeltnerChannelStrategies
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies
+
+    frames = make_frames(('AAA', 'BBB'))
+    panel = tv_panel.Panel.from_frames(frames)
+    assert not tv_panel.panel_supported(KeltnerChannelStrategies())
+    outputs = AllVolatilityStrategies().run_panel(panel)
+    for ticker, frame in frames.items():
+        expected = AllVolatilityStrategies(max_workers=1).run_all_strategies(frame.copy(), append=False)
+        expected = expected.loc[:, ~expected.columns.duplicated(keep='last')]
+        actual = tv_panel.ticker_outputs(outputs, ticker)[expected.columns]
+        assert np.array_equal(actual.to_numpy(np.float64), expected.to_numpy(np.float64), equal_nan=True)
+    print(f"✅ {len(outputs)} columns over {len(frames)} tickers")
+
+
+if __name__ == "__main__":
+    test_panel_from_wide_layout()
+    test_vectorized_class_matches_single_ticker_runs()
+    test_group_runner_panel_with_fallback()
@@ -0,0 +1,86 @@
+"""
+Tests for primitives shared across TV library strategy classes
+"""
+
+import numpy as np
+import pandas as pd
+
+from test_data_sources import synthetic_ohlcv
+
+
+def test_primitives_match_pandas_expressions():
+    """Each primitive equals the expression the library classes used to inline"""
+    import tv_primitives
+
+    print("\n🧪 TESTING SHARED PRIMITIVES")
+    df = synthetic_ohlcv(31, 'PRIM')
+    prev_close = df['Close'].shift(1)
+    components = [df['High'] - df['Low'], (df['High'] - prev_close).abs(), (df['Low'] - prev_close).abs()]
+    true_range = pd.concat(components, axis=1).max(axis=1)
+    strict = np.maximum(np.maximum(*components[:2]), components[2])
+
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'true_range'), true_range)
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'ATR', 14, 1), true_range.rolling(window=14, min_periods=1).mean())
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'ATR', 14, 14, False),
+                                   pd.Series(strict).rolling(window=14, min_periods=14).mean())
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'rolling_max', 'High', 20, 1),
+                                   df['High'].rolling(window=20, min_periods=1).max())
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'ema', 'Close', 12),
+                                   df['Close'].ewm(span=12, adjust=False).mean())
+    pd.testing.assert_series_equal(tv_primitives.get(df, 'typical_price'), (df['High'] + df['Low'] + df['Close']) / 3)
+    print("✅ Primitives match the inline expressions")
+
+
+def test_store_computes_once_and_shares_read_only():
+    import tv_primitives
+
+    df = synthetic_ohlcv(31, 'PRIM')
+    with tv_primitives.sharing(df) as store:
+        atr = tv_primitives.get(df, 'ATR', 14, 1)
+        assert tv_primitives.get(df, 'ATR', 14, 1, True) is atr
+        assert tv_primitives.get(df, 'rolling_sum', ('true_range',), 14, 1) is not None
+        assert store.computed == 3 and store.requests == 5  # ATR, true_range, rolling_sum
+        assert tv_primitives.get(df.copy(), 'ATR', 14, 1) is not atr  # other frames aren't shared
+        try:
+            atr.iloc[0] = 0.0
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("shared primitives must be read-only")
+    assert tv_primitives.store_for(df) is None
+
+    for bad_key in (('ATR',), ('sma', 'Close'), ('median', 'Close', 5)):
+        try:
+            tv_primitives.get(df, *bad_key)
+        except (KeyError, TypeError):
+            continue
+        raise AssertionError(f"expected an error for {bad_key}")
+
+
+def test_group_runner_shares_primitives():
+    """A group run computes each shared primitive once across all classes"""
+    import tv_primitives
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies
+
+    df = synthetic_ohlcv(31, 'PRIM')
+    stores = []
+    original = tv_primitives.PrimitiveStore
+
+    class RecordingStore(original):
+        def __init__(self, frame):
+            super().__init__(frame)
+            stores.append(self)
+
+    tv_primitives.PrimitiveStore = RecordingStore
+    try:
+        AllVolatilityStrategies().run_all_strategies(df, append=False)
+    finally:
+        tv_primitives.PrimitiveStore = original
+    assert len(stores) == 1 and stores[0].requests > stores[0].computed > 0
+    print(f"✅ {stores[0].requests} primitive requests served by {stores[0].computed} computations")
+
+
+if __name__ == "__main__":
+    test_primitives_match_pandas_expressions()
+    test_store_computes_once_and_shares_read_only()
+    test_group_runner_shares_primitives()
@@ -0,0 +1,74 @@
+"""
+Tests for the shared-memory process executor behind StrategyGroupRunner
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(rows=400, seed=11):
+    """Synthetic OHLCV with an int Volume column and a non-numeric Date column"""
+    from test_data_sources import synthetic_ohlcv
+
+    df = synthetic_ohlcv(seed, 'POOL', '5y').tail(rows)
+    df = df.reset_index()
+    df['Date'] = df['Date'].astype(str)
+    df['Volume'] = df['Volume'].astype(np.int64)
+    return df
+
+
+def test_shared_frame_round_trip():
+    """Workers see the same frame (values, dtypes, index) the parent published"""
+    from tv_process_pool import SharedFrame, attach_frame, pack_frame, unpack_frame
+
+    print("\n🧪 TESTING SHARED-MEMORY FRAME")
+    df = make_ohlcv()
+    with SharedFrame(df) as shared:
+        memory, frame = attach_frame(shared.spec())
+        try:
+            pd.testing.assert_frame_equal(frame, df)
+            assert not frame['Close'].to_numpy().flags.writeable
+        finally:
+            del frame
+            memory.close()
+
+    result = pd.DataFrame({'A_Score': np.array([1, 0, -1] * 4), 'A_Value': np.linspace(0, 1, 12),
+                           'A_Explanation': ['up', 'flat', 'down'] * 4,
+                           'A_Label': pd.Categorical(['Up', None, 'Down'] * 4)})
+    columns, arrays = pack_frame(result)
+    assert arrays[0][1].dtype == np.int8
+    pd.testing.assert_frame_equal(unpack_frame((columns, arrays), result.index), result)
+    print("✅ Shared frame and packed results round-trip exactly")
+
+
+def test_process_executor_matches_thread_executor():
+    """The process executor produces the same per-strategy frames as the thread executor"""
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies
+
+    df = make_ohlcv()
+    options = dict(append=False, ta_indicator_value=True, signal_explanation=True)
+    threaded = AllVolatilityStrategies(max_workers=2)
+    threaded.run_all_strategies(df, **options)
+    pooled = AllVolatilityStrategies(max_workers=2, executor="process")
+    combined = pooled.run_all_strategies(df, **options)
+
+    assert not combined.empty
+    for name in pooled.strategy_names:
+        pd.testing.assert_frame_equal(getattr(pooled, f"{name}_df"), getattr(threaded, f"{name}_df"))
+    print(f"✅ {len(pooled.strategy_names)} strategies identical across thread and process executors")
+
+
+def test_unknown_executor_rejected():
+    from ta_strategies_combinations_TVLibrary import AllStrategies
+
+    try:
+        AllStrategies(executor="fiber")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for an unknown executor")
+
+
+if __name__ == "__main__":
+    test_shared_frame_round_trip()
+    test_process_executor_matches_thread_executor()
+    test_unknown_executor_rejected()
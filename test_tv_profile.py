@@ -0,0 +1,64 @@
+"""
+Tests for the per-strategy cost profile and longest-task-first scheduling
+"""
+
+import os
+import tempfile
+
+
+def test_profile_schedule_and_report():
+    """Unprofiled strategies start first, then the most expensive ones"""
+    from tv_profile import StrategyProfile
+
+    print("\n🧪 TESTING STRATEGY COST PROFILE")
+    profile = StrategyProfile()
+    profile.record('Fast', 1000, wall_seconds=0.02, cpu_seconds=0.01, output_bytes=1000)
+    profile.record('Slow', 1000, wall_seconds=0.5, cpu_seconds=0.4, output_bytes=8000)
+    profile.record('Medium', 2000, wall_seconds=0.2, cpu_seconds=0.2, output_bytes=2000)
+
+    assert profile.schedule(['Fast', 'Medium', 'New', 'Slow'], 1000) == ['New', 'Slow', 'Medium', 'Fast']
+    assert abs(profile.expected_seconds('Medium', 4000) - 0.4) < 1e-12
+
+    profile.record('Slow', 1000, wall_seconds=0.1, cpu_seconds=0.1, output_bytes=8000)
+    assert profile.entries['Slow']['runs'] == 2
+    assert 0.1 < profile.expected_seconds('Slow', 1000) < 0.4  # smoothed, not replaced
+
+    report = profile.report(rows=1000)
+    assert list(report.index) == ['Slow', 'Medium', 'Fast']
+    assert abs(report['share'].sum() - 1.0) < 1e-9
+    print("✅ Longest-task-first order and report working")
+
+
+def test_chunks_balanced_by_cost():
+    from tv_process_pool import chunk_items
+
+    items = [(name, None) for name in 'abcdef']
+    chunks = chunk_items(items, 2, costs=[5, 1, 1, 1, 1, 1])
+    assert [name for name, _ in chunks[0]] == ['a']
+    assert sorted(name for name, _ in chunks[1]) == ['b', 'c', 'd', 'e', 'f']
+    assert chunk_items(items, 2) == [items[0::2], items[1::2]]
+
+
+def test_runner_persists_profile():
+    """A runner given a path records every strategy and a new runner picks the profile up"""
+    from test_data_sources import synthetic_ohlcv
+    from ta_strategies_combinations_TVLibrary import AllVolumeStrategies
+
+    df = synthetic_ohlcv(51, 'PROF')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'profile.json')
+        runner = AllVolumeStrategies(profile=path)
+        runner.run_all_strategies(df, append=False)
+        assert set(runner.last_timings) == set(AllVolumeStrategies.strategy_names)
+        assert os.path.exists(path)
+
+        reloaded = AllVolumeStrategies(profile=path).profile
+        assert set(reloaded.entries) == set(AllVolumeStrategies.strategy_names)
+        assert all(entry['output_bytes_per_row'] > 0 for entry in reloaded.entries.values())
+        reloaded.print_report(rows=len(df), top=5)
+
+
+if __name__ == "__main__":
+    test_profile_schedule_and_report()
+    test_chunks_balanced_by_cost()
+    test_runner_persists_profile()
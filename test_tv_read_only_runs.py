@@ -0,0 +1,62 @@
+"""
+Tests for the read-only input contract and deterministic merging of the group runners
+"""
+
+import numpy as np
+import pandas as pd
+
+from test_data_sources import synthetic_ohlcv
+
+
+def test_read_only_view_shares_memory():
+    """Workers' view shares df's arrays, rejects in-place writes and keeps new columns to itself"""
+    from ta_strategies_combinations_TVLibrary import _read_only_view
+
+    print("\n🧪 TESTING READ-ONLY RUNNER INPUT")
+    df = synthetic_ohlcv(41, 'RO')
+    view = _read_only_view(df)
+    pd.testing.assert_frame_equal(view, df)
+    assert np.shares_memory(view['Close'].to_numpy(), df['Close'].to_numpy())
+    try:
+        view['Close'].to_numpy()[0] = 0.0
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("view columns must be read-only")
+    view['Extra'] = 1.0
+    assert 'Extra' not in df.columns
+    print("✅ Read-only view shares the input without copying")
+
+
+def test_runs_leave_input_untouched_and_merge_in_order():
+    """The input frame is never modified, and the merged result doesn't depend on worker count"""
+    from ta_strategies_combinations_TVLibrary import AllTrendStrategies
+
+    df = synthetic_ohlcv(41, 'RO')
+    original = df.copy()
+    flags = dict(ta_indicator_value=True, signal_value=True)
+    single = AllTrendStrategies(max_workers=1).run_all_strategies(df, append=False, **flags)
+    many = AllTrendStrategies(max_workers=8).run_all_strategies(df, append=False, **flags)
+    pd.testing.assert_frame_equal(df, original)
+    assert single.columns.equals(many.columns) and single.equals(many)
+
+    framed = AllTrendStrategies(max_workers=8).run_all_strategies(df, append=False, output="frame")
+    assert framed.columns.equals(AllTrendStrategies(max_workers=2).run_all_strategies(
+        df, append=False, output="frame").columns)
+    print(f"✅ {many.shape[1]} columns merged in strategy order")
+
+
+def test_append_writes_once_after_all_workers():
+    """append=True gives the same frame whatever the worker count"""
+    from ta_strategies_combinations_TVLibrary import AllVolatilityStrategies
+
+    single, many = synthetic_ohlcv(41, 'RO'), synthetic_ohlcv(41, 'RO')
+    AllVolatilityStrategies(max_workers=1).run_all_strategies(single)
+    AllVolatilityStrategies(max_workers=8).run_all_strategies(many)
+    pd.testing.assert_frame_equal(single, many)
+
+
+if __name__ == "__main__":
+    test_read_only_view_shares_memory()
+    test_runs_leave_input_untouched_and_merge_in_order()
+    test_append_writes_once_after_all_workers()
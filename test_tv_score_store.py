@@ -0,0 +1,92 @@
+"""
+Tests for the memory-mapped score matrix export
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+def test_store_round_trip_and_append():
+    """Slices are views of the mapped file; appends skip known bars and survive a torn write"""
+    from tv_score_store import SCORES_FILE, ScoreStore, create_store
+
+    print("\n🧪 TESTING SCORE STORE")
+    index = pd.date_range('2024-01-01', periods=6, freq='D')
+    scores = np.arange(18, dtype=np.int8).reshape(6, 3) % 3 - 1
+    columns = [{'name': 'A_Score', 'strategy': 'A'}, {'name': 'B1_Score', 'strategy': 'B'},
+               {'name': 'B2_Score', 'strategy': 'B'}]
+    with tempfile.TemporaryDirectory() as path:
+        store = create_store(path, scores, index, columns)
+        assert store.shape == (6, 3) and store.index.equals(index)
+        view = store.select(strategy='B', start='2024-01-03')
+        assert isinstance(view, np.memmap) and np.array_equal(view, scores[2:, 1:])
+        assert not view.flags.writeable
+        assert store.frame(names='A_Score', end='2024-01-02')['A_Score'].tolist() == scores[:2, 0].tolist()
+
+        # A torn append: bytes written to the matrix but the sidecar never updated
+        with open(os.path.join(path, SCORES_FILE), 'ab') as f:
+            f.write(b'\x05' * 3)
+        writable = ScoreStore(path, mode='r+')
+        longer = pd.date_range('2024-01-01', periods=8, freq='D')
+        extra = np.full((8, 3), 1, dtype=np.int8)
+        assert writable.append(extra, longer) == 2
+        assert writable.append(extra, longer) == 0
+        reopened = ScoreStore(path)
+        assert reopened.shape == (8, 3) and reopened.index.equals(longer)
+        assert np.array_equal(reopened.scores[:6], scores) and (reopened.scores[6:] == 1).all()
+        try:
+            create_store(path, scores, index, columns)
+        except FileExistsError:
+            pass
+        else:
+            raise AssertionError("existing stores must not be overwritten silently")
+    print("✅ Zero-copy slices and incremental appends working")
+
+
+def test_runner_export_matches_scores():
+    from test_data_sources import synthetic_ohlcv
+    from ta_strategies_combinations_TVLibrary import AllVolumeStrategies
+
+    df = synthetic_ohlcv(71, 'STORE')
+    expected = AllVolumeStrategies().run_all_strategies(df, append=False)
+    with tempfile.TemporaryDirectory() as path:
+        store = AllVolumeStrategies().export_scores(df.iloc[:-5], path)
+        assert store.shape == (len(df) - 5, expected.shape[1])
+        store = AllVolumeStrategies().export_scores(df, path)
+        assert store.names == list(expected.columns)
+        assert np.array_equal(np.asarray(store.scores), expected.to_numpy())
+        meta = store.columns
+        assert set(meta['strategy']) == set(AllVolumeStrategies.strategy_names)
+        assert meta['sub_strategy'].notna().all() and isinstance(meta['params'][0], dict)
+    print(f"✅ {expected.shape[1]} score columns exported with metadata")
+
+
+def test_export_uses_date_column():
+    """Frames with a RangeIndex are stamped by their Date column; bare row numbers are refused"""
+    from test_data_sources import synthetic_ohlcv
+    from ta_strategies_combinations_TVLibrary import AllVolumeStrategies
+
+    dated = synthetic_ohlcv(72, 'STORE')
+    df = dated.reset_index()  # As inputs.download_and_prepare_data returns it
+    with tempfile.TemporaryDirectory() as path:
+        AllVolumeStrategies().export_scores(df.iloc[:-5], path)
+        store = AllVolumeStrategies().export_scores(df, path)
+        assert store.index.equals(pd.DatetimeIndex(dated.index)) and len(store) == len(df)
+        assert store.rows(start=dated.index[-5]) == slice(len(df) - 5, len(df))
+    with tempfile.TemporaryDirectory() as path:
+        try:
+            AllVolumeStrategies().export_scores(df.drop(columns='Date'), path)
+        except ValueError as e:
+            assert "datetime timestamps" in str(e) and not os.listdir(path)
+        else:
+            raise AssertionError("row numbers must not be stored as timestamps")
+    print("✅ Date column used for RangeIndex frames")
+
+
+if __name__ == "__main__":
+    test_store_round_trip_and_append()
+    test_runner_export_matches_scores()
+    test_export_uses_date_column()
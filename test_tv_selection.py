@@ -0,0 +1,98 @@
+"""
+Tests for strategy subset selection in the TV library group runners
+"""
+
+import numpy as np
+
+from test_data_sources import synthetic_ohlcv
+
+
+def assert_same_columns(selected, full):
+    """Every selected column exists in the full run with the same values"""
+    for name in selected.columns:
+        if full.columns.get_indexer_for([name]).size > 1 or selected.columns.get_indexer_for([name]).size > 1:
+            continue  # a few classes share indicator column names
+        expected, actual = full[name], selected[name]
+        if expected.dtype.kind == 'f':
+            np.testing.assert_allclose(actual.to_numpy(dtype=float), expected.to_numpy(), rtol=1e-6, equal_nan=True)
+        else:
+            assert expected.astype(object).equals(actual.astype(object)), name
+
+
+def test_class_and_category_selection():
+    """Name patterns and categories decide which classes are instantiated at all"""
+    from ta_strategies_combinations_TVLibrary import AllStrategies
+    from tv_selection import StrategySelector
+
+    print("\n🧪 TESTING STRATEGY SELECTION")
+    runner = AllStrategies(selector=StrategySelector(include='Stochastic*', exclude='*RSI*'))
+    assert runner.selected_names == [name for name in AllStrategies.strategy_names
+                                     if name.startswith('Stochastic') and 'RSI' not in name]
+    assert set(runner.strategy_instances) == set(runner.selected_names)
+
+    volume = AllStrategies(selector=StrategySelector(categories='volume', exclude='OnBalance*'))
+    assert 'ChaikinMoneyFlowStrategies' in volume.selected_names
+    assert 'OnBalanceVolumeStrategies' not in volume.selected_names
+    assert 'RelativeStrengthIndexStrategies' not in volume.selected_names
+
+    try:
+        StrategySelector(categories='candles')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError for an unknown category")
+    print("✅ Class and category filters working")
+
+
+def test_kind_selection_matches_full_run():
+    """Selecting sub-strategy kinds returns exactly those columns of the full run"""
+    from ta_strategies_combinations_TVLibrary import AllMomentumStrategies
+    from tv_selection import StrategySelector
+
+    df = synthetic_ohlcv(21, 'SEL')
+    full = AllMomentumStrategies().run_all_strategies(df.copy(), append=False, ta_indicator_value=True)
+    selected = AllMomentumStrategies(selector=StrategySelector(kinds='threshold')).run_all_strategies(
+        df.copy(), append=False, ta_indicator_value=True)
+
+    scores = [name for name in selected.columns if name.endswith('_Score')]
+    assert scores and all('Threshold' in name for name in scores)
+    # The indicator column only comes with the sub-strategy that reports it in a full run
+    assert 'RSI_Period:14_TA_Indicator_Value' not in selected.columns
+    assert_same_columns(selected, full)
+    print(f"✅ {len(scores)} threshold scores selected out of {full.shape[1]} columns")
+
+
+def test_column_patterns_only_run_what_they_need():
+    """Column patterns run only the sub-strategies that emit a matching column"""
+    import ta_strategies_TVLibrary as tv
+    from ta_strategies_combinations_TVLibrary import AllStrategies
+    from tv_selection import StrategySelector
+
+    df = synthetic_ohlcv(21, 'SEL')
+    selector = StrategySelector(columns=['RSI_*_Score', 'Aberration_*_TA_Indicator_Value'])
+    runner = AllStrategies(selector=selector)
+    for output in ("concat", "frame"):
+        result = runner.run_all_strategies(df.copy(), append=False, ta_indicator_value=True, output=output)
+        assert sorted(result.columns) == sorted([
+            'RSI_Period:14_Baseline:50_ZeroCross_Signal_Score',
+            'RSI_Period:14_Upper_Threshold:70_Lower_Threshold:30_Threshold_Signal_Score',
+            'RSI_Period:14_Slope_Signal_Score',
+            'Aberration_Period:20_TA_Indicator_Value',
+        ]), output
+    assert selector.plan(tv.AberrationStrategies()) == (('zero_cross', 'calculate_zero_cross_values', True),)
+    assert selector.plan(tv.MACDStrategies()) == ()
+
+    appended = df.copy()
+    runner.run_all_strategies(appended, append=True)
+    assert [name for name in appended.columns if name not in df.columns] == [
+        name for name in result.columns if name.endswith('_Score')]
+    assert_same_columns(result, tv.RelativeStrengthIndexStrategies().run_all_strategies(
+        df.copy(), append=False).join(tv.AberrationStrategies().run_all_strategies(
+            df.copy(), append=False, ta_indicator_value=True)))
+    print("✅ Column patterns select sub-strategies and trim outputs")
+
+
+if __name__ == "__main__":
+    test_class_and_category_selection()
+    test_kind_selection_matches_full_run()
+    test_column_patterns_only_run_what_they_need()
@@ -0,0 +1,175 @@
+"""
+Tests for tv_windows: vectorized window primitives must match rolling(...).apply(fn, raw=True)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_series(rows=500, seed=5, with_gaps=False):
+    """Random-walk closes; with_gaps adds a NaN run, a flat run and a leading NaN"""
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.015, rows))))
+    if with_gaps:
+        close.iloc[0] = np.nan
+        close.iloc[100:103] = np.nan
+        close.iloc[300:320] = close.iloc[299]
+    return close
+
+
+def rolling_apply(series, window, func, min_periods=None):
+    """The per-bar reference implementation the primitives replace"""
+    min_periods = window if min_periods is None else min_periods
+    return series.rolling(window=window, min_periods=min_periods).apply(func, raw=True).to_numpy()
+
+
+def assert_matches(actual, expected, label):
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-10, equal_nan=True, err_msg=label)
+
+
+def test_window_primitives_match_rolling_apply():
+    """Weighted sums, argmax/argmin, regression and correlation match their rolling-apply forms"""
+    import tv_windows
+
+    print("\n🧪 TESTING TV WINDOW PRIMITIVES")
+    window = 14
+    weights = np.exp(-np.linspace(-2, 2, window) ** 2)
+    x = np.arange(window)
+    for with_gaps in (False, True):
+        close = make_series(with_gaps=with_gaps)
+
+        assert_matches(tv_windows.weighted_average(close, weights),
+                       rolling_apply(close, window, lambda w: np.dot(w, weights) / weights.sum()), "weighted_average")
+        assert_matches(tv_windows.rolling_sum(close, window), rolling_apply(close, window, np.sum), "rolling_sum")
+
+        for func, method in ((tv_windows.rolling_argmax, 'argmax'), (tv_windows.rolling_argmin, 'argmin')):
+            expected = rolling_apply(close, window, lambda w: getattr(w, method)(), min_periods=1)
+            expected[:window - 1] = np.nan
+            np.testing.assert_array_equal(func(close, window), expected, err_msg=method)
+
+        slope, intercept = tv_windows.linear_regression(close, window)
+        assert_matches(slope, rolling_apply(close, window, lambda y: np.polyfit(x, y, 1)[0]), "slope")
+        assert_matches(intercept, rolling_apply(close, window, lambda y: np.polyfit(x, y, 1)[1]), "intercept")
+
+        def corr(w):
+            return 0.0 if np.std(w) == 0 else np.corrcoef(x, w)[0, 1]
+        assert_matches(tv_windows.correlation_with_time(close, window), rolling_apply(close, window, corr), "correlation")
+    print("✅ Window primitives match rolling().apply on clean and gappy data")
+
+
+def test_fill_warmup_matches_min_periods_one():
+    """Warm-up windows reproduce rolling(min_periods=1).apply for the first window-1 bars"""
+    import tv_windows
+
+    close = make_series(with_gaps=True).iloc[:40]
+    window = 10
+    func = lambda w: np.dot(w, np.arange(1, len(w) + 1)) / np.arange(1, len(w) + 1).sum()
+    values = tv_windows.weighted_average(close, np.arange(1, window + 1))
+    tv_windows.fill_warmup(close, window, func, values)
+    assert_matches(values, rolling_apply(close, window, func, min_periods=1), "fill_warmup")
+
+    # Short inputs never reach a full window
+    short = tv_windows.fill_warmup(close[:3], window, func, np.full(3, np.nan))
+    assert_matches(short, rolling_apply(close[:3], window, func, min_periods=1), "short input")
+
+
+def baseline_regression(y):
+    """The original per-window slope and intercept of the LinearRegression* indicators"""
+    n = len(y)
+    x = np.arange(n)
+    denom = n * np.sum(x**2) - (np.sum(x))**2
+    slope = (n * np.dot(x, y) - np.sum(x) * np.sum(y)) / denom if denom != 0 else 0
+    intercept = (np.sum(y) - slope * np.sum(x)) / n
+    return slope, intercept
+
+
+def baseline_linreg_slope(arr):
+    """SlopeStrategies' original per-window linreg_slope"""
+    n = len(arr)
+    x = np.arange(n)
+    sum_x = x.sum()
+    sum_x2 = (x * x).sum()
+    sum_y = arr.sum()
+    sum_xy = (x * arr).sum()
+    denominator = n * sum_x2 - sum_x ** 2
+    if denominator == 0:
+        return 0
+    return (n * sum_xy - sum_x * sum_y) / denominator
+
+
+def baseline_cfo(x):
+    """ChandeForecastOscillatorStrategies' original per-window calc_cfo"""
+    n = len(x)
+    indices = np.arange(1, n + 1)
+    sum_x = indices.sum()
+    sum_x2 = (indices ** 2).sum()
+    sum_y = x.sum()
+    sum_xy = (indices * x).sum()
+    denom = (n * sum_x2 - sum_x ** 2)
+    slope = (n * sum_xy - sum_x * sum_y) / denom if denom != 0 else 0
+    intercept = (sum_y - slope * sum_x) / n
+    forecast = slope * (n + 1) + intercept
+    price = x[-1]
+    return 100 * (price - forecast) / price if price != 0 else 0
+
+
+def regression_checks():
+    """(strategy class, values attribute, baseline per-window function, rolling min_periods)"""
+    import ta_strategies_TVLibrary as tv
+
+    line = lambda y: baseline_regression(y)[1] + baseline_regression(y)[0] * (len(y) - 1)
+    return [
+        (tv.LinearRegressionStrategies, 'reg_line', line, None),
+        (tv.LinearRegressionAngleStrategies, 'lr_angle', lambda y: np.degrees(np.arctan(baseline_regression(y)[0])), None),
+        (tv.LinearRegressionInterceptStrategies, 'lr_intercept', lambda y: baseline_regression(y)[1], None),
+        (tv.LinearRegressionSlopeStrategies, 'slope', lambda y: baseline_regression(y)[0], None),
+        (tv.SlopeStrategies, 'slope', baseline_linreg_slope, 1),
+        (tv.ChandeForecastOscillatorStrategies, 'cfo', baseline_cfo, 1),
+    ]
+
+
+def test_regression_indicators_use_closed_forms():
+    """Regression indicators agree with their original per-window functions"""
+    df = pd.DataFrame({'Close': make_series(with_gaps=True)})
+    for strategy_class, _, baseline, min_periods in regression_checks():
+        strategy = strategy_class()
+        expected = rolling_apply(df['Close'], strategy.period, baseline, min_periods=min_periods)
+        assert_matches(strategy.compute_values(df).to_numpy(), expected, strategy_class.__name__)
+    print("✅ Regression indicators match their per-window baselines")
+
+
+def test_flat_windows_keep_baseline_scores():
+    """On flat runs every regression indicator's scores equal those computed from the rolling-apply baseline"""
+    import tv_windows
+
+    rng = np.random.default_rng(8)
+    for trial in range(40):
+        level = np.round(rng.uniform(1, 500), rng.integers(0, 5))
+        close = np.concatenate([100 * np.exp(np.cumsum(rng.normal(0, 0.01, 40))), np.full(30, level),
+                                100 * np.exp(np.cumsum(rng.normal(0, 0.01, 30))), np.full(5, level)])
+        df = pd.DataFrame({'Close': close})
+
+        # Flat windows carry the per-window formula's rounding residue, not an exact 0
+        slope, intercept = tv_windows.linear_regression(close, 14)
+        for i in range(53, 70):
+            assert (slope[i], intercept[i]) == baseline_regression(close[i - 13:i + 1])
+
+        for strategy_class, attribute, baseline, min_periods in regression_checks():
+            strategy, reference = strategy_class(), strategy_class()
+            expected = rolling_apply(df['Close'], strategy.period, baseline, min_periods=min_periods)
+            setattr(reference, attribute, pd.Series(expected, index=df.index))
+            values = strategy.compute_values(df).to_numpy()
+            assert_matches(values, expected, strategy_class.__name__)
+            np.testing.assert_array_equal(np.sign(values[53:70]), np.sign(expected[53:70]))
+            for method in [name for name in dir(strategy) if name.startswith('calculate_scores_')]:
+                np.testing.assert_array_equal(getattr(strategy, method)(df).to_numpy(),
+                                              getattr(reference, method)(df).to_numpy(),
+                                              err_msg=f"{strategy_class.__name__}.{method}")
+    print("✅ Regression indicator scores match the baseline on flat runs")
+
+
+if __name__ == "__main__":
+    test_window_primitives_match_rolling_apply()
+    test_fill_warmup_matches_min_periods_one()
+    test_regression_indicators_use_closed_forms()
+    test_flat_windows_keep_baseline_scores()
@@ -3,8 +3,10 @@ Trade Executor - Orchestrates Portfolio Manager and Risk Manager
 Handles trade execution, logging, and strategy flow control
 """
 
+from metrics import OnlineMetrics
 from portfolio_manager import PortfolioManager
 from risk_manager import RiskManager
+from trade_log import TradeLog
 
 class TradeExecutor:
     """Executes trades and manages the interaction between portfolio and risk systems"""
@@ -13,20 +15,43 @@ class TradeExecutor:
         """Initialize trade executor with portfolio and risk managers"""
         self.portfolio = PortfolioManager(initial_cash, per_trade_config)
         self.risk = RiskManager(sl_tp_config)
-        self.trades = []
+        self.trades = TradeLog()
+        self.metrics = OnlineMetrics()  # Fed trades here and Portfolio_Value rows by the run loop
+        self._bar = None
         
         # portfolio, risk, trades
         print(f"Trade Executor initialized")
     
-    def process_market_tick(self, current_price, entry_signal, exit_signal, strategy_type):
-        """Process one market tick - handles all risk checks and signals"""
+    def attach_bars(self, data):
+        """Hand the data's prices to the risk manager for intrabar fills and trailing stops"""
+        self.trades.attach_index(data.index)
+        if self.risk.fill_mode == 'intrabar' and 'High' in data.columns and 'Low' in data.columns:
+            open_prices = data['Open'].to_numpy() if 'Open' in data.columns else None
+            self.risk.attach_bars(open_prices, data['High'].to_numpy(), data['Low'].to_numpy())
+        elif self.risk.fill_mode == 'close' and self.risk.trailing_sl_enabled:
+            # Trailing stops follow the Close: running extremes come from the whole column at once
+            self.risk.attach_bars(None, None, None, close=data['Close'].to_numpy())
+
+    def process_market_tick(self, current_price, entry_signal, exit_signal, strategy_type, bar=None):
+        """
+        Process one market tick - handles all risk checks and signals
+        `bar` is the tick's position in the data, used by intrabar SL/TP fills (see attach_bars)
+        and recorded with every trade in the trade log
+        """
+        trade = self._process_market_tick(current_price, entry_signal, exit_signal, strategy_type, bar)
+        if trade is not None:
+            self.metrics.update_trades(self.trades)
+        return trade
+
+    def _process_market_tick(self, current_price, entry_signal, exit_signal, strategy_type, bar):
+        self._bar = bar
         # 🚨 HIGHEST PRIORITY: Risk Management Checks
-        risk_result = self.risk.get_risk_check_result(current_price, self.portfolio)
+        risk_result = self.risk.get_risk_check_result(current_price, self.portfolio, bar)
         
         if risk_result['action'] == 'LIQUIDATION':
             return self._execute_liquidation(current_price, risk_result['info'])
         
-        elif risk_result['action'] == 'STOP_LOSS':
+        elif risk_result['action'] in ('STOP_LOSS', 'TRAILING_STOP'):
             return self._execute_stop_loss(current_price, risk_result)
         
         elif risk_result['action'] == 'TAKE_PROFIT':
@@ -57,15 +82,11 @@ class TradeExecutor:
         print(f"  Final cash: ${result['final_cash']:,.2f}")
         
         # Log trade
-        trade = {
-            'type': 'LIQUIDATION_SHORT',
-            'price': current_price,
-            'shares': result['shares'],
-            'money_spent': result['money_spent'],
-            'profit_loss': result['profit_loss'],
-            'reason': f"Loss {liquidation_info['current_loss']:,.2f} exceeded threshold {liquidation_info['threshold_stop']:,.2f}"
-        }
-        self.trades.append(trade)
+        trade = self.trades.append(
+            'LIQUIDATION_SHORT', current_price, result['shares'], bar=self._bar,
+            amount=result['money_spent'], profit_loss=result['profit_loss'],
+            note=f"Loss {liquidation_info['current_loss']:,.2f} exceeded threshold {liquidation_info['threshold_stop']:,.2f}"
+        )
         
         # Reset risk manager
         self.risk.reset_levels()
@@ -74,12 +95,13 @@ class TradeExecutor:
     
     def _execute_stop_loss(self, current_price, risk_result):
         """Execute stop loss exit"""
+        # Intrabar fills exit at the touched level (or the gap Open) instead of the Close
+        current_price = risk_result.get('fill_price', current_price)
+        action_name = "🔄 TRAILING STOP" if risk_result['action'] == 'TRAILING_STOP' else "🚨 STOP LOSS"
         if risk_result['position_type'] == 'LONG':
             result = self.portfolio.exit_long_position(current_price)
-            action_name = "🚨 STOP LOSS"
         else:  # SHORT
             result = self.portfolio.exit_short_position(current_price)
-            action_name = "🚨 STOP LOSS"
         
         print(f"{action_name}: Closed {result['shares']} shares at ${current_price:.2f}")
         print(f"  Entry price: ${risk_result['entry_price']:.2f}")
@@ -87,14 +109,10 @@ class TradeExecutor:
         print(f"  Final cash: ${result['final_cash']:,.2f}")
         
         # Log trade
-        trade = {
-            'type': f"STOP_LOSS_{risk_result['position_type']}",
-            'price': current_price,
-            'shares': result['shares'],
-            'profit_loss': result['profit_loss'],
-            'entry_price': risk_result['entry_price']
-        }
-        self.trades.append(trade)
+        trade = self.trades.append(
+            f"{risk_result['action']}_{risk_result['position_type']}", current_price, result['shares'], bar=self._bar,
+            profit_loss=result['profit_loss'], entry_price=risk_result['entry_price']
+        )
         
         # Reset risk manager
         self.risk.reset_levels()
@@ -103,6 +121,8 @@ class TradeExecutor:
     
     def _execute_take_profit(self, current_price, risk_result):
         """Execute take profit exit"""
+        # Intrabar fills exit at the touched level (or the gap Open) instead of the Close
+        current_price = risk_result.get('fill_price', current_price)
         if risk_result['position_type'] == 'LONG':
             result = self.portfolio.exit_long_position(current_price)
             action_name = "💰 TAKE PROFIT"
@@ -116,14 +136,10 @@ class TradeExecutor:
         print(f"  Final cash: ${result['final_cash']:,.2f}")
         
         # Log trade
-        trade = {
-            'type': f"TAKE_PROFIT_{risk_result['position_type']}",
-            'price': current_price,
-            'shares': result['shares'],
-            'profit_loss': result['profit_loss'],
-            'entry_price': risk_result['entry_price']
-        }
-        self.trades.append(trade)
+        trade = self.trades.append(
+            f"TAKE_PROFIT_{risk_result['position_type']}", current_price, result['shares'], bar=self._bar,
+            profit_loss=result['profit_loss'], entry_price=risk_result['entry_price']
+        )
         
         # Reset risk manager
         self.risk.reset_levels()
@@ -147,13 +163,7 @@ class TradeExecutor:
             else:
                 print(f"  ⚠️ No Stop Loss/Take Profit enabled")
             
-            trade = {
-                'type': 'BUY',
-                'price': current_price,
-                'shares': result['shares'],
-                'money_spent': result['money_spent']
-            }
-            self.trades.append(trade)
+            trade = self.trades.append('BUY', current_price, result['shares'], bar=self._bar, amount=result['money_spent'])
             return trade
         
         # LONG EXIT
@@ -165,14 +175,8 @@ class TradeExecutor:
             print(f"  Profit/Loss: ${result['profit_loss']:,.2f}")
             print(f"  Final cash: ${result['final_cash']:,.2f}")
             
-            trade = {
-                'type': 'SELL',
-                'price': current_price,
-                'shares': result['shares'],
-                'money_received': result['selling_price'],
-                'profit_loss': result['profit_loss']
-            }
-            self.trades.append(trade)
+            trade = self.trades.append('SELL', current_price, result['shares'], bar=self._bar,
+                                       amount=result['selling_price'], profit_loss=result['profit_loss'])
             
             # Reset risk manager
             self.risk.reset_levels()
@@ -197,13 +201,7 @@ class TradeExecutor:
             else:
                 print(f"  ⚠️ No Stop Loss/Take Profit enabled")
             
-            trade = {
-                'type': 'SHORT',
-                'price': current_price,
-                'shares': result['shares'],
-                'money_received': result['money_received']
-            }
-            self.trades.append(trade)
+            trade = self.trades.append('SHORT', current_price, result['shares'], bar=self._bar, amount=result['money_received'])
             return trade
         
         # SHORT EXIT
@@ -215,14 +213,8 @@ class TradeExecutor:
             print(f"  Profit/Loss: ${result['profit_loss']:,.2f}")
             print(f"  Final cash: ${result['final_cash']:,.2f}")
             
-            trade = {
-                'type': 'COVER',
-                'price': current_price,
-                'shares': result['shares'],
-                'money_spent': result['money_spent'],
-                'profit_loss': result['profit_loss']
-            }
-            self.trades.append(trade)
+            trade = self.trades.append('COVER', current_price, result['shares'], bar=self._bar,
+                                       amount=result['money_spent'], profit_loss=result['profit_loss'])
             
             # Reset risk manager
             self.risk.reset_levels()
@@ -244,8 +236,7 @@ class TradeExecutor:
                 if self.risk.is_sl_tp_enabled():
                     print(f"  {self.risk.format_sl_tp_display()}")
                 
-                trade = {'type': 'LONG_ENTRY', 'price': current_price, 'shares': result['shares'], 'money_spent': result['money_spent']}
-                self.trades.append(trade)
+                trade = self.trades.append('LONG_ENTRY', current_price, result['shares'], bar=self._bar, amount=result['money_spent'])
                 return trade
                 
             elif self.portfolio.is_short():  # Short → Long flip
@@ -262,8 +253,9 @@ class TradeExecutor:
                 if self.risk.is_sl_tp_enabled():
                     print(f"  {self.risk.format_sl_tp_display()}")
                 
-                trade = {'type': 'FLIP_TO_LONG', 'price': current_price, 'shares_covered': short_result['shares'], 'shares_bought': long_result['shares'], 'short_profit': short_profit}
-                self.trades.append(trade)
+                trade = self.trades.append('FLIP_TO_LONG', current_price, long_result['shares'], bar=self._bar,
+                                           amount=long_result['money_spent'], closed_shares=short_result['shares'],
+                                           closed_profit=short_profit)
                 return trade
         
         # EXIT SIGNAL: Go SHORT
@@ -278,8 +270,7 @@ class TradeExecutor:
                 if self.risk.is_sl_tp_enabled():
                     print(f"  {self.risk.format_sl_tp_display()}")
                 
-                trade = {'type': 'SHORT_ENTRY', 'price': current_price, 'shares': result['shares'], 'money_received': result['money_received']}
-                self.trades.append(trade)
+                trade = self.trades.append('SHORT_ENTRY', current_price, result['shares'], bar=self._bar, amount=result['money_received'])
                 return trade
                 
             elif self.portfolio.is_long():  # Long → Short flip
@@ -296,8 +287,9 @@ class TradeExecutor:
                 if self.risk.is_sl_tp_enabled():
                     print(f"  {self.risk.format_sl_tp_display()}")
                 
-                trade = {'type': 'FLIP_TO_SHORT', 'price': current_price, 'shares_sold': long_result['shares'], 'shares_shorted': short_result['shares'], 'long_profit': long_profit}
-                self.trades.append(trade)
+                trade = self.trades.append('FLIP_TO_SHORT', current_price, short_result['shares'], bar=self._bar,
+                                           amount=short_result['money_received'], closed_shares=long_result['shares'],
+                                           closed_profit=long_profit)
                 return trade
         
         return None
@@ -352,7 +344,7 @@ class TradeExecutor:
         # Calculate and display advanced metrics if data is provided
         if data is not None and len(self.trades) > 0:
             try:
-                from metrics import calculate_advanced_metrics
+                from metrics import run_metrics
                 
                 # Debug: Check portfolio values
                 if 'Portfolio_Value' in data.columns:
@@ -360,7 +352,7 @@ class TradeExecutor:
                     print(f"\n🔍 DEBUG: Portfolio values range: ${portfolio_values.min():,.2f} to ${portfolio_values.max():,.2f}")
                     print(f"🔍 DEBUG: Portfolio data points: {len(portfolio_values)}")
                 
-                metrics = calculate_advanced_metrics(self.portfolio, data, self.trades)
+                metrics = run_metrics(self.portfolio, data, self.trades, self.metrics)
                 
                 if metrics:  # Only display if metrics were calculated successfully
                     print(f"\n📈 ADVANCED PERFORMANCE METRICS:")
@@ -408,8 +400,11 @@ class TradeExecutor:
             filename: Output JSON filename
         """
         import json
+        import math
         from datetime import datetime
         
+        import pandas as pd
+        
         # Get last price from data if available
         current_price = None
         if data is not None and len(data) > 0:
@@ -446,8 +441,8 @@ class TradeExecutor:
         # Add advanced metrics if available
         if data is not None and len(self.trades) > 0:
             try:
-                from metrics import calculate_advanced_metrics
-                metrics = calculate_advanced_metrics(self.portfolio, data, self.trades)
+                from metrics import run_metrics
+                metrics = run_metrics(self.portfolio, data, self.trades, self.metrics)
                 
                 if metrics:
                     output["performance_metrics"] = {
@@ -479,57 +474,34 @@ class TradeExecutor:
                 # If metrics fail, just skip them
                 pass
         
-        # Process trades - add dates from data if available
-        trade_number = 0
-        for i, trade in enumerate(self.trades):
-            trade_number += 1
+        # Process trades - whole columns come out of the trade log at once and are zipped into rows
+        trades = self.trades
+        if data is not None and trades.index is None:
+            trades.attach_index(data.index)
+        dates = [None if pd.isna(date) else str(date) for date in trades.timestamps]
+        rows = zip(
+            trades.column('event').tolist(), trades.column('shares').tolist(), trades.column('price').tolist(),
+            trades.column('exit_reason').tolist(), trades.column('amount').tolist(),
+            trades.realized_profits().tolist(), trades.column('entry_price').tolist(), dates
+        )
+        for trade_number, (kind, shares, price, exit_reason, amount, profit_loss, entry_price, date) in enumerate(rows, 1):
             trade_data = {
                 "trade_number": trade_number,
-                "type": trade.get('type', 'UNKNOWN'),
-                "shares": trade.get('shares', 0),
-                "price": trade.get('price', 0)
+                "type": kind,
+                "shares": shares,
+                "price": price
             }
+            if data is not None:
+                trade_data['date'] = date
             
-            # Add date if available (try to find from data index)
-            if data is not None and 'date' in trade:
-                trade_data['date'] = trade['date']
-            elif data is not None and len(data) > i:
-                # Try to extract date from data
-                try:
-                    trade_data['date'] = str(data.index[i])
-                except:
-                    trade_data['date'] = None
-            
-            # Add type-specific fields
-            if trade['type'] in ['BUY', 'LONG_ENTRY', 'LONG']:
-                trade_data['amount'] = trade.get('money_spent', 0)
-                if 'sl_price' in trade:
-                    trade_data['sl_price'] = trade['sl_price']
-                if 'tp_price' in trade:
-                    trade_data['tp_price'] = trade['tp_price']
-            
-            elif trade['type'] in ['SELL', 'LONG_EXIT']:
-                trade_data['amount'] = trade.get('money_received', 0)
-                trade_data['profit_loss'] = trade.get('profit_loss', 0)
-                trade_data['exit_reason'] = trade.get('exit_reason', 'SIGNAL')
-            
-            elif trade['type'] == 'STOP_LOSS':
-                trade_data['entry_price'] = trade.get('entry_price', 0)
-                trade_data['profit_loss'] = trade.get('profit_loss', 0)
-                trade_data['exit_reason'] = 'STOP_LOSS'
-            
-            elif trade['type'] == 'TAKE_PROFIT':
-                trade_data['entry_price'] = trade.get('entry_price', 0)
-                trade_data['profit_loss'] = trade.get('profit_loss', 0)
-                trade_data['exit_reason'] = 'TAKE_PROFIT'
-            
-            elif trade['type'] in ['SHORT', 'SHORT_ENTRY']:
-                trade_data['amount'] = trade.get('money_received', 0)
-            
-            elif trade['type'] == 'COVER':
-                trade_data['amount'] = trade.get('money_spent', 0)
-                trade_data['profit_loss'] = trade.get('profit_loss', 0)
-                trade_data['exit_reason'] = 'SIGNAL'
+            # Type-specific fields: cash moved, and P&L / reason for exits
+            if not math.isnan(amount):
+                trade_data['amount'] = amount
+            if not math.isnan(entry_price):
+                trade_data['entry_price'] = entry_price
+            if exit_reason:
+                trade_data['profit_loss'] = profit_loss
+                trade_data['exit_reason'] = exit_reason
             
             output["trades"].append(trade_data)
         
@@ -0,0 +1,299 @@
+"""
+Trade Log - Columnar, append-optimized record of executed trades
+Trades are rows of one NumPy structured array with a fixed schema (bar indices, side, price,
+shares, P&L, exit reason, ...), so analytics over millions of trades are array expressions.
+Iterating the log yields TradeRecord row views that read like the per-trade dicts the
+executors used to keep (same keys per trade type), so existing consumers keep working.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+LONG, SHORT = 1, -1
+
+# Code 0 means "not an exit" (the row opens a position)
+EXIT_REASONS = ('', 'SIGNAL', 'REVERSAL', 'STOP_LOSS', 'TRAILING_STOP', 'TAKE_PROFIT', 'LIQUIDATION')
+ACTIONS = ('', 'BUY', 'SELL', 'SHORT', 'COVER', 'LIQUIDATE')
+ACTION_SIDES = {'BUY': LONG, 'SELL': LONG, 'SHORT': SHORT, 'COVER': SHORT, 'LIQUIDATE': SHORT}
+
+_SINGLE = (('type', 'event'), ('price', 'price'), ('shares', 'shares'))
+_MULTI = (('ticker', 'ticker'), ('action', 'action'), ('price', 'price'), ('shares', 'shares'))
+_RISK_EXIT = _SINGLE + (('profit_loss', 'profit_loss'), ('entry_price', 'entry_price'))
+_MULTI_EXIT = _MULTI + (('profit_loss', 'profit_loss'), ('type', 'event'))
+
+# event -> (side (None: from the action), exit reason, opens a position, legacy dict layout)
+# Sides are those of the position a row opens, or closes for exits (flips close and reopen)
+EVENTS = {
+    # TradeExecutor
+    'BUY': (LONG, '', True, _SINGLE + (('money_spent', 'amount'),)),
+    'SELL': (LONG, 'SIGNAL', False, _SINGLE + (('money_received', 'amount'), ('profit_loss', 'profit_loss'))),
+    'SHORT': (SHORT, '', True, _SINGLE + (('money_received', 'amount'),)),
+    'COVER': (SHORT, 'SIGNAL', False, _SINGLE + (('money_spent', 'amount'), ('profit_loss', 'profit_loss'))),
+    'LONG_ENTRY': (LONG, '', True, _SINGLE + (('money_spent', 'amount'),)),
+    'SHORT_ENTRY': (SHORT, '', True, _SINGLE + (('money_received', 'amount'),)),
+    'FLIP_TO_LONG': (SHORT, 'REVERSAL', True, (('type', 'event'), ('price', 'price'), ('shares_covered', 'closed_shares'),
+                                              ('shares_bought', 'shares'), ('short_profit', 'closed_profit'))),
+    'FLIP_TO_SHORT': (LONG, 'REVERSAL', True, (('type', 'event'), ('price', 'price'), ('shares_sold', 'closed_shares'),
+                                              ('shares_shorted', 'shares'), ('long_profit', 'closed_profit'))),
+    'STOP_LOSS_LONG': (LONG, 'STOP_LOSS', False, _RISK_EXIT),
+    'STOP_LOSS_SHORT': (SHORT, 'STOP_LOSS', False, _RISK_EXIT),
+    'TRAILING_STOP_LONG': (LONG, 'TRAILING_STOP', False, _RISK_EXIT),
+    'TRAILING_STOP_SHORT': (SHORT, 'TRAILING_STOP', False, _RISK_EXIT),
+    'TAKE_PROFIT_LONG': (LONG, 'TAKE_PROFIT', False, _RISK_EXIT),
+    'TAKE_PROFIT_SHORT': (SHORT, 'TAKE_PROFIT', False, _RISK_EXIT),
+    'LIQUIDATION_SHORT': (SHORT, 'LIQUIDATION', False, _SINGLE + (('money_spent', 'amount'), ('profit_loss', 'profit_loss'),
+                                                                  ('reason', 'note'))),
+    # MultiTickerPortfolioManager
+    'Entry': (None, '', True, _MULTI + (('value', 'amount'), ('type', 'event'))),
+    'Exit': (None, 'SIGNAL', False, _MULTI + (('value', 'amount'), ('profit_loss', 'profit_loss'), ('type', 'event'))),
+    'Reversal Entry': (None, '', True, _MULTI + (('type', 'event'),)),
+    'Reversal Exit': (None, 'REVERSAL', False, _MULTI_EXIT),
+    'Stop Loss': (None, 'STOP_LOSS', False, _MULTI_EXIT),
+    'Trailing Stop': (None, 'TRAILING_STOP', False, _MULTI_EXIT),
+    'Take Profit': (None, 'TAKE_PROFIT', False, _MULTI_EXIT),
+    'Liquidation': (None, 'LIQUIDATION', False, _MULTI_EXIT),
+}
+EVENT_NAMES = tuple(EVENTS)
+_EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+_REASON_CODES = {name: code for code, name in enumerate(EXIT_REASONS)}
+_OPENS = np.array([EVENTS[name][2] for name in EVENT_NAMES])
+
+
+def event_fields(event, action=''):
+    """Schema values (event, action, side, exit_reason) of an event - for filling extend() blocks"""
+    side, reason, _, _ = EVENTS[event]
+    return (_EVENT_CODES[event], _ACTION_CODES[action], ACTION_SIDES[action] if side is None else side,
+            _REASON_CODES[reason])
+
+# Fixed schema; bars are -1 when the executor wasn't told the bar, missing amounts / P&L are NaN
+SCHEMA = np.dtype([
+    ('ticker', np.int16),         # code into TradeLog.tickers
+    ('event', np.int8),           # code into EVENT_NAMES
+    ('action', np.int8),          # code into ACTIONS
+    ('side', np.int8),            # LONG / SHORT
+    ('exit_reason', np.int8),     # code into EXIT_REASONS
+    ('bar', np.int64),            # position of the trade's bar in the data
+    ('entry_bar', np.int64),      # bar the position was opened on (the trade's own bar for entries)
+    ('price', np.float64),
+    ('shares', np.int64),         # shares opened or closed (flips: shares of the new position)
+    ('amount', np.float64),       # cash spent / received / position value
+    ('profit_loss', np.float64),  # realized P&L of exits
+    ('entry_price', np.float64),  # entry price of SL/TP exits
+    ('closed_shares', np.int64),  # flips: shares of the closed position
+    ('closed_profit', np.float64),  # flips: P&L of the closed position
+])
+_CATEGORIES = {'event': EVENT_NAMES, 'action': ACTIONS, 'exit_reason': EXIT_REASONS}
+
+
+class TradeRecord(Mapping):
+    """Read-only view of one trade: its legacy dict keys as a mapping, schema fields as attributes"""
+
+    __slots__ = ('_log', '_row')
+
+    def __init__(self, log, row):
+        self._log = log
+        self._row = row
+
+    def _layout(self):
+        return EVENTS[EVENT_NAMES[self._log._buffer['event'][self._row]]][3]
+
+    def __getitem__(self, key):
+        for name, field in self._layout():
+            if name == key:
+                return self._log.value(self._row, field)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return (name for name, _ in self._layout())
+
+    def __len__(self):
+        return len(self._layout())
+
+    def __getattr__(self, name):
+        if name in SCHEMA.names or name in ('note', 'timestamp', 'entry_timestamp'):
+            return self._log.value(self._row, name)
+        raise AttributeError(name)
+
+    def to_dict(self):
+        return {name: self._log.value(self._row, field) for name, field in self._layout()}
+
+    def __repr__(self):
+        return f"TradeRecord({self.to_dict()!r})"
+
+
+class TradeLog:
+    """Append-optimized columnar trade log (a growing structured array)"""
+
+    def __init__(self, capacity=64):
+        self._buffer = np.empty(capacity, dtype=SCHEMA)
+        self._size = 0
+        self._notes = {}
+        self._open_bars = {}
+        self.tickers = ['']
+        self._ticker_codes = {'': 0}
+        self.index = None
+
+    def attach_index(self, index):
+        """Bar labels (usually the data's DatetimeIndex) used to resolve bar numbers to timestamps"""
+        self.index = pd.Index(index)
+
+    def append(self, event, price, shares, bar=None, ticker='', action='', amount=np.nan, profit_loss=np.nan,
+               entry_price=np.nan, closed_shares=0, closed_profit=np.nan, note=None):
+        """Record one trade and return its row view"""
+        side, reason, opens, _ = EVENTS[event]
+        if side is None:
+            side = ACTION_SIDES[action]
+        ticker_code = self._ticker_code(ticker)
+        bar = -1 if bar is None else bar
+        entry_bar = self._open_bars.pop(ticker_code, -1) if reason else bar
+        if opens:
+            self._open_bars[ticker_code] = bar
+
+        if self._size == len(self._buffer):
+            self._grow(self._size + 1)
+        row = self._size
+        self._buffer[row] = (ticker_code, _EVENT_CODES[event], _ACTION_CODES[action], side, _REASON_CODES[reason],
+                             bar, entry_bar, price, shares, amount, profit_loss, entry_price, closed_shares, closed_profit)
+        if note is not None:
+            self._notes[row] = note
+        self._size += 1
+        return TradeRecord(self, row)
+
+    def extend(self, rows, tickers=('',)):
+        """
+        Append a block of trades at once (a SCHEMA structured array, e.g. from a vectorized engine)
+        whose ticker field holds positions in `tickers`; every other field must already be filled
+        """
+        codes = np.array([self._ticker_code(ticker) for ticker in tickers], dtype=np.int16)
+        end = self._size + len(rows)
+        if end > len(self._buffer):
+            self._grow(end)
+        block = self._buffer[self._size:end]
+        block[:] = rows
+        block['ticker'] = codes[rows['ticker']]
+        self._size = end
+        # Positions still open after the block: decided by each ticker's last row in it
+        reversed_tickers = block['ticker'][::-1]
+        ticker_codes, last = np.unique(reversed_tickers, return_index=True)
+        for code, row in zip(ticker_codes.tolist(), (len(block) - 1 - last).tolist()):
+            if _OPENS[block['event'][row]]:
+                self._open_bars[code] = block['bar'][row].item()
+            else:
+                self._open_bars.pop(code, None)
+
+    @staticmethod
+    def rows(count):
+        """An empty block of `count` trades for extend()"""
+        rows = np.zeros(count, dtype=SCHEMA)
+        for field in ('amount', 'profit_loss', 'entry_price', 'closed_profit'):
+            rows[field] = np.nan
+        return rows
+
+    def _ticker_code(self, ticker):
+        code = self._ticker_codes.get(ticker)
+        if code is None:
+            code = self._ticker_codes[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return code
+
+    def _grow(self, size):
+        grown = np.empty(max(size, 2 * len(self._buffer)), dtype=SCHEMA)
+        grown[:self._size] = self._buffer[:self._size]
+        self._buffer = grown
+
+    def value(self, row, field):
+        """One field of one trade as a Python value (categorical fields decoded)"""
+        if field == 'note':
+            return self._notes.get(row)
+        if field in ('timestamp', 'entry_timestamp'):
+            bar = self._buffer['bar' if field == 'timestamp' else 'entry_bar'][row]
+            return self.index[bar] if self.index is not None and 0 <= bar < len(self.index) else None
+        code = self._buffer[field][row].item()
+        if field == 'ticker':
+            return self.tickers[code]
+        if field in _CATEGORIES:
+            return _CATEGORIES[field][code]
+        return code
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return (TradeRecord(self, row) for row in range(self._size))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [TradeRecord(self, row) for row in range(*item.indices(self._size))]
+        row = item + self._size if item < 0 else item
+        if not 0 <= row < self._size:
+            raise IndexError("trade index out of range")
+        return TradeRecord(self, row)
+
+    def __eq__(self, other):
+        if isinstance(other, (TradeLog, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"TradeLog({self._size} trades)"
+
+    @property
+    def array(self):
+        """The recorded rows (a view of the buffer, valid until the next append grows it)"""
+        return self._buffer[:self._size]
+
+    def column(self, name):
+        """One schema column as an array; categorical columns are decoded to object arrays"""
+        values = self.array[name]
+        if name == 'ticker':
+            return np.asarray(self.tickers, dtype=object)[values]
+        if name in _CATEGORIES:
+            return np.asarray(_CATEGORIES[name], dtype=object)[values]
+        return values
+
+    def _timestamps(self, bars):
+        if self.index is None:
+            return pd.Index([None] * len(bars))
+        known = (bars >= 0) & (bars < len(self.index))
+        return self.index.take(np.where(known, bars, 0)).where(known)
+
+    @property
+    def timestamps(self):
+        """Labels of each trade's bar (missing where the bar is unknown)"""
+        return self._timestamps(self.array['bar'])
+
+    @property
+    def entry_timestamps(self):
+        return self._timestamps(self.array['entry_bar'])
+
+    def exits(self):
+        """Boolean mask of the trades that close a position"""
+        return self.array['exit_reason'] != 0
+
+    def realized_profits(self):
+        """P&L realized by each trade (flips: the closed position's), NaN for entries"""
+        array = self.array
+        return np.where(np.isnan(array['profit_loss']), array['closed_profit'], array['profit_loss'])
+
+    def count_by_ticker(self):
+        """{ticker: number of trades}"""
+        counts = np.bincount(self.array['ticker'], minlength=len(self.tickers))
+        return {ticker: int(count) for ticker, count in zip(self.tickers, counts) if count}
+
+    def to_numpy(self):
+        """Copy of the rows as a structured array (categorical fields as codes, see tickers / EVENT_NAMES)"""
+        return self.array.copy()
+
+    def to_frame(self):
+        """The trades as a DataFrame with decoded categorical columns and bar timestamps"""
+        frame = pd.DataFrame({name: self.column(name) for name in SCHEMA.names})
+        frame['timestamp'] = np.asarray(self.timestamps)
+        frame['entry_timestamp'] = np.asarray(self.entry_timestamps)
+        return frame
+
+    def to_dicts(self):
+        """The trades as the legacy per-trade dicts"""
+        return [record.to_dict() for record in self]
@@ -0,0 +1,546 @@
+"""
+TV Kernels - Array kernels for the recursive / state-machine indicators in ta_strategies_TVLibrary
+Recursive filters and state machines are written once in scalar style: they are compiled
+with numba when it is installed, otherwise they run over plain Python lists (much faster than
+per-bar .iloc access). Window sums and running totals use vectorized NumPy directly.
+
+Every kernel reproduces the exact update expression of the loop it replaces so results stay
+numerically identical to the original implementations.
+"""
+
+import math
+from functools import wraps
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+BACKEND = "numba" if NUMBA_AVAILABLE else "python"
+
+
+def _kernel(func):
+    """Compile a scalar-style kernel with numba, or run it over Python lists as a fallback"""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(func)
+
+    @wraps(func)
+    def run(*args):
+        # Python floats are far cheaper to index and combine than NumPy scalars
+        return func(*[arg.tolist() if isinstance(arg, np.ndarray) else arg for arg in args])
+    return run
+
+
+def as_float_array(values):
+    """Contiguous float64 copy-free view of a Series/array/list"""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+# =============================================================================
+# Recursive filters
+# =============================================================================
+
+@_kernel
+def _blend_filter(values, alphas, start):
+    n = len(values)
+    out = np.empty(n)
+    for i in range(min(start, n)):
+        out[i] = values[i]
+    if n == 0 or start >= n:
+        return out
+    prev = values[start - 1]
+    for i in range(start, n):
+        alpha = alphas[i]
+        prev = alpha * values[i] + (1 - alpha) * prev
+        out[i] = prev
+    return out
+
+
+@_kernel
+def _step_filter(values, alphas, start):
+    n = len(values)
+    out = np.empty(n)
+    for i in range(min(start, n)):
+        out[i] = values[i]
+    if n == 0 or start >= n:
+        return out
+    prev = values[start - 1]
+    for i in range(start, n):
+        prev = prev + alphas[i] * (values[i] - prev)
+        out[i] = prev
+    return out
+
+
+@_kernel
+def _smoothed_average(values, seed, period, start):
+    n = len(values)
+    out = np.empty(n)
+    for i in range(min(start, n)):
+        out[i] = seed[i]
+    if n == 0 or start >= n:
+        return out
+    prev = seed[start - 1]
+    for i in range(start, n):
+        prev = (values[i] + (period - 1) * prev) / period
+        out[i] = prev
+    return out
+
+
+def exponential_smoothing(values, alpha, start=1):
+    """
+    out[i] = alpha * x[i] + (1 - alpha) * out[i-1], seeded with the first `start` raw values
+    alpha may be a scalar or a per-bar array
+    """
+    values = as_float_array(values)
+    alphas = np.broadcast_to(as_float_array(alpha), values.shape).copy()
+    return _blend_filter(values, alphas, max(start, 1))
+
+
+def adaptive_smoothing(values, alpha, start=1):
+    """
+    out[i] = out[i-1] + alpha * (x[i] - out[i-1]), seeded with the first `start` raw values
+    Same recursion as exponential_smoothing written in step form (EVMA, KAMA, JMA, FRAMA, ...)
+    """
+    values = as_float_array(values)
+    alphas = np.broadcast_to(as_float_array(alpha), values.shape).copy()
+    return _step_filter(values, alphas, max(start, 1))
+
+
+def volume_scaled_alpha(base_alpha, volume, average_volume):
+    """Per-bar alpha = base_alpha * volume / average volume (base_alpha when the average is 0), capped at 1"""
+    volume = as_float_array(volume)
+    average_volume = as_float_array(average_volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alpha = np.where(average_volume != 0, base_alpha * (volume / average_volume), base_alpha)
+    return np.where(alpha > 1, 1, alpha)
+
+
+def smoothed_average(values, period, seed=None, start=1):
+    """
+    Wilder-style smoothing: out[i] = (x[i] + (period - 1) * out[i-1]) / period
+    The first `start` outputs come from `seed` (defaults to the raw values)
+    """
+    values = as_float_array(values)
+    seed = values if seed is None else as_float_array(seed)
+    return _smoothed_average(values, seed, period, max(start, 1))
+
+
+@_kernel
+def _super_smoother(prices, c1, c2, c3):
+    n = len(prices)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    out[0] = prices[0]
+    if n > 1:
+        out[1] = prices[1]
+    for i in range(2, n):
+        out[i] = c1 * (prices[i] + prices[i - 1]) / 2 + c2 * out[i - 1] + c3 * out[i - 2]
+    return out
+
+
+def super_smoother(prices, c1, c2, c3):
+    """Ehlers two-pole super smoother"""
+    return _super_smoother(as_float_array(prices), c1, c2, c3)
+
+
+@_kernel
+def _holt_linear(prices, alpha, beta):
+    n = len(prices)
+    forecast = np.empty(n)
+    if n == 0:
+        return forecast
+    level = prices[0]
+    trend = prices[1] - prices[0] if n > 1 else 0.0
+    forecast[0] = level + trend
+    for i in range(1, n):
+        prev_level = level
+        level = alpha * prices[i] + (1 - alpha) * (prev_level + trend)
+        trend = beta * (level - prev_level) + (1 - beta) * trend
+        forecast[i] = level + trend
+    return forecast
+
+
+def holt_linear(prices, alpha, beta):
+    """Holt's linear (level + trend) exponential smoothing forecast"""
+    return _holt_linear(as_float_array(prices), alpha, beta)
+
+
+@_kernel
+def _mcginley_dynamic(prices, period):
+    n = len(prices)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    prev = prices[0]
+    out[0] = prev
+    for i in range(1, n):
+        ratio = prices[i] / prev if prev != 0 else 1.0
+        factor = period * (ratio ** 4)
+        if factor == 0:
+            factor = period
+        prev = prev + (prices[i] - prev) / factor
+        out[i] = prev
+    return out
+
+
+def mcginley_dynamic(prices, period):
+    """McGinley Dynamic moving average"""
+    return _mcginley_dynamic(as_float_array(prices), period)
+
+
+@_kernel
+def _kdj(rsv):
+    n = len(rsv)
+    k_values = np.empty(n)
+    d_values = np.empty(n)
+    j_values = np.empty(n)
+    k_prev = 50.0
+    d_prev = 50.0
+    for i in range(n):
+        k_curr = (2 / 3) * k_prev + (1 / 3) * rsv[i]
+        d_curr = (2 / 3) * d_prev + (1 / 3) * k_curr
+        k_values[i] = k_curr
+        d_values[i] = d_curr
+        j_values[i] = 3 * k_curr - 2 * d_curr
+        k_prev = k_curr
+        d_prev = d_curr
+    return k_values, d_values, j_values
+
+
+def kdj(rsv):
+    """K, D and J lines from raw stochastic values (1/3 smoothing seeded at 50)"""
+    return _kdj(as_float_array(rsv))
+
+
+# =============================================================================
+# State machines (trailing stops / stop-and-reverse / counters)
+# =============================================================================
+
+@_kernel
+def _chande_kroll_stop(close, long_candidate, short_candidate):
+    n = len(close)
+    out = np.zeros(n)
+    if n == 0:
+        return out
+    mid = (long_candidate[0] + short_candidate[0]) / 2
+    prev = long_candidate[0] if close[0] >= mid else short_candidate[0]
+    out[0] = prev
+    for i in range(1, n):
+        if close[i - 1] > prev:
+            value = long_candidate[i]
+            if prev > value:
+                value = prev
+        elif close[i - 1] < prev:
+            value = short_candidate[i]
+            if prev < value:
+                value = prev
+        else:
+            value = prev
+        out[i] = value
+        prev = value
+    return out
+
+
+def chande_kroll_stop(close, long_candidate, short_candidate):
+    """Chande Kroll stop line that ratchets between long and short candidates"""
+    return _chande_kroll_stop(as_float_array(close), as_float_array(long_candidate), as_float_array(short_candidate))
+
+
+@_kernel
+def _gann_hilo(close, high, low):
+    n = len(close)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    prev = close[0]
+    out[0] = prev
+    for i in range(1, n):
+        if close[i] > prev:
+            value = low[i]
+            if prev < value:
+                value = prev
+        elif close[i] < prev:
+            value = high[i]
+            if prev > value:
+                value = prev
+        else:
+            value = prev
+        out[i] = value
+        prev = value
+    return out
+
+
+def gann_hilo(close, high, low):
+    """Gann High-Low activator"""
+    return _gann_hilo(as_float_array(close), as_float_array(high), as_float_array(low))
+
+
+@_kernel
+def _parabolic_sar(high, low, close, initial_af, max_af):
+    n = len(close)
+    out = np.empty(n)
+    uptrend = close[1] > close[0]
+    if uptrend:
+        psar = low[0]
+        ep = high[1] if high[1] > high[0] else high[0]
+    else:
+        psar = high[0]
+        ep = low[1] if low[1] < low[0] else low[0]
+    af = initial_af
+    out[0] = psar
+    out[1] = psar
+    for i in range(2, n):
+        prev_psar = psar
+        if uptrend:
+            psar = prev_psar + af * (ep - prev_psar)
+            if low[i - 1] < psar:
+                psar = low[i - 1]
+            if low[i - 2] < psar:
+                psar = low[i - 2]
+            if high[i] > ep:
+                ep = high[i]
+                af = af + initial_af
+                if max_af < af:
+                    af = max_af
+            if low[i] < psar:
+                uptrend = False
+                psar = ep
+                ep = low[i]
+                af = initial_af
+        else:
+            psar = prev_psar - af * (prev_psar - ep)
+            if high[i - 1] > psar:
+                psar = high[i - 1]
+            if high[i - 2] > psar:
+                psar = high[i - 2]
+            if low[i] < ep:
+                ep = low[i]
+                af = af + initial_af
+                if max_af < af:
+                    af = max_af
+            if high[i] > psar:
+                uptrend = True
+                psar = ep
+                ep = high[i]
+                af = initial_af
+        out[i] = psar
+    return out
+
+
+def parabolic_sar(high, low, close, initial_af, max_af):
+    """Parabolic SAR (ParabolicStopAndReverseStrategies variant, needs at least 2 bars)"""
+    return _parabolic_sar(as_float_array(high), as_float_array(low), as_float_array(close), initial_af, max_af)
+
+
+@_kernel
+def _stop_and_reverse(high, low, close, initial_af, max_af):
+    n = len(close)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    uptrend = n > 1 and close[1] > close[0]
+    if uptrend:
+        out[0] = low[0]
+        ep = high[0]
+    else:
+        out[0] = high[0]
+        ep = low[0]
+    af = initial_af
+    for i in range(1, n):
+        previous_sar = out[i - 1]
+        if uptrend:
+            sar_i = previous_sar + af * (ep - previous_sar)
+            if low[i - 1] < sar_i:
+                sar_i = low[i - 1]
+            if i >= 2 and low[i - 2] < sar_i:
+                sar_i = low[i - 2]
+            if low[i] < sar_i:
+                uptrend = False
+                sar_i = ep
+                af = initial_af
+                ep = low[i]
+            elif high[i] > ep:
+                ep = high[i]
+                af = af + initial_af
+                if max_af < af:
+                    af = max_af
+        else:
+            sar_i = previous_sar - af * (previous_sar - ep)
+            if high[i - 1] > sar_i:
+                sar_i = high[i - 1]
+            if i >= 2 and high[i - 2] > sar_i:
+                sar_i = high[i - 2]
+            if high[i] > sar_i:
+                uptrend = True
+                sar_i = ep
+                af = initial_af
+                ep = high[i]
+            elif low[i] < ep:
+                ep = low[i]
+                af = af + initial_af
+                if max_af < af:
+                    af = max_af
+        out[i] = sar_i
+    return out
+
+
+def stop_and_reverse(high, low, close, initial_af, max_af):
+    """Stop-and-reverse (StopAndReverseStrategies variant)"""
+    return _stop_and_reverse(as_float_array(high), as_float_array(low), as_float_array(close), initial_af, max_af)
+
+
+@_kernel
+def _supertrend_bands(close, basic_ub, basic_lb):
+    n = len(close)
+    final_ub = np.empty(n)
+    final_lb = np.empty(n)
+    if n == 0:
+        return final_ub, final_lb
+    prev_ub = basic_ub[0]
+    prev_lb = basic_lb[0]
+    final_ub[0] = prev_ub
+    final_lb[0] = prev_lb
+    for i in range(1, n):
+        if basic_ub[i] < prev_ub or close[i - 1] > prev_ub:
+            prev_ub = basic_ub[i]
+        if basic_lb[i] > prev_lb or close[i - 1] < prev_lb:
+            prev_lb = basic_lb[i]
+        final_ub[i] = prev_ub
+        final_lb[i] = prev_lb
+    return final_ub, final_lb
+
+
+@_kernel
+def _supertrend_direction(close, final_ub, final_lb):
+    n = len(close)
+    supertrend = np.empty(n)
+    trend = np.empty(n, dtype=np.int64)
+    if n == 0:
+        return supertrend, trend
+    supertrend[0] = math.nan
+    trend[0] = 1
+    for i in range(1, n):
+        if close[i] <= final_ub[i]:
+            supertrend[i] = final_ub[i]
+            trend[i] = -1
+        elif close[i] >= final_lb[i]:
+            supertrend[i] = final_lb[i]
+            trend[i] = 1
+        else:
+            supertrend[i] = supertrend[i - 1]
+            trend[i] = trend[i - 1]
+    return supertrend, trend
+
+
+def supertrend(close, basic_ub, basic_lb):
+    """
+    Supertrend final bands, line and direction
+    Returns (final_ub, final_lb, supertrend, trend) - supertrend is NaN on the first bar
+    """
+    close = as_float_array(close)
+    final_ub, final_lb = _supertrend_bands(close, as_float_array(basic_ub), as_float_array(basic_lb))
+    line, trend = _supertrend_direction(close, final_ub, final_lb)
+    return final_ub, final_lb, line, np.asarray(trend, dtype=np.int64)
+
+
+@_kernel
+def _setup_counts(close, lookback):
+    n = len(close)
+    buy_counts = np.zeros(n, dtype=np.int64)
+    sell_counts = np.zeros(n, dtype=np.int64)
+    for i in range(lookback, n):
+        if close[i] < close[i - lookback]:
+            buy_counts[i] = buy_counts[i - 1] + 1
+        if close[i] > close[i - lookback]:
+            sell_counts[i] = sell_counts[i - 1] + 1
+    return buy_counts, sell_counts
+
+
+def setup_counts(close, lookback=4):
+    """TD Sequential buy/sell setup counters (consecutive closes below/above close[i - lookback])"""
+    buy_counts, sell_counts = _setup_counts(as_float_array(close), lookback)
+    return np.asarray(buy_counts, dtype=np.int64), np.asarray(sell_counts, dtype=np.int64)
+
+
+# =============================================================================
+# Vectorized running totals and window sums
+# =============================================================================
+
+def on_balance_volume(close, volume):
+    """OBV: running total of +volume on up closes and -volume on down closes (keeps volume dtype)"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume)
+    if len(close) == 0:
+        return np.zeros(0, dtype=volume.dtype)
+    signed = np.zeros_like(volume)
+    up = close[1:] > close[:-1]
+    down = close[1:] < close[:-1]
+    signed[1:] = np.where(up, volume[1:], np.where(down, -volume[1:], 0))
+    return np.cumsum(signed)
+
+
+def volume_index(close, volume, baseline, positive):
+    """
+    Positive/negative volume index: compound the close-to-close return only on bars where
+    volume rose (positive=True) or fell (positive=False)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume)
+    if len(close) == 0:
+        return np.zeros(0)
+    active = volume[1:] > volume[:-1] if positive else volume[1:] < volume[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = (close[1:] - close[:-1]) / close[:-1]
+    factors = np.empty(len(close))
+    factors[0] = baseline
+    factors[1:] = np.where(active, 1 + ret, 1.0)
+    return np.cumprod(factors)
+
+
+def weighted_window_sum(values, weights):
+    """
+    sum(weights[k] * window[k]) for each trailing window of len(weights), accumulated left to
+    right exactly like a Python sum(). Incomplete leading windows are NaN.
+    """
+    values = as_float_array(values)
+    n, period = len(values), len(weights)
+    total = np.zeros(n)
+    for k, weight in enumerate(weights):
+        offset = period - 1 - k  # window[k] is values[i - offset]
+        term = np.zeros(n)
+        if offset < n:
+            term[offset:] = weight * values[:n - offset]
+        total = total + term
+    total[:period - 1] = np.nan
+    return total
+
+
+def rolling_population_std(values, period):
+    """
+    Population standard deviation over trailing windows (expanding for the first period-1 bars),
+    using plain left-to-right sums like the original list-based loop
+    """
+    values = as_float_array(values)
+    n = len(values)
+    counts = np.minimum(np.arange(1, n + 1), period).astype(np.float64)
+
+    total = np.zeros(n)
+    for offset in range(period - 1, -1, -1):
+        term = np.zeros(n)
+        if offset < n:
+            term[offset:] = values[:n - offset]
+        total = total + term
+    mean = total / counts
+
+    squares = np.zeros(n)
+    for offset in range(period - 1, -1, -1):
+        term = np.zeros(n)
+        if offset < n:
+            deviation = values[:n - offset] - mean[offset:]
+            term[offset:] = deviation * deviation
+        squares = squares + term
+    return np.sqrt(squares / counts)
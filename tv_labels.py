@@ -0,0 +1,54 @@
+"""
+TV Labels - Integer-coded signal values and explanations for ta_strategies_TVLibrary
+The *_map methods used to build a Python string per row with series.map(...). coded_map returns
+pandas Categoricals instead: one int8 code per row pointing into the strategy's label table,
+so long histories don't hold millions of copies of the same sentence. Strings are only built
+when materialize_labels is called for display or export.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _coded(series, mapping):
+    """Categorical equivalent of series.map(mapping) (unmapped scores become NaN)"""
+    keys = list(mapping)
+    labels = list(mapping.values())
+    if any(not isinstance(label, str) for label in labels):
+        return series.map(mapping)
+
+    categories = list(dict.fromkeys(labels))
+    category_of_key = np.array([categories.index(label) for label in labels], dtype=np.int64)
+    positions = pd.Index(keys).get_indexer(np.asarray(series).ravel())
+    codes = np.where(positions >= 0, category_of_key[positions], -1)
+    if isinstance(series, pd.DataFrame):
+        # tv_panel (time x ticker) scores: int8 codes, categories kept in attrs
+        frame = pd.DataFrame(codes.reshape(series.shape).astype(np.int8), index=series.index, columns=series.columns)
+        frame.attrs['categories'] = categories
+        return frame
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+
+def coded_map(series, mapping_value, mapping_explanation):
+    """Map a score series to (value, explanation) Categoricals sharing the score's index"""
+    return _coded(series, mapping_value), _coded(series, mapping_explanation)
+
+
+def label_tables(df):
+    """Lookup table (code -> label) for every categorical column of a result frame"""
+    return {
+        column: dict(enumerate(dtype.categories))
+        for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    }
+
+
+def materialize_labels(df):
+    """Copy of a result frame (or Series) with categorical label columns turned back into strings"""
+    if isinstance(df, pd.Series):
+        return df.astype(object) if isinstance(df.dtype, pd.CategoricalDtype) else df
+    result = df.copy()
+    for position in range(result.shape[1]):
+        column = result.iloc[:, position]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            result.isetitem(position, materialize_labels(column))
+    return result
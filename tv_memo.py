@@ -0,0 +1,222 @@
+"""
+TV Memo - Per-dataset memoization for ta_strategies_TVLibrary strategy instances
+Library classes cache their indicator on the instance (`if self.x is None: self.x = ...`), which
+made an instance silently reuse the first DataFrame's indicator on every later DataFrame.
+install() wraps each class so that whenever an outermost call arrives with a different dataset,
+the instance's cached indicator state is parked in a small per-instance LRU and replaced by the
+state for the new dataset (or by the freshly constructed state if it hasn't seen it yet).
+
+Datasets are keyed by a fingerprint of the frame's index and numeric columns (strategies such as
+Beta read columns beyond OHLCV, e.g. 'Benchmark') plus the instance's parameters.
+Fingerprints are remembered per DataFrame object, so each frame is hashed once, not once per
+strategy; in-place edits to the OHLCV values of a frame that was already used are not detected.
+"""
+
+import functools
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+from indicator_cache import FINGERPRINT_COLUMNS, data_fingerprint
+
+# Datasets whose indicator state each instance keeps besides the current one
+DEFAULT_MAX_DATASETS = 4
+_max_datasets = DEFAULT_MAX_DATASETS
+
+# Attributes owned by this module live on the instance under this prefix
+_PREFIX = '_tv_'
+
+_fingerprints = {}  # id(frame) -> (weakref to frame, row count, fingerprint)
+_fingerprints_lock = threading.Lock()
+
+
+def configure(max_datasets=DEFAULT_MAX_DATASETS):
+    """Set how many other datasets' indicator state each instance keeps (0 = recompute on every switch)"""
+    global _max_datasets
+    if max_datasets < 0:
+        raise ValueError("max_datasets must be >= 0")
+    _max_datasets = max_datasets
+
+
+def _forget_frame(key, ref):
+    with _fingerprints_lock:
+        entry = _fingerprints.get(key)
+        if entry is not None and entry[0] is ref:
+            del _fingerprints[key]
+
+
+def dataset_fingerprint(df):
+    """Fingerprint of a DataFrame's index and numeric columns, computed once per frame object (None for non-DataFrames)"""
+    if not isinstance(df, pd.DataFrame):
+        return None
+    key = id(df)
+    entry = _fingerprints.get(key)
+    if entry is not None and entry[0]() is df and entry[1] == len(df):
+        return entry[2]
+    columns = FINGERPRINT_COLUMNS
+    if df.columns.is_unique:
+        columns = [col for col, dtype in df.dtypes.items() if col in FINGERPRINT_COLUMNS or dtype.kind in 'biuf']
+    fingerprint = data_fingerprint(df, columns)
+    ref = weakref.ref(df, functools.partial(_forget_frame, key))
+    with _fingerprints_lock:
+        _fingerprints[key] = (ref, len(df), fingerprint)
+    return fingerprint
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _ensure_state(instance):
+    """Record which attributes are memoized results (None or absent after construction)"""
+    state = instance.__dict__
+    if _PREFIX + 'memo' not in state:
+        state[_PREFIX + 'results'] = {
+            name: value is None for name, value in state.items() if not name.startswith(_PREFIX)
+        }
+        state[_PREFIX + 'memo'] = OrderedDict()
+        state[_PREFIX + 'key'] = None
+        state[_PREFIX + 'depth'] = 0
+    return state
+
+
+def _result_names(state):
+    results = state[_PREFIX + 'results']
+    return [name for name in state if not name.startswith(_PREFIX) and results.get(name, True)]
+
+
+def _parameters(state):
+    results = state[_PREFIX + 'results']
+    return tuple(
+        (name, _hashable(value)) for name, value in state.items()
+        if not name.startswith(_PREFIX) and not results.get(name, True)
+    )
+
+
+def _dataset_key(state, df):
+    fingerprint = dataset_fingerprint(df)
+    if fingerprint is None:
+        return None
+    return fingerprint, _parameters(state)
+
+
+def parameters(instance):
+    """The instance's parameters (attributes set by __init__ that aren't memoized results) as a hashable tuple"""
+    return _parameters(_ensure_state(instance))
+
+
+def fresh_copy(instance):
+    """New instance of the same class with the same parameters and no memoized state"""
+    state = _ensure_state(instance)
+    results = state[_PREFIX + 'results']
+    copy = type(instance).__new__(type(instance))
+    copy.__dict__.update(
+        (name, None if results.get(name, True) else value) for name, value in state.items()
+        if not name.startswith(_PREFIX) and name in results
+    )
+    _ensure_state(copy)
+    copy.__dict__[_PREFIX + 'results'] = dict(results)
+    return copy
+
+
+def switch_dataset(instance, df):
+    """Bind the instance's memoized indicator state to `df`, parking the state of the previous dataset"""
+    state = _ensure_state(instance)
+    key = _dataset_key(state, df)
+    if key is None or key == state[_PREFIX + 'key']:
+        return
+    names = _result_names(state)
+    memo = state[_PREFIX + 'memo']
+
+    previous_key = state[_PREFIX + 'key']
+    current = {name: state[name] for name in names if state[name] is not None}
+    if previous_key is not None and current and _max_datasets > 0:
+        memo[previous_key] = current
+        memo.move_to_end(previous_key)
+        while len(memo) > _max_datasets:
+            memo.popitem(last=False)
+
+    # Back to the freshly constructed state, then restore anything already computed for this dataset
+    results = state[_PREFIX + 'results']
+    for name in names:
+        if name in results:
+            state[name] = None
+        else:
+            del state[name]
+    state.update(memo.pop(key, {}))
+    state[_PREFIX + 'key'] = key
+
+
+def clear(instance):
+    """Drop every memoized dataset and reset the instance to its freshly constructed state"""
+    state = _ensure_state(instance)
+    results = state[_PREFIX + 'results']
+    for name in _result_names(state):
+        if name in results:
+            state[name] = None
+        else:
+            del state[name]
+    state[_PREFIX + 'memo'].clear()
+    state[_PREFIX + 'key'] = None
+
+
+def _wrap_init(init):
+    @functools.wraps(init)
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        _ensure_state(self)
+    return __init__
+
+
+def _wrap_dataset_method(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = _ensure_state(self)
+        if state[_PREFIX + 'depth']:
+            # Nested call (e.g. run_all_strategies -> calculate_*): already bound to the outer dataset
+            return method(self, *args, **kwargs)
+        df = args[0] if args else kwargs.get('df')
+        switch_dataset(self, df)
+        state[_PREFIX + 'depth'] += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            state[_PREFIX + 'depth'] -= 1
+    return wrapper
+
+
+def _takes_dataset(func):
+    try:
+        params = list(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        return False
+    return len(params) >= 2 and params[1] == 'df'
+
+
+def make_dataset_aware(cls):
+    """Wrap a strategy class so its instances memoize indicator state per dataset"""
+    if getattr(cls, '_tv_dataset_aware', False):
+        return cls
+    for name, func in list(vars(cls).items()):
+        if name == '__init__':
+            setattr(cls, name, _wrap_init(func))
+        elif inspect.isfunction(func) and _takes_dataset(func):
+            setattr(cls, name, _wrap_dataset_method(func))
+    cls._tv_dataset_aware = True
+    return cls
+
+
+def install(namespace):
+    """Make every class defined in a module namespace (e.g. globals()) dataset-aware; returns the count"""
+    module_name = namespace.get('__name__')
+    classes = [obj for obj in namespace.values() if isinstance(obj, type) and obj.__module__ == module_name]
+    for cls in classes:
+        make_dataset_aware(cls)
+    return len(classes)
@@ -0,0 +1,221 @@
+"""
+TV Output - Result assembly for ta_strategies_TVLibrary
+Every calculate_*_values method hands its (column, values) pairs to emit(). By default emit keeps
+the original behaviour (write into the caller's df when append=True, return a small DataFrame).
+While a strategy instance is bound to an OutputBlock, emit instead writes straight into the
+block's preallocated matrices - int8 scores, float32 indicator values, int8 label codes - and
+returns an empty frame, so the combined result is built once at the end (or never, for callers
+that want the raw arrays).
+"""
+
+import inspect
+import re
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+INT8_MIN, INT8_MAX = np.iinfo(np.int8).min, np.iinfo(np.int8).max
+
+_SUB_STRATEGY_METHOD = re.compile(r'calculate_\w+_values$')
+
+
+def emit(strategy, df, append, outputs):
+    """Deliver a sub-strategy's output columns to the bound OutputBlock, or as a DataFrame"""
+    block = strategy.__dict__.get('_tv_output')
+    if block is not None:
+        block.add_columns(outputs, owner=type(strategy).__name__)
+        return pd.DataFrame()
+    if append:
+        for name, values in outputs:
+            df[name] = values
+    df_copy = pd.DataFrame()
+    for name, values in outputs:
+        df_copy[name] = values
+    return df_copy
+
+
+def write_columns(df, frame):
+    """Set every column of `frame` on `df` in order (a repeated name ends up with its last values)"""
+    for position, name in enumerate(frame.columns):
+        df[name] = frame.iloc[:, position]
+
+
+@contextmanager
+def bound(strategy, block):
+    """Route a strategy instance's emit() calls into `block` for the duration of the context"""
+    strategy.__dict__['_tv_output'] = block
+    try:
+        yield strategy
+    finally:
+        strategy.__dict__.pop('_tv_output', None)
+
+
+def declared_outputs(strategy):
+    """
+    Upper bound on the columns one run_all_strategies call emits: each calculate_*_values
+    sub-strategy writes at most one score, one value and one explanation column
+    """
+    return sum(1 for name, _ in inspect.getmembers(type(strategy), inspect.isfunction)
+               if _SUB_STRATEGY_METHOD.match(name))
+
+
+class OutputBlock:
+    """
+    Preallocated column store for strategy outputs
+    Scores live in an int8 matrix, indicator values in a float32 matrix and label columns as
+    int8 codes plus a category table; anything else (strings, odd dtypes) is kept as-is.
+    Matrices grow if the declared capacity turns out to be too small.
+    `keep` (name -> bool) drops unwanted columns as they arrive. Columns are grouped by owner in
+    the order of `owners` (owners not listed follow in order of first output), so the assembled
+    frame doesn't depend on which worker thread finished first.
+    """
+
+    def __init__(self, n_rows, score_capacity=0, indicator_capacity=0, label_capacity=0, keep=None, owners=()):
+        self.n_rows = n_rows
+        self.keep = keep
+        self._scores = np.zeros((score_capacity, n_rows), dtype=np.int8)
+        self._indicators = np.full((indicator_capacity, n_rows), np.nan, dtype=np.float32)
+        self._labels = np.full((label_capacity, n_rows), -1, dtype=np.int8)
+        self._used = {'score': 0, 'indicator': 0, 'label': 0}
+        self._categories = []
+        self._other = []
+        self._columns = []  # (owner rank, sequence, name, kind, slot)
+        self._owners = {owner: rank for rank, owner in enumerate(owners)}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_strategies(cls, n_rows, strategies, ta_indicator_value=False, signal_score=True,
+                       signal_value=False, signal_explanation=False, sub_strategies=None, keep=None, owners=()):
+        """Block sized from the strategies' declared sub-strategy counts (or an explicit count)"""
+        if sub_strategies is None:
+            sub_strategies = sum(declared_outputs(strategy) for strategy in strategies)
+        labels = sub_strategies * (int(signal_value) + int(signal_explanation))
+        return cls(n_rows,
+                   score_capacity=sub_strategies if signal_score else 0,
+                   indicator_capacity=len(strategies) if ta_indicator_value else 0,
+                   label_capacity=labels, keep=keep, owners=owners)
+
+    def __len__(self):
+        return len(self._columns)
+
+    @property
+    def columns(self):
+        """Column names in assembly order (grouped by strategy, in order of first output)"""
+        return [entry[2] for entry in sorted(self._columns)]
+
+    def _matrix(self, kind):
+        return {'score': self._scores, 'indicator': self._indicators, 'label': self._labels}[kind]
+
+    def _allocate(self, kind):
+        matrix = self._matrix(kind)
+        slot = self._used[kind]
+        if slot == len(matrix):
+            fill = {'score': 0, 'indicator': np.nan, 'label': -1}[kind]
+            grown = np.full((max(2 * len(matrix), 8), self.n_rows), fill, dtype=matrix.dtype)
+            grown[:len(matrix)] = matrix
+            setattr(self, {'score': '_scores', 'indicator': '_indicators', 'label': '_labels'}[kind], grown)
+            matrix = grown
+        self._used[kind] = slot + 1
+        return matrix, slot
+
+    def _classify(self, values):
+        if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+            if len(values.dtype.categories) <= INT8_MAX:
+                return 'label', values
+            return 'other', values
+        array = np.asarray(values)
+        if array.ndim != 1 or len(array) != self.n_rows:
+            return 'other', values
+        if array.dtype.kind in 'biu':
+            if len(array) == 0 or (array.min() >= INT8_MIN and array.max() <= INT8_MAX):
+                return 'score', array
+            return 'other', values
+        if array.dtype.kind == 'f':
+            return 'indicator', array
+        return 'other', values
+
+    def add_columns(self, outputs, owner=None):
+        """Store (name, values) pairs emitted by one sub-strategy"""
+        with self._lock:
+            rank = self._owners.setdefault(owner, len(self._owners))
+            for name, values in outputs:
+                if self.keep is not None and not self.keep(name):
+                    continue
+                kind, data = self._classify(values)
+                if kind == 'other':
+                    slot = len(self._other)
+                    self._other.append(data)
+                elif kind == 'label':
+                    matrix, slot = self._allocate(kind)
+                    matrix[slot] = data.cat.codes.to_numpy()
+                    self._categories.append(data.dtype)
+                else:
+                    matrix, slot = self._allocate(kind)
+                    matrix[slot] = data
+                self._columns.append((rank, len(self._columns), name, kind, slot))
+
+    def add_frame(self, frame, owner=None):
+        """Store every column of an already-built result frame"""
+        if frame is None or frame.empty:
+            return
+        self.add_columns([(frame.columns[i], frame.iloc[:, i]) for i in range(frame.shape[1])], owner=owner)
+
+    def owner_nbytes(self):
+        """Bytes of stored output per owner"""
+        itemsize = {'score': self._scores.itemsize, 'indicator': self._indicators.itemsize,
+                    'label': self._labels.itemsize}
+        owners = {rank: owner for owner, rank in self._owners.items()}
+        sizes = {}
+        for rank, _, _, kind, slot in self._columns:
+            if kind == 'other':
+                values = self._other[slot]
+                nbytes = values.memory_usage(index=False) if isinstance(values, pd.Series) else np.asarray(values).nbytes
+            else:
+                nbytes = itemsize[kind] * self.n_rows
+            sizes[owners[rank]] = sizes.get(owners[rank], 0) + nbytes
+        return sizes
+
+    def _column_values(self, kind, slot):
+        if kind == 'other':
+            return self._other[slot]
+        if kind == 'label':
+            return pd.Categorical.from_codes(self._labels[slot], dtype=self._categories[slot])
+        return self._matrix(kind)[slot]
+
+    def arrays(self):
+        """Raw outputs without building a DataFrame: {kind: (names, matrix)} plus label tables and owners"""
+        ordered = sorted(self._columns)
+        owners = {rank: owner for owner, rank in self._owners.items()}
+        result = {'owners': {}}
+        for kind in ('score', 'indicator', 'label'):
+            entries = [entry for entry in ordered if entry[3] == kind]
+            result[kind] = ([entry[2] for entry in entries],
+                            self._matrix(kind)[[entry[4] for entry in entries]])
+            result['owners'][kind] = [owners[entry[0]] for entry in entries]
+        result['label_tables'] = {
+            entry[2]: dict(enumerate(self._categories[entry[4]].categories))
+            for entry in ordered if entry[3] == 'label'
+        }
+        result['other'] = {entry[2]: self._other[entry[4]] for entry in ordered if entry[3] == 'other'}
+        return result
+
+    def to_frame(self, index=None):
+        """Build the combined DataFrame once"""
+        ordered = sorted(self._columns)
+        if not ordered:
+            return pd.DataFrame()
+        data = {}
+        for position, (_, _, _, kind, slot) in enumerate(ordered):
+            values = self._column_values(kind, slot)
+            if isinstance(values, pd.Series) and index is not None:
+                values = values.to_numpy() if len(values) == len(index) else values
+            data[position] = values
+        frame = pd.DataFrame(data, index=index)
+        frame.columns = pd.Index([entry[2] for entry in ordered])
+        return frame
+
+    def write_into(self, df):
+        """Append the block's columns to `df` (the append=True path)"""
+        write_columns(df, self.to_frame(df.index))
@@ -0,0 +1,203 @@
+"""
+TV Panel - Multi-ticker (time x ticker) batch mode for ta_strategies_TVLibrary
+A Panel holds one time x ticker DataFrame per OHLCV field and stands in for the single-ticker
+DataFrame the library classes normally receive: panel['Close'] is a 2D frame, so the pandas
+expressions in compute_values and the score methods (rolling windows, EWMs, shifts, np.select)
+compute every ticker in one vectorized call. Results come back as {column: time x ticker frame}.
+
+Classes whose code only works on one series (Python loops, tv_kernels state machines, helpers
+building plain pd.Series) are detected by a one-off probe that compares the panel run with
+per-ticker runs on a small synthetic panel; those classes run ticker by ticker instead, so
+run_panel() always returns the same values as running each ticker separately.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+PROBE_ROWS = 260
+PROBE_TICKERS = ('P1', 'P2', 'P3')
+
+_support = {}  # (class, parameters) -> whether the vectorized path matches per-ticker runs
+_support_lock = threading.Lock()
+
+
+class Panel:
+    """Time x ticker frames per field; passed to library methods in place of a single-ticker df"""
+
+    def __init__(self, fields):
+        fields = dict(fields)
+        if not fields:
+            raise ValueError("A panel needs at least one field")
+        first = next(iter(fields.values()))
+        for name, frame in fields.items():
+            if not (frame.index.equals(first.index) and frame.columns.equals(first.columns)):
+                raise ValueError(f"Field '{name}' is not aligned with the other fields")
+        self._fields = fields
+        self.index = first.index
+        self.tickers = first.columns
+        self.columns = pd.Index(list(fields))
+
+    @classmethod
+    def from_frames(cls, frames, fields=FIELDS):
+        """Panel from {ticker: single-ticker OHLCV DataFrame} (indexes are outer-joined)"""
+        tickers = list(frames)
+        available = [field for field in fields if all(field in frames[t].columns for t in tickers)]
+        return cls({field: pd.concat([frames[t][field].rename(t) for t in tickers], axis=1)
+                    for field in available})
+
+    @classmethod
+    def from_wide(cls, df, date_column='Date', fields=FIELDS):
+        """Panel from the `{ticker}_{field}` layout built by inputs.download_multi_ticker_data"""
+        if date_column in df.columns:
+            df = df.set_index(date_column)
+        columns = {}
+        for column in df.columns:
+            ticker, _, field = str(column).rpartition('_')
+            if ticker and field in fields:
+                columns.setdefault(field, {})[ticker] = df[column]
+        if not columns:
+            raise ValueError("No `{ticker}_{field}` columns found")
+        return cls({field: pd.DataFrame(columns[field]) for field in fields if field in columns})
+
+    def __getitem__(self, field):
+        return self._fields[field]
+
+    def __contains__(self, field):
+        return field in self._fields
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def shape(self):
+        return len(self.index), len(self.tickers)
+
+    def ticker_frame(self, ticker):
+        """Single-ticker OHLCV DataFrame of one ticker"""
+        return pd.DataFrame({field: frame[ticker] for field, frame in self._fields.items()}, index=self.index)
+
+
+def series(values, df):
+    """pd.Series(values, index=df.index), or a time x ticker frame when df is a Panel"""
+    if isinstance(df, Panel):
+        return pd.DataFrame(values, index=df.index, columns=df.tickers)
+    return pd.Series(values, index=df.index)
+
+
+def labels(frame):
+    """Panel label output (int8 codes, categories in frame.attrs) as strings; -1 becomes NaN"""
+    categories = np.asarray(list(frame.attrs['categories']) + [np.nan], dtype=object)
+    return pd.DataFrame(categories[frame.to_numpy()], index=frame.index, columns=frame.columns)
+
+
+def ticker_outputs(outputs, ticker):
+    """Columns of one ticker from run_panel() outputs, as a single-ticker DataFrame"""
+    return pd.DataFrame({name: labels(frame)[ticker] if 'categories' in frame.attrs else frame[ticker]
+                         for name, frame in outputs.items()})
+
+
+class _PanelRecorder:
+    """Stands in for an OutputBlock during a vectorized run: keeps each emitted time x ticker frame"""
+
+    def __init__(self, panel):
+        self.panel = panel
+        self.outputs = []
+
+    def add_columns(self, outputs, owner=None):
+        for name, values in outputs:
+            if not isinstance(values, pd.DataFrame) or values.shape != self.panel.shape:
+                raise TypeError(f"Column {name} is not a time x ticker frame")
+            self.outputs.append((name, values))
+
+
+def _run_vectorized(instance, panel, flags):
+    import tv_memo
+    import tv_output
+    import tv_primitives
+
+    strategy, recorder = tv_memo.fresh_copy(instance), _PanelRecorder(panel)
+    with tv_output.bound(strategy, recorder), tv_primitives.sharing(panel):
+        result = strategy.run_all_strategies(panel, append=False, **flags)
+    if isinstance(result, pd.DataFrame) and not result.empty:
+        raise TypeError(f"{type(instance).__name__} returned columns outside tv_output.emit")
+    return recorder.outputs
+
+
+def _stack(columns, panel):
+    """One time x ticker frame from per-ticker Series (categoricals become int8 codes)"""
+    first = columns[0]
+    if isinstance(first.dtype, pd.CategoricalDtype):
+        codes = np.column_stack([column.cat.codes.to_numpy() for column in columns]).astype(np.int8)
+        frame = pd.DataFrame(codes, index=panel.index, columns=panel.tickers)
+        frame.attrs['categories'] = list(first.cat.categories)
+        return frame
+    return pd.DataFrame(np.column_stack([column.to_numpy() for column in columns]),
+                        index=panel.index, columns=panel.tickers)
+
+
+def _run_per_ticker(instance, panel, flags):
+    results = [instance.run_all_strategies(panel.ticker_frame(ticker), append=False, **flags)
+               for ticker in panel.tickers]
+    names = list(results[0].columns) if isinstance(results[0], pd.DataFrame) else []
+    return [(name, _stack([result.iloc[:, position] for result in results], panel))
+            for position, name in enumerate(names)]
+
+
+def _same_outputs(actual, expected):
+    if [name for name, _ in actual] != [name for name, _ in expected]:
+        return False
+    for (_, left), (_, right) in zip(actual, expected):
+        if ('categories' in left.attrs) != ('categories' in right.attrs):
+            return False
+        if 'categories' in left.attrs:
+            left, right = labels(left), labels(right)
+            if not left.equals(right):
+                return False
+        elif not np.array_equal(left.to_numpy(np.float64), right.to_numpy(np.float64), equal_nan=True):
+            return False
+    return True
+
+
+def _probe_panel():
+    from data_sources import SyntheticSource
+
+    source = SyntheticSource(seed=0)
+    return Panel.from_frames({ticker: source.fetch(ticker, '2y', '1d').tail(PROBE_ROWS) for ticker in PROBE_TICKERS})
+
+
+def panel_supported(instance):
+    """Whether the instance's class computes a panel in one vectorized pass (probed once per class/parameters)"""
+    import tv_memo
+
+    key = (type(instance), tv_memo.parameters(instance))
+    with _support_lock:
+        if key not in _support:
+            probe = _probe_panel()
+            flags = dict(ta_indicator_value=True, signal_score=True, signal_value=True, signal_explanation=True)
+            try:
+                supported = _same_outputs(_run_vectorized(instance, probe, flags),
+                                          _run_per_ticker(tv_memo.fresh_copy(instance), probe, flags))
+            except Exception:
+                supported = False
+            _support[key] = supported
+        return _support[key]
+
+
+def run_panel(instance, panel, ta_indicator_value=False, signal_score=True, signal_value=False, signal_explanation=False):
+    """
+    Every ticker of `panel` through one strategy instance: {column: time x ticker frame}
+    Vectorized when panel_supported(instance), ticker by ticker otherwise. Value/explanation
+    columns are int8 codes with their categories in frame.attrs['categories'] (see labels()).
+    A column name emitted twice keeps its last values, as with append=True on a single frame.
+    """
+    flags = dict(ta_indicator_value=ta_indicator_value, signal_score=signal_score,
+                 signal_value=signal_value, signal_explanation=signal_explanation)
+    if panel_supported(instance):
+        outputs = _run_vectorized(instance, panel, flags)
+    else:
+        outputs = _run_per_ticker(instance, panel, flags)
+    return dict(outputs)
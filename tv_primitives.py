@@ -0,0 +1,141 @@
+"""
+TV Primitives - Building blocks shared across ta_strategies_TVLibrary classes
+Many strategy classes derive their indicator from the same few series: true range and ATR,
+rolling SMA / std / max / min of a price column, EMA of Close, typical price. Inside a
+sharing(df) block (StrategyGroupRunner.run_all_strategies opens one per run), get(df, kind, ...)
+computes each distinct primitive once and hands the same read-only Series to every class that
+asks for it. Outside a block, get() simply computes the primitive.
+
+Keys are (kind, *args); trailing arguments may be left out to use their defaults:
+    ("true_range", skipna=True)            max(H - L, |H - prev C|, |L - prev C|)
+    ("ATR", period, min_periods=None, skipna=True)
+    ("typical_price",)                     (H + L + C) / 3
+    ("sma" | "std" | "var" | "rolling_sum" | "rolling_max" | "rolling_min", source, window, min_periods=None)
+    ("ema", source, span)                  ewm(span, adjust=False).mean()
+`source` is a column name or another primitive key, e.g. ("rolling_sum", ("true_range",), 14, 1).
+skipna=False gives NaN wherever a true range component is NaN (the np.maximum form), instead of
+the max of the remaining components (the DataFrame.max form).
+"""
+
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+_ROLLING = {
+    'sma': 'mean',
+    'std': 'std',
+    'var': 'var',
+    'rolling_sum': 'sum',
+    'rolling_max': 'max',
+    'rolling_min': 'min',
+}
+
+# Number of required arguments and defaults of the optional ones, per kind
+_SIGNATURES = {
+    'true_range': (0, (True,)),
+    'ATR': (1, (None, True)),
+    'typical_price': (0, ()),
+    'ema': (2, ()),
+    **{kind: (2, (None,)) for kind in _ROLLING},
+}
+
+_active = {}  # id(frame) -> [store, nesting depth]
+_active_lock = threading.Lock()
+
+
+def normalize_key(kind, *args):
+    """Full (kind, *args) key with defaults filled in"""
+    if kind not in _SIGNATURES:
+        raise KeyError(f"Unknown primitive '{kind}'; expected one of {sorted(_SIGNATURES)}")
+    required, defaults = _SIGNATURES[kind]
+    if not required <= len(args) <= required + len(defaults):
+        raise TypeError(f"Primitive '{kind}' takes {required} to {required + len(defaults)} arguments, got {len(args)}")
+    return (kind,) + tuple(args) + defaults[len(args) - required:]
+
+
+def compute(df, key, get):
+    """Compute one primitive for df; `get` resolves the primitives it is built from"""
+    kind, args = key[0], key[1:]
+
+    def source(name):
+        return get(*name) if isinstance(name, tuple) else df[name]
+
+    if kind == 'true_range':
+        prev_close = df['Close'].shift(1)
+        # Elementwise so that tv_panel's time x ticker frames work too; fmax skips NaN, maximum propagates it
+        combine = np.fmax if args[0] else np.maximum
+        return combine(combine(df['High'] - df['Low'], (df['High'] - prev_close).abs()), (df['Low'] - prev_close).abs())
+    if kind == 'ATR':
+        period, min_periods, skipna = args
+        return get('true_range', skipna).rolling(window=period, min_periods=min_periods).mean()
+    if kind == 'typical_price':
+        return (df['High'] + df['Low'] + df['Close']) / 3
+    if kind == 'ema':
+        return source(args[0]).ewm(span=args[1], adjust=False).mean()
+    name, window, min_periods = args
+    return getattr(source(name).rolling(window=window, min_periods=min_periods), _ROLLING[kind])()
+
+
+class PrimitiveStore:
+    """Primitives of one dataset, each computed on first request and then shared (read-only)"""
+
+    def __init__(self, df):
+        self.df = df
+        self._values = {}
+        self._key_locks = {}
+        self.computed = 0
+        self.requests = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, kind, *args):
+        """The primitive (kind, *args), computing it if no class has asked for it yet"""
+        key = normalize_key(kind, *args)
+        self.requests += 1
+        value = self._values.get(key)
+        if value is not None:
+            return value
+        with self._key_locks.setdefault(key, threading.Lock()):
+            value = self._values.get(key)
+            if value is None:
+                value = compute(self.df, key, self.get)
+                # Shared between classes: any in-place write would leak into the others
+                value.to_numpy().flags.writeable = False
+                self._values[key] = value
+                self.computed += 1
+        return value
+
+
+def store_for(df):
+    """The PrimitiveStore shared for this exact DataFrame object, or None"""
+    entry = _active.get(id(df))
+    if entry is not None and entry[0].df is df:
+        return entry[0]
+    return None
+
+
+@contextmanager
+def sharing(df):
+    """Share primitives of `df` among every get(df, ...) call made inside the block (nestable)"""
+    with _active_lock:
+        entry = _active.get(id(df))
+        if entry is None or entry[0].df is not df:
+            entry = _active[id(df)] = [PrimitiveStore(df), 0]
+        entry[1] += 1
+    try:
+        yield entry[0]
+    finally:
+        with _active_lock:
+            entry[1] -= 1
+            if entry[1] == 0 and _active.get(id(df)) is entry:
+                del _active[id(df)]
+
+
+def get(df, kind, *args):
+    """Primitive (kind, *args) of df: shared inside a sharing(df) block, computed directly otherwise"""
+    store = store_for(df)
+    if store is not None:
+        return store.get(kind, *args)
+    return compute(df, normalize_key(kind, *args), lambda *key: get(df, *key))
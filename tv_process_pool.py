@@ -0,0 +1,209 @@
+"""
+TV Process Pool - Run TV library strategy groups in worker processes
+The OHLCV frame is published once through shared memory: every worker attaches to it at startup
+instead of receiving a pickled copy with each task. Workers send back compact column arrays
+(signal scores as int8) rather than pickled DataFrames, and the parent rebuilds the frames.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import tv_primitives
+
+logger = logging.getLogger(__name__)
+
+# Tasks per worker: enough to balance uneven strategy costs without much scheduling overhead
+CHUNKS_PER_WORKER = 4
+
+# Worker-side state, set once by _init_worker
+_worker_memory = None
+_worker_frame = None
+
+
+class SharedFrame:
+    """
+    A DataFrame whose numeric columns are copied once into a shared-memory block
+    Non-numeric columns and the index travel with the spec (pickled once per worker)
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.index = df.index
+        self.length = len(df)
+        self.layout = []
+        self.other = {}
+
+        arrays = []
+        offset = 0
+        for position in range(len(self.columns)):
+            values = df.iloc[:, position].to_numpy()
+            if values.dtype.kind not in 'biuf':
+                self.other[position] = values
+                continue
+            values = np.ascontiguousarray(values)
+            self.layout.append((position, values.dtype.str, offset))
+            arrays.append(values)
+            offset += -(-values.nbytes // 8) * 8  # keep every column 8-byte aligned
+
+        self.memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (_, dtype, start), values in zip(self.layout, arrays):
+            np.ndarray(len(values), dtype=dtype, buffer=self.memory.buf, offset=start)[:] = values
+
+    def spec(self):
+        """Everything a worker needs to attach to the frame"""
+        return self.memory.name, self.layout, self.other, self.columns, self.index, self.length
+
+    def close(self):
+        """Release and remove the shared-memory block"""
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def attach_frame(spec):
+    """
+    Rebuild a DataFrame from a SharedFrame spec
+    Returns (memory, frame); numeric columns are read-only views, so keep `memory` open while using the frame
+    """
+    name, layout, other, columns, index, length = spec
+    memory = shared_memory.SharedMemory(name=name)
+    data = dict(other)
+    for position, dtype, start in layout:
+        values = np.ndarray(length, dtype=dtype, buffer=memory.buf, offset=start)
+        values.flags.writeable = False
+        data[position] = values
+    frame = pd.DataFrame({position: data[position] for position in range(len(columns))}, index=index, copy=False)
+    frame.columns = pd.Index(columns)
+    return memory, frame
+
+
+def pack_frame(df):
+    """
+    Compact, picklable form of a strategy result: column names plus one array per column
+    Integer columns that fit are narrowed to int8 and restored by unpack_frame; categorical
+    label columns travel as their codes plus the category table
+    """
+    if df.empty:
+        return None
+    arrays = []
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            arrays.append((column.dtype, column.cat.codes.to_numpy()))
+            continue
+        values = column.to_numpy()
+        dtype = values.dtype
+        if dtype.kind in 'iu' and len(values) and values.min() >= -128 and values.max() <= 127:
+            values = values.astype(np.int8)
+        arrays.append((dtype.str if dtype.kind != 'O' else 'O', values))
+    return list(df.columns), arrays
+
+
+def unpack_frame(packed, index):
+    """Inverse of pack_frame, on the caller's index"""
+    if packed is None:
+        return pd.DataFrame()
+    columns, arrays = packed
+    data = {}
+    for position, (dtype, values) in enumerate(arrays):
+        if isinstance(dtype, pd.CategoricalDtype):
+            data[position] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            data[position] = values.astype(dtype, copy=False)
+    frame = pd.DataFrame(data, index=index)
+    frame.columns = pd.Index(columns)
+    return frame
+
+
+def _init_worker(spec):
+    global _worker_memory, _worker_frame
+    _worker_memory, _worker_frame = attach_frame(spec)
+    # Every chunk this worker runs shares one primitive store for the frame (kept for the worker's lifetime)
+    tv_primitives.sharing(_worker_frame).__enter__()
+
+
+def _run_strategy_chunk(items, options):
+    """Worker task: run a chunk of (name, instance) pairs against the shared frame"""
+    from ta_strategies_combinations_TVLibrary import _run_timed_strategy
+
+    packed = []
+    timings = {}
+    for item in items:
+        name, result_df, wall_seconds, cpu_seconds = _run_timed_strategy(item, _worker_frame, **options)
+        timings[name] = (wall_seconds, cpu_seconds)
+        packable = result_df.index.equals(_worker_frame.index) and all(
+            isinstance(dtype, (np.dtype, pd.CategoricalDtype)) for dtype in result_df.dtypes)
+        if not result_df.empty and not packable:
+            # Foreign index or other extension dtypes: ship the DataFrame itself
+            packed.append((name, result_df))
+        else:
+            packed.append((name, pack_frame(result_df)))
+    return packed, timings
+
+
+def chunk_items(items, chunks, costs=None):
+    """
+    Split items into `chunks` groups
+    Without costs, groups are interleaved so neighbouring strategies land in different tasks.
+    With costs (one per item, None if unknown), items are packed longest-first into the currently
+    cheapest group and the groups are returned most expensive first.
+    """
+    chunks = max(1, min(chunks, len(items)))
+    if costs is None:
+        return [items[i::chunks] for i in range(chunks)]
+    known = [cost for cost in costs if cost is not None]
+    fallback = max(known) if known else 1.0  # unknown cost: assume it may be as slow as the slowest
+    order = sorted(range(len(items)), key=lambda i: -(fallback if costs[i] is None else costs[i]))
+    groups = [[] for _ in range(chunks)]
+    totals = [0.0] * chunks
+    for i in order:
+        target = totals.index(min(totals))
+        groups[target].append(items[i])
+        totals[target] += fallback if costs[i] is None else costs[i]
+    ranked = sorted(range(chunks), key=lambda g: -totals[g])
+    return [groups[g] for g in ranked if groups[g]]
+
+
+def run_in_processes(strategy_instances, df, max_workers, options, costs=None, timings=None):
+    """
+    Run every strategy instance's run_all_strategies(df, **options) in a process pool
+    Yields (name, result_df) as chunks complete; failed chunks yield empty DataFrames
+    `costs` (name -> expected seconds) balances the chunks; `timings` (a dict) receives
+    name -> (wall seconds, CPU seconds) measured in the workers
+    """
+    items = list(strategy_instances.items())
+    if not items:
+        return
+    item_costs = None if costs is None else [costs.get(name) for name, _ in items]
+    with SharedFrame(df) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.spec(),)) as executor:
+            future_to_chunk = {
+                executor.submit(_run_strategy_chunk, chunk, options): chunk
+                for chunk in chunk_items(items, max_workers * CHUNKS_PER_WORKER, item_costs)
+            }
+            for future in as_completed(future_to_chunk):
+                try:
+                    packed_results, chunk_timings = future.result()
+                except Exception as e:
+                    names = [name for name, _ in future_to_chunk[future]]
+                    logger.error(f"Strategy chunk {names} generated an exception: {e}")
+                    for name in names:
+                        yield name, pd.DataFrame()
+                    continue
+                if timings is not None:
+                    timings.update(chunk_timings)
+                for name, packed in packed_results:
+                    if isinstance(packed, pd.DataFrame):
+                        yield name, packed
+                    else:
+                        yield name, unpack_frame(packed, df.index)
@@ -0,0 +1,141 @@
+"""
+TV Profile - Per-strategy cost profile for the TV library group runners
+Each run records how long every strategy class took (wall and CPU time, per 1000 rows) and how
+much output it produced. Runners use the profile to start the most expensive classes first
+(longest-task-first), so a slow class no longer begins last and stretches the whole run.
+Profiles can be saved to a JSON file and reloaded by later runs; report() shows where the time goes.
+"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+PROFILE_VERSION = 1
+
+# Weight of the newest run in the smoothed costs (the rest comes from earlier runs)
+SMOOTHING = 0.3
+
+_FIELDS = ('wall_per_krow', 'cpu_per_krow', 'output_bytes_per_row')
+
+
+class StrategyProfile:
+    """Smoothed per-strategy costs, optionally persisted to `path` (JSON)"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Profile stored at `path` (an empty one if the file doesn't exist yet)"""
+        profile = cls(path)
+        if os.path.exists(path):
+            with open(path) as f:
+                payload = json.load(f)
+            if payload.get('version') == PROFILE_VERSION:
+                profile.entries = payload.get('strategies', {})
+        return profile
+
+    def save(self, path=None):
+        """Write the profile as JSON (to `path`, or the path it was loaded from)"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the strategy profile to")
+        with self._lock:
+            payload = {'version': PROFILE_VERSION, 'strategies': self.entries}
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = f"{path}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump(payload, f, indent=2, sort_keys=True)
+            os.replace(temporary, path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def record(self, name, rows, wall_seconds, cpu_seconds, output_bytes):
+        """Fold one run of strategy `name` on `rows` rows into its smoothed costs"""
+        krows = max(rows, 1) / 1000
+        sample = {
+            'wall_per_krow': wall_seconds / krows,
+            'cpu_per_krow': cpu_seconds / krows,
+            'output_bytes_per_row': output_bytes / max(rows, 1),
+        }
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = self.entries[name] = dict(sample, runs=0)
+            else:
+                for field in _FIELDS:
+                    entry[field] = (1 - SMOOTHING) * entry[field] + SMOOTHING * sample[field]
+            entry['runs'] += 1
+            entry['last_rows'] = rows
+            entry['last_wall_seconds'] = wall_seconds
+
+    def expected_seconds(self, name, rows):
+        """Expected CPU seconds of `name` on `rows` rows (None if it has never been profiled)"""
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        return entry['cpu_per_krow'] * max(rows, 1) / 1000
+
+    def schedule(self, names, rows):
+        """
+        `names` in the order they should start: unprofiled strategies first (their cost is
+        unknown), then by descending expected cost; ties keep their original order
+        """
+        expected = {name: self.expected_seconds(name, rows) for name in names}
+        unknown = [name for name in names if expected[name] is None]
+        known = sorted((name for name in names if expected[name] is not None), key=lambda name: -expected[name])
+        return unknown + known
+
+    def report(self, rows=1000):
+        """DataFrame of profiled strategies by expected cost on `rows` rows, with their share of the total"""
+        records = [
+            {
+                'strategy': name,
+                'runs': entry['runs'],
+                'expected_seconds': entry['cpu_per_krow'] * rows / 1000,
+                'wall_per_krow': entry['wall_per_krow'],
+                'cpu_per_krow': entry['cpu_per_krow'],
+                'output_mb': entry['output_bytes_per_row'] * rows / 1e6,
+            }
+            for name, entry in self.entries.items()
+        ]
+        if not records:
+            return pd.DataFrame(columns=['runs', 'expected_seconds', 'wall_per_krow', 'cpu_per_krow',
+                                         'output_mb', 'share', 'cumulative_share'])
+        report = pd.DataFrame(records).set_index('strategy').sort_values('expected_seconds', ascending=False)
+        total = report['expected_seconds'].sum()
+        report['share'] = report['expected_seconds'] / total if total > 0 else 0.0
+        report['cumulative_share'] = report['share'].cumsum()
+        return report
+
+    def print_report(self, rows=1000, top=15):
+        """Print the most expensive strategies"""
+        report = self.report(rows)
+        print(f"\n⏱️  STRATEGY COST PROFILE ({len(report)} strategies, per {rows:,} rows)")
+        print("=" * 80)
+        if report.empty:
+            print("No runs recorded yet")
+            return
+        for name, row in report.head(top).iterrows():
+            print(f"{name:<55} {row['expected_seconds'] * 1000:8.1f} ms {row['share']:6.1%} "
+                  f"(cum {row['cumulative_share']:6.1%})")
+        print(f"Total expected: {report['expected_seconds'].sum():.2f} s")
+
+
+def resolve_profile(profile):
+    """A StrategyProfile from None (in-memory), a path (loaded/persisted) or an existing profile"""
+    if profile is None:
+        return StrategyProfile()
+    if isinstance(profile, StrategyProfile):
+        return profile
+    return StrategyProfile.load(os.fspath(profile))
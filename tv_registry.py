@@ -0,0 +1,81 @@
+"""
+TV Registry - Lazy, by-name access to ta_strategies_TVLibrary strategy classes
+The 27k-line library is only imported the first time a strategy class is actually used
+"""
+
+import importlib
+import sys
+import threading
+
+TV_LIBRARY_MODULE = "ta_strategies_TVLibrary"
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def load_library():
+    """Import ta_strategies_TVLibrary on first call and return the module"""
+    global _library
+    if _library is None:
+        with _library_lock:
+            if _library is None:
+                _library = importlib.import_module(TV_LIBRARY_MODULE)
+    return _library
+
+
+def is_library_loaded():
+    """True once the TV library module has been imported (by anyone)"""
+    return TV_LIBRARY_MODULE in sys.modules
+
+
+def resolve_strategy_class(name):
+    """Return the strategy class called `name` from the TV library"""
+    library = load_library()
+    try:
+        return getattr(library, name)
+    except AttributeError:
+        raise AttributeError(f"{TV_LIBRARY_MODULE} has no strategy class '{name}'") from None
+
+
+def list_strategy_classes():
+    """Names of every strategy class defined in the TV library"""
+    library = load_library()
+    return sorted(
+        name for name, obj in vars(library).items()
+        if isinstance(obj, type) and obj.__module__ == library.__name__
+    )
+
+
+class LazyStrategyClass:
+    """
+    Stand-in for a TV library class that resolves the real class on first use
+    Calling it constructs an instance exactly like the real class would
+    """
+
+    def __init__(self, name):
+        self.__name__ = name
+        self._cls = None
+
+    def resolve(self):
+        """Return the real class (importing the library if needed)"""
+        if self._cls is None:
+            self._cls = resolve_strategy_class(self.__name__)
+        return self._cls
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Only reached for attributes not set in __init__ (class attributes, static methods, ...)
+        if attr.startswith('__') or attr == '_cls':
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        state = "resolved" if self._cls is not None else "lazy"
+        return f"<LazyStrategyClass {self.__name__} ({state})>"
+
+
+def lazy_class(name):
+    """Create a lazy stand-in for a TV library strategy class"""
+    return LazyStrategyClass(name)
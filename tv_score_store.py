@@ -0,0 +1,190 @@
+"""
+TV Score Store - Memory-mapped int8 signal-score matrix exported from the group runners
+A store is a directory holding
+    scores.int8    time x column int8 matrix in C order (new bars are appended at the end)
+    index.int64    bar timestamps (nanoseconds since the epoch)
+    columns.json   sidecar: row count and, per column, its name, strategy class, parameters and sub-strategy
+ScoreStore maps the files instead of reading them, so opening a multi-GB result is instant and
+time ranges or a strategy's (contiguous) columns are views of the mapped file. The row count in
+the sidecar is written last: an interrupted append leaves the store at its previous length.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+SCORES_FILE = 'scores.int8'
+INDEX_FILE = 'index.int64'
+COLUMNS_FILE = 'columns.json'
+
+
+def _write_sidecar(path, sidecar):
+    temporary = os.path.join(path, f"{COLUMNS_FILE}.tmp")
+    with open(temporary, 'w') as f:
+        json.dump(sidecar, f, indent=1, default=str)
+    os.replace(temporary, os.path.join(path, COLUMNS_FILE))
+
+
+def _timestamps(index):
+    """int64 nanosecond timestamps of a DatetimeIndex or datetime column (time zones are dropped)"""
+    if not pd.api.types.is_datetime64_any_dtype(index):
+        raise ValueError(f"Score store bars need datetime timestamps, got a {type(index).__name__} of {index.dtype}")
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit('ns').asi8
+
+
+def _map(filename, dtype, shape, mode):
+    if shape[0] == 0 or (len(shape) > 1 and shape[1] == 0):
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode=mode, shape=shape)
+
+
+def create_store(path, scores, index, columns, overwrite=False):
+    """
+    Write a new store: `scores` is a time x column int8 matrix, `index` the bar timestamps and
+    `columns` one metadata dict per column (at least 'name'). Returns the opened ScoreStore.
+    """
+    scores = np.asarray(scores)
+    if scores.ndim != 2 or scores.shape != (len(index), len(columns)):
+        raise ValueError(f"scores must be {len(index)} x {len(columns)}, got {scores.shape}")
+    if os.path.exists(os.path.join(path, COLUMNS_FILE)) and not overwrite:
+        raise FileExistsError(f"A score store already exists at {path}")
+    timestamps = _timestamps(index)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, SCORES_FILE), 'wb') as f:
+        f.write(np.ascontiguousarray(scores, dtype=np.int8).tobytes())
+    with open(os.path.join(path, INDEX_FILE), 'wb') as f:
+        f.write(timestamps.tobytes())
+    _write_sidecar(path, {'version': STORE_VERSION, 'rows': len(index), 'columns': list(columns)})
+    return ScoreStore(path)
+
+
+class ScoreStore:
+    """An exported score matrix, memory-mapped (read-only unless mode='r+')"""
+
+    def __init__(self, path, mode='r'):
+        if mode not in ('r', 'r+'):
+            raise ValueError(f"mode must be 'r' or 'r+', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, COLUMNS_FILE)) as f:
+            self._sidecar = json.load(f)
+        if self._sidecar.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported score store version {self._sidecar.get('version')!r}")
+        self._map()
+
+    def _map(self):
+        rows, width = self._sidecar['rows'], len(self._sidecar['columns'])
+        self.scores = _map(os.path.join(self.path, SCORES_FILE), np.int8, (rows, width), self.mode)
+        self._timestamps = _map(os.path.join(self.path, INDEX_FILE), np.int64, (rows,), 'r')
+
+    def __len__(self):
+        return self._sidecar['rows']
+
+    @property
+    def shape(self):
+        return self.scores.shape
+
+    @property
+    def index(self):
+        return pd.DatetimeIndex(np.asarray(self._timestamps).view('datetime64[ns]'))
+
+    @property
+    def columns(self):
+        """Column metadata (name, strategy, params, sub_strategy), one row per matrix column"""
+        return pd.DataFrame(self._sidecar['columns'])
+
+    @property
+    def names(self):
+        return [column['name'] for column in self._sidecar['columns']]
+
+    def positions(self, strategy=None, sub_strategy=None, names=None):
+        """Matrix column positions matching every given filter (names: a name or list of names)"""
+        if isinstance(names, str):
+            names = [names]
+        return [
+            position for position, column in enumerate(self._sidecar['columns'])
+            if (strategy is None or column.get('strategy') == strategy)
+            and (sub_strategy is None or column.get('sub_strategy') == sub_strategy)
+            and (names is None or column['name'] in names)
+        ]
+
+    def rows(self, start=None, end=None):
+        """Positional row slice for timestamps in [start, end]"""
+        index = self.index
+        first = 0 if start is None else index.searchsorted(pd.Timestamp(start), side='left')
+        last = len(index) if end is None else index.searchsorted(pd.Timestamp(end), side='right')
+        return slice(first, last)
+
+    def select(self, strategy=None, sub_strategy=None, names=None, start=None, end=None):
+        """Scores of the matching columns and time range; a view when the columns are contiguous"""
+        positions = self.positions(strategy, sub_strategy, names)
+        rows = self.rows(start, end)
+        if positions and positions == list(range(positions[0], positions[-1] + 1)):
+            return self.scores[rows, positions[0]:positions[-1] + 1]
+        return self.scores[rows][:, positions]
+
+    def frame(self, strategy=None, sub_strategy=None, names=None, start=None, end=None):
+        """Selected scores as a DataFrame indexed by timestamp (a copy)"""
+        positions = self.positions(strategy, sub_strategy, names)
+        rows = self.rows(start, end)
+        frame = pd.DataFrame(np.array(self.select(strategy, sub_strategy, names, start, end)), index=self.index[rows])
+        frame.columns = pd.Index([self._sidecar['columns'][position]['name'] for position in positions])
+        return frame
+
+    def append(self, scores, index):
+        """
+        Append new bars; rows at or before the last stored timestamp are skipped, so passing
+        scores recomputed over a longer history only adds the bars the store doesn't have yet.
+        Returns the number of rows added.
+        """
+        if self.mode != 'r+':
+            raise PermissionError("Open the store with mode='r+' to append")
+        scores = np.asarray(scores)
+        if scores.ndim != 2 or scores.shape != (len(index), self.shape[1]):
+            raise ValueError(f"scores must be {len(index)} x {self.shape[1]}, got {scores.shape}")
+        timestamps = _timestamps(index)
+        if len(self):
+            keep = timestamps > self._timestamps[-1]
+            scores, timestamps = scores[keep], timestamps[keep]
+        if len(timestamps) == 0:
+            return 0
+        rows = len(self)
+        self.scores = self._timestamps = None  # release the maps before growing the files
+        for filename, data, row_bytes in ((SCORES_FILE, np.ascontiguousarray(scores, dtype=np.int8), scores.shape[1]),
+                                          (INDEX_FILE, timestamps, 8)):
+            with open(os.path.join(self.path, filename), 'r+b') as f:
+                # Drop whatever an interrupted append left behind the recorded rows
+                f.truncate(rows * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(data.tobytes())
+        self._sidecar['rows'] = rows + len(timestamps)
+        _write_sidecar(self.path, self._sidecar)
+        self._map()
+        return len(timestamps)
+
+
+def column_metadata(names, owners, instances):
+    """Sidecar entries for score columns emitted by `owners` (class names) of the runner's `instances`"""
+    import tv_memo
+    from tv_selection import output_columns, sub_strategy_plan
+
+    sub_strategies = {}
+    for owner in dict.fromkeys(owners):
+        instance = instances.get(owner)
+        kinds = {}
+        if instance is not None:
+            for kind, method, _ in sub_strategy_plan(type(instance)):
+                for name in output_columns(instance, method) or ():
+                    kinds.setdefault(name, kind)
+        sub_strategies[owner] = (kinds, dict(tv_memo.parameters(instance)) if instance is not None else {})
+    return [
+        {'name': name, 'strategy': owner, 'params': sub_strategies[owner][1],
+         'sub_strategy': sub_strategies[owner][0].get(name)}
+        for name, owner in zip(names, owners)
+    ]
@@ -0,0 +1,225 @@
+"""
+TV Selection - Run a chosen subset of the TV library instead of every class and sub-strategy
+A StrategySelector picks strategy classes (by name pattern and category), sub-strategy kinds
+(the `zero_cross` in calculate_zero_cross_values) and output columns (name patterns).
+Only the selected calculate_*_values methods are called, and library classes compute their
+indicator lazily inside those methods, so unselected sub-strategies cost nothing.
+"""
+
+import fnmatch
+import functools
+import inspect
+import re
+
+import pandas as pd
+
+import tv_memo
+import tv_output
+
+CATEGORIES = ('trend', 'momentum', 'volatility', 'volume', 'other')
+
+# A (non-commented) sub-strategy call inside a class's run_all_strategies
+_SUB_STRATEGY_CALL = re.compile(r'self\.(calculate_(\w+)_values)\(')
+
+# Frame the column-name probe runs on (column names don't depend on the data)
+PROBE_ROWS = 260
+
+_probed_columns = {}  # (class, parameters) -> {method: column names, or None if the probe failed}
+
+
+def _patterns(value):
+    """None, a single pattern or an iterable of patterns -> tuple (None stays None)"""
+    if value is None:
+        return None
+    if isinstance(value, (str, re.Pattern)):
+        return (value,)
+    return tuple(value)
+
+
+def _matches(name, patterns):
+    """True if `name` matches any glob string or compiled regex in `patterns`"""
+    for pattern in patterns:
+        if isinstance(pattern, re.Pattern):
+            if pattern.search(name):
+                return True
+        elif fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def strategy_category(name):
+    """Category of a TV library class name, from the group runner lists ('other' if in none)"""
+    from ta_strategies_combinations_TVLibrary import (MOMENTUM_STRATEGY_NAMES, TREND_STRATEGY_NAMES,
+                                                      VOLATILITY_STRATEGY_NAMES, VOLUME_STRATEGY_NAMES)
+
+    for category, names in (('trend', TREND_STRATEGY_NAMES), ('momentum', MOMENTUM_STRATEGY_NAMES),
+                            ('volatility', VOLATILITY_STRATEGY_NAMES), ('volume', VOLUME_STRATEGY_NAMES)):
+        if name in names:
+            return category
+    return 'other'
+
+
+@functools.lru_cache(maxsize=None)
+def sub_strategy_plan(cls):
+    """
+    Sub-strategies a class's run_all_strategies runs, in order, as (kind, method, passes_indicator)
+    passes_indicator is True where the call forwards the caller's ta_indicator_value flag
+    """
+    plan = []
+    for line in inspect.getsource(cls.run_all_strategies).splitlines():
+        code = line.split('#', 1)[0]
+        match = _SUB_STRATEGY_CALL.search(code)
+        if match:
+            plan.append((match.group(2), match.group(1), 'ta_indicator_value=ta_indicator_value' in code))
+    return tuple(plan)
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_frame():
+    from data_sources import SyntheticSource
+
+    return SyntheticSource(seed=0).fetch('PROBE', '2y', '1d').tail(PROBE_ROWS)
+
+
+class _ColumnRecorder:
+    """Stands in for an OutputBlock during the probe: keeps the emitted column names only"""
+
+    def __init__(self):
+        self.names = []
+
+    def add_columns(self, outputs, owner=None):
+        self.names.extend(name for name, _ in outputs)
+
+
+def output_columns(instance, method):
+    """
+    Column names a sub-strategy method emits in a full run with every output flag on, for this
+    instance's parameters
+    Found by running the class's sub-strategies once on a small synthetic frame (cached per class
+    and parameters); None if that run fails
+    """
+    key = (type(instance), tv_memo.parameters(instance))
+    if key not in _probed_columns:
+        probe, frame, recorder = tv_memo.fresh_copy(instance), _probe_frame(), _ColumnRecorder()
+        columns = {}
+        with tv_output.bound(probe, recorder):
+            for _, name, passes_indicator in sub_strategy_plan(type(instance)):
+                recorder.names = []
+                try:
+                    result = getattr(probe, name)(frame, append=False, ta_indicator_value=passes_indicator, signal_score=True,
+                                                  signal_value=True, signal_explanation=True)
+                except Exception:
+                    columns[name] = None
+                    continue
+                if isinstance(result, pd.DataFrame):
+                    recorder.names.extend(result.columns)
+                columns[name] = tuple(recorder.names)
+        _probed_columns[key] = columns
+    return _probed_columns[key].get(method)
+
+
+class StrategySelector:
+    """
+    Which TV library classes, sub-strategies and columns a group runner should produce
+
+    include / exclude: class-name glob patterns or compiled regexes, e.g. "Stochastic*"
+    categories: any of 'trend', 'momentum', 'volatility', 'volume', 'other'
+    kinds / exclude_kinds: sub-strategy kinds, e.g. "zero_cross", "*threshold*"
+    columns: output column-name patterns; only sub-strategies that emit a matching column run,
+             and only matching columns are returned
+    Unset criteria select everything.
+    """
+
+    def __init__(self, include=None, exclude=None, categories=None, kinds=None, exclude_kinds=None, columns=None):
+        self.include = _patterns(include)
+        self.exclude = _patterns(exclude) or ()
+        self.categories = _patterns(categories)
+        if self.categories is not None:
+            unknown = set(self.categories) - set(CATEGORIES)
+            if unknown:
+                raise ValueError(f"Unknown strategy categories {sorted(unknown)}; expected any of {CATEGORIES}")
+        self.kinds = _patterns(kinds)
+        self.exclude_kinds = _patterns(exclude_kinds) or ()
+        self.columns = _patterns(columns)
+        self._plans = {}
+
+    def __repr__(self):
+        criteria = {name: value for name, value in vars(self).items() if not name.startswith('_') and value}
+        return f"StrategySelector({', '.join(f'{name}={value!r}' for name, value in criteria.items())})"
+
+    @property
+    def filters_sub_strategies(self):
+        """True if the selector narrows what runs inside a class (not just which classes run)"""
+        return self.kinds is not None or bool(self.exclude_kinds) or self.columns is not None
+
+    def selects_class(self, name):
+        """True if the class called `name` passes the name and category criteria"""
+        if self.include is not None and not _matches(name, self.include):
+            return False
+        if _matches(name, self.exclude):
+            return False
+        return self.categories is None or strategy_category(name) in self.categories
+
+    def select_names(self, names):
+        """The class names that pass the name and category criteria, in their original order"""
+        return [name for name in names if self.selects_class(name)]
+
+    def keeps_column(self, name):
+        """True if an output column should be kept"""
+        return self.columns is None or _matches(str(name), self.columns)
+
+    def filter_frame(self, frame):
+        """Drop the columns of a result frame that don't match the column patterns"""
+        if self.columns is None or frame is None or frame.empty:
+            return frame
+        return frame.loc[:, [self.keeps_column(name) for name in frame.columns]]
+
+    def plan(self, instance):
+        """
+        Selected sub-strategies of an instance as (kind, method, passes_indicator), in run order
+        The indicator value column only comes with the sub-strategy that emits it in a full run
+        (sub-strategies may report different series under the same name). An empty plan means
+        the instance has nothing to produce.
+        """
+        key = (type(instance), tv_memo.parameters(instance) if self.columns is not None else None)
+        if key not in self._plans:
+            self._plans[key] = self._build_plan(instance)
+        return self._plans[key]
+
+    def _build_plan(self, instance):
+        plan = [
+            entry for entry in sub_strategy_plan(type(instance))
+            if (self.kinds is None or _matches(entry[0], self.kinds)) and not _matches(entry[0], self.exclude_kinds)
+        ]
+        if self.columns is not None:
+            selected = []
+            for entry in plan:
+                columns = output_columns(instance, entry[1])
+                # A method whose columns couldn't be probed runs anyway; filter_frame trims it
+                if columns is None or any(self.keeps_column(name) for name in columns):
+                    selected.append(entry)
+            plan = selected
+        return tuple(plan)
+
+    def run(self, instance, df, append=True, ta_indicator_value=False, signal_score=True, signal_value=False,
+            signal_explanation=False):
+        """The selected part of instance.run_all_strategies(df, ...)"""
+        if not self.filters_sub_strategies:
+            return instance.run_all_strategies(
+                df, append=append, ta_indicator_value=ta_indicator_value, signal_score=signal_score,
+                signal_value=signal_value, signal_explanation=signal_explanation)
+
+        # With column patterns the unmatched columns must not reach df, so write after filtering
+        write_later = append and self.columns is not None
+        frames = []
+        for _, method, passes_indicator in self.plan(instance):
+            frame = getattr(instance, method)(
+                df, append=append and not write_later, ta_indicator_value=ta_indicator_value and passes_indicator,
+                signal_score=signal_score, signal_value=signal_value, signal_explanation=signal_explanation)
+            if frame is not None:
+                frames.append(frame)
+        result = self.filter_frame(pd.concat(frames, axis=1)) if frames else pd.DataFrame()
+        if write_later:
+            for position, name in enumerate(result.columns):
+                df[name] = result.iloc[:, position]
+        return result
@@ -0,0 +1,186 @@
+"""
+TV Windows - Vectorized trailing-window primitives for ta_strategies_TVLibrary
+Replaces rolling(...).apply(python_fn, raw=True), which calls back into Python once per bar.
+Full windows are computed with sliding-window views, fixed-weight convolution and rolling-sum
+closed forms; the short warm-up windows of min_periods=1 indicators reuse the original
+per-window function, so only the first window-1 bars ever go through Python.
+
+All functions take a Series/array and return float64 arrays aligned with the input, NaN where
+the window is incomplete. A window containing NaN yields NaN, as it did with np.dot.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_float_array(values):
+    """Contiguous float64 array from a Series/array/list"""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def _aligned(full_windows, n, window):
+    """Place one-value-per-full-window results at the window's last bar"""
+    out = np.full(n, np.nan)
+    if n >= window:
+        out[window - 1:] = full_windows
+    return out
+
+
+def sliding_windows(values, window):
+    """Read-only (n - window + 1, window) view of every full trailing window (no copy)"""
+    values = as_float_array(values)
+    if len(values) < window:
+        return np.empty((0, window))
+    return sliding_window_view(values, window)
+
+
+# =============================================================================
+# Fixed-weight windows
+# =============================================================================
+
+def window_dot(values, weights):
+    """
+    dot(window, weights) for every full trailing window of len(weights)
+    weights[0] applies to the oldest bar in the window, weights[-1] to the current bar
+    """
+    values = as_float_array(values)
+    weights = np.asarray(weights, dtype=np.float64)
+    n, window = len(values), len(weights)
+    if n < window:
+        return np.full(n, np.nan)
+    # convolve flips its kernel, so reverse the weights to get a trailing dot product
+    return _aligned(np.convolve(values, weights[::-1], mode='valid'), n, window)
+
+
+def weighted_average(values, weights):
+    """Fixed-weight moving average: dot(window, weights) / sum(weights)"""
+    weights = np.asarray(weights, dtype=np.float64)
+    return window_dot(values, weights) / weights.sum()
+
+
+def rolling_sum(values, window):
+    """Sum of every full trailing window"""
+    return window_dot(values, np.ones(window))
+
+
+# =============================================================================
+# Order statistics
+# =============================================================================
+
+def _window_arg(values, window, extreme):
+    values = as_float_array(values)
+    n = len(values)
+    if n < window:
+        return np.full(n, np.nan)
+    rolling = pd.Series(values).rolling(window, min_periods=1)
+    target = getattr(rolling, extreme)().to_numpy()[window - 1:]
+    windows = sliding_windows(values, window)
+    first_match = np.zeros(len(windows))
+    first_nan = np.full(len(windows), -1.0)
+    # Scan newest to oldest so the oldest matching position wins, as with np.argmax
+    for k in range(window - 1, -1, -1):
+        column = windows[:, k]
+        np.copyto(first_match, k, where=column == target)
+        np.copyto(first_nan, k, where=np.isnan(column))
+    # np.argmax/argmin report the first NaN when a window has one; all-NaN windows stay NaN
+    positions = np.where(first_nan >= 0, first_nan, first_match)
+    positions[np.isnan(target)] = np.nan
+    return _aligned(positions, n, window)
+
+
+def rolling_argmax(values, window):
+    """Position (0 = oldest bar) of the first maximum in every full trailing window"""
+    return _window_arg(values, window, 'max')
+
+
+def rolling_argmin(values, window):
+    """Position (0 = oldest bar) of the first minimum in every full trailing window"""
+    return _window_arg(values, window, 'min')
+
+
+# =============================================================================
+# Rolling-sum closed forms
+# =============================================================================
+
+def flat_windows(values, window):
+    """True where a full trailing window holds a single repeated value (pandas' variance is exactly 0 there)"""
+    variance = pd.Series(as_float_array(values)).rolling(window, min_periods=window).var(ddof=0).to_numpy()
+    return variance == 0
+
+
+def window_regression(y, x_start=0):
+    """Least-squares slope and intercept of one window, as the per-window indicators computed them"""
+    n = len(y)
+    x = np.arange(x_start, x_start + n)
+    denom = n * np.sum(x**2) - (np.sum(x))**2
+    slope = (n * np.dot(x, y) - np.sum(x) * np.sum(y)) / denom if denom != 0 else 0
+    intercept = (np.sum(y) - slope * np.sum(x)) / n
+    return slope, intercept
+
+
+def linear_regression(values, window, x_start=0):
+    """
+    Least-squares slope and intercept of every full trailing window against
+    x = x_start, ..., x_start + window - 1, from rolling sums over window-centered x
+    Flat windows are recomputed with window_regression: its rounding residue there (not an
+    exact 0) decides the sign of the slope, so zero and price crosses stay as they were
+    """
+    values = as_float_array(values)
+    x = np.arange(x_start, x_start + window, dtype=np.float64)
+    centered_x = x - x.mean()
+    sum_centered_x2 = (centered_x * centered_x).sum()
+    mean_y = rolling_sum(values, window) / window
+    # sum((x - mean_x) * (y - mean_y)) == sum((x - mean_x) * y) since the centered x sums to 0
+    if sum_centered_x2 != 0:
+        slope = window_dot(values, centered_x) / sum_centered_x2
+    else:
+        slope = np.where(np.isnan(mean_y), np.nan, 0.0)
+    intercept = mean_y - slope * x.mean()
+    for i in np.flatnonzero(flat_windows(values, window)):
+        slope[i], intercept[i] = window_regression(values[i - window + 1:i + 1], x_start)
+    return slope, intercept
+
+
+def correlation_with_time(values, window):
+    """
+    Pearson correlation of every full trailing window with 0, 1, ..., window - 1
+    Flat windows (zero variance) give 0
+    """
+    values = as_float_array(values)
+    index = np.arange(window, dtype=np.float64)
+    centered_index = index - index.mean()
+    std_index = np.sqrt((centered_index ** 2).sum())
+    # sum((i - mean_i) * (y - mean_y)) == sum((i - mean_i) * y) since the centered index sums to 0
+    covariance = window_dot(values, centered_index)
+    # pandas' online variance is numerically stable and exactly 0 on flat windows
+    std_values = np.sqrt(pd.Series(values).rolling(window, min_periods=window).var(ddof=0).to_numpy() * window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = covariance / (std_values * std_index)
+    flat = (std_values == 0) | (std_index == 0)
+    return np.where(flat & ~np.isnan(covariance), 0.0, corr)
+
+
+# =============================================================================
+# Warm-up windows
+# =============================================================================
+
+def fill_warmup(values, window, func, out):
+    """
+    Fill the first window - 1 bars of `out` like rolling(window, min_periods=1).apply(func, raw=True):
+    func sees the growing window values[:i + 1]; all-NaN windows stay NaN
+    """
+    values = as_float_array(values)
+    for i in range(min(window - 1, len(values))):
+        head = values[:i + 1]
+        out[i] = func(head) if not np.isnan(head).all() else np.nan
+    return out
+
+
+def fill_windows(values, window, func, out, mask):
+    """Recompute the full trailing windows ending where `mask` is True with the per-window function"""
+    values = as_float_array(values)
+    for i in np.flatnonzero(mask):
+        if i >= window - 1:
+            out[i] = func(values[i - window + 1:i + 1])
+    return out